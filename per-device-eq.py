@@ -13,8 +13,12 @@ config, eq, profiles, pipewire, integration, cli, gui.
   --list-profiles        list known profiles
   --inspect <node.name>  dump node params (pw-dump info.params)
   --apply                apply each bound profile to its sink now
+                         (--with-taste: with the active taste layer)
   --install              install the hook + desktop integration
   --uninstall            remove the hook + desktop integration
+  --bridge A B [C ...]   frame bridge between rigs' profiles (a matrix
+                         past two, or with --matrix)
+  --export [PROFILE ...] bake profiles for export targets + a manifest
   (no args)              launch the GTK4 GUI
 """
 
@@ -33,14 +37,10 @@ for _cand in (_HERE,
             sys.path.insert(0, _cand)
         break
 
-from perdeviceeq.config import SYS_DESKTOP_FILE
-from perdeviceeq.pipewire import missing_tools, missing_tools_message
-from perdeviceeq.integration import (install_full, uninstall_hook,
-                                      restart_wireplumber,
-                                      uninstall_desktop_integration)
-from perdeviceeq.cli import (cmd_list, cmd_list_sources,
-                             cmd_list_profiles, cmd_inspect,
-                             cmd_apply)
+# Every command imports what it runs, in its own branch: --apply from a
+# login script or a WirePlumber-adjacent hook pays for the stdlib, the
+# profile store and the pw-* wrappers -- never GTK, NumPy or SciPy
+# (tests/test_startup.py holds that line and the time budget).
 
 
 def main():
@@ -63,20 +63,42 @@ def main():
                    help="install the WirePlumber hook + the desktop entry")
     g.add_argument("--uninstall", action="store_true",
                    help="remove the hook + the desktop entry")
-    g.add_argument("--bridge", nargs=2, metavar=("A", "B"),
-                   help="frame bridge: the measured delta between two "
-                        "profiles of one reference device on two rigs")
+    g.add_argument("--bridge", nargs="+", metavar="PROFILE",
+                   help="frame bridge: the measured delta between "
+                        "profiles of one reference device on different "
+                        "rigs (two: one pair; more: the N-way matrix)")
+    g.add_argument("--export", nargs="*", metavar="PROFILE",
+                   help="bake profiles (ids or names; default: every "
+                        "user profile) for export targets, with a "
+                        "verification manifest")
+    ap.add_argument("--target", action="append", metavar="ID",
+                    help="with --export: a target id, repeatable "
+                         "(default: every registered target)")
+    ap.add_argument("--jobs", type=int, metavar="N",
+                    help="with --export: parallel bakes "
+                         "(default: one per core)")
+    ap.add_argument("--no-taste", action="store_true",
+                    help="with --export: leave the active taste "
+                         "layer out")
+    ap.add_argument("--with-taste", action="store_true",
+                    help="with --apply: compose the active taste "
+                         "layer over each bound profile, as the GUI "
+                         "plays it")
     ap.add_argument("--published", metavar="CURVE",
                     help="with --bridge: freq/dB text of the same "
                          "device on a trusted rig, for the external-"
                          "anchor audit of B")
-    ap.add_argument("--out", metavar="DIR", default="bridge-out",
-                    help="with --bridge: output directory "
-                         "(default: %(default)s)")
+    ap.add_argument("--matrix", action="store_true",
+                    help="with --bridge: the N-way matrix report even "
+                         "for two profiles")
+    ap.add_argument("--out", metavar="DIR",
+                    help="with --bridge / --export: output directory "
+                         "(default: bridge-out / export-out)")
     args = ap.parse_args()
 
     if (args.list_sinks or args.list_sources or args.inspect
             or args.apply):
+        from perdeviceeq.pipewire import missing_tools, missing_tools_message
         miss = missing_tools()
         if miss:
             print(missing_tools_message(miss), file=sys.stderr)
@@ -87,29 +109,51 @@ def main():
         from perdeviceeq.profiles import ProfileStore
         try:
             store = ProfileStore()
-            a = br.resolve_profile(store, args.bridge[0])
-            b = br.resolve_profile(store, args.bridge[1])
-            pub = (br.parse_curve(args.published)
-                   if args.published else None)
-            res = br.compute_bridge(a, b, published=pub)
-            rp = br.write_outputs(res, args.out)
+            profs = [br.resolve_profile(store, k) for k in args.bridge]
+            out = args.out or "bridge-out"
+            if len(profs) < 2:
+                raise br.BridgeError("--bridge needs at least two "
+                                     "profiles")
+            if len(profs) > 2 or args.matrix:
+                if args.published:
+                    raise br.BridgeError("--published audits one pair; "
+                                         "bridge that pair on its own")
+                rp = br.write_matrix_outputs(br.compute_matrix(profs),
+                                             out)
+            else:
+                pub = (br.parse_curve(args.published)
+                       if args.published else None)
+                res = br.compute_bridge(profs[0], profs[1],
+                                        published=pub)
+                rp = br.write_outputs(res, out)
         except (br.BridgeError, OSError) as e:
             print(str(e), file=sys.stderr)
             return 2
         sys.stdout.write(open(rp).read())
-        print("written: %s" % args.out)
+        print("written: %s" % out)
         return 0
+    if args.export is not None:
+        from perdeviceeq.cli import cmd_export
+        return cmd_export(args.export, args.target,
+                          args.out or "export-out", jobs=args.jobs,
+                          taste=not args.no_taste)
     if args.list_sinks:
+        from perdeviceeq.cli import cmd_list
         return cmd_list()
     if args.list_sources:
+        from perdeviceeq.cli import cmd_list_sources
         return cmd_list_sources()
     if args.list_profiles:
+        from perdeviceeq.cli import cmd_list_profiles
         return cmd_list_profiles()
     if args.inspect:
+        from perdeviceeq.cli import cmd_inspect
         return cmd_inspect(args.inspect)
     if args.apply:
-        return cmd_apply()
+        from perdeviceeq.cli import cmd_apply
+        return cmd_apply(taste=args.with_taste)
     if args.install:
+        from perdeviceeq.integration import install_full
         try:
             res = install_full()
         except FileNotFoundError as e:
@@ -125,6 +169,10 @@ def main():
         print("uninstall everything with: per-device-eq.py --uninstall")
         return 0
     if args.uninstall:
+        from perdeviceeq.config import SYS_DESKTOP_FILE
+        from perdeviceeq.integration import (
+            restart_wireplumber, uninstall_desktop_integration,
+            uninstall_hook)
         if uninstall_hook():
             print("hook + config removed; restarting WirePlumber once...")
             restart_wireplumber()
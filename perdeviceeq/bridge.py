@@ -19,6 +19,13 @@ Absolute level is meaningless across rigs (different drives and
 sensitivities), so every comparison is aligned to zero mean inside
 ALIGN_LO..ALIGN_HI and the removed offset is reported, never
 silently eaten.
+
+compute_matrix is the lab-scale form: N profiles of the same
+reference device, each canvas reconstructed once, all of them
+resampled into one (rig, channel, freq) stack, every pairwise delta
+and RSS spread taken by broadcasting, and a per-rig offset set
+solved by least squares over the trusted pairs -- so a lab with
+dozens of rigs reads one report instead of N^2 bridges.
 """
 
 import hashlib
@@ -29,14 +36,13 @@ import numpy as np
 
 from . import measure_core as mc
 from . import refit
+from . import runs
 
 TRUST_SPREAD_DB = 1.5      # RSS spread above this ends the trusted band
 ALIGN_LO = 200.0           # level-alignment window, Hz: high enough to
 ALIGN_HI = 800.0           # dodge seal variance, low enough to dodge
                            # insertion-depth chaos
 
-SMOOTH_FRACTION = 6        # channel_results' box smoothing, 1/6 oct
-
 SCHEMA = 1
 
 
@@ -44,18 +50,27 @@ class BridgeError(RuntimeError):
     pass
 
 
+def _fit_smoothing(profile):
+    """The smoothing setting the profile was fitted with (refit's
+    default when it carries no fit)."""
+    params = (profile.get("fit") or {}).get("params") or {}
+    return params.get("smoothing", 6)
+
+
 def _mean_curves(profile):
     """Profile -> {channel: (freqs, mag_db, spread_db)} off its canvas.
 
-    mag_db is the calibrated, box-smoothed per-channel average exactly
-    as the fit sees it (refit.channel_results); spread_db is the
+    mag_db is the calibrated, smoothed per-channel average exactly as
+    the fit sees it (refit.channel_results under the fit's own
+    smoothing: 1/N octave, erb or psychoacoustic); spread_db is the
     take-to-take spread on the same grid.
     """
     meas = profile.get("measurement")
     if not meas or not meas.get("takes"):
         raise BridgeError("profile %r carries no measurement canvas"
                           % profile.get("name", profile.get("id")))
-    results, _ = refit.channel_results(meas)
+    results, _ = refit.channel_results(
+        meas, smoothing=_fit_smoothing(profile))
     out = {}
     for ch, r in results.items():
         d = r["data"]
@@ -65,21 +80,30 @@ def _mean_curves(profile):
     return out
 
 
-def _common_grid(meas_a, meas_b):
-    """The intersection of the two canvases' grids, at the coarser
+def _common_grid(*meas):
+    """The intersection of the canvases' grids, at the coarsest
     density -- interpolation may only ever downsample."""
-    def g(meas):
-        gr = meas.get("grid") or {}
+    def g(m):
+        gr = m.get("grid") or {}
         return (float(gr.get("f_lo", mc.GRID_F_LO)),
                 float(gr.get("f_hi", mc.GRID_F_HI)),
                 int(gr.get("ppo", mc.GRID_PPO)))
-    lo_a, hi_a, ppo_a = g(meas_a)
-    lo_b, hi_b, ppo_b = g(meas_b)
-    lo, hi = max(lo_a, lo_b), min(hi_a, hi_b)
+    grids = [g(m) for m in meas]
+    lo = max(x[0] for x in grids)
+    hi = min(x[1] for x in grids)
     if not hi > lo:
-        raise BridgeError("the two canvases share no frequency range")
-    ppo = min(ppo_a, ppo_b)
-    return mc.log_grid(lo, hi, ppo), ppo
+        raise BridgeError("the %s canvases share no frequency range"
+                          % ("two" if len(meas) == 2 else "rigs'"))
+    return mc.log_grid(lo, hi, min(x[2] for x in grids))
+
+
+def _guard(freqs, profiles):
+    """(len(profiles), F) erosion half-widths on the common grid: row
+    k is how far profile k's smoothing window reaches each way at
+    every point, off the operator's own half-widths -- the width in
+    octaves is the fit's, whatever grid it was smoothed on."""
+    return np.stack([mc.smoothing_half_widths(freqs, _fit_smoothing(p))
+                     for p in profiles])
 
 
 def _resample(freqs_src, vals, freqs_dst):
@@ -95,34 +119,6 @@ def _align_offset(freqs, vals):
     return float(np.mean(vals[m]))
 
 
-def _erode(mask, w):
-    """False spreads w points each way: the pipeline box-smooths the
-    means, so a point within half a smoothing window of a spread
-    violation has already borrowed from the chaos."""
-    if w <= 0:
-        return mask.copy()
-    bad = (~mask).astype(float)
-    kern = np.ones(2 * w + 1)
-    return ~(np.convolve(bad, kern, mode="same") > 0.0)
-
-
-def _longest_run(mask):
-    """(start, end) indices of the longest True run, or None."""
-    best = None
-    i, n = 0, len(mask)
-    while i < n:
-        if mask[i]:
-            j = i
-            while j + 1 < n and mask[j + 1]:
-                j += 1
-            if best is None or j - i > best[1] - best[0]:
-                best = (i, j)
-            i = j + 1
-        else:
-            i += 1
-    return best
-
-
 def parse_curve(path):
     """freq/dB text: whitespace or comma separated, '#' '*' ';'
     comments -- the dialect REW and AutoEq both emit."""
@@ -163,6 +159,7 @@ def _rig_meta(profile):
             "profile_name": profile.get("name"),
             "rig": src.get("name"),
             "serial": src.get("serial"),
+            "smoothing": _fit_smoothing(profile),
             "cal_files": {sha: (e or {}).get("file")
                           for sha, e in lib.items()}}
 
@@ -176,9 +173,8 @@ def compute_bridge(prof_a, prof_b, published=None):
     if not chans:
         raise BridgeError("the two profiles share no channels")
 
-    freqs, ppo = _common_grid(prof_a["measurement"],
-                              prof_b["measurement"])
-    guard = max(1, int(round(ppo / (2.0 * SMOOTH_FRACTION))))
+    freqs = _common_grid(prof_a["measurement"], prof_b["measurement"])
+    guard = _guard(freqs, (prof_a, prof_b)).max(axis=0)
     per_ch = {}
     for ch in chans:
         fa, ma, sa = curves_a[ch]
@@ -191,7 +187,11 @@ def compute_bridge(prof_a, prof_b, published=None):
         off = _align_offset(freqs, d_raw)
         d = d_raw - off
         trust = rss <= TRUST_SPREAD_DB
-        run = _longest_run(_erode(trust, guard))
+        # eroded first: the pipeline smooths the means, so a point
+        # within half a smoothing window (the wider of the two fits'
+        # at that frequency) of a spread violation has already
+        # borrowed from the chaos
+        run = runs.longest_run(runs.erode(trust, guard))
         # the trusted BAND is the longest contiguous run: isolated
         # quiet islands beyond it are seating luck, not physics
         band = np.zeros_like(trust)
@@ -236,6 +236,113 @@ def compute_bridge(prof_a, prof_b, published=None):
             "trust_spread_db": TRUST_SPREAD_DB}
 
 
+def _on_grid(curves, chans, freqs):
+    """One rig's {channel: (f, mag, spread)} -> two (channel, freq)
+    arrays on the common grid; a canvas already on it is taken as
+    is."""
+    mag = np.empty((len(chans), len(freqs)))
+    spr = np.empty_like(mag)
+    for k, ch in enumerate(chans):
+        f, m, sp = curves[ch]
+        if len(f) == len(freqs) and np.allclose(f, freqs):
+            mag[k], spr[k] = m, sp
+        else:
+            mag[k] = _resample(f, m, freqs)
+            spr[k] = _resample(f, sp, freqs)
+    return mag, spr
+
+
+def _rig_offsets(delta, trusted):
+    """Least-squares per-rig offsets X from the pairwise deltas.
+
+    delta[i, j] ~ X[i] - X[j] is solved per (channel, freq) over the
+    pairs `trusted` there, through the pseudo-inverse of that
+    pair graph's Laplacian: the minimum-norm solution, i.e. offsets
+    summing to zero over each connected set of rigs. The deltas come
+    from one stack of means, so the system is consistent wherever
+    the graph reaches and the solve is the gauge fix -- what it adds
+    is that a rig only gets an offset where it is trusted against
+    someone. Rigs with no trusted partner at a point read NaN.
+    delta, trusted: (rig, rig, channel, freq); returns (rig,
+    channel, freq)."""
+    adj = trusted.astype(float)
+    idx = np.arange(adj.shape[0])
+    adj[idx, idx] = 0.0
+    a = np.moveaxis(adj, (0, 1), (-2, -1))             # (c, f, n, n)
+    lap = -a
+    deg = a.sum(axis=-1)
+    lap[..., idx, idx] += deg
+    rhs = np.einsum("cfij,cfij->cfi", a,
+                    np.moveaxis(np.nan_to_num(delta), (0, 1),
+                                (-2, -1)))
+    x = np.einsum("cfij,cfj->cfi", np.linalg.pinv(lap), rhs)
+    x[deg == 0.0] = np.nan
+    return np.moveaxis(x, -1, 0)
+
+
+def compute_matrix(profiles):
+    """The N-way bridge, pure: every pair of `profiles` (>= 2 of
+    one reference device, each canvas reconstructed once).
+
+    All rigs go into one (rig, channel, freq) stack on the common
+    grid; the level-aligned pairwise deltas D[i, j] = A_i - A_j and
+    the RSS spreads come out of one broadcast each (D is
+    antisymmetric, so row i reads 'rig i minus rig j'). Each pair's
+    trusted band is the same eroded longest run compute_bridge
+    uses, judged on the channels' worst RSS, and the per-rig
+    offsets are the least-squares solution over the trusted pairs
+    (_rig_offsets). No published anchor here: bridge one pair for
+    that."""
+    if len(profiles) < 2:
+        raise BridgeError("a bridge matrix needs at least two profiles")
+    curves = [_mean_curves(p) for p in profiles]
+    chans = sorted(set.intersection(*(set(c) for c in curves)))
+    if not chans:
+        raise BridgeError("the profiles share no channels")
+    freqs = _common_grid(*(p["measurement"] for p in profiles))
+    g = _guard(freqs, profiles)
+
+    stacks = [_on_grid(c, chans, freqs) for c in curves]
+    mag = np.stack([m for m, _ in stacks])             # (n, c, f)
+    spr = np.stack([s for _, s in stacks])
+    win = (freqs >= ALIGN_LO) & (freqs <= ALIGN_HI)
+    if not win.any():
+        win = np.ones_like(freqs, dtype=bool)
+    level = mag[..., win].mean(axis=-1)                # (n, c)
+    shape = mag - level[..., None]
+    delta = shape[:, None] - shape[None, :]            # (n, n, c, f)
+    sq = spr * spr
+    rss = np.sqrt(sq[:, None] + sq[None, :])
+    trust = rss <= TRUST_SPREAD_DB
+
+    n = len(profiles)
+    # every pair's band in one pass over the (pair, freq) mask
+    worst = rss.max(axis=2).reshape(n * n, -1)         # (n*n, f)
+    guard = np.maximum(g[:, None], g[None, :]).reshape(n * n, -1)
+    lo, hi = runs.longest_runs(runs.erode(worst <= TRUST_SPREAD_DB,
+                                          guard))
+    idx = np.arange(len(freqs))
+    band_mask = ((idx >= lo[:, None]) & (idx <= hi[:, None])
+                 & (lo[:, None] >= 0)).reshape(n, n, -1)
+    band_mask[np.arange(n), np.arange(n)] = False
+    bands = [[(float(freqs[lo[i * n + j]]), float(freqs[hi[i * n + j]]))
+              if i != j and lo[i * n + j] >= 0 else None
+              for j in range(n)] for i in range(n)]
+    inside = np.where(band_mask[:, :, None, :], np.abs(delta), -1.0)
+    max_d = inside.max(axis=(2, 3))
+    max_d[max_d < 0.0] = np.nan
+    offsets = _rig_offsets(delta, trust & band_mask[:, :, None, :])
+
+    return {"schema": SCHEMA, "kind": "matrix", "freq_hz": freqs,
+            "channels": chans, "rigs": [_rig_meta(p) for p in profiles],
+            "delta_db": delta, "rss_spread_db": rss,
+            "level_db": level, "pair_band_hz": bands,
+            "pair_band_mask": band_mask, "pair_max_abs_delta_db": max_d,
+            "rig_offset_db": offsets,
+            "align_band_hz": (ALIGN_LO, ALIGN_HI),
+            "trust_spread_db": TRUST_SPREAD_DB}
+
+
 def _jsonable(bridge):
     out = json.loads(json.dumps(bridge, default=lambda o:
                                 o.tolist() if isinstance(o, np.ndarray)
@@ -326,6 +433,93 @@ def _report_text(bridge):
     return "\n".join(lines) + "\n"
 
 
+def _plain(o):
+    """json default for the matrix: arrays to lists, NaN (no trusted
+    partner) to null."""
+    if isinstance(o, np.ndarray):
+        if o.dtype.kind == "f":
+            return np.where(np.isfinite(o), o, None).tolist()
+        return o.tolist()
+    return float(o)
+
+
+def write_matrix_outputs(matrix, outdir):
+    """matrix.json (pair summaries + per-rig offsets; the full
+    N x N x channel x freq delta stays in memory -- bridge one pair
+    for its curves) + offsets.txt (freq, then each rig's
+    channel-mean offset) + report.txt; returns the report path."""
+    os.makedirs(outdir, exist_ok=True)
+    keep = {k: v for k, v in matrix.items()
+            if k not in ("delta_db", "rss_spread_db",
+                         "pair_band_mask")}
+    out = json.loads(json.dumps(keep, default=_plain))
+    blob = json.dumps(out, sort_keys=True).encode()
+    out["content_sha256"] = hashlib.sha256(blob).hexdigest()
+    with open(os.path.join(outdir, "matrix.json"), "w") as fh:
+        json.dump(out, fh, indent=1, sort_keys=True)
+        fh.write("\n")
+
+    x = matrix["rig_offset_db"]
+    cnt = np.isfinite(x).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        off = np.where(cnt > 0, np.nansum(x, axis=1) / cnt, np.nan)
+    with open(os.path.join(outdir, "offsets.txt"), "w") as fh:
+        fh.write("* bridge matrix: per-rig offset, channel mean, dB "
+                 "(nan: no trusted partner)\n")
+        fh.write("* freq %s\n" % " ".join(
+            r["profile_name"] or str(r["profile_id"])
+            for r in matrix["rigs"]))
+        for f, col in zip(matrix["freq_hz"], off.T):
+            fh.write("%.6g %s\n" % (f, " ".join("%.4f" % v
+                                                for v in col)))
+
+    rp = os.path.join(outdir, "report.txt")
+    with open(rp, "w") as fh:
+        fh.write(_matrix_report_text(matrix))
+    return rp
+
+
+def _matrix_report_text(matrix):
+    rigs = matrix["rigs"]
+    n = len(rigs)
+    lines = ["bridge matrix: %d rigs, channels %s"
+             % (n, ", ".join(matrix["channels"])), ""]
+    for i, r in enumerate(rigs):
+        lines.append("%2d  %s  (rig %s)" % (i, r["profile_name"],
+                                            r["rig"]))
+    lines += ["", "max |D| inside each pair's trusted band, dB "
+              "('--': no trusted band):",
+              "    " + "".join("%7d" % j for j in range(n))]
+    md = matrix["pair_max_abs_delta_db"]
+    for i in range(n):
+        lines.append("%2d  " % i + "".join(
+            "%7s" % ("" if i == j else "--" if np.isnan(md[i, j])
+                     else "%.2f" % md[i, j]) for j in range(n)))
+    lines.append("")
+    off = matrix["rig_offset_db"]
+    for i, r in enumerate(rigs):
+        x = off[i]
+        ok = np.isfinite(x)
+        if not ok.any():
+            lines.append("%2d: no trusted partner anywhere -- reseat "
+                         "and remeasure" % i)
+            continue
+        lines.append("%2d: offset from the rigs it is trusted "
+                     "against: max %.2f dB over %.0f%% of the grid"
+                     % (i, float(np.abs(x[ok]).max()),
+                        100.0 * ok.all(axis=0).mean()))
+    lines.append("")
+    lines.append(
+        "reading the numbers: each D is the composite of coupler "
+        "physics, capsule and cal file, exactly as in a two-rig "
+        "bridge; the per-rig offsets are the least-squares split of "
+        "all trusted pairs, zero-mean over the rigs each point "
+        "connects. Pair trust ends where the RSS of the two rigs' "
+        "take-to-take spreads crosses %.1f dB."
+        % matrix["trust_spread_db"])
+    return "\n".join(lines) + "\n"
+
+
 def resolve_profile(store, key):
     """pid first, then an exact (case-insensitive) unique name."""
     p = store.get(key)
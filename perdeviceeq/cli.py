@@ -1,14 +1,15 @@
 # -*- coding: utf-8 -*-
 """CLI command implementations (no GTK). These back the --list / --list-profiles
-/ --inspect / --apply flags; argument parsing and dispatch live in the launcher.
+/ --inspect / --apply / --export flags; argument parsing and dispatch live in
+the launcher.
 """
 
 import json, sys
 
 from .config import CLEAN_ID
-from .profiles import ProfileStore
+from .profiles import GraphCache, ProfileStore, load_bindings
 from .pipewire import (list_sinks, list_sources, node_params,
-                       metadata_set, metadata_clear)
+                       metadata_writer)
 
 
 def cmd_list():
@@ -44,22 +45,98 @@ def cmd_inspect(name):
     print(json.dumps(params, indent=2, ensure_ascii=False))
     return 0
 
-def cmd_apply():
+def cmd_apply(taste=False):
     """Push every bound device's graph into the 'per-device-eq' metadata; the WP
-    hook applies it. Requires the hook to be installed (run --install-hook once)."""
-    store = ProfileStore()
-    presets = store.presets()
-    n = 0
-    for node, pid in store.bindings.items():
+    hook applies it. Requires the hook to be installed (run --install-hook once).
+    With taste=True (--with-taste) the active taste layer is composed over each
+    profile, as the GUI plays it; by default the bound profiles go out as saved.
+
+    Streams the compiled graph cache (profiles.GraphCache): a device whose
+    binding and profile file are unchanged since the last save costs one stat,
+    whatever its canvas. A stale entry is settled by sha against its profile --
+    the store is loaded once, on the first miss -- and written back, so the next
+    run is all hits again (a --with-taste run rebuilds under the layer). The
+    writes are queued at once (MetadataWriter.set_many) and go out as one
+    batch: one pw-metadata child for every device, key by key only against
+    a hook that predates the batch key."""
+    bindings = load_bindings()
+    cache = GraphCache()
+    if taste:
+        from .preferences import PreferenceLayers
+        taste = PreferenceLayers().active()
+    else:
+        taste = None
+    store = None
+    writer = metadata_writer()      # one queue, delivered as one batch
+    changes = {}
+    applied = []
+    for node, pid in bindings.items():
         if not pid or pid == CLEAN_ID:
-            metadata_clear(node)
+            changes[node] = None
             continue
-        graph = presets.get(node)
-        if graph is None:
+        entry = cache.lookup(node, pid, taste)
+        if entry is None:
+            store = store or ProfileStore()
+            if not store.has(pid):
+                continue
+            entry = cache.refresh(node, store.get(pid), taste)
+        if entry["graph"] is None:
             continue
-        ok = metadata_set(node, graph)
+        changes[node] = entry["graph"]
+        applied.append((node, pid))
+    cache.save()
+    writer.set_many(changes)
+    writer.flush()
+    n = 0
+    for node, pid in applied:
+        ok = writer.results.get(node, False)
         print("%s %s -> %s" % ("metadata" if ok else "FAILED  ", node, pid))
         n += 1 if ok else 0
     if not n:
         print("nothing applied (is the hook installed? run --install-hook)")
     return 0 if n else 1
+
+
+def cmd_export(keys, target_ids, out_dir, jobs=None, taste=True):
+    """Bake profiles x export targets into out_dir with a manifest
+    (export_bake.bake_batch). `keys` are profile ids or names (empty:
+    every user profile); `target_ids` registry ids (empty: all of
+    them). The active taste layer rides along unless taste=False.
+    Exit 0 when every artifact verified, 1 when one needs a look,
+    2 when the batch could not start."""
+    from . import export_bake as xb
+    from . import export_peq as xp
+    from .bridge import BridgeError, resolve_profile
+    from .preferences import PreferenceLayers
+    store = ProfileStore()
+    try:
+        if keys:
+            profs = [resolve_profile(store, k) for k in keys]
+        else:
+            profs = [p for p in store.ordered()
+                     if not p["builtin"] and p["id"] != CLEAN_ID]
+        reg = xp.load_targets()
+        if target_ids:
+            by_id = {t["id"]: t for t in reg}
+            bad = [t for t in target_ids if t not in by_id]
+            if bad:
+                raise xb.ExportError(
+                    "unknown export target %s (known: %s)"
+                    % (", ".join(bad), ", ".join(sorted(by_id))))
+            targets = [by_id[t] for t in target_ids]
+        else:
+            targets = reg
+        layer = PreferenceLayers().active() if taste else None
+        man = xb.bake_batch(
+            profs, targets, out_dir, jobs=jobs,
+            taste=(layer["name"], list(layer["bands"]))
+            if layer else None,
+            on_entry=lambda e: print("%-5s %s  %s" % (
+                {True: "pass", False: "CHECK"}.get(e.get("ok"), "fit"),
+                e["file"] or "-", e.get("error") or e["line"])))
+    except (BridgeError, xb.ExportError) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    print("%d files, %d to check -- manifest: %s"
+          % (man["count"], man["failed"], out_dir))
+    return 1 if man["failed"] else 0
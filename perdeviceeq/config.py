@@ -46,7 +46,13 @@ METADATA_NAME  = "per-device-eq"
 # compares at startup and offers a one-click reinstall on
 # mismatch. Bump on any breaking change to the graph string or
 # the metadata contract; additive changes ride free.
-PROTOCOL = "1"
+# 2: the "batch" key (many devices in one write, see BATCH_KEY).
+PROTOCOL = "2"
+# One write carrying many devices: a JSON object node.name -> graph
+# ("" clears) under this key; a protocol-2 hook applies each entry,
+# mirrors it to the node's own key and drops the batch.
+BATCH_KEY = "batch"
+BATCH_PROTOCOL = "2"          # the first hook protocol that reads it
 # the static hook is shipped next to the package (repo) or system-wide (package)
 HOOK_SRC_CANDIDATES = [os.path.join(_DATA_ROOT, "wireplumber", WP_SCRIPT_NAME),
                        "/usr/share/per-device-eq/wireplumber/" + WP_SCRIPT_NAME]
@@ -0,0 +1,698 @@
+# -*- coding: utf-8 -*-
+"""Export baking without a window: the export wizard's per-target
+bake, and the batch export built on it.
+
+The wizard used to hold the bake itself -- which chain a policy
+picks, where the desired comes from, the header every artifact
+carries, the null test that gates it -- inside GTK callbacks, so an
+export was only possible one profile and one target at a time, by
+hand. Baker is that logic with the widgets taken out: one profile
+(and optionally its taste layer), bake(target, policy) returns the
+artifact text, the verification line the wizard shows and the
+numbers behind it. The wizard is a Baker plus controls; the batch
+export (bake_batch, behind `per-device-eq.py --export`) is a Baker
+per profile, run for every selected target.
+
+A batch distributes corrections: every profile x target (a vendor
+target with device presets bakes once per preset) lands as a file in
+one directory, next to manifest.json listing each file with its
+verification -- the null test in dB for the native writers, the fit
+residual for fixed sliders and re-fits, the package roundtrip for
+.pdeq -- and whether it passed. Bakes are independent, so they run
+in a process pool; the export-time re-fits (a mean policy over
+non-parallel channels, a chain over a target's band budget) are
+what makes a batch expensive, and they spread across cores.
+
+Pure computation -- no GTK; numpy/scipy enter through export_peq's
+lazy imports like everywhere else.
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import os
+
+from . import eq
+from . import export_peq as xp
+from . import pdeq
+
+NULL_N = 480           # null-test grid density over the fit band
+PLOT_N = 240           # fixed-band fit / residual plot grid
+MANIFEST_NAME = "manifest.json"
+
+
+class ExportError(RuntimeError):
+    """A batch that cannot start (no profiles, unknown target ids,
+    an unusable output directory)."""
+
+
+def target_policies(target, chains):
+    """The collapse policies a target may be baked with, default
+    first (the wizard's combo, in its order)."""
+    stereo = (target["writer"] == "poweramp"
+              and xp.poweramp_stereo_keys(chains))
+    band_domain = target["writer"] in ("parametric", "poweramp")
+    choices = (["stereo"] if stereo
+               else xp.collapse_choices(chains, band_domain))
+    if target["writer"] == "poweramp":
+        choices = [c for c in choices if c != "mean"]
+    return choices
+
+
+class Baker:
+    """One profile's export, GTK-free. `body` is the profile body
+    (the wizard passes the editor's working body, the batch the
+    stored one), `taste_bands`/`taste_name` the active taste layer
+    or nothing. bake() is the whole per-target bake; a re-fit is
+    either run in place or, with refit=False, reported back so a
+    caller with a main loop can run bake_refit() on a worker."""
+
+    def __init__(self, body, taste_bands=None, taste_name=None):
+        self.body = body
+        self.taste_name = taste_name
+        self.taste_bands = list(taste_bands or [])
+        self.chains = xp.composed_chains(body, self.taste_bands)
+        self.chains_plain = (xp.composed_chains(body, None)
+                             if self.taste_name else self.chains)
+        self.flo, self.fhi = xp.fit_band(body)
+        self.source, self.source_why = xp.export_source(body)
+        self._canvas = None
+
+    # ---- shared wording -------------------------------------------
+
+    def chain_summary(self, taste=True):
+        """One sentence describing the SOURCE: profile, taste layer
+        when included, chain count. No level figure: the profile
+        preamp is not what an artifact carries (headroom lowers it,
+        a graphic line has none at all), so each writer states its
+        own effective level in the status instead. Phrased so no
+        line ever matches the AutoEq "Preamp:" shape."""
+        s = "Profile “%s”" % self.body.get("name", "?")
+        if self.taste_name and taste:
+            s += " + taste layer “%s”" % self.taste_name
+        n = len(self.chains)
+        ch = "one chain" if n == 1 else "%d channel chains" % n
+        return "%s -- %s." % (s, ch)
+
+    def band_str(self):
+        return "%g-%g Hz" % (self.flo, self.fhi)
+
+    def header(self, target, note, taste=True):
+        from . import __version__
+        return ["Exported by per-device-eq %s for %s"
+                % (__version__, target["name"]),
+                "Source: " + self.chain_summary(taste),
+                "Chain collapse: %s." % note]
+
+    def source_line(self, canvas_note=None):
+        """The artifact-header statement of what fed the export."""
+        if self.source == "measurement":
+            s = ("Fed from: the measurement canvas -- the desired"
+                 " correction the fit was asked for")
+            if canvas_note:
+                s += " (%s)" % canvas_note
+            return s + "."
+        return ("Fed from: the playback chain (%s)."
+                % self.source_why)
+
+    def collapse_note(self, policy):
+        """The collapse wording for a canvas-fed bake, matching
+        what collapse()/pick_chain() would say for the chain."""
+        keys = [k for k, _g, _b in self.chains]
+        if policy == "mean":
+            return "mean of %s" % ", ".join(keys)
+        if policy == "all":
+            return "single chain (apply-all)"
+        return "channel %s of %s" % (policy, ", ".join(keys))
+
+    def null_line(self, rep, against="the in-app chain"):
+        """The null-test sentence from a verify_scan report. A scan
+        that stopped early on a failure states its figure as a
+        floor: the verdict is certain, the exact worst is not."""
+        err = rep["max"]
+        verdict = ("pass" if err <= xp.NULL_PASS_DB else
+                   "CHECK, above the %.1f dB ceiling"
+                   % xp.NULL_PASS_DB)
+        return ("Null test vs %s: max %s%.2f dB over %s"
+                " -- %s." % (against,
+                             "" if rep["exact"] else "at least ",
+                             err, self.band_str(), verdict))
+
+    @staticmethod
+    def attribution(res, rep, got, ref, freqs):
+        """On a failed band-domain null test: record where the error
+        lives (export_peq.band_errors over the parsed-back `got`
+        (preamp, Band list) and the source `ref` (preamp, band
+        dicts)) in res["bands"], and return the status suffix."""
+        res["bands"] = xp.band_errors(got[0], got[1], ref[0], ref[1],
+                                      freqs)
+        lab, db = res["bands"][0]
+        return (" Worst near %.0f Hz; largest contribution: %s,"
+                " %.2f dB." % (rep["freq"], lab, db))
+
+    # ---- the measurement source -----------------------------------
+
+    def canvas_desired(self):
+        """(fg, curves, note) rebuilt once, taste-free; a canvas
+        that refuses flips the whole bake to the chain source."""
+        if self._canvas is None:
+            from .refit import RefitError
+            try:
+                self._canvas = xp.desired_from_canvas(self.body)
+            except RefitError as e:
+                self.source = "chain"
+                self.source_why = str(e)
+                self._canvas = False
+        return self._canvas or None
+
+    def boost_cap(self):
+        return float(((self.body.get("fit") or {})
+                      .get("params") or {}).get("max_boost", 6.0))
+
+    def measurement_vals(self, policy, taste, cap=None):
+        """(fg, vals, canvas_note, capped_by) for `policy` under the
+        measurement source, or None -> bake from the chain. Order
+        matters: the policy collapses the raw desired first; `cap`,
+        when given, then clips the boost at the fit's own ceiling --
+        deep dips are not filled, the same doctrine the band fits
+        obey -- and capped_by reports how far the ask exceeded it;
+        the taste overlay lands LAST, uncapped, because a taste
+        layer is intent, not a measurement artifact."""
+        if self.source != "measurement":
+            return None
+        got = self.canvas_desired()
+        if not got:
+            return None
+        fg, curves, note = got
+        if policy == "mean":
+            vals = xp.mean_curve(curves)
+        elif policy in curves:
+            vals = list(curves[policy])
+        elif len(curves) == 1:
+            vals = list(next(iter(curves.values())))
+        else:
+            self.source = "chain"
+            self.source_why = ("the canvas channels do not match"
+                               " the chain keys")
+            return None
+        capped_by = 0.0
+        if cap is not None:
+            over = max(vals) - cap
+            if over > 0:
+                capped_by = over
+            vals = xp.cap_soft(vals, cap)
+        if taste and self.taste_bands:
+            tail = xp.chain_response(0.0, self.taste_bands, fg)
+            vals = [v + d for v, d in zip(vals, tail)]
+        return fg, vals, note, capped_by
+
+    # ---- baking + verification --------------------------------------
+
+    def bake(self, target, policy=None, taste=True, refit=True,
+             progress=None, preset_name=None):
+        """Render `target`'s artifact for `policy` (default: the
+        target's first policy) and verify it. Returns {"text",
+        "line" (the status sentence), "ok" (True / False, None for a
+        fit that states a residual instead of passing a null),
+        "null_db", "resid_max", "resid_rms", "refit" (the reason,
+        when one ran or -- refit=False -- is still due), "sol" (the
+        fixed-band solution), "bands" (a failed band-domain null
+        test's per-band error, worst first)}. Every branch states its truth: the
+        null test, the rounding cost, or the fit residual."""
+        t = target
+        writer = t["writer"]
+        allc = self.chains if taste else self.chains_plain
+        if policy is None:
+            policy = target_policies(t, self.chains)[0]
+        auto = bool(self.body.get("preamp_auto", True))
+        nf = xp.log_grid(self.flo, self.fhi, NULL_N)
+        res = {"text": "", "line": "", "ok": None, "null_db": None,
+               "resid_max": None, "resid_rms": None, "refit": None,
+               "sol": None, "bands": None}
+        if writer == "pdeq":
+            # the native row: no chains, no taste, no bake -- the
+            # profile itself, canvas and all. A refusal lands in
+            # the status, never in a traceback
+            try:
+                text = pdeq.pdeq_pack(self.body)
+            except ValueError as e:
+                res.update(line="Cannot pack: %s." % e, ok=False)
+                return res
+            sha = pdeq.payload_sha256(self.body)
+            try:
+                back = pdeq.pdeq_unpack(text)[1]
+            except ValueError:
+                back = None
+            res.update(
+                text=text, ok=back == sha,
+                null_db=0.0 if back == sha else None,
+                line="Packs the working profile verbatim -- "
+                     "canvas, fit provenance and rig fingerprint "
+                     "travel whole; the import on the other side "
+                     "validates and shows them. sha256 %s."
+                     % sha[:16])
+        elif writer == "poweramp":
+            name = self.body.get("name", "profile")
+            if self.taste_name and taste:
+                name = "%s + %s" % (name, self.taste_name)
+            if policy == "stereo":
+                chains = allc
+            else:
+                g, bands, _note = xp.pick_chain(allc, policy)
+                chains = [("all", g, bands)]
+            adj, moved = xp.headroom_preamp(
+                chains[0][1], [b for _k, _g, b in chains],
+                auto=auto)
+            if moved:
+                chains = [(k, adj, b) for k, _g, b in chains]
+            text = xp.poweramp_json(t, chains, name)
+            clamped, spill = xp.preamp_spill(adj, t)
+            reps = xp.null_check_poweramp(text, chains, nf)
+            errs = {k: r["max"] for k, r in reps.items()}
+            worst = max(errs.values())
+            per = ", ".join("%s %s%.2f" % (
+                k, "" if reps[k]["exact"] else ">=", v)
+                for k, v in sorted(errs.items()))
+            verdict = ("pass" if worst <= xp.NULL_PASS_DB else
+                       "CHECK, above the %.1f dB ceiling"
+                       % xp.NULL_PASS_DB)
+            line = ("Null test per chain over %s: %s dB -- %s."
+                    " Preset preamp %+.1f dB%s."
+                    % (self.band_str(), per, verdict, clamped,
+                       (" (lowered %.1f dB for headroom)" % -moved)
+                       if moved < 0 and not auto else ""))
+            if spill:
+                line += (" %+.1f dB beyond the target's preamp"
+                         " range rides as a flat band per"
+                         " channel." % spill)
+            if worst > xp.NULL_PASS_DB:
+                k, g, bands = max(chains, key=lambda c: errs[c[0]])
+                got = xp.parse_poweramp(
+                    text, k if k in xp.PA_CH else "FL")
+                line += self.attribution(res, reps[k], got,
+                                         (g, bands), nf)
+            res.update(text=text, line=line, null_db=worst,
+                       ok=worst <= xp.NULL_PASS_DB)
+        elif writer == "parametric":
+            maxb = t.get("max_bands")
+            refit_why = None
+            perr = None
+            if policy == "mean":
+                pm, pwhy = xp.parallel_mean(allc, nf)
+                if pm:
+                    g, bands, perr = pm
+                    note = ("mean of %s -- pairwise band average"
+                            % ", ".join(k for k, _g, _b in allc))
+                else:
+                    refit_why = "mean of channels -- " + pwhy
+            else:
+                g, bands, note = xp.pick_chain(allc, policy)
+            if refit_why is None:
+                fg, fbands, folded = xp.fold_flat(g, bands)
+                viol = xp.chain_violations(t, fbands)
+                if viol:
+                    refit_why = "; ".join(viol)
+            if refit_why:
+                if not refit:
+                    res["refit"] = refit_why
+                    return res
+                return self.bake_refit(t, policy, taste, maxb,
+                                       refit_why, progress=progress)
+            hdr = self.header(t, note, taste)
+            if perr is not None:
+                hdr.append("Mean by pairwise band average of"
+                           " parallel tables; verified within"
+                           " %.2f dB of the true mean." % perr)
+            tl = xp.limits_text(t)
+            if tl:
+                hdr.append("Target limits: %s -- the chain"
+                           " fits as-is." % tl)
+            if folded:
+                hdr.append("Flat-gain trim folded into the"
+                           " shared gain (%+.1f dB)." % folded)
+            fg, moved = xp.headroom_preamp(fg, [fbands], auto=auto)
+            if moved < 0 and not auto:
+                hdr.append("Shared gain lowered %.1f dB so the"
+                           " composed chain stays under 0 dBFS."
+                           % -moved)
+            ref = xp.reference_response(g + moved, bands, nf)
+            psuf = ("" if perr is None else
+                    " Mean by band average, %.2f dB vs the"
+                    " true mean." % perr)
+            text = xp.parametric_text(fg, fbands, header=hdr)
+            rep = xp.null_check_parametric(text, nf, ref)
+            err = rep["max"]
+            line = (self.null_line(rep)
+                    + " Export preamp %+.1f dB." % fg + psuf)
+            if err > xp.NULL_PASS_DB:
+                line += self.attribution(res, rep,
+                                         eq.parse_autoeq(text),
+                                         (fg, fbands), nf)
+            res.update(text=text, null_db=err, line=line,
+                       ok=err <= xp.NULL_PASS_DB)
+        elif writer == "graphiceq":
+            grid = xp.graphic_grid()
+            mv = self.measurement_vals(policy, taste,
+                                       cap=self.boost_cap())
+            capped_by = 0.0
+            if mv:
+                fgc, vals, tnote, capped_by = mv
+                note = self.collapse_note(policy)
+                resp = xp.sample_curve(fgc, vals, grid)
+                ref = xp.sample_curve(fgc, vals, nf)
+            else:
+                tnote = None
+                resp, note = xp.collapse(allc, policy, grid)
+                ref, _n = xp.collapse(allc, policy, nf)
+            hdr = self.header(t, note, taste)
+            hdr.append(self.source_line(tnote))
+            if capped_by > 0:
+                hdr.append("Boost capped at %+.1f dB (the fit's"
+                           " policy, %.2g dB knee): the"
+                           " measurement asked %.2f dB more to"
+                           " fill deep dips."
+                           % (self.boost_cap(), xp.CAP_KNEE_DB,
+                              capped_by))
+            text, shift = xp.graphiceq_text(
+                grid, resp, header=hdr, bare=bool(t.get("bare")))
+            rep = xp.null_check_graphic(text, nf, ref, shift)
+            err = rep["max"]
+            line = "Source: %s. %s" % (
+                "canvas" if mv else "chain",
+                self.null_line(rep, "the measured desired" if mv
+                               else "the in-app chain"))
+            if err > xp.NULL_PASS_DB and rep["freq"]:
+                line += " Worst near %.0f Hz." % rep["freq"]
+            if shift:
+                line += " Level shifted %+.1f dB." % shift
+            if capped_by > 0:
+                line += (" Boost capped at %+.1f dB."
+                         % self.boost_cap())
+            res.update(text=text, line=line, null_db=err,
+                       ok=err <= xp.NULL_PASS_DB)
+        else:                                   # fixed
+            pf = xp.log_grid(self.flo, self.fhi, PLOT_N)
+            mv = self.measurement_vals(policy, taste,
+                                       cap=self.boost_cap())
+            capped_by = 0.0
+            if mv:
+                fgc, vals, tnote, capped_by = mv
+                note = self.collapse_note(policy)
+                desired = xp.sample_curve(fgc, vals, pf)
+            else:
+                tnote = None
+                desired, note = xp.collapse(allc, policy, pf)
+            sol = xp.solve_fixed(t, pf, desired)
+            hdr = self.header(t, note, taste)
+            hdr.append(self.source_line(tnote))
+            if preset_name:
+                hdr.append("Device preset: %s." % preset_name)
+            if capped_by > 0:
+                hdr.append("Boost capped at %+.1f dB (the fit's"
+                           " policy, %.2g dB knee): the"
+                           " measurement asked %.2f dB more to"
+                           " fill deep dips."
+                           % (self.boost_cap(), xp.CAP_KNEE_DB,
+                              capped_by))
+            text = xp.fixed_sheet_text(t, sol, header=hdr)
+            res.update(
+                text=text, sol=sol,
+                resid_max=sol["resid_max"],
+                resid_rms=sol["resid_rms"],
+                line="Source: %s. Fit over %s: residual max %.1f"
+                     " dB, rms %.1f dB across %s; level trim %+.1f"
+                     " dB." % ("canvas" if mv else "chain",
+                               sol["basis"], sol["resid_max"],
+                               sol["resid_rms"], self.band_str(),
+                               sol["offset"]))
+        return res
+
+    def bake_refit(self, t, policy, taste, maxb, why, progress=None):
+        """A band-domain export through the export-time re-fit: the
+        mean policy, or a chain over the target's band budget. The
+        desired comes from the canvas under the measurement source,
+        from the chain response otherwise; center_curve splits it
+        into shape (the bands realize it) and level (rides in the
+        preamp, and under Auto the composed Safe owns it outright).
+        The band budget is the target's max_bands, else the
+        profile's own fit budget (params.bands), else the richest
+        chain -- so two unbudgeted parametric targets, or one
+        matching the profile's budget, bake identical tables
+        instead of diverging on greedy horizon. The optimizer's
+        box is narrowed to the target's declared gain/Q/type
+        ranges, and a declared freq_range narrows the fit band
+        itself. The format roundtrip governs pass/fail; the re-fit
+        residual is stated as its own number, like the fixed
+        writer's.
+
+        The taste layer never enters the optimizer: band-domain
+        doctrine says taste bands ride verbatim, so the fit chases
+        the taste-free desired on a budget shrunk by the taste
+        band count, and the taste bands are appended to the result
+        as-is -- outside the fit and outside its boost cap (a +12
+        dB taste shelf is intent, not a dip to refuse). Only a
+        taste band that violates the target's declared ranges is
+        folded into the desired instead, and the header says so.
+        The composed headroom then sees the real peak, so Auto
+        preamp moves when the taste does. The optimizer's answer is
+        cached on disk (export_peq.refit_bands), so a question the
+        wizard or a batch asked before lands at once. Returns
+        bake()'s dict."""
+        allc = self.chains if taste else self.chains_plain
+        auto = bool(self.body.get("preamp_auto", True))
+        nf = xp.log_grid(self.flo, self.fhi, NULL_N)
+        flo, fhi = self.flo, self.fhi
+        fr = t.get("freq_range")
+        if fr:
+            flo = max(flo, float(fr[0]))
+            fhi = min(fhi, float(fr[1]))
+        fgrid = xp.log_grid(flo, fhi, NULL_N)
+        lim = xp.fit_limits(t)
+        tb = ([dict(b) for b in self.taste_bands
+               if b.get("enabled", True)]
+              if taste and self.taste_name else [])
+        ok, fold = [], []
+        for b in tb:
+            g, q = float(b["gain"]), float(b["q"])
+            gl, ql = lim.get("gain"), lim.get("q")
+            tys = lim.get("types")
+            bad = ((fr and not flo <= float(b["freq"]) <= fhi)
+                   or (tys and b["type"] not in tys)
+                   or (gl and not gl[0] <= g <= gl[1])
+                   or (ql and not ql[0] <= q <= ql[1]))
+            (fold if bad else ok).append(b)
+        plainc = self.chains_plain if taste else allc
+        mv = self.measurement_vals(policy, False)
+        if mv:
+            fgc, cvals, tnote, _cb = mv
+            note = self.collapse_note(policy)
+            vals = xp.sample_curve(fgc, cvals, fgrid)
+        else:
+            tnote = None
+            vals, note = xp.collapse(plainc, policy, fgrid)
+        if fold:
+            tail = xp.chain_response(0.0, fold, fgrid)
+            vals = [v + d for v, d in zip(vals, tail)]
+        vals0, off = xp.center_curve(vals)
+        params = (self.body.get("fit") or {}).get("params") or {}
+        rich = max([len([b for b in bb
+                         if b.get("enabled", True)])
+                    for _k, _g, bb in plainc] or [0])
+        budget = maxb or int(params.get("bands", 0)) or rich or 10
+        fit_budget = max(1, budget - len(ok)) if ok else budget
+        gcap = float(params.get("max_boost", 6.0))
+        glim = lim.get("gain")
+        ghi = min(gcap, glim[1]) if glim else gcap
+        # warm start: the chain being re-fit is the nearest answer
+        # (the richest one stands in for a mean)
+        if policy in [k for k, _g, _b in plainc]:
+            seed = xp.pick_chain(plainc, policy)[1]
+        else:
+            seed = max((bb for _k, _g, bb in plainc), key=len)
+        bands, rmax, rrms = xp.refit_bands(
+            fgrid, vals0, flo, fhi, fit_budget, gcap,
+            limits=lim, progress=progress, cache=True,
+            seed=[dict(b) for b in seed] or None)
+        got = xp.chain_response(0.0, bands, fgrid)
+        ct = [min(v, ghi) for v in vals0]
+        ce = [abs(a - b) for a, b in zip(got, ct)]
+        cmax = max(ce)
+        crms = (sum(e * e for e in ce) / len(ce)) ** 0.5
+        ask = rmax - cmax
+        nfit = len(bands)
+        bands = bands + ok
+        base = (float(self.body.get("preamp", 0.0)) + off
+                if mv else off)
+        adj, _moved = xp.headroom_preamp(base, [bands], auto=auto)
+        hdr = self.header(t, note, taste)
+        hdr.append(self.source_line(tnote))
+        tl = xp.limits_text(t)
+        if tl:
+            hdr.append("Target limits: %s." % tl)
+        hdr.append("Re-fit to %d bands (%s); residual max %.2f,"
+                   " rms %.2f dB vs the capped target."
+                   % (nfit, why, cmax, crms))
+        if ask > 0.3:
+            hdr.append("The uncapped ask exceeds the %+.1f dB"
+                       " boost cap by up to %.2f dB: deep dips"
+                       " stay unfilled." % (ghi, rmax))
+        if ok:
+            hdr.append("Taste layer: %d band%s appended verbatim"
+                       " -- outside the fit and its boost cap."
+                       % (len(ok), "" if len(ok) == 1 else "s"))
+        if fold:
+            hdr.append("%d taste band%s outside the target's"
+                       " declared ranges: folded into the desired"
+                       " and re-fit." % (len(fold),
+                                         "" if len(fold) == 1
+                                         else "s"))
+        ref = xp.reference_response(adj, bands, nf)
+        text = xp.parametric_text(adj, bands, header=hdr)
+        rep = xp.null_check_parametric(text, nf, ref)
+        err = rep["max"]
+        unf = ("" if ask <= 0.3 else
+               " Unfillable ask %.2f dB above the cap." % rmax)
+        ts = " + %d taste" % len(ok) if ok else ""
+        line = ("Source: %s. Re-fit to %d bands%s (%s): residual"
+                " max %.2f, rms %.2f dB vs the capped target.%s"
+                " Format roundtrip max %.2f dB -- %s. Export"
+                " preamp %+.1f dB."
+                % ("canvas" if mv else "chain", nfit, ts, why,
+                   cmax, crms, unf, err,
+                   "pass" if err <= xp.NULL_PASS_DB else "CHECK",
+                   adj))
+        out = {"text": text, "ok": err <= xp.NULL_PASS_DB,
+               "null_db": err, "resid_max": cmax, "resid_rms": crms,
+               "refit": why, "sol": None, "bands": None}
+        if err > xp.NULL_PASS_DB:
+            line += self.attribution(out, rep, eq.parse_autoeq(text),
+                                     (adj, bands), nf)
+        out["line"] = line
+        return out
+
+
+# ---- the batch export ----------------------------------------------------
+
+
+def safe_stem(name):
+    """Filesystem-safe stem for export file names (the GUI's rule)."""
+    s = "".join(c if (c.isalnum() or c in " ._-") else "_"
+                for c in name).strip()
+    return s.replace(" ", "_") or "profile"
+
+
+def plan_jobs(profiles, targets, taste=None, policy=None):
+    """One job per artifact: every profile x target, a fixed target
+    with device presets once per preset. `taste` is (name, bands) or
+    None; `policy` overrides each target's default collapse policy
+    where the target offers it. Jobs are plain dicts -- they cross
+    the process-pool boundary."""
+    jobs = []
+    for p in profiles:
+        chains = xp.composed_chains(p, taste[1] if taste else None)
+        for t in targets:
+            variants = [(t, None)]
+            if t["writer"] == "fixed" and t.get("presets"):
+                variants = [(dict(t, centers=pr["centers"],
+                                  gain_range=pr["gain_range"],
+                                  gain_step=pr["gain_step"]),
+                             pr["name"]) for pr in t["presets"]]
+            choices = target_policies(t, chains)
+            pol = policy if policy in choices else choices[0]
+            for tv, preset in variants:
+                stem = "%s - %s" % (p.get("name", "profile"),
+                                    preset or t["name"])
+                jobs.append({"profile": p, "target": tv,
+                             "preset": preset, "policy": pol,
+                             "taste": taste,
+                             "file": safe_stem(stem)
+                             + t.get("ext", ".txt")})
+    seen = {}
+    for j in jobs:                 # two names folding to one stem
+        n = seen.get(j["file"], 0)
+        seen[j["file"]] = n + 1
+        if n:
+            stem, ext = os.path.splitext(j["file"])
+            j["file"] = "%s-%d%s" % (stem, n + 1, ext)
+    return jobs
+
+
+def run_job(job):
+    """Bake one job; returns its manifest entry (text included, for
+    the parent to write). Module-level so a process pool can run it."""
+    taste = job.get("taste")
+    bk = Baker(job["profile"], taste[1] if taste else None,
+               taste[0] if taste else None)
+    t = job["target"]
+    entry = {"file": job["file"], "profile": job["profile"].get("id"),
+             "profile_name": job["profile"].get("name"),
+             "target": t["id"], "writer": t["writer"],
+             "preset": job["preset"], "policy": job["policy"],
+             "taste": taste[0] if taste else None}
+    try:
+        res = bk.bake(t, job["policy"], taste=bool(taste),
+                      preset_name=job["preset"])
+    except Exception as e:       # one bad bake must not sink a batch
+        entry.update(ok=False, error="%s: %s" % (type(e).__name__, e),
+                     text="")
+        return entry
+    entry.update({k: res[k] for k in ("text", "line", "ok", "null_db",
+                                      "resid_max", "resid_rms",
+                                      "refit", "bands")})
+    entry["source"] = bk.source
+    return entry
+
+
+def bake_batch(profiles, targets, out_dir, taste=None, policy=None,
+               jobs=None, on_entry=None):
+    """Bake every profile x target into `out_dir` and write the
+    manifest. `jobs` is the process count (None: one per core, 1:
+    in-process); on_entry(entry) reports each artifact as it lands.
+    Returns the manifest dict. A failed null test still writes its
+    file -- the manifest marks it, so a batch over fifty devices
+    does not silently lose the one that needs a look."""
+    if not profiles:
+        raise ExportError("no profiles to export")
+    if not targets:
+        raise ExportError("no export targets selected")
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+    except OSError as e:
+        raise ExportError("cannot create %s: %s" % (out_dir, e))
+    plan = plan_jobs(profiles, targets, taste, policy)
+    n = jobs if jobs is not None else (os.cpu_count() or 1)
+    n = max(1, min(int(n), len(plan)))
+    entries = []
+
+    def land(entry):
+        text = entry.pop("text", "")
+        if text:
+            with open(os.path.join(out_dir, entry["file"]), "w",
+                      encoding="utf-8") as f:
+                f.write(text)
+            entry["sha256"] = hashlib.sha256(
+                text.encode("utf-8")).hexdigest()
+        else:
+            entry["file"] = None
+        entries.append(entry)
+        if on_entry is not None:
+            on_entry(entry)
+
+    if n == 1:
+        for job in plan:
+            land(run_job(job))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(n) as pool:
+            for entry in pool.map(run_job, plan):
+                land(entry)
+    from . import __version__
+    man = {"generator": "per-device-eq %s" % __version__,
+           "null_pass_db": xp.NULL_PASS_DB,
+           "files": entries,
+           "count": len(entries),
+           "failed": sum(1 for e in entries if e.get("ok") is False)}
+    tmp = os.path.join(out_dir, MANIFEST_NAME + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(man, f, indent=1, ensure_ascii=False)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST_NAME))
+    return man
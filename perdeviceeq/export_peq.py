@@ -28,10 +28,13 @@ the fixed-band fit only, same dependency story as fit_peq.
 """
 
 import bisect
+import collections
+import hashlib
 import json
 import math
 import os
 import sys
+import threading
 
 from . import eq
 from .config import CONFIG_DIR
@@ -341,6 +344,42 @@ def chain_response(preamp, band_dicts, freqs):
     return eq.response_db(preamp, to_bands(band_dicts), freqs)
 
 
+def chain_responses(chains, freqs):
+    """Every chain's response on `freqs` at once, as a numpy array
+    (one row per chain): the coefficients from the app's exact
+    eq.biquad, only the frequency evaluation vectorized -- the audit
+    and the mean verification evaluate whole registries of chains,
+    where the per-point Python loop of chain_response dominated."""
+    import numpy as np
+    fv = np.asarray(freqs, dtype=float)
+    out = np.empty((len(chains), len(fv)))
+    for i, (_k, g, band_dicts) in enumerate(chains):
+        out[i] = float(g) + _bands_db(
+            _coeff_table(to_bands(band_dicts)), fv).sum(axis=0)
+    return out
+
+
+def _coeff_table(bands):
+    """(n, 6) eq.biquad coefficients of the enabled Band objects."""
+    import numpy as np
+    rows = [eq.biquad(b.type, b.freq, b.gain, b.q)
+            for b in bands if b.enabled]
+    return np.array(rows, dtype=float).reshape(len(rows), 6)
+
+
+def _bands_db(coeffs, fv):
+    """Per-band dB on the numpy grid `fv`, one row per coefficient
+    row -- eq.mag_db vectorized, its -120 dB floor included."""
+    import numpy as np
+    z1 = np.exp(-2j * np.pi * fv / eq.FS)[None, :]
+    z2 = z1 * z1
+    c = coeffs[:, :, None]
+    m = np.abs((c[:, 0] + c[:, 1] * z1 + c[:, 2] * z2)
+               / (c[:, 3] + c[:, 4] * z1 + c[:, 5] * z2))
+    return np.where(m > 1e-12,
+                    20.0 * np.log10(np.maximum(m, 1e-300)), -120.0)
+
+
 def fold_flat(preamp, bands):
     """Fold flat-gain shelf bands (freq < 1 Hz: the balance-trim
     trick fit_peq uses) into the preamp -- importers reject Fc 0 and
@@ -536,14 +575,141 @@ def _interp_logf(fs, gs, f):
     return gs[i] + t * (gs[i + 1] - gs[i])
 
 
+# ---- verification: the null-test engine -----------------------------------
+#
+# Every bake verifies its artifact by parsing it back and comparing its
+# response with the in-app chain's. The engine evaluates in chunks,
+# coarse to fine -- chunk k is every stride-th grid point from offset k,
+# so the first chunk already sweeps the whole band -- and stops at the
+# first chunk that puts the error over the ceiling: a FAIL is certain
+# from that point on, and the figure reported is the worst seen so far
+# (a lower bound, flagged exact=False). A PASS needs every point, so a
+# passing artifact costs one vectorized pass. The in-app reference is
+# memoized per (chain, grid): the writers of one bake, and the toggles
+# of one wizard page, reuse it instead of re-running the biquads.
+
+NULL_CHUNK = 64             # grid points per verification chunk
+REF_CACHE_MAX = 64          # in-app reference responses kept (LRU)
+_REF_CACHE = collections.OrderedDict()
+_REF_LOCK = threading.Lock()
+
+
+def reference_response(preamp, band_dicts, freqs):
+    """chain_response as a read-only numpy array, memoized: the
+    in-app side of every null test for this chain on this grid."""
+    import numpy as np
+    key = (float(preamp), _sha(band_dicts), _sha(list(freqs)))
+    with _REF_LOCK:
+        got = _REF_CACHE.get(key)
+        if got is not None:
+            _REF_CACHE.move_to_end(key)
+            return got
+    fv = np.asarray(freqs, dtype=float)
+    got = float(preamp) + _bands_db(
+        _coeff_table(to_bands(band_dicts)), fv).sum(axis=0)
+    got.flags.writeable = False
+    with _REF_LOCK:
+        _REF_CACHE[key] = got
+        while len(_REF_CACHE) > REF_CACHE_MAX:
+            _REF_CACHE.popitem(last=False)
+    return got
+
+
+def verify_scan(err_at, n, ceiling=NULL_PASS_DB, exhaustive=False):
+    """Run `err_at(idx)` (|exported - in-app| in dB at the grid
+    indices idx, a numpy array) over n points in coarse-to-fine
+    chunks. Returns {"max", "at" (grid index of the worst point),
+    "points" (evaluated), "exact" (every point seen)}; without
+    `exhaustive` the scan stops once max exceeds `ceiling`."""
+    import numpy as np
+    stride = max(1, -(-n // NULL_CHUNK))
+    worst, at, seen = 0.0, 0, 0
+    for k in range(min(stride, n)):
+        idx = np.arange(k, n, stride)
+        e = err_at(idx)
+        j = int(np.argmax(e))
+        if e[j] > worst or seen == 0:
+            worst, at = float(e[j]), int(idx[j])
+        seen += len(idx)
+        if worst > ceiling and not exhaustive:
+            break
+    return {"max": worst, "at": at, "points": seen,
+            "exact": seen == n}
+
+
+def _band_check(pre, bands, freqs, ref, ceiling, exhaustive):
+    import numpy as np
+    fv = np.asarray(freqs, dtype=float)
+    ref = np.asarray(ref, dtype=float)
+    co = _coeff_table(bands)
+    rep = verify_scan(
+        lambda idx: np.abs(pre + _bands_db(co, fv[idx]).sum(axis=0)
+                           - ref[idx]),
+        len(fv), ceiling, exhaustive)
+    rep["freq"] = float(fv[rep["at"]]) if len(fv) else None
+    return rep
+
+
+def null_check_parametric(text, freqs, ref_resp, ceiling=NULL_PASS_DB,
+                          exhaustive=False):
+    """The parametric null test as a verify_scan report (plus "freq",
+    the worst point in Hz): the export parsed back with the app's
+    own parser, evaluated with the app's own biquads."""
+    pre, bands = eq.parse_autoeq(text)
+    return _band_check(pre, bands, freqs, ref_resp, ceiling,
+                       exhaustive)
+
+
 def null_test_parametric(text, freqs, ref_resp):
     """Max |exported - in-app| in dB over `freqs`: the export is
     parsed back with the app's own parser and evaluated with the
     app's own biquads, so this is the roundtrip the acceptance
     criterion names, not a formatting check."""
-    pre, bands = eq.parse_autoeq(text)
-    got = eq.response_db(pre, bands, freqs)
-    return max(abs(a - b) for a, b in zip(got, ref_resp))
+    return null_check_parametric(text, freqs, ref_resp,
+                                 exhaustive=True)["max"]
+
+
+def band_errors(got_pre, got_bands, ref_pre, ref_band_dicts, freqs):
+    """Where a null-test error comes from: [(label, max dB)], worst
+    first. Exported bands pair with the source's in order when the
+    two lists line up type for type, else each with the nearest
+    source band of its type (log frequency); a band left unpaired
+    on either side contributes its whole response. The preamp is
+    its own entry. Run on a failure, not on every bake."""
+    import numpy as np
+    fv = np.asarray(freqs, dtype=float)
+    src = [b for b in to_bands(ref_band_dicts) if b.enabled]
+    got = [b for b in got_bands if b.enabled]
+    gdb = _bands_db(_coeff_table(got), fv)
+    sdb = _bands_db(_coeff_table(src), fv)
+    if [b.type for b in got] == [b.type for b in src]:
+        pairs = list(zip(range(len(got)), range(len(src))))
+    else:
+        pairs, free = [], set(range(len(src)))
+        for i, b in enumerate(got):
+            cand = [j for j in free if src[j].type == b.type]
+            if cand:
+                j = min(cand, key=lambda j: abs(
+                    math.log10(max(src[j].freq, 1.0))
+                    - math.log10(max(b.freq, 1.0))))
+                free.discard(j)
+                pairs.append((i, j))
+    out = [("preamp", abs(float(got_pre) - float(ref_pre)))]
+    gi, sj = set(), set()
+    for i, j in pairs:
+        gi.add(i)
+        sj.add(j)
+        out.append(("%s %g Hz" % (src[j].type, src[j].freq),
+                    float(np.max(np.abs(gdb[i] - sdb[j])))))
+    for i, b in enumerate(got):
+        if i not in gi:
+            out.append(("%s %g Hz (export only)" % (b.type, b.freq),
+                        float(np.max(np.abs(gdb[i])))))
+    for j, b in enumerate(src):
+        if j not in sj:
+            out.append(("%s %g Hz (missing)" % (b.type, b.freq),
+                        float(np.max(np.abs(sdb[j])))))
+    return sorted(out, key=lambda e: -e[1])
 
 
 def headroom_preamp(preamp, chain_bands, auto=False, n=480):
@@ -700,11 +866,9 @@ def parallel_mean(chains, freqs):
                         "freq": round(f, 1),
                         "gain": round(gain, 2),
                         "q": round(q, 3), "enabled": True})
-    got = chain_response(g_m, bands_m, freqs)
-    cols = [chain_response(g, b, freqs) for _k, g, b in chains]
-    true = [sum(c[i] for c in cols) / m
-            for i in range(len(freqs))]
-    err = max(abs(a - b) for a, b in zip(got, true))
+    got = chain_responses([("mean", g_m, bands_m)], freqs)[0]
+    true = chain_responses(chains, freqs).mean(axis=0)
+    err = float(abs(got - true).max())
     if err > NULL_PASS_DB:
         return None, ("the pairwise average misses the true mean"
                       " by %.2f dB" % err)
@@ -748,13 +912,14 @@ def _projection_err(chains, freqs):
     response over `freqs`. Smoothed curves on a ~12.7-point-per-
     octave grid land in the hundredths; the number, not the hope,
     goes on the row."""
-    pol = "mean" if len(chains) > 1 else chains[0][0]
-    grid = list(AUTOEQ_GEQ_FREQS)
-    on_g, _n = collapse(chains, pol, grid)
-    on_g = [round(v, 1) for v in on_g]
-    true, _n = collapse(chains, pol, freqs)
-    est = [_interp_logf(grid, on_g, f) for f in freqs]
-    return max(abs(a - b) for a, b in zip(est, true))
+    import numpy as np
+    grid = np.asarray(AUTOEQ_GEQ_FREQS, dtype=float)
+    fv = np.asarray(freqs, dtype=float)
+    on_g = np.round(chain_responses(chains, grid).mean(axis=0), 1)
+    true = chain_responses(chains, fv).mean(axis=0)
+    # _interp_logf's reading: linear in log f, edge-held
+    est = np.interp(np.log(fv), np.log(grid), on_g)
+    return float(abs(est - true).max())
 
 
 # The response-domain boost cap is a curve, not a bound: a hard
@@ -861,6 +1026,73 @@ def audit_target(t, chains, freqs):
     return 3, "re-fit", gaps
 
 
+AUDIT_CACHE_MAX = 1024      # (chains, grid, target) audits kept
+_AUDIT_CACHE = collections.OrderedDict()
+_AUDIT_LOCK = threading.Lock()
+
+
+def _sha(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True,
+                                   default=str).encode()).hexdigest()
+
+
+def chains_fingerprint(chains, freqs):
+    """What an audit depends on besides the target: the chains
+    (keys, preamps, every band field) and the evaluation grid."""
+    return _sha([[[k, float(g), b] for k, g, b in chains],
+                 [float(f) for f in freqs]])
+
+
+def _audit_key(fp, t):
+    # the id names the row; the content catches a drop-in edited
+    # under the same id while the app runs
+    return fp, t.get("id"), _sha(t)
+
+
+def cached_audits(targets, chains, freqs):
+    """{target id: audit} for the targets already audited against
+    these chains -- what a picker can show before any work runs."""
+    fp = chains_fingerprint(chains, freqs)
+    out = {}
+    with _AUDIT_LOCK:
+        for t in targets:
+            hit = _AUDIT_CACHE.get(_audit_key(fp, t))
+            if hit is not None:
+                out[t["id"]] = hit
+    return out
+
+
+def audit_targets(targets, chains, freqs, on_result=None,
+                  cancelled=None):
+    """audit_target over a whole registry, memoized per (chain
+    fingerprint, target): {target id: (score, flag, reasons)}.
+    Built for a worker thread -- on_result(target_id, audit) fires
+    as each row's verdict lands, cached ones first-class and
+    instant; `cancelled()` returning True stops the walk between
+    targets (the picker closed). Results are shared: read, never
+    mutate."""
+    fp = chains_fingerprint(chains, freqs)
+    out = {}
+    for t in targets:
+        if cancelled is not None and cancelled():
+            break
+        key = _audit_key(fp, t)
+        with _AUDIT_LOCK:
+            hit = _AUDIT_CACHE.get(key)
+            if hit is not None:
+                _AUDIT_CACHE.move_to_end(key)
+        if hit is None:
+            hit = audit_target(t, chains, freqs)
+            with _AUDIT_LOCK:
+                _AUDIT_CACHE[key] = hit
+                while len(_AUDIT_CACHE) > AUDIT_CACHE_MAX:
+                    _AUDIT_CACHE.popitem(last=False)
+        out[t["id"]] = hit
+        if on_result is not None:
+            on_result(t["id"], hit)
+    return out
+
+
 def center_curve(vals):
     """(centered, mean): split a curve into shape and level. The
     re-fit paths fit the shape; the level rides in the exported
@@ -869,23 +1101,120 @@ def center_curve(vals):
     return [v - off for v in vals], off
 
 
+# The export-time re-fit is the one expensive step of a bake (seconds
+# of optimizer per run), and the wizard re-asks the same question on
+# every taste flip, policy flip and page revisit; a batch asks it once
+# per profile x target, across processes. Its answer depends on nothing
+# but the question, so it is kept on disk: one JSON file per question,
+# named by the sha256 of everything the optimizer sees -- the desired
+# curve and its grid, the fit band, the budget, the boost cap, the
+# target's limit box -- plus the app version, so a changed optimizer
+# never serves a stale answer. Files are written atomically and
+# independently (no shared index to lock); recency is the file mtime,
+# touched on every hit, and the oldest fall off past REFIT_CACHE_MAX.
+
+REFIT_CACHE_DIR = os.path.join(CONFIG_DIR, "refit-cache")
+REFIT_CACHE_MAX = 256       # cached re-fits kept on disk, LRU by mtime
+
+
+def refit_key(fg, desired, flo, fhi, n_bands, max_boost, limits=None,
+              seed=None):
+    """The sha256 naming one re-fit question in the cache (a warm
+    start's seed is part of the question: it can change the
+    answer)."""
+    from . import __version__
+    q = {"v": __version__,
+         "fg": [round(float(f), 6) for f in fg],
+         "desired": [round(float(v), 6) for v in desired],
+         "band": [round(float(flo), 6), round(float(fhi), 6)],
+         "n": int(n_bands), "boost": round(float(max_boost), 6),
+         "limits": limits or {}, "seed": seed or []}
+    return hashlib.sha256(json.dumps(
+        q, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _refit_cached(key):
+    path = os.path.join(REFIT_CACHE_DIR, key + ".json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            got = json.load(f)
+        out = ([dict(b) for b in got["bands"]], float(got["rmax"]),
+               float(got["rrms"]))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        try:                        # a torn or foreign file: a miss
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return out
+
+
+def _refit_store(key, bands, rmax, rrms):
+    """Best effort: a cache that cannot write is a slower bake, not
+    a failed one."""
+    d = REFIT_CACHE_DIR
+    try:
+        os.makedirs(d, exist_ok=True)
+        tmp = os.path.join(d, "%s.%d.tmp" % (key, os.getpid()))
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"bands": bands, "rmax": rmax, "rrms": rrms}, f)
+        os.replace(tmp, os.path.join(d, key + ".json"))
+        names = [n for n in os.listdir(d) if n.endswith(".json")]
+        if len(names) <= REFIT_CACHE_MAX:
+            return
+        aged = []
+        for n in names:
+            try:
+                aged.append((os.stat(os.path.join(d, n)).st_mtime, n))
+            except OSError:
+                pass
+        aged.sort()
+        for _m, n in aged[:len(aged) - REFIT_CACHE_MAX]:
+            try:
+                os.remove(os.path.join(d, n))
+            except OSError:
+                pass
+    except OSError:
+        pass
+
+
 def refit_bands(fg, desired, flo, fhi, n_bands, max_boost,
-                limits=None, progress=None):
+                limits=None, progress=None, cache=False, seed=None):
     """Fit up to n_bands onto `desired` over fg; the export-time
     re-fit behind the mean policy and limit-violating chains.
     `limits` narrows the optimizer to the target's declared
-    gain/Q/type box (fit_limits). Returns (band dicts, resid_max,
-    resid_rms)."""
+    gain/Q/type box (fit_limits). With `cache`, an identical
+    question answered before (refit_key, on disk under
+    REFIT_CACHE_DIR) returns at once, without progress calls.
+    `seed` (band dicts) warm-starts the optimizer from a chain close
+    to the answer -- the chain being re-fit -- with the full greedy
+    fit as its fallback (fit_peq.fit_to_desired).
+    Returns (band dicts, resid_max, resid_rms)."""
+    key = None
+    if cache:
+        key = refit_key(fg, desired, flo, fhi, n_bands, max_boost,
+                        limits, seed)
+        got = _refit_cached(key)
+        if got is not None:
+            return got
     from . import fit_peq
     import numpy as np
     bands, resid = fit_peq.fit_to_desired(
         np.asarray(fg, float), desired, flo, fhi, n_bands,
-        max_boost, limits=limits, progress=progress)
+        max_boost, limits=limits, progress=progress, seed=seed)
     out = [{"type": t, "freq": round(f, 1), "gain": round(g, 2),
             "q": round(q, 3), "enabled": True}
            for t, f, g, q in sorted(bands, key=lambda b: b[1])]
     rmax = float(max(abs(v) for v in resid))
     rrms = float((sum(v * v for v in resid) / len(resid)) ** 0.5)
+    if key is not None:
+        _refit_store(key, out, rmax, rrms)
     return out, rmax, rrms
 
 
@@ -1035,21 +1364,30 @@ def parse_poweramp(text, side):
     return float(preset["preamp"]), bands
 
 
-def null_test_poweramp(text, chains, freqs):
-    """Per-chain max |exported - in-app| in dB over `freqs`:
-    {key: err}. Each side of the preset is parsed back and run
-    through the app's own biquads against the matching unfolded
-    chain, trims and all."""
+def null_check_poweramp(text, chains, freqs, ceiling=NULL_PASS_DB,
+                        exhaustive=False):
+    """Per-chain null test reports, {key: verify_scan report}: each
+    side of the preset parsed back and run through the app's own
+    biquads against the matching unfolded chain, trims and all."""
     out = {}
     for key, g, bands in chains:
         side = key if key in PA_CH else "FL"
         pre, got_bands = parse_poweramp(text, side)
-        got = eq.response_db(pre, got_bands, freqs)
-        ref = chain_response(g, bands, freqs)
-        out[key] = max(abs(a - b) for a, b in zip(got, ref))
+        out[key] = _band_check(pre, got_bands, freqs,
+                               reference_response(g, bands, freqs),
+                               ceiling, exhaustive)
     return out
 
 
+def null_test_poweramp(text, chains, freqs):
+    """Per-chain max |exported - in-app| in dB over `freqs`:
+    {key: err}. Each side of the preset is parsed back and run
+    through the app's own biquads against the matching unfolded
+    chain, trims and all."""
+    return {k: r["max"] for k, r in null_check_poweramp(
+        text, chains, freqs, exhaustive=True).items()}
+
+
 # ---- the fixed-band fit (writer class b) -------------------------------
 
 
@@ -1065,6 +1403,16 @@ def peaking_basis(centers, q, freqs):
     return np.array(cols, dtype=float).T
 
 
+def _basis_path(target):
+    path = target.get("basis_file")
+    if not path:
+        return None
+    if not os.path.isabs(path):
+        base = os.path.dirname(target.get("_src", ""))
+        path = os.path.join(base or USER_TARGET_DIR, path)
+    return path
+
+
 def load_basis(target, freqs):
     """The measured slider basis interpolated onto `freqs`, or None.
     The JSON contract ({"freq": [...], "curve_gain_db": g,
@@ -1075,12 +1423,9 @@ def load_basis(target, freqs):
     target's centers is refused loudly and the caller falls back to
     the assumed basis -- a silently wrong basis would defeat the
     residual's whole point."""
-    path = target.get("basis_file")
+    path = _basis_path(target)
     if not path:
         return None
-    if not os.path.isabs(path):
-        base = os.path.dirname(target.get("_src", ""))
-        path = os.path.join(base or USER_TARGET_DIR, path)
     try:
         with open(path, encoding="utf-8") as f:
             data = json.load(f)
@@ -1104,6 +1449,61 @@ def load_basis(target, freqs):
     return np.array(cols, dtype=float).T
 
 
+BASIS_CACHE_MAX = 32        # fixed-band bases kept, least recently used out
+_BASIS_CACHE = collections.OrderedDict()
+_BASIS_LOCK = threading.Lock()
+
+
+def fixed_basis(target, freqs):
+    """The slider basis of a fixed-band target on `freqs`, with the
+    thin QR factorization of [basis | 1] the solve needs, cached.
+
+    The wizard re-bakes on every toggle and policy change, and every
+    bake used to rebuild the basis -- one biquad response per slider
+    over the whole grid, or a JSON read and an interpolation -- and
+    hand the full grid to lsq_linear. The basis depends only on the
+    centers, the assumed Q, the measured file's CONTENT (sha1, so an
+    edited drop-in is picked up) and the grid, so it is keyed on
+    exactly those; a new desired curve then costs one projection
+    Q^T d and a (k+1)-sized bounded solve on R. Returns {"basis",
+    "note", "q", "r"}; the arrays are read-only and shared."""
+    import numpy as np
+    centers = tuple(float(c) for c in target["centers"])
+    bq = float(target.get("basis_q") or 1.414)
+    path = _basis_path(target)
+    sha = None
+    if path:
+        try:
+            with open(path, "rb") as f:
+                sha = hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            sha = "unreadable"
+    fv = np.asarray(freqs, dtype=float)
+    key = (centers, bq, path, sha,
+           hashlib.sha1(fv.tobytes()).hexdigest())
+    with _BASIS_LOCK:
+        hit = _BASIS_CACHE.get(key)
+        if hit is not None:
+            _BASIS_CACHE.move_to_end(key)
+            return hit
+    basis = load_basis(target, freqs)
+    if basis is not None:
+        note = "measured basis (%s)" % os.path.basename(
+            target.get("basis_file", ""))
+    else:
+        basis = peaking_basis(centers, bq, freqs)
+        note = "assumed peaking basis, Q %g" % bq
+    qm, rm = np.linalg.qr(np.hstack([basis, np.ones((len(fv), 1))]))
+    for m in (basis, qm, rm):
+        m.setflags(write=False)
+    hit = {"basis": basis, "note": note, "q": qm, "r": rm}
+    with _BASIS_LOCK:
+        _BASIS_CACHE[key] = hit
+        while len(_BASIS_CACHE) > BASIS_CACHE_MAX:
+            _BASIS_CACHE.popitem(last=False)
+    return hit
+
+
 def solve_fixed(target, freqs, desired):
     """Writer class (b): gains for the target's fixed centers by
     bounded least squares, a free level offset absorbing what
@@ -1114,29 +1514,38 @@ def solve_fixed(target, freqs, desired):
     must state the error of what the person will actually enter.
     Returns the dict the wizard plots and fixed_sheet_text prints;
     the residual is in it by construction, so the fixed-band path
-    cannot produce an export that never computed one."""
+    cannot produce an export that never computed one.
+
+    The least squares runs on the cached factorization (see
+    fixed_basis): ||[B 1]x - d|| and ||Rx - Q^T d|| differ by a
+    constant, so the bounded solve is (k+1)-square, and skipped
+    outright when the unconstrained optimum already sits inside
+    the gain range."""
     import numpy as np
+    from scipy.linalg import solve_triangular
     from scipy.optimize import lsq_linear
+    fb = fixed_basis(target, freqs)
+    basis, note = fb["basis"], fb["note"]
     centers = [float(c) for c in target["centers"]]
     k = len(centers)
-    basis = load_basis(target, freqs)
-    if basis is not None:
-        note = "measured basis (%s)" % os.path.basename(
-            target.get("basis_file", ""))
-    else:
-        q = float(target.get("basis_q") or 1.414)
-        basis = peaking_basis(centers, q, freqs)
-        note = "assumed peaking basis, Q %g" % q
     d = np.asarray(desired, dtype=float)
     glo, ghi = [float(v) for v in
                 (target.get("gain_range") or [-6.0, 6.0])]
-    a = np.hstack([basis, np.ones((len(freqs), 1))])
-    lo = np.array([glo] * k + [-np.inf])
-    hi = np.array([ghi] * k + [np.inf])
-    sol = lsq_linear(a, d, bounds=(lo, hi))
+    qd = fb["q"].T @ d
+    x = None
+    try:
+        x = solve_triangular(fb["r"], qd)
+    except np.linalg.LinAlgError:
+        pass
+    if x is None or not (np.all(np.isfinite(x))
+                         and np.all(x[:k] >= glo)
+                         and np.all(x[:k] <= ghi)):
+        lo = np.array([glo] * k + [-np.inf])
+        hi = np.array([ghi] * k + [np.inf])
+        x = lsq_linear(fb["r"], qd, bounds=(lo, hi)).x
     step = float(target.get("gain_step") or 0.0)
     gains = [min(ghi, max(glo, round_step(v, step)))
-             for v in sol.x[:k]]
+             for v in x[:k]]
     shaped = basis @ np.asarray(gains)
     offset = float(np.mean(d - shaped))
     achieved = shaped + offset
@@ -1152,6 +1561,22 @@ def solve_fixed(target, freqs, desired):
             "basis": note}
 
 
+def solve_presets(target, freqs, desired):
+    """Every device preset of a fixed-band target solved against one
+    desired curve: [(preset, solve_fixed result)] best fit first
+    (residual rms, then max). The presets share the target's grid,
+    so this is one basis build per distinct slider layout and one
+    small solve each -- cheap enough to rank the preset picker on
+    every bake."""
+    out = []
+    for p in target.get("presets") or []:
+        t = dict(target, centers=p["centers"],
+                 gain_range=p["gain_range"], gain_step=p["gain_step"])
+        out.append((p, solve_fixed(t, freqs, desired)))
+    out.sort(key=lambda ps: (ps[1]["resid_rms"], ps[1]["resid_max"]))
+    return out
+
+
 def fixed_sheet_text(target, sol, header=()):
     """The slider sheet for a solve_fixed result. The fit's basis,
     the absorbed level trim and the residual figures are printed
@@ -1171,12 +1596,31 @@ def fixed_sheet_text(target, sol, header=()):
     return "\n".join(lines) + "\n"
 
 
+def null_check_graphic(text, freqs, ref_resp, shift=0.0,
+                       ceiling=NULL_PASS_DB, exhaustive=False):
+    """The graphic null test as a verify_scan report (plus "freq"):
+    |exported - (in-app + shift)|, the point list read the way
+    importers do -- linear in log frequency, held at the ends
+    (_interp_logf, vectorized)."""
+    import numpy as np
+    fs, gs = parse_graphiceq(text)
+    if not fs:
+        return {"max": float("inf"), "at": 0, "points": 0,
+                "exact": False, "freq": None}
+    fv = np.asarray(freqs, dtype=float)
+    lf, lx = np.log10(fv), np.log10(np.asarray(fs, dtype=float))
+    gv = np.asarray(gs, dtype=float)
+    want = np.asarray(ref_resp, dtype=float) + shift
+    rep = verify_scan(
+        lambda idx: np.abs(np.interp(lf[idx], lx, gv) - want[idx]),
+        len(fv), ceiling, exhaustive)
+    rep["freq"] = float(fv[rep["at"]])
+    return rep
+
+
 def null_test_graphic(text, freqs, ref_resp, shift=0.0):
     """Max |exported - (in-app + shift)| in dB over `freqs`, reading
     the point list the way importers do (_interp_logf). `shift` is
     the level shift graphiceq_text reported."""
-    fs, gs = parse_graphiceq(text)
-    if not fs:
-        return float("inf")
-    return max(abs(_interp_logf(fs, gs, f) - (r + shift))
-               for f, r in zip(freqs, ref_resp))
+    return null_check_graphic(text, freqs, ref_resp, shift,
+                              exhaustive=True)["max"]
@@ -21,8 +21,9 @@ exists, was not hand-edited and still matches its canvas -- and
 from the playback chain otherwise. Every artifact header and every
 status line names its source.
 
-All math lives in export_peq (pure, tested); this module is GTK
-plumbing only and stays out of the test run like gui.py.
+All math lives in export_peq, the bake itself in export_bake (both
+pure, tested -- the batch export runs the same Baker); this module is
+GTK plumbing only and stays out of the test run like gui.py.
 """
 
 import math
@@ -34,10 +35,8 @@ gi.require_version("Adw", "1")
 from gi.repository import Gtk, GLib, Adw
 
 from . import export_peq as xp
-from . import pdeq
+from .export_bake import Baker, target_policies
 
-_NULL_N = 480          # null-test grid density over the fit band
-_PLOT_N = 240          # fixed-band fit / residual plot grid
 _GRID_FREQS = (20, 50, 100, 200, 500, 1000,
                2000, 5000, 10000, 20000)
 
@@ -57,134 +56,40 @@ class ExportDialog(Adw.Dialog):
         self.set_content_height(680)
         self.body = win._working_body()
         layer = win.pref_layers.active()
-        self.taste_name = layer["name"] if layer else None
-        self.taste_bands = win.pref_layers.active_bands()
-        self.chains = xp.composed_chains(self.body,
-                                         self.taste_bands)
-        self.chains_plain = (xp.composed_chains(self.body, None)
-                             if self.taste_name else self.chains)
-        self.flo, self.fhi = xp.fit_band(self.body)
-        self.source, self.source_why = xp.export_source(self.body)
+        self.bk = Baker(self.body, win.pref_layers.active_bands(),
+                        layer["name"] if layer else None)
+        self.taste_name = self.bk.taste_name
+        self.chains = self.bk.chains
+        self.flo, self.fhi = self.bk.flo, self.bk.fhi
         n = len(self.chains)
         self._subtitle = ("\u201c%s\u201d -- %d channel chain%s"
                           % (self.body.get("name", "profile"), n,
                              "" if n == 1 else "s"))
-        self._canvas = None
+        self._closed = False         # stops the picker audit worker
+        self.connect("closed", self._on_closed)
         self.nav = Adw.NavigationView()
         self.nav.add(self._targets_page())
         self.set_child(self.nav)
 
-    # ---- shared wording -------------------------------------------
-
-    def _chain_summary(self, taste=True):
-        """One sentence describing the SOURCE: profile, taste layer
-        when included, chain count. No level figure: the profile
-        preamp is not what an artifact carries (headroom lowers it,
-        a graphic line has none at all), so each writer states its
-        own effective level in the status instead. Phrased so no
-        line ever matches the AutoEq "Preamp:" shape."""
-        s = "Profile \u201c%s\u201d" % self.body.get("name", "?")
-        if self.taste_name and taste:
-            s += " + taste layer \u201c%s\u201d" % self.taste_name
-        n = len(self.chains)
-        ch = "one chain" if n == 1 else "%d channel chains" % n
-        return "%s -- %s." % (s, ch)
-
-    def _band_str(self):
-        return "%g-%g Hz" % (self.flo, self.fhi)
-
-    def _header(self, target, note, taste=True):
-        from . import __version__
-        return ["Exported by per-device-eq %s for %s"
-                % (__version__, target["name"]),
-                "Source: " + self._chain_summary(taste),
-                "Chain collapse: %s." % note]
-
-    def _source_line(self, canvas_note=None):
-        """The artifact-header statement of what fed the export."""
-        if self.source == "measurement":
-            s = ("Fed from: the measurement canvas -- the desired"
-                 " correction the fit was asked for")
-            if canvas_note:
-                s += " (%s)" % canvas_note
-            return s + "."
-        return ("Fed from: the playback chain (%s)."
-                % self.source_why)
-
-    def _collapse_note(self, policy):
-        """The collapse wording for a canvas-fed bake, matching
-        what collapse()/pick_chain() would say for the chain."""
-        keys = [k for k, _g, _b in self.chains]
-        if policy == "mean":
-            return "mean of %s" % ", ".join(keys)
-        if policy == "all":
-            return "single chain (apply-all)"
-        return "channel %s of %s" % (policy, ", ".join(keys))
-
-    def _canvas_desired(self):
-        """(fg, curves, note) rebuilt once, taste-free; a canvas
-        that refuses flips the whole dialog to the chain source."""
-        if self._canvas is None:
-            from .refit import RefitError
-            try:
-                self._canvas = xp.desired_from_canvas(self.body)
-            except RefitError as e:
-                self.source = "chain"
-                self.source_why = str(e)
-                self._canvas = False
-        return self._canvas or None
-
-    def _boost_cap(self):
-        return float(((self.body.get("fit") or {})
-                      .get("params") or {}).get("max_boost", 6.0))
-
-    def _measurement_vals(self, st, taste, cap=None):
-        """(fg, vals, canvas_note, capped_by) for the current
-        policy under the measurement source, or None -> bake from
-        the chain. Order matters: the policy collapses the raw
-        desired first; `cap`, when given, then clips the boost at
-        the fit's own ceiling -- deep dips are not filled, the
-        same doctrine the band fits obey -- and capped_by reports
-        how far the ask exceeded it; the taste overlay lands LAST,
-        uncapped, because a taste layer is intent, not a
-        measurement artifact."""
-        if self.source != "measurement":
-            return None
-        got = self._canvas_desired()
-        if not got:
-            return None
-        fg, curves, note = got
-        pol = st["policy"]
-        if pol == "mean":
-            vals = xp.mean_curve(curves)
-        elif pol in curves:
-            vals = list(curves[pol])
-        elif len(curves) == 1:
-            vals = list(next(iter(curves.values())))
-        else:
-            self.source = "chain"
-            self.source_why = ("the canvas channels do not match"
-                               " the chain keys")
-            return None
-        capped_by = 0.0
-        if cap is not None:
-            over = max(vals) - cap
-            if over > 0:
-                capped_by = over
-            vals = xp.cap_soft(vals, cap)
-        if taste and self.taste_bands:
-            tail = xp.chain_response(0.0, self.taste_bands, fg)
-            vals = [v + d for v, d in zip(vals, tail)]
-        return fg, vals, note, capped_by
+    def _on_closed(self, *_a):
+        self._closed = True
 
     # ---- page 1: where is this going? -----------------------------
 
     def _targets_page(self):
+        """The registry, grouped. Rows appear at once; their
+        fidelity verdicts (export_peq.audit_targets: projection
+        errors, band means, limit checks) run on a worker thread and
+        stream in -- each row's flag and tooltip as it lands, then
+        every group re-ordered by score. Verdicts are cached per
+        (chains, target), so a reopened wizard paints flagged and
+        sorted before the first frame."""
         page = Adw.PreferencesPage()
         targets = xp.load_targets()
-        audit = {t["id"]: xp.audit_target(
-            t, self.chains, xp.log_grid(self.flo, self.fhi, 240))
-            for t in targets}
+        grid = xp.log_grid(self.flo, self.fhi, 240)
+        self._audits = xp.cached_audits(targets, self.chains, grid)
+        self._audit_rows = {}
+        self._audit_groups = []
         groups = (("Import files",
                    "Formats the target application reads in",
                    xp.FILE_WRITERS),
@@ -193,12 +98,12 @@ class ExportDialog(Adw.Dialog):
                    xp.HAND_WRITERS))
         for title, desc, writers in groups:
             grp = Adw.PreferencesGroup(title=title, description=desc)
-            got = False
             rows = [t for t in targets
                     if t.get("writer") in writers]
-            rows.sort(key=lambda t: audit[t["id"]][0])
+            if not rows:
+                continue
+            rows.sort(key=self._audit_rank)
             for t in rows:
-                _score, tflag, gaps = audit[t["id"]]
                 # the CI population taught this: gaps used to
                 # join the note with a literal newline, and the
                 # container's clean store dressed two rows in
@@ -210,28 +115,33 @@ class ExportDialog(Adw.Dialog):
                 # on the surface, so the subtitle stays one
                 # line in every store.
                 sub = GLib.markup_escape_text(t.get("note", ""))
-                tip = None
-                if gaps:
-                    tip = (((tflag + ": ") if tflag
-                            else "missing: ")
-                           + ", ".join(gaps))
                 row = Adw.ActionRow(title=GLib.markup_escape_text(
                     t["name"]), subtitle=sub)
-                if tip:
-                    row.set_tooltip_text(tip)
                 row.set_use_markup(True)
                 row.set_activatable(True)
-                if tflag:
-                    flag = Gtk.Label(label=tflag)
-                    flag.add_css_class("error")
-                    row.add_suffix(flag)
+                flag = Gtk.Label()
+                flag.add_css_class("error")
+                flag.set_visible(False)
+                row.add_suffix(flag)
                 row.add_suffix(Gtk.Image.new_from_icon_name(
                     "go-next-symbolic"))
                 row.connect("activated", self._on_target, t)
                 grp.add(row)
-                got = True
-            if got:
-                page.add(grp)
+                self._audit_rows[t["id"]] = (row, flag)
+                if t["id"] in self._audits:
+                    self._land_audit(t["id"], self._audits[t["id"]])
+            self._audit_groups.append((grp, rows))
+            page.add(grp)
+        todo = [t for t in targets if t["id"] not in self._audits]
+        if todo:
+            def work():
+                xp.audit_targets(
+                    todo, self.chains, grid,
+                    on_result=lambda tid, a: GLib.idle_add(
+                        self._land_audit, tid, a),
+                    cancelled=lambda: self._closed)
+                GLib.idle_add(self._sort_targets)
+            threading.Thread(target=work, daemon=True).start()
         tv = Adw.ToolbarView()
         hb = Adw.HeaderBar()
         hb.set_title_widget(Adw.WindowTitle(
@@ -240,6 +150,40 @@ class ExportDialog(Adw.Dialog):
         tv.set_content(page)
         return Adw.NavigationPage(title="Export EQ", child=tv)
 
+    def _audit_rank(self, t):
+        a = self._audits.get(t["id"])
+        return a[0] if a else 5     # unscored: past the worst (4)
+
+    def _land_audit(self, tid, audit):
+        """One verdict onto its row: the red flag and the tooltip."""
+        self._audits[tid] = audit
+        row, flag = self._audit_rows.get(tid, (None, None))
+        if row is None:
+            return False
+        _score, tflag, gaps = audit
+        tip = None
+        if gaps:
+            tip = (((tflag + ": ") if tflag else "missing: ")
+                   + ", ".join(gaps))
+        row.set_tooltip_text(tip)
+        flag.set_label(tflag)
+        flag.set_visible(bool(tflag))
+        return False
+
+    def _sort_targets(self):
+        """Every verdict is in: re-order each group by fidelity (a
+        stable sort -- equal scores keep the registry order)."""
+        for grp, rows in self._audit_groups:
+            want = sorted(rows, key=self._audit_rank)
+            if want == rows:
+                continue
+            for t in rows:
+                grp.remove(self._audit_rows[t["id"]][0])
+            for t in want:
+                grp.add(self._audit_rows[t["id"]][0])
+            rows[:] = want
+        return False
+
     def _on_target(self, _row, target):
         self.nav.push(self._target_page(target))
 
@@ -256,15 +200,7 @@ class ExportDialog(Adw.Dialog):
         return "Channel %s" % policy
 
     def _target_page(self, target):
-        stereo = (target["writer"] == "poweramp"
-                  and xp.poweramp_stereo_keys(self.chains))
-        band_domain = target["writer"] in ("parametric",
-                                           "poweramp")
-        choices = (["stereo"] if stereo
-                   else xp.collapse_choices(self.chains,
-                                            band_domain))
-        if target["writer"] == "poweramp":
-            choices = [c for c in choices if c != "mean"]
+        choices = target_policies(target, self.chains)
         st = {"target": target, "policy": choices[0]}
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL,
                       spacing=12, margin_top=12, margin_bottom=12,
@@ -315,6 +251,7 @@ class ExportDialog(Adw.Dialog):
                 prow = Adw.ComboRow(title="Device preset",
                                     model=pn)
                 rows.add(prow)
+                st["preset_row"] = prow
             ent = Adw.EntryRow(title="Slider centers, Hz")
             ent.set_show_apply_button(True)
             ent.set_text(", ".join(
@@ -438,14 +375,6 @@ class ExportDialog(Adw.Dialog):
 
     # ---- baking + verification --------------------------------------
 
-    def _null_line(self, err, against="the in-app chain"):
-        verdict = ("pass" if err <= xp.NULL_PASS_DB else
-                   "CHECK, above the %.1f dB ceiling"
-                   % xp.NULL_PASS_DB)
-        return ("Null test vs %s: max %.2f dB over %s"
-                " -- %s." % (against, err, self._band_str(),
-                             verdict))
-
     @staticmethod
     def _set_status(st, line, ok):
         lab = st["status"]
@@ -458,10 +387,12 @@ class ExportDialog(Adw.Dialog):
         lab.set_text(line)
 
     def _bake(self, st):
-        """Render the export text for the current collapse policy,
-        run its verification and refresh the page. Every branch
-        states its truth: the null test, the rounding cost, or the
-        fit residual -- nothing is copied or saved unverified."""
+        """Read the page's controls into the target, bake it for the
+        current collapse policy and refresh the page. The bake and
+        its verification are export_bake.Baker's -- the batch
+        export runs the same one -- so every branch states its
+        truth here too: the null test, the rounding cost, or the
+        fit residual. Nothing is copied or saved unverified."""
         st["gen"] = st.get("gen", 0) + 1
         for k in ("copy", "save"):
             if k in st:
@@ -471,228 +402,63 @@ class ExportDialog(Adw.Dialog):
         t = st["target"]
         writer = t["writer"]
         taste = st.get("taste", True)
-        allc = self.chains if taste else self.chains_plain
-        auto = bool(self.body.get("preamp_auto", True))
-        nf = xp.log_grid(self.flo, self.fhi, _NULL_N)
-        if writer == "pdeq":
-            # the native row: no chains, no taste, no bake --
-            # the working profile itself, canvas and all. A
-            # refusal lands in the status, never in a traceback
+        if writer == "parametric" and "budget" in st:
+            b = int(st["budget"].get_value())
+            if b:
+                t = dict(t, max_bands=b)
+            elif "max_bands" in t:
+                t = {k: v for k, v in t.items() if k != "max_bands"}
+        elif writer == "fixed" and "centers_row" in st:
+            txt = st["centers_row"].get_text()
             try:
-                text = pdeq.pdeq_pack(self.body)
-            except ValueError as e:
-                text = ""
-                for k in ("copy", "save"):
-                    st[k].set_sensitive(False)
-                self._set_status(st, "Cannot pack: %s." % e,
-                                 False)
-            else:
-                self._set_status(
-                    st, "Packs the working profile verbatim -- "
-                    "canvas, fit provenance and rig fingerprint "
-                    "travel whole; the import on the other side "
-                    "validates and shows them. sha256 %s."
-                    % pdeq.payload_sha256(self.body)[:16], True)
-        elif writer == "poweramp":
-            name = self.body.get("name", "profile")
-            if self.taste_name and taste:
-                name = "%s + %s" % (name, self.taste_name)
-            if st["policy"] == "stereo":
-                chains = allc
-            else:
-                g, bands, _note = xp.pick_chain(allc,
-                                                st["policy"])
-                chains = [("all", g, bands)]
-            adj, moved = xp.headroom_preamp(
-                chains[0][1], [b for _k, _g, b in chains],
-                auto=auto)
-            if moved:
-                chains = [(k, adj, b) for k, _g, b in chains]
-            text = xp.poweramp_json(t, chains, name)
-            clamped, spill = xp.preamp_spill(adj, t)
-            errs = xp.null_test_poweramp(text, chains, nf)
-            worst = max(errs.values())
-            per = ", ".join("%s %.2f" % (k, v)
-                            for k, v in sorted(errs.items()))
-            verdict = ("pass" if worst <= xp.NULL_PASS_DB else
-                       "CHECK, above the %.1f dB ceiling"
-                       % xp.NULL_PASS_DB)
-            line = ("Null test per chain over %s: %s dB -- %s."
-                    " Preset preamp %+.1f dB%s."
-                    % (self._band_str(), per, verdict, clamped,
-                       (" (lowered %.1f dB for headroom)" % -moved)
-                       if moved < 0 and not auto else ""))
-            if spill:
-                line += (" %+.1f dB beyond the target's preamp"
-                         " range rides as a flat band per"
-                         " channel." % spill)
-            self._set_status(st, line, worst <= xp.NULL_PASS_DB)
-        elif writer == "parametric":
-            if "budget" in st:
-                b = int(st["budget"].get_value())
-                if b:
-                    t = dict(t, max_bands=b)
-                elif "max_bands" in t:
-                    t = {k: v for k, v in t.items()
-                         if k != "max_bands"}
-            maxb = t.get("max_bands")
-            refit_why = None
-            perr = None
-            if st["policy"] == "mean":
-                pm, pwhy = xp.parallel_mean(allc, nf)
-                if pm:
-                    g, bands, perr = pm
-                    note = ("mean of %s -- pairwise band average"
-                            % ", ".join(k for k, _g, _b in allc))
-                else:
-                    refit_why = "mean of channels -- " + pwhy
-            else:
-                g, bands, note = xp.pick_chain(allc, st["policy"])
-            if refit_why is None:
-                fg, fbands, folded = xp.fold_flat(g, bands)
-                viol = xp.chain_violations(t, fbands)
-                if viol:
-                    refit_why = "; ".join(viol)
-            if refit_why:
-                self._bake_refit_async(st, t, writer, taste,
-                                       allc, auto, nf, maxb,
-                                       refit_why)
+                cs = [float(x) for x in
+                      txt.replace(";", ",").split(",") if x.strip()]
+            except ValueError:
+                cs = []
+            lo = st["glo"].get_value()
+            hi = st["ghi"].get_value()
+            step = round(st["gst"].get_value(), 2)
+            terr = None
+            if (len(cs) < 2 or cs[0] <= 0
+                    or any(b <= a for a, b in zip(cs, cs[1:]))):
+                terr = ("Slider centers need 2+ ascending"
+                        " positive Hz values.")
+            elif lo >= hi:
+                terr = "Gain min must sit below gain max."
+            if terr:
+                st["view"].get_buffer().set_text("")
+                self._set_status(st, terr, False)
                 return
-            else:
-                hdr = self._header(t, note, taste)
-                if perr is not None:
-                    hdr.append("Mean by pairwise band average of"
-                               " parallel tables; verified within"
-                               " %.2f dB of the true mean." % perr)
-                tl = xp.limits_text(t)
-                if tl:
-                    hdr.append("Target limits: %s -- the chain"
-                               " fits as-is." % tl)
-                if folded:
-                    hdr.append("Flat-gain trim folded into the"
-                               " shared gain (%+.1f dB)." % folded)
-                fg, moved = xp.headroom_preamp(fg, [fbands],
-                                               auto=auto)
-                if moved < 0 and not auto:
-                    hdr.append("Shared gain lowered %.1f dB so the"
-                               " composed chain stays under 0 dBFS."
-                               % -moved)
-                ref = xp.chain_response(g + moved, bands, nf)
-                psuf = ("" if perr is None else
-                        " Mean by band average, %.2f dB vs the"
-                        " true mean." % perr)
-                text = xp.parametric_text(fg, fbands,
-                                          header=hdr)
-                err = xp.null_test_parametric(text, nf, ref)
-                self._set_status(
-                    st, self._null_line(err)
-                    + " Export preamp %+.1f dB." % fg + psuf,
-                    err <= xp.NULL_PASS_DB)
-        elif writer == "graphiceq":
-            grid = xp.graphic_grid()
-            mv = self._measurement_vals(st, taste,
-                                        cap=self._boost_cap())
-            capped_by = 0.0
-            if mv:
-                fgc, vals, tnote, capped_by = mv
-                note = self._collapse_note(st["policy"])
-                resp = xp.sample_curve(fgc, vals, grid)
-                ref = xp.sample_curve(fgc, vals, nf)
-            else:
-                tnote = None
-                resp, note = xp.collapse(allc, st["policy"], grid)
-                ref, _n = xp.collapse(allc, st["policy"], nf)
-            hdr = self._header(t, note, taste)
-            hdr.append(self._source_line(tnote))
-            if capped_by > 0:
-                hdr.append("Boost capped at %+.1f dB (the fit's"
-                           " policy, %.2g dB knee): the"
-                           " measurement asked %.2f dB more to"
-                           " fill deep dips."
-                           % (self._boost_cap(), xp.CAP_KNEE_DB,
-                              capped_by))
-            text, shift = xp.graphiceq_text(
-                grid, resp, header=hdr, bare=bool(t.get("bare")))
-            err = xp.null_test_graphic(text, nf, ref, shift)
-            line = "Source: %s. %s" % (
-                "canvas" if mv else "chain",
-                self._null_line(err, "the measured desired" if mv
-                                else "the in-app chain"))
-            if shift:
-                line += " Level shifted %+.1f dB." % shift
-            if capped_by > 0:
-                line += (" Boost capped at %+.1f dB."
-                         % self._boost_cap())
-            self._set_status(st, line, err <= xp.NULL_PASS_DB)
-        else:                                   # fixed
-            if "centers_row" in st:
-                txt = st["centers_row"].get_text()
-                try:
-                    cs = [float(x) for x in
-                          txt.replace(";", ",").split(",")
-                          if x.strip()]
-                except ValueError:
-                    cs = []
-                lo = st["glo"].get_value()
-                hi = st["ghi"].get_value()
-                step = round(st["gst"].get_value(), 2)
-                terr = None
-                if (len(cs) < 2 or cs[0] <= 0
-                        or any(b <= a
-                               for a, b in zip(cs, cs[1:]))):
-                    terr = ("Slider centers need 2+ ascending"
-                            " positive Hz values.")
-                elif lo >= hi:
-                    terr = "Gain min must sit below gain max."
-                if terr:
-                    st["view"].get_buffer().set_text("")
-                    self._set_status(st, terr, False)
-                    return
-                t = dict(t, centers=cs, gain_range=[lo, hi],
-                         gain_step=step)
-            pf = xp.log_grid(self.flo, self.fhi, _PLOT_N)
-            mv = self._measurement_vals(st, taste,
-                                        cap=self._boost_cap())
-            capped_by = 0.0
-            if mv:
-                fgc, vals, tnote, capped_by = mv
-                note = self._collapse_note(st["policy"])
-                desired = xp.sample_curve(fgc, vals, pf)
-            else:
-                tnote = None
-                desired, note = xp.collapse(allc, st["policy"],
-                                            pf)
-            sol = xp.solve_fixed(t, pf, desired)
-            st["sol"] = sol
-            hdr = self._header(t, note, taste)
-            hdr.append(self._source_line(tnote))
-            if st.get("preset_name"):
-                hdr.append("Device preset: %s."
-                           % st["preset_name"])
-            if capped_by > 0:
-                hdr.append("Boost capped at %+.1f dB (the fit's"
-                           " policy, %.2g dB knee): the"
-                           " measurement asked %.2f dB more to"
-                           " fill deep dips."
-                           % (self._boost_cap(), xp.CAP_KNEE_DB,
-                              capped_by))
-            text = xp.fixed_sheet_text(t, sol, header=hdr)
-            self._set_status(
-                st, "Source: %s. Fit over %s: residual max %.1f"
-                " dB, rms %.1f dB across %s; level trim %+.1f dB."
-                % ("canvas" if mv else "chain", sol["basis"],
-                   sol["resid_max"], sol["resid_rms"],
-                   self._band_str(), sol["offset"]), None)
+            t = dict(t, centers=cs, gain_range=[lo, hi],
+                     gain_step=step)
+        res = self.bk.bake(t, st["policy"], taste, refit=False,
+                           preset_name=st.get("preset_name"))
+        if res["refit"]:
+            self._bake_refit_async(st, t, taste, res["refit"])
+            return
+        if not res["text"]:
+            for k in ("copy", "save"):
+                st[k].set_sensitive(False)
+        if writer == "fixed":
+            sol = st["sol"] = res["sol"]
+            if st.get("preset_row") is not None:
+                # every preset against this curve: the cached bases
+                # make the ranking a handful of small solves
+                best, bsol = xp.solve_presets(
+                    st["target"], sol["freqs"], sol["desired"])[0]
+                st["preset_row"].set_subtitle(
+                    "Best fit for this curve: %s (rms %.1f dB)"
+                    % (best["name"], bsol["resid_rms"]))
             st["resid"].queue_draw()
-        st["text"] = text
-        st["view"].get_buffer().set_text(text)
+        self._set_status(st, res["line"], res["ok"])
+        st["text"] = res["text"]
+        st["view"].get_buffer().set_text(res["text"])
 
-    def _bake_refit_async(self, st, t, writer, taste, allc,
-                          auto, nf, maxb, why):
+    def _bake_refit_async(self, st, t, taste, why):
         """The optimizer takes seconds on a real profile; freezing
         the main loop until GNOME offers Force Quit is not a
         progress report. The math runs on a worker thread -- pure
-        export_peq calls, no GTK objects touched -- and lands via
+        Baker.bake_refit, no GTK objects touched -- and lands via
         idle_add. A generation stamp on the page drops any result
         that a newer toggle or policy change has superseded."""
         gen = st["gen"]
@@ -704,13 +470,10 @@ class ExportDialog(Adw.Dialog):
         st["view"].get_buffer().set_text(
             "# re-fitting -- the preview lands when the optimizer"
             " does")
-        self._set_status(
-            st, "Source: %s. Re-fitting (%s)..."
-            % ("canvas" if self.source == "measurement"
-               else "chain", why), None)
-
-        src = ("canvas" if self.source == "measurement"
+        src = ("canvas" if self.bk.source == "measurement"
                else "chain")
+        self._set_status(
+            st, "Source: %s. Re-fitting (%s)..." % (src, why), None)
 
         def on_prog(frac, band, horizon, evals):
             def apply():
@@ -726,9 +489,9 @@ class ExportDialog(Adw.Dialog):
 
         def work():
             try:
-                res = self._bake_refit(st, t, writer, taste,
-                                       allc, auto, nf, maxb, why,
-                                       progress=on_prog)
+                res = self.bk.bake_refit(t, st["policy"], taste,
+                                         t.get("max_bands"), why,
+                                         progress=on_prog)
             except Exception as e:
                 res = e
 
@@ -742,138 +505,14 @@ class ExportDialog(Adw.Dialog):
                     self._set_status(st, "Re-fit failed: %s"
                                      % res, False)
                     return False
-                text, line, ok = res
-                st["text"] = text
-                st["view"].get_buffer().set_text(text)
-                self._set_status(st, line, ok)
+                st["text"] = res["text"]
+                st["view"].get_buffer().set_text(res["text"])
+                self._set_status(st, res["line"], res["ok"])
                 return False
             GLib.idle_add(land)
 
         threading.Thread(target=work, daemon=True).start()
 
-    def _bake_refit(self, st, t, writer, taste, allc, auto, nf,
-                    maxb, why, progress=None):
-        """A band-domain export through the export-time re-fit: the
-        mean policy, or a chain over the target's band budget. The
-        desired comes from the canvas under the measurement source,
-        from the chain response otherwise; center_curve splits it
-        into shape (the bands realize it) and level (rides in the
-        preamp, and under Auto the composed Safe owns it outright).
-        The band budget is the target's max_bands, else the
-        profile's own fit budget (params.bands), else the richest
-        chain -- so two unbudgeted parametric targets, or one
-        matching the profile's budget, bake identical tables
-        instead of diverging on greedy horizon. The optimizer's
-        box is narrowed to the target's declared gain/Q/type
-        ranges, and a declared freq_range narrows the fit band
-        itself. The format roundtrip governs pass/fail; the re-fit
-        residual is stated as its own number, like the fixed
-        writer's.
-
-        The taste layer never enters the optimizer: band-domain
-        doctrine says taste bands ride verbatim, so the fit chases
-        the taste-free desired on a budget shrunk by the taste
-        band count, and the taste bands are appended to the result
-        as-is -- outside the fit and outside its boost cap (a +12
-        dB taste shelf is intent, not a dip to refuse). Only a
-        taste band that violates the target's declared ranges is
-        folded into the desired instead, and the header says so.
-        The composed headroom then sees the real peak, so Auto
-        preamp moves when the taste does."""
-        flo, fhi = self.flo, self.fhi
-        fr = t.get("freq_range")
-        if fr:
-            flo = max(flo, float(fr[0]))
-            fhi = min(fhi, float(fr[1]))
-        fgrid = xp.log_grid(flo, fhi, _NULL_N)
-        lim = xp.fit_limits(t)
-        tb = ([dict(b) for b in self.taste_bands
-               if b.get("enabled", True)]
-              if taste and self.taste_name else [])
-        ok, fold = [], []
-        for b in tb:
-            g, q = float(b["gain"]), float(b["q"])
-            gl, ql = lim.get("gain"), lim.get("q")
-            tys = lim.get("types")
-            bad = ((fr and not flo <= float(b["freq"]) <= fhi)
-                   or (tys and b["type"] not in tys)
-                   or (gl and not gl[0] <= g <= gl[1])
-                   or (ql and not ql[0] <= q <= ql[1]))
-            (fold if bad else ok).append(b)
-        plainc = self.chains_plain if taste else allc
-        mv = self._measurement_vals(st, False)
-        if mv:
-            fgc, cvals, tnote, _cb = mv
-            note = self._collapse_note(st["policy"])
-            vals = xp.sample_curve(fgc, cvals, fgrid)
-        else:
-            tnote = None
-            vals, note = xp.collapse(plainc, st["policy"], fgrid)
-        if fold:
-            tail = xp.chain_response(0.0, fold, fgrid)
-            vals = [v + d for v, d in zip(vals, tail)]
-        vals0, off = xp.center_curve(vals)
-        params = (self.body.get("fit") or {}).get("params") or {}
-        rich = max([len([b for b in bb
-                         if b.get("enabled", True)])
-                    for _k, _g, bb in plainc] or [0])
-        budget = maxb or int(params.get("bands", 0)) or rich or 10
-        fit_budget = max(1, budget - len(ok)) if ok else budget
-        gcap = float(params.get("max_boost", 6.0))
-        glim = lim.get("gain")
-        ghi = min(gcap, glim[1]) if glim else gcap
-        bands, rmax, rrms = xp.refit_bands(
-            fgrid, vals0, flo, fhi, fit_budget, gcap,
-            limits=lim, progress=progress)
-        got = xp.chain_response(0.0, bands, fgrid)
-        ct = [min(v, ghi) for v in vals0]
-        ce = [abs(a - b) for a, b in zip(got, ct)]
-        cmax = max(ce)
-        crms = (sum(e * e for e in ce) / len(ce)) ** 0.5
-        ask = rmax - cmax
-        nfit = len(bands)
-        bands = bands + ok
-        base = (float(self.body.get("preamp", 0.0)) + off
-                if mv else off)
-        adj, _moved = xp.headroom_preamp(base, [bands], auto=auto)
-        hdr = self._header(t, note, taste)
-        hdr.append(self._source_line(tnote))
-        tl = xp.limits_text(t)
-        if tl:
-            hdr.append("Target limits: %s." % tl)
-        hdr.append("Re-fit to %d bands (%s); residual max %.2f,"
-                   " rms %.2f dB vs the capped target."
-                   % (nfit, why, cmax, crms))
-        if ask > 0.3:
-            hdr.append("The uncapped ask exceeds the %+.1f dB"
-                       " boost cap by up to %.2f dB: deep dips"
-                       " stay unfilled." % (ghi, rmax))
-        if ok:
-            hdr.append("Taste layer: %d band%s appended verbatim"
-                       " -- outside the fit and its boost cap."
-                       % (len(ok), "" if len(ok) == 1 else "s"))
-        if fold:
-            hdr.append("%d taste band%s outside the target's"
-                       " declared ranges: folded into the desired"
-                       " and re-fit." % (len(fold),
-                                         "" if len(fold) == 1
-                                         else "s"))
-        ref = xp.chain_response(adj, bands, nf)
-        text = xp.parametric_text(adj, bands, header=hdr)
-        err = xp.null_test_parametric(text, nf, ref)
-        unf = ("" if ask <= 0.3 else
-               " Unfillable ask %.2f dB above the cap." % rmax)
-        ts = " + %d taste" % len(ok) if ok else ""
-        line = ("Source: %s. Re-fit to %d bands%s (%s): residual"
-                " max %.2f, rms %.2f dB vs the capped target.%s"
-                " Format roundtrip max %.2f dB -- %s. Export"
-                " preamp %+.1f dB."
-                % ("canvas" if mv else "chain", nfit, ts, why,
-                   cmax, crms, unf, err,
-                   "pass" if err <= xp.NULL_PASS_DB else "CHECK",
-                   adj))
-        return text, line, err <= xp.NULL_PASS_DB
-
     # ---- the residual plot (fixed-band targets) ---------------------
 
     def _draw_resid(self, _area, cr, w, h, st):
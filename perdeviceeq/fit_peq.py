@@ -21,6 +21,13 @@ shelves netting 2 dB) that waste the band budget and defeat hand
 editing. Pruning is anchored to the original residual and may cost at
 most PRUNE_EPS_DB at any grid point.
 
+--search N trades CPU for quality where it matters (shipped presets):
+N candidate topologies -- other placement orders, shelf edges,
+starting Qs, peaking-only mixes -- are fit in parallel worker
+processes under the same box, and the best by worst-case then RMS
+residual is kept (search_to_desired). The plain greedy is always
+candidate 0, so a search never returns a worse fit.
+
 When the measurement carries the per-take drives (levels recorded by
 measure_session) and the channels share one acoustic reference, a
 per-channel balance trim is added as a freq-0 shelf band (flat gain,
@@ -28,13 +35,15 @@ the preamp trick), aligning the channels' true levels down to the
 quietest one. See balance_trims for the exact validity gate.
 """
 import argparse
+import concurrent.futures
 import datetime
 import json
 import math
+import os
 import sys
+import time
 
 import numpy as np
-from scipy.optimize import least_squares
 
 from . import eq
 from .config import FS, SCHEMA_VERSION
@@ -51,6 +60,11 @@ SHELF_Q_MAX = 1.0       # a band may retune this far from placement
 PRUNE_EPS_DB = 0.25         # pruning may cost at most this much, anywhere
 PRUNE_OVERLAP_DB = 0.25     # a drop frees only bands it reaches this far
 PRUNE_SPAN_OCT = 0.5        # a trial may retune a freed band this far
+WARM_SPAN_OCT = 0.5         # a seeded band may retune this far
+WARM_NFEV = 400             # the warm joint refine's evaluation budget
+SEARCH_STARTS = 16          # candidate topologies a --search tries
+SEARCH_TIE_DB = 0.25        # worst residuals this close tie; RMS decides
+SEARCH_PEAKS = 3            # a candidate places at one of the top peaks
 TRIM_MIN_DB = 0.05          # below this a trim is measurement noise
 TRIM_WARN_DB = 3.0          # past this it smells like a seating problem
 
@@ -97,7 +111,7 @@ def _bounds(max_boost, limits):
 
 
 def _refine(bands, fg, desired, flo, fhi, max_boost, span_oct=None,
-            anchors=None, limits=None, tick=None):
+            anchors=None, limits=None, tick=None, max_nfev=3000):
     """Joint least-squares of every band against `desired`. With
     span_oct each band's frequency is leashed to that many octaves
     around its anchor -- the placement frequency in the greedy loop
@@ -136,15 +150,16 @@ def _refine(bands, fg, desired, flo, fhi, max_boost, span_oct=None,
               for i in range(len(types))]
         return _response(bl, fg) - desired
 
+    from scipy.optimize import least_squares    # lazy: ~0.3 s
     sol = least_squares(resfun, x0, bounds=(lo, hi), method="trf",
-                        max_nfev=3000)
+                        max_nfev=max_nfev)
     return [(types[i], float(10 ** sol.x[3 * i]),
              float(np.clip(sol.x[3 * i + 1], g_lo, g_hi)),
              float(sol.x[3 * i + 2])) for i in range(len(types))]
 
 
 def _prune(bands, fg, target, flo, fhi, max_boost,
-           limits=None, tick=None):
+           limits=None, tick=None, only=None):
     """Drop bands whose work their NEIGHBOURS absorb.
 
     The greedy placement is order-dependent and the joint refine only
@@ -170,7 +185,11 @@ def _prune(bands, fg, target, flo, fhi, max_boost,
     start -- absorbing a neighbour is reshaping, not relocation. A
     directly dropped stack member still dissolves (its partner is
     inside the overlap set); an unrelated drop can no longer rebuild
-    the other end of the spectrum."""
+    the other end of the spectrum.
+
+    `only`, when given, is a boolean mask over fg: just the bands
+    centered where it is True are tried (the warm fit's "where the
+    residual changed")."""
     if not bands:
         return bands
     resid0 = np.abs(target - _response(bands, fg))
@@ -179,6 +198,9 @@ def _prune(bands, fg, target, flo, fhi, max_boost,
     while changed and bands:
         changed = False
         for i in range(len(bands)):
+            if only is not None and not only[
+                    int(np.argmin(np.abs(fg - bands[i][1])))]:
+                continue
             dresp = _mag_db_vec(*bands[i], fg)
             rest = bands[:i] + bands[i + 1:]
             free, frozen = [], []
@@ -203,8 +225,93 @@ def _prune(bands, fg, target, flo, fhi, max_boost,
     return bands
 
 
+def _place(resid, k, fg, flo, fhi, allowed, box, edge=2.0, q0=2.0):
+    """The greedy placement at grid index k: low shelf within `edge`x
+    of flo, high shelf within `edge`x of fhi, peaking between (the
+    nearest allowed type when the target lacks it), gain from the
+    residual there, starting Q `q0` (both knobs only ever turned by
+    the search's candidates)."""
+    g_lo, g_hi, q_lo, q_hi = box
+    f0 = fg[k]
+    btype = ("LSC" if f0 <= flo * edge
+             else "HSC" if f0 >= fhi / edge else "PK")
+    if btype not in allowed:
+        btype = "PK" if "PK" in allowed else allowed[0]
+    g0 = float(np.clip(resid[k], g_lo, g_hi))
+    q0h = q_hi if btype == "PK" else min(q_hi, SHELF_Q_MAX)
+    return (btype, f0, g0, min(max(q0, q_lo), q0h))
+
+
+def _seed_bands(seed, n_bands, flo, fhi, allowed, box):
+    """A seed as band tuples the box can hold: dicts or tuples,
+    disabled bands and flat trims (< 1 Hz shelves, fit_profiles'
+    balance trick) dropped, frequencies pulled into the fit band,
+    gain and Q clipped, types the target lacks swapped like a
+    placement would; over budget, the strongest bands stay."""
+    g_lo, g_hi, q_lo, q_hi = box
+    out = []
+    for b in seed:
+        if isinstance(b, dict):
+            if not b.get("enabled", True):
+                continue
+            b = (b["type"], b["freq"], b["gain"], b["q"])
+        t, f, g, q = b[0], float(b[1]), float(b[2]), float(b[3])
+        if f < 1.0:
+            continue
+        if t not in allowed:
+            t = "PK" if "PK" in allowed else allowed[0]
+        qh = q_hi if t == "PK" else min(q_hi, SHELF_Q_MAX)
+        out.append((t, min(max(f, flo), fhi),
+                    min(max(g, g_lo), g_hi), min(max(q, q_lo), qh)))
+    out.sort(key=lambda b: -abs(b[2]))
+    return sorted(out[:max(int(n_bands), 0)], key=lambda b: b[1])
+
+
+def _warm_fit(seed, fg, target, flo, fhi, n_bands, max_boost, limits,
+              allowed, box, tick):
+    """The seeded path: a bounded joint refine of the seed (each
+    band leashed WARM_SPAN_OCT around where it was), then greedy
+    placements only while the residual still peaks past the target
+    -- each refining just the new band and its neighbours within
+    GREEDY_SPAN_OCT, the rest frozen -- then a prune limited to the
+    region the seed no longer fit."""
+    moved = np.abs(target - _response(seed, fg)) >= RESID_TARGET_DB
+    bands = _refine(seed, fg, target, flo, fhi, max_boost,
+                    span_oct=WARM_SPAN_OCT, limits=limits, tick=tick,
+                    max_nfev=WARM_NFEV) if seed else []
+    while len(bands) < n_bands:
+        resid = target - _response(bands, fg)
+        k = int(np.argmax(np.abs(resid)))
+        if abs(resid[k]) < RESID_TARGET_DB:
+            break
+        new = _place(resid, k, fg, flo, fhi, allowed, box)
+        near = [b for b in bands
+                if abs(np.log2(b[1] / new[1])) <= GREEDY_SPAN_OCT]
+        frozen = [b for b in bands if b not in near]
+        free = near + [new]
+        bands = frozen + _refine(
+            free, fg, target - _response(frozen, fg), flo, fhi,
+            max_boost, span_oct=GREEDY_SPAN_OCT, limits=limits,
+            tick=tick, max_nfev=WARM_NFEV)
+    if moved.any():
+        bands = _prune(bands, fg, target, flo, fhi, max_boost,
+                       limits=limits, tick=tick, only=moved)
+    return sorted(bands, key=lambda b: b[1])
+
+
+def seed_residual(seed, fg, desired, max_boost):
+    """Worst in-band |capped desired - seed response|: how well the
+    bands a re-fit is replacing fit the curve they were fit to --
+    the seed_tol a warm start is held to."""
+    sb = _seed_bands(seed, len(seed), fg[0], fg[-1],
+                     ("PK", "LSC", "HSC"), _bounds(max_boost, None))
+    target = np.minimum(np.asarray(desired, float), max_boost)
+    return float(np.max(np.abs(target - _response(sb, fg))))
+
+
 def fit_to_desired(fg, desired, flo, fhi, n_bands, max_boost,
-                   limits=None, progress=None):
+                   limits=None, progress=None, seed=None,
+                   seed_tol=None, stats=None):
     """The greedy core over a GIVEN desired correction on fg:
     place, leash-refine, prune. Cuts are unbounded; boost is capped
     at max_boost (filling deep nulls wastes headroom and amplifies
@@ -246,6 +353,18 @@ def fit_to_desired(fg, desired, flo, fhi, n_bands, max_boost,
     keep ticking in the last step; frac 1.0 is emitted exactly
     once, at the end.
 
+    `seed`, when given, warm-starts the fit from existing bands
+    (tuples or band dicts -- the fit being replaced): an incremental
+    re-fit, one take added and the desired moved by tenths of a dB,
+    needs the bands it already has nudged, not rebuilt from an empty
+    list (_warm_fit). The warm result is kept when its worst in-band
+    residual against the capped target is within the greedy's own
+    target -- or `seed_tol`, the residual the seed achieved on the
+    curve it was fit to, when larger -- plus PRUNE_EPS_DB, the slack
+    a prune may spend anyway. Otherwise the full greedy fit runs and
+    the better of the two is returned. `stats`, a dict, receives
+    {"warm": kept the warm result, "evals": residual evaluations}.
+
     Returns (bands, resid) with bands as (type, f, g, q) tuples."""
     desired = np.asarray(desired, float)
     g_lo, g_hi, q_lo, q_hi = _bounds(max_boost, limits)
@@ -264,22 +383,29 @@ def fit_to_desired(fg, desired, flo, fhi, n_bands, max_boost,
                          0.999),
                      prog["band"], horizon, prog["tot"])
 
+    box = (g_lo, g_hi, q_lo, q_hi)
+    warm = None
+    if seed is not None:
+        sb = _seed_bands(seed, n_bands, flo, fhi, allowed, box)
+        warm = _warm_fit(sb, fg, target, flo, fhi, n_bands,
+                         max_boost, limits, allowed, box, tick)
+        werr = float(np.max(np.abs(target - _response(warm, fg))))
+        bar = max(RESID_TARGET_DB, float(seed_tol or 0.0)) \
+            + PRUNE_EPS_DB
+        if werr <= bar:
+            if progress is not None:
+                progress(1.0, len(warm), horizon, prog["tot"])
+            if stats is not None:
+                stats.update(warm=True, evals=prog["tot"])
+            return warm, desired - _response(warm, fg)
     bands, anchors = [], []
     for _ in range(n_bands):
         resid = target - _response(bands, fg)
         k = int(np.argmax(np.abs(resid)))
         if abs(resid[k]) < RESID_TARGET_DB:
             break
-        f0 = fg[k]
-        btype = ("LSC" if f0 <= flo * 2
-                 else "HSC" if f0 >= fhi / 2 else "PK")
-        if btype not in allowed:
-            btype = "PK" if "PK" in allowed else allowed[0]
-        g0 = float(np.clip(resid[k], g_lo, g_hi))
-        q0h = q_hi if btype == "PK" else min(q_hi, SHELF_Q_MAX)
-        bands.append((btype, f0, g0,
-                      min(max(2.0, q_lo), q0h)))
-        anchors.append(f0)
+        bands.append(_place(resid, k, fg, flo, fhi, allowed, box))
+        anchors.append(bands[-1][1])
         bands = _refine(bands, fg, target, flo, fhi, max_boost,
                         span_oct=GREEDY_SPAN_OCT, anchors=anchors,
                         limits=limits, tick=tick)
@@ -287,11 +413,165 @@ def fit_to_desired(fg, desired, flo, fhi, n_bands, max_boost,
         prog["fev"] = 0
     bands = _prune(bands, fg, target, flo, fhi, max_boost,
                    limits=limits, tick=tick)
+    if warm is not None and werr < float(
+            np.max(np.abs(target - _response(bands, fg)))):
+        bands = warm
     if progress is not None:
         progress(1.0, prog["band"], horizon, prog["tot"])
+    if stats is not None:
+        stats.update(warm=bands is warm, evals=prog["tot"])
     return bands, desired - _response(bands, fg)   # vs TRUE target
 
 
+def _variant(i, allowed):
+    """Candidate i's knobs, a pure function of i so a search answers
+    the same on one process or sixteen: the shelf edge, the starting
+    Q, how many of the residual's top peaks a placement picks among,
+    and -- for every fourth candidate -- peaking bands only (a shelf
+    placed early is the usual root of a cancelling stack)."""
+    rng = np.random.default_rng(i)
+    types = allowed
+    if i % 4 == 3 and "PK" in allowed:
+        types = ("PK",)
+    return {"edge": float(rng.choice([1.5, 2.0, 3.0, 4.0])),
+            "q0": float(np.exp(rng.uniform(np.log(0.7), np.log(4.0)))),
+            "peaks": int(rng.integers(1, SEARCH_PEAKS + 1)),
+            "types": types, "rng": rng}
+
+
+def _peaks(resid, n):
+    """Grid indices of the n largest local maxima of |resid| past the
+    greedy target, largest first (the argmax alone when none is)."""
+    a = np.abs(resid)
+    inner = (a[1:-1] >= a[:-2]) & (a[1:-1] >= a[2:])
+    idx = np.concatenate(([0], np.nonzero(inner)[0] + 1, [len(a) - 1]))
+    idx = idx[a[idx] >= RESID_TARGET_DB]
+    if not len(idx):
+        return [int(np.argmax(a))]
+    return [int(k) for k in idx[np.argsort(-a[idx])][:n]]
+
+
+def _score(bands, fg, target):
+    r = target - _response(bands, fg)
+    return float(np.max(np.abs(r))), float(np.sqrt(np.mean(r * r)))
+
+
+def _search_job(job):
+    """One search candidate: (index, bands, worst, rms, seconds,
+    evals). Candidate 0 is the plain greedy -- the search can only
+    improve on it -- the rest run the same place/refine/prune loop
+    under _variant's knobs. Module-level so a process pool can run
+    it."""
+    fg, desired, flo, fhi, n_bands, max_boost, limits, i = job
+    t0 = time.process_time()
+    cnt = {"evals": 0}
+    box = _bounds(max_boost, limits)
+    target = np.minimum(desired, box[1])
+    if i == 0:
+        st = {}
+        bands, _r = fit_to_desired(fg, desired, flo, fhi, n_bands,
+                                   max_boost, limits=limits, stats=st)
+        cnt["evals"] = st["evals"]
+    else:
+        def tick():
+            cnt["evals"] += 1
+        allowed = tuple((limits or {}).get("types")
+                        or ("PK", "LSC", "HSC"))
+        v = _variant(i, allowed)
+        bands, anchors = [], []
+        for _ in range(n_bands):
+            resid = target - _response(bands, fg)
+            if float(np.max(np.abs(resid))) < RESID_TARGET_DB:
+                break
+            pk = _peaks(resid, v["peaks"])
+            k = pk[int(v["rng"].integers(len(pk)))]
+            bands.append(_place(resid, k, fg, flo, fhi, v["types"], box,
+                                edge=v["edge"], q0=v["q0"]))
+            anchors.append(bands[-1][1])
+            bands = _refine(bands, fg, target, flo, fhi, max_boost,
+                            span_oct=GREEDY_SPAN_OCT, anchors=anchors,
+                            limits=limits, tick=tick)
+        bands = _prune(bands, fg, target, flo, fhi, max_boost,
+                       limits=limits, tick=tick)
+        bands = sorted(bands, key=lambda b: b[1])
+    worst, rms = _score(bands, fg, target)
+    return (i, bands, worst, rms, time.process_time() - t0,
+            cnt["evals"])
+
+
+def search_to_desired(fg, desired, flo, fhi, n_bands, max_boost,
+                      limits=None, starts=SEARCH_STARTS, jobs=None,
+                      progress=None, stats=None):
+    """The multi-start global mode over fit_to_desired's question:
+    `starts` candidate topologies (_search_job; candidate 0 the
+    plain greedy) fit in `jobs` worker processes (None: one per
+    core, 1: in-process), the best kept.
+
+    The greedy is order-dependent: its first placement commits the
+    topology the refine then only polishes, and the prune can only
+    remove what it was handed. Spending CPU on other orders, shelf
+    edges, starting Qs and band-type mixes finds the fits it walks
+    past -- under the very same _bounds box and SHELF_Q_MAX, so a
+    searched preset is one the app could have produced. Best is the
+    lowest worst in-band residual against the capped target; within
+    SEARCH_TIE_DB of it the lowest RMS wins, then the fewer bands,
+    then the lower candidate index -- deterministic, whatever order
+    the workers finish in.
+
+    `progress` is called as progress(frac, band, horizon, evals) as
+    candidates land (band: the best so far's count, evals: the
+    total), frac 1.0 once at the end. `stats`, a dict, receives the
+    trade-off: {"starts", "jobs", "seconds" (wall), "cpu_seconds"
+    (summed over candidates), "evals", "greedy" and "best" as
+    (worst, rms), "won" (the winning index)}.
+
+    Returns (bands, resid) like fit_to_desired."""
+    desired = np.asarray(desired, float)
+    starts = max(1, int(starts))
+    n = jobs if jobs is not None else (os.cpu_count() or 1)
+    n = max(1, min(int(n), starts))
+    plan = [(fg, desired, flo, fhi, n_bands, max_boost, limits, i)
+            for i in range(starts)]
+    t0 = time.monotonic()
+    got = []
+
+    def land(res):
+        got.append(res)
+        if progress is not None:
+            best = _pick(got)
+            progress(min(len(got) / starts, 0.999), len(best[1]),
+                     max(int(n_bands), 1), sum(r[5] for r in got))
+
+    if n == 1:
+        for job in plan:
+            land(_search_job(job))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(n) as pool:
+            for res in pool.map(_search_job, plan):
+                land(res)
+    best = _pick(got)
+    if progress is not None:
+        progress(1.0, len(best[1]), max(int(n_bands), 1),
+                 sum(r[5] for r in got))
+    if stats is not None:
+        greedy = next(r for r in got if r[0] == 0)
+        stats.update(starts=starts, jobs=n,
+                     seconds=time.monotonic() - t0,
+                     cpu_seconds=sum(r[4] for r in got),
+                     evals=sum(r[5] for r in got),
+                     greedy=(greedy[2], greedy[3]),
+                     best=(best[2], best[3]), won=best[0])
+    return best[1], desired - _response(best[1], fg)
+
+
+def _pick(results):
+    """search_to_desired's winner among (index, bands, worst, rms,
+    ...) tuples."""
+    floor = min(r[2] for r in results)
+    tied = [r for r in results if r[2] <= floor + SEARCH_TIE_DB]
+    return min(tied, key=lambda r: (r[3], len(r[1]), r[0]))
+
+
 def desired_curve(freq, mag, flo, fhi):
     """(fg, desired, mean_db): the flat-target correction
     fit_channel derives -- mean minus smoothed magnitude over the
@@ -302,13 +582,27 @@ def desired_curve(freq, mag, flo, fhi):
 
 
 def fit_channel(freq, mag, flo, fhi, n_bands, max_boost,
-                progress=None):
+                progress=None, seed=None, seed_tol=None, search=0,
+                jobs=None, stats=None):
     """Return (bands, fg, desired, resid): the flat-target desired
     from desired_curve, fit by fit_to_desired. `progress` is
-    fit_to_desired's per-band heartbeat, forwarded as-is."""
+    fit_to_desired's per-band heartbeat, `seed`/`seed_tol` its warm
+    start, `stats` its report, all forwarded as-is. With `search`
+    (a candidate count) the fit is search_to_desired's instead, on
+    `jobs` processes; a seed is then ignored -- a search is the
+    from-scratch answer, spent on purpose."""
     fg, desired, _mean = desired_curve(freq, mag, flo, fhi)
-    bands, resid = fit_to_desired(fg, desired, flo, fhi, n_bands,
-                                  max_boost, progress=progress)
+    if search:
+        bands, resid = search_to_desired(fg, desired, flo, fhi,
+                                         n_bands, max_boost,
+                                         starts=search, jobs=jobs,
+                                         progress=progress,
+                                         stats=stats)
+    else:
+        bands, resid = fit_to_desired(fg, desired, flo, fhi, n_bands,
+                                      max_boost, progress=progress,
+                                      seed=seed, seed_tol=seed_tol,
+                                      stats=stats)
     return bands, fg, desired, resid
 
 
@@ -390,12 +684,15 @@ def _bands_to_dicts(bands):
              "q": round(q, 3), "enabled": True} for t, f, g, q in bands]
 
 
-def _report(tag, bands, fg, resid, flo, fhi, trim_db=None):
+def _report(tag, bands, fg, resid, flo, fhi, trim_db=None,
+            search=None):
     """Console report of one channel's fit. trim_db, when given, is
     the channel's balance trim: printed as the band row it becomes in
     the profile (counted in the header, so the console table matches
     the editor's row for row) and folded into the safe-preamp estimate
-    -- a flat trim moves this channel's whole curve."""
+    -- a flat trim moves this channel's whole curve. `search`, a
+    search_to_desired stats dict, adds the quality/time line: what
+    the candidates bought over the greedy, and what they cost."""
     has_trim = trim_db is not None and abs(trim_db) >= TRIM_MIN_DB
     print("\n[%s] %d bands, fit %g-%g Hz"
           % (tag, len(bands) + (1 if has_trim else 0), flo, fhi))
@@ -418,6 +715,14 @@ def _report(tag, bands, fg, resid, flo, fhi, trim_db=None):
     if hi.any():
         print("  residual 8-%g kHz: max %.2f dB (edge of cal trust)"
               % (fhi / 1000, float(np.max(np.abs(resid[hi])))))
+    if search:
+        print("  search: %d candidates on %d processes, %.1f s "
+              "(%.1f s CPU); max %.2f -> %.2f dB, RMS %.2f -> %.2f dB "
+              "(candidate %d)"
+              % (search["starts"], search["jobs"], search["seconds"],
+                 search["cpu_seconds"], search["greedy"][0],
+                 search["best"][0], search["greedy"][1],
+                 search["best"][1], search["won"]))
 
 
 def _curve(result):
@@ -431,7 +736,7 @@ def _curve(result):
 
 def fit_profiles(results, name=None, bands=10, f_lo=20.0, f_hi=12000.0,
                  max_boost=6.0, mono=False, report=False,
-                 progress=None):
+                 progress=None, seeds=None, search=0, jobs=None):
     """Fit a profile dict from measurement result dicts. `results` maps
     a channel key (e.g. "FL") to a process_takes result. With mono=True a
     single result is fit once and applied to all channels (apply_all);
@@ -451,7 +756,17 @@ def fit_profiles(results, name=None, bands=10, f_lo=20.0, f_hi=12000.0,
     mapped onto (i + channel_frac) / n and held below 1.0 until
     the single final progress(1.0, None, 0, 0, 0). `evals` is the
     current channel's residual-evaluation counter -- the number
-    that visibly ticks while the bar creeps."""
+    that visibly ticks while the bar creeps.
+
+    `seeds` maps a channel key ("all" under mono) to (bands, tol):
+    that channel's fit warm-starts from the bands it is replacing
+    (fit_to_desired's seed / seed_tol); channels without an entry
+    fit from scratch.
+
+    `search`, a candidate count, fits every channel with
+    search_to_desired on `jobs` processes instead of the greedy
+    (seeds are then moot); the report gains each channel's
+    quality/time line."""
     name = name or "Measured %s" % datetime.date.today().isoformat()
     prof = {"name": name, "version": SCHEMA_VERSION, "preamp": 0.0,
             "all": {"bands": []}, "channels": {}, "ch_keys": []}
@@ -470,24 +785,33 @@ def fit_profiles(results, name=None, bands=10, f_lo=20.0, f_hi=12000.0,
     if mono:
         (_key, result), = results.items()
         freq, mag = _curve(result)
+        sd, tol = (seeds or {}).get("all", (None, None))
+        sst = {}
         bnds, fg, _desired, resid = fit_channel(
             freq, mag, f_lo, f_hi, bands, max_boost,
-            progress=chan_prog(0, _key))
+            progress=chan_prog(0, _key), seed=sd, seed_tol=tol,
+            search=search, jobs=jobs, stats=sst)
         if report:
-            _report("all", bnds, fg, resid, f_lo, f_hi)
+            _report("all", bnds, fg, resid, f_lo, f_hi,
+                    search=sst if search else None)
         prof["apply_all"] = True
         prof["all"] = {"bands": _bands_to_dicts(bnds)}
     else:
         prof["apply_all"] = False
         prof["ch_keys"] = list(results.keys())
-        fits, means = {}, {}
+        fits, means, sst = {}, {}, {}
         keys = list(results.keys())
         for i, key in enumerate(keys):
             result = results[key]
             freq, mag = _curve(result)
+            sd, tol = (seeds or {}).get(key, (None, None))
+            sst[key] = {}
             fits[key] = fit_channel(freq, mag, f_lo, f_hi, bands,
                                     max_boost,
-                                    progress=chan_prog(i, key))
+                                    progress=chan_prog(i, key),
+                                    seed=sd, seed_tol=tol,
+                                    search=search, jobs=jobs,
+                                    stats=sst[key])
             _fg, yg = _grid_interp(freq, mag, f_lo, f_hi)
             means[key] = float(yg.mean())
         trims, why = balance_trims(results, means)
@@ -495,7 +819,8 @@ def fit_profiles(results, name=None, bands=10, f_lo=20.0, f_hi=12000.0,
             t = (trims or {}).get(key, 0.0)
             if report:
                 _report(key, bnds, fg, resid, f_lo, f_hi,
-                        trim_db=(t if trims is not None else None))
+                        trim_db=(t if trims is not None else None),
+                        search=sst[key] if search else None)
             bd = _bands_to_dicts(bnds)
             if abs(t) >= TRIM_MIN_DB:
                 bd.insert(0, {"type": "HSC", "freq": 0.0,
@@ -533,6 +858,14 @@ def main(argv):
     p.add_argument("--max-boost", type=float, default=6.0,
                    help="cap positive gain (dB); cuts are "
                         "unbounded (default 6)")
+    p.add_argument("--search", type=int, nargs="?", const=SEARCH_STARTS,
+                   default=0, metavar="N",
+                   help="multi-start global fit: try N candidate "
+                        "topologies, keep the best (default N %d)"
+                        % SEARCH_STARTS)
+    p.add_argument("--jobs", type=int, metavar="N",
+                   help="with --search: worker processes "
+                        "(default: one per core)")
     p.add_argument("--name", help="profile name (default from --device/date)")
     p.add_argument("--out", required=True, help="profile JSON to write")
     a = p.parse_args(argv)
@@ -544,7 +877,8 @@ def main(argv):
         results = {"all": _load_result(a.mono)}
         prof = fit_profiles(results, name=a.name, bands=a.bands,
                             f_lo=a.f_lo, f_hi=a.f_hi,
-                            max_boost=a.max_boost, mono=True, report=True)
+                            max_boost=a.max_boost, mono=True, report=True,
+                            search=a.search, jobs=a.jobs)
     else:
         results = {}
         for key, path in (("FL", a.left), ("FR", a.right)):
@@ -552,7 +886,8 @@ def main(argv):
                 results[key] = _load_result(path)
         prof = fit_profiles(results, name=a.name, bands=a.bands,
                             f_lo=a.f_lo, f_hi=a.f_hi,
-                            max_boost=a.max_boost, report=True)
+                            max_boost=a.max_boost, report=True,
+                            search=a.search, jobs=a.jobs)
 
     with open(a.out, "w", encoding="utf-8") as f:
         json.dump(prof, f, indent=2, ensure_ascii=False)
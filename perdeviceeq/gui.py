@@ -22,12 +22,16 @@ single editor (graph + band table + preamp) is currently editing. On save/apply
 the slots are assembled into a profile body and handed to the tested
 profiles.save_user / eq.profile_graph.
 
-Undo/redo is a history of serialized editor snapshots; a new snapshot is pushed
-on each settled (debounced) edit, so a drag of a spin button collapses into one
-undo step. Scroll over spin buttons / dropdowns is intercepted so the wheel
+Undo/redo is a history.History of editor states stored as patches; a step is
+recorded on each settled (debounced) edit, so a drag of a spin button collapses
+into one undo step. Scroll over spin buttons / dropdowns is intercepted so the wheel
 never changes a value by accident; the scroll is forwarded to the page instead.
 
-Deferred to a later increment: dragging band handles on the graph, GtkColumnView
+A band drag is heard while it moves: live (non-final) edits skip the
+debounce and go through pipewire.Audition, a rate-bounded preview that
+neither saves nor records history; the release commits once.
+
+Deferred to a later increment: GtkColumnView
 for the band table, per-row sparklines, the online AutoEQ catalog.
 """
 
@@ -39,6 +43,7 @@ gi.require_version("Adw", "1")
 from gi.repository import Gtk, Gio, GLib, Gdk, Adw, Pango
 
 from . import __version__, config, eq, pipewire, integration
+from .history import History
 from .picker import NodePicker
 from .config import (APP_ID, CLEAN_ID, FAVORITES_FILE, UI_STATE_FILE,
                      UI_FILE_CANDIDATES)
@@ -49,7 +54,10 @@ from .profiles import ProfileStore, editor_body
 DB_MAX = 24.0
 FMIN, FMAX = config.FMIN, config.FMAX
 _SAVE_DEBOUNCE_MS = 200
-_HISTORY_CAP = 100
+# snapshot paths every edit push re-reads: O(1) each, and the ones a
+# fork (pid), a mode flip or a layer pick change without an edit site
+_HIST_SCALARS = (("pid",), ("apply_all",), ("preamp",), ("preamp_auto",),
+                 ("ch_keys",), ("taste", "active"))
 
 
 def _ui_path():
@@ -135,6 +143,8 @@ class EqWindow(Adw.ApplicationWindow):
         self.live = False
         self.current_pid = CLEAN_ID
         self._save_source = 0
+        self._audition = pipewire.Audition()   # live drag preview
+        self._audition_source = 0
         self._loading = False
         self.sinks = []
         self._node_gone = False
@@ -167,10 +177,10 @@ class EqWindow(Adw.ApplicationWindow):
 
         # undo/redo history (serialized snapshots); the timeline
         # is GLOBAL -- device and taste edits interleave in it
-        self._hist = []
-        self._hidx = -1
+        self._hist = History()
         self._restoring = False
         self._dev_dirty = False     # a device-side edit awaits saving
+        self._touched = set()       # snapshot paths edited since a push
         self.preamp_auto = True     # preamp follows Safe (Next #4)
         self._preamp_syncing = False
         self._auto_syncing = False
@@ -334,6 +344,8 @@ class EqWindow(Adw.ApplicationWindow):
         self.view.graph.set_content_height(240)
 
         self._canvas = None          # measurement overlay cache
+        self._trust = None           # (pid, trust.TrustState), synced
+        self._canvas_stale = False   # takes landed since the overlay
         self.show_meas = True
         # Text registers only: their strings feed the card header's
         # dim trust line. The bar that showed them under the table
@@ -386,12 +398,18 @@ class EqWindow(Adw.ApplicationWindow):
         """The editor reports an edit of the shown slot: land it in
         the slot IN PLACE (the alias and the slot share the list)
         and run the classic pipeline -- fork built-ins, live apply,
-        headroom, debounced save with undo history."""
+        headroom, debounced save with undo history. A live drag
+        (final False) only redraws and auditions; the release
+        reports final and takes the classic path once."""
         if self._loading:
             return
         self._ensure_audible()
         self.bands[:] = [eq.Band.from_dict(b) for b in bands]
-        self._on_edit()
+        if not final:
+            self.view.graph.queue_draw()
+            self._audition_edit()
+            return
+        self._on_edit(("slots", self.cur_ch, "bands"))
 
     def _overlay_curve(self):
         """(freqs, measured, spread, trust_band) for the slot on
@@ -411,19 +429,21 @@ class EqWindow(Adw.ApplicationWindow):
 
     def _canvas_refresh(self):
         """Recompute the measurement overlay and the trust plaque for
-        the loaded profile: cheap (a few ms over the stored
-        magnitudes), runs on every load and debounced save so the
-        stale / incomplete / edited chips never lie."""
+        the loaded profile: a few ms over the stored magnitudes, but
+        it reads every take, so it runs on load and on the debounced
+        save -- the stale / incomplete / edited chips never lie --
+        and not per take of a live sitting (_live_take)."""
         p = self.store.get(self.current_pid) or {}
         m = p.get("measurement")
         has = isinstance(m, dict) and bool(m.get("takes"))
         self.meas_toggle.set_visible(bool(has))
+        self._canvas_stale = False
         if not has:
             self._canvas = None
             self.device_hdr.set_text("")
             self._sync_view_curves()
             return
-        from . import refit, trust      # heavy deps stay lazy
+        from . import refit             # heavy deps stay lazy
         from . import export_peq, fit_peq
         fit = p.get("fit") or {}
         params = fit.get("params") or {}
@@ -435,7 +455,7 @@ class EqWindow(Adw.ApplicationWindow):
         except refit.RefitError as e:
             cache["err"] = str(e)
             results = {}
-        rep = trust.assess(p)
+        rep = self._trust_report(p)
         lo_all = hi_all = None
         for key, r in results.items():
             d = r["data"]
@@ -474,11 +494,48 @@ class EqWindow(Adw.ApplicationWindow):
                 cache["fit_resid"] = worst
         if lo_all is not None:
             cache["ylo"], cache["yhi"] = lo_all - 3.0, hi_all + 3.0
+        cache["stale"] = refit.fit_is_stale(p)
         self._canvas = cache
+        self._plaque_refresh(p, rep)
+        self._sync_view_curves()
 
+    def _trust_report(self, p):
+        """The trust report of profile `p` (the loaded one), read off a
+        TrustState kept across refreshes: only the takes committed or
+        removed since the last read cost."""
+        from . import trust
+        if self._trust is None or self._trust[0] != self.current_pid:
+            self._trust = (self.current_pid, trust.TrustState())
+        state = self._trust[1]
+        state.sync(p["measurement"])
+        params = (p.get("fit") or {}).get("params") or {}
+        return state.assess(fit_params=params)
+
+    def _live_take(self):
+        """A take committed to (or deleted from) the loaded profile by
+        the measurement window. Only the trust plaque follows, at the
+        O(freqs) the kept TrustState pays for one take; the overlay
+        and the fit's stale check read the whole canvas and wait for
+        the debounced save, or the reload when the window closes."""
+        p = self.store.get(self.current_pid) or {}
+        m = p.get("measurement")
+        if (self._canvas is None or self._canvas["err"]
+                or not isinstance(m, dict) or not m.get("takes")):
+            self._canvas_refresh()      # first take: nothing to keep
+            return
+        self._canvas_stale = True
+        self._plaque_refresh(p, self._trust_report(p))
+
+    def _plaque_refresh(self, p, rep):
+        """The trust line, its tooltip and the fit chips, from `rep`
+        and the overlay cache (its error, fit residual and stale
+        verdict are the last full refresh's)."""
+        cache = self._canvas
+        m = p["measurement"]
+        fit = p.get("fit") or {}
         ids = {t.get("id") for t in m.get("takes") or []}
         used = set(fit.get("takes") or [])
-        stale = refit.fit_is_stale(p)
+        stale = cache["stale"]
         incomplete = bool(fit) and bool(ids - used)
         edited = bool(fit.get("edited"))
         if cache["err"]:
@@ -527,7 +584,6 @@ class EqWindow(Adw.ApplicationWindow):
                 self.fit_state_label.get_text()]
         self.device_hdr.set_text(
             " \u00b7 ".join(x for x in bits if x))
-        self._sync_view_curves()
 
     def _on_refit(self, *_):
         """Re-fit the profile from its own canvas; hand edits ask."""
@@ -1382,7 +1438,7 @@ class EqWindow(Adw.ApplicationWindow):
             self.cur_ch = self.ch_keys[0] if self.ch_keys else "all"
             self._build_channel_bar()
             self._load_slot(self.cur_ch)
-        self._on_edit()
+        self._on_edit(("slots",))
 
     # ---- profile load / edit ----------------------------------------------
     def _display_name(self, p):
@@ -1459,8 +1515,8 @@ class EqWindow(Adw.ApplicationWindow):
         # it exists so an edit made here has a pre-state to revert
         # to, since device snapshots carry one profile, not all.
         if not self._hist:
-            self._hist = [self._snapshot()]
-            self._hidx = 0
+            snap = self._snapshot()
+            self._hist.seed(snap, pid=snap["pid"])
         elif not self._restoring:
             # A freshly created profile (clone, import) is a real
             # step: undo deletes it into the graveyard. A plain
@@ -1470,7 +1526,7 @@ class EqWindow(Adw.ApplicationWindow):
             # real edit materializes it (and truncates rightfully).
             if born:
                 self._push_history(born=pid)
-            elif self._hidx < len(self._hist) - 1:
+            elif self._hist.index < len(self._hist) - 1:
                 self._pending_sel = self._snapshot()
             else:
                 self._push_history(sel=True)
@@ -1498,10 +1554,13 @@ class EqWindow(Adw.ApplicationWindow):
         self.store.set_binding(self.node, pid)
         self.profile_button.set_label(self._display_name(self.store.get(pid)))
 
-    def _on_edit(self):
-        """Any edit: fork built-ins if needed, redraw, debounce the save."""
+    def _on_edit(self, *touched):
+        """Any edit: fork built-ins if needed, redraw, debounce the save.
+        `touched` names the snapshot paths the edit changed (a slot's
+        bands, all slots); the history step is built from those."""
         if self._loading:
             return
+        self._touched.update(touched)
         self._ensure_editable()
         self._dev_dirty = True
         self.view.graph.queue_draw()
@@ -1532,10 +1591,12 @@ class EqWindow(Adw.ApplicationWindow):
                 self.store.save_user(self._working_body())
             self._apply_now()
             if not self._restoring:
-                self._push_history()
+                self._push_history(touched=self._take_touched())
             self._canvas_refresh()
         elif not self._restoring:
-            self._push_history()
+            self._push_history(touched=self._take_touched())
+        if self._canvas_stale:
+            self._canvas_refresh()
         return GLib.SOURCE_REMOVE
 
     def _apply_now(self):
@@ -1545,35 +1606,110 @@ class EqWindow(Adw.ApplicationWindow):
         self._update_meter()
         if not self.live or not self.node:
             return
-        node = self.node
+        self._audition.cancel()               # this commit supersedes it
+        graph = self._live_graph()
+        writer = pipewire.metadata_writer()   # coalesced, in order
+        if graph is None:
+            writer.clear(self.node)
+        else:
+            writer.set(self.node, graph)
+
+    def _live_graph(self, extra=None):
+        """The graph the sink should play right now, or None for key
+        removal (bypassed, or nothing in either layer). `extra`
+        overrides the active taste layer's bands -- a taste drag
+        auditions bands the layer store has not been told about."""
         body = self._working_body()
-        extra = self.pref_layers.active_bands()
+        if extra is None:
+            extra = self.pref_layers.active_bands()
         silent = (not eq.profile_has_content(body)
-                  and not self.pref_layers.active_has_content())
+                  and not any(b.get("enabled", True) for b in extra))
         if self.bypass_row.get_active() or silent:
-            pipewire._in_thread(lambda: pipewire.metadata_clear(node))
-        else:
-            graph = eq.profile_graph(body, extra=extra)
-            pipewire._in_thread(lambda: pipewire.metadata_set(node,
-                                                              graph))
+            return None
+        return eq.profile_graph(body, extra=extra)
+
+    # ---- live drag preview -------------------------------------------------
+    def _audition_edit(self, extra=None):
+        """Hear a drag as it happens: hand the graph builder to the
+        rate-bounded Audition (pipewire.AUDITION_HZ) instead of the
+        save debounce. No profile write, no history, no canvas; a
+        save the previous edit armed is pushed back, so the store is
+        not written mid-gesture either. The release lands as a final
+        edit and commits once."""
+        if self._save_source:
+            self._schedule_save()
+        if not self.live or not self.node:
+            return
+        build = lambda: self._live_graph(extra)
+        if self._audition.offer(self.node, build) \
+                and not self._audition_source:
+            self._audition_source = GLib.timeout_add(
+                max(1, int(1000 * self._audition.interval)),
+                self._audition_tick)
+
+    def _audition_tick(self):
+        if self._audition.tick():
+            return GLib.SOURCE_CONTINUE
+        self._audition_source = 0
+        return GLib.SOURCE_REMOVE
 
     # ---- undo / redo -------------------------------------------------------
     def _snapshot(self):
         """Serialize editor state for undo (the viewed channel is left out)."""
         keys = ["all"] + list(self.ch_keys)
+        return dict(self._snapshot_head(),
+                    slots={k: self._slot_to_dict(k) for k in keys},
+                    taste={"active": self.pref_layers.active_id,
+                           "layers": [self._layer_to_dict(l) for l in
+                                      self.pref_layers.layers]})
+
+    def _snapshot_head(self):
         return {"pid": self.current_pid,
                 "apply_all": self.apply_all,
                 "preamp": float(self.preamp),
                 "preamp_auto": bool(self.preamp_auto),
-                "ch_keys": list(self.ch_keys),
-                "slots": {k: self._slot_to_dict(k) for k in keys},
-                "taste": {
-                    "active": self.pref_layers.active_id,
-                    "layers": [
-                        {"id": l["id"], "name": l["name"],
-                         "bands": [dict(x) for x in
-                                   (l.get("bands") or [])]}
-                        for l in self.pref_layers.layers]}}
+                "ch_keys": list(self.ch_keys)}
+
+    @staticmethod
+    def _layer_to_dict(l):
+        return {"id": l["id"], "name": l["name"],
+                "bands": [dict(x) for x in (l.get("bands") or [])]}
+
+    def _snapshot_at(self, path):
+        """The _snapshot() value at `path`, built alone: one slot or
+        one taste layer costs that slot or layer, not the editor."""
+        head, rest = path[0], path[1:]
+        if head == "slots":
+            if not rest:
+                return self._snapshot()["slots"]
+            node, rest = self._slot_to_dict(rest[0]), rest[1:]
+        elif head == "taste":
+            if rest[:1] == ("active",):
+                return self.pref_layers.active_id
+            if len(rest) < 2:
+                return self._snapshot()["taste"]
+            node = self._layer_to_dict(self.pref_layers.layers[rest[1]])
+            rest = rest[2:]
+        else:
+            node = self._snapshot_head()[head]
+        for k in rest:
+            node = node[k]
+        return node
+
+    def _take_touched(self):
+        """The edit paths gathered since the last push, plus the
+        scalars, with paths inside another dropped (a layer delete
+        swallows the layer's earlier drag). A layer index that no
+        longer exists widens to the whole taste tree."""
+        paths = set(self._touched) | set(_HIST_SCALARS)
+        self._touched = set()
+        n = len(self.pref_layers.layers)
+        if any(p[:2] == ("taste", "layers") and len(p) > 2
+               and p[2] >= n for p in paths):
+            paths.add(("taste",))
+        return sorted((p for p in paths
+                       if not any(p[:i] in paths
+                                  for i in range(1, len(p)))), key=str)
 
     def _restore(self, snap):
         """Load an undo snapshot back into the editor. Snapshots
@@ -1637,44 +1773,42 @@ class EqWindow(Adw.ApplicationWindow):
         self._update_headroom()
         self._canvas_refresh()
 
-    def _push_history(self, sel=False, born=None):
-        """Append a snapshot, dropping any redo tail (cap
-        _HISTORY_CAP). sel=True marks a selection baseline (a state
-        between edits, never an undo step of its own); born=pid
-        marks a profile birth: undo, leaving that entry, buries the
-        profile. A real push first materializes a deferred
-        mid-history switch, so the edit's pre-state is on record.
-        Dedup compares content without the marks."""
-        snap = self._snapshot()
-        if sel:
-            snap["sel"] = True
-        if born:
-            snap["born"] = born
-        if self._hidx < len(self._hist) - 1:        # drop the redo branch
-            del self._hist[self._hidx + 1:]
-
-        def _bare(d):
-            return {k: v for k, v in d.items()
-                    if k not in ("sel", "born")}
+    def _push_history(self, sel=False, born=None, touched=None):
+        """Record the editor state as one timeline step, dropping any
+        redo tail (history.History: a patch of what changed, capped
+        at history.HISTORY_CAP). sel=True marks a selection baseline
+        (a state between edits, never an undo step of its own);
+        born=pid marks a profile birth: undo, leaving that entry,
+        buries the profile. A real push first materializes a
+        deferred mid-history switch, so the edit's pre-state is on
+        record. The marks sit beside the patch, so dedup -- an
+        empty patch -- never sees them.
+
+        An edit push passes `touched`, the snapshot paths its edit
+        sites named (_take_touched): only those subtrees are built
+        and compared, so a settled drag costs its slot, not every
+        slot of every channel. Switches, births and restores leave
+        it None and diff the full snapshot."""
+        self._hist.truncate()
         pend = self._pending_sel
         self._pending_sel = None
         if pend is not None and not sel:
-            pend = dict(pend)
-            pend["sel"] = True
-            if _bare(self._hist[self._hidx]) != _bare(pend):
-                self._hist.append(pend)
-                self._hidx = len(self._hist) - 1
-        if not self._hist or _bare(self._hist[self._hidx]) \
-                != _bare(snap):
-            self._hist.append(snap)
-            self._hidx = len(self._hist) - 1
-            if len(self._hist) > _HISTORY_CAP:
-                self._hist.pop(0)
-                self._hidx -= 1
+            self._hist.push(pend, sel=True, pid=pend["pid"])
+        marks = {"pid": self.current_pid}
+        if sel:
+            marks["sel"] = True
+        if born:
+            marks["born"] = born
+        if touched is None or not self._hist:
+            self._touched = set()        # the full snapshot covers them
+            self._hist.push(self._snapshot(), **marks)
+        else:
+            self._hist.push_patch([(p, self._snapshot_at(p))
+                                   for p in touched], **marks)
         self._update_undo_buttons()
 
-    def _snap_alive(self, snap):
-        pid = snap.get("pid")
+    def _snap_alive(self, i):
+        pid = self._hist.marks(i).get("pid")
         return (not pid or self.store.has(pid)
                 or pid in self._graveyard)
 
@@ -1683,14 +1817,15 @@ class EqWindow(Adw.ApplicationWindow):
         not -- undoing an edit lands its pre-state and STAYS on
         that profile; only dead entries are skipped. A deferred
         switch is abandoned: undo navigates the recorded branch."""
-        if self._hidx <= 0:
+        h = self._hist
+        if h.index <= 0:
             return
         self._pending_sel = None
         self._restoring = True
         try:
-            while self._hidx > 0:
-                leaving = self._hist[self._hidx]
-                bpid = leaving.get("born")
+            i = h.index
+            while i > 0:
+                bpid = h.marks(i).get("born")
                 if bpid and self.store.has(bpid):
                     # undoing a birth: bury it (redo resurrects)
                     self._graveyard[bpid] = json.loads(
@@ -1699,30 +1834,34 @@ class EqWindow(Adw.ApplicationWindow):
                     self.favorites.discard(bpid)
                     _save_favorites(self.favorites)
                     self._populate_picker()
-                self._hidx -= 1
-                snap = self._hist[self._hidx]
-                if not self._snap_alive(snap):
+                i -= 1
+                if not self._snap_alive(i):
                     continue
-                self._restore(snap)
+                self._restore(h.move(i))
                 break
+            else:
+                h.move(i)          # only dead entries behind: park
         finally:
             self._restoring = False
         self._update_undo_buttons()
 
     def _redo(self, *_):
         """ONE step forward, skipping only dead entries."""
-        if self._hidx >= len(self._hist) - 1:
+        h = self._hist
+        if h.index >= len(h) - 1:
             return
         self._pending_sel = None
         self._restoring = True
         try:
-            while self._hidx < len(self._hist) - 1:
-                self._hidx += 1
-                snap = self._hist[self._hidx]
-                if not self._snap_alive(snap):
+            i = h.index
+            while i < len(h) - 1:
+                i += 1
+                if not self._snap_alive(i):
                     continue
-                self._restore(snap)
+                self._restore(h.move(i))
                 break
+            else:
+                h.move(i)          # only dead entries ahead: park
         finally:
             self._restoring = False
         self._update_undo_buttons()
@@ -1732,14 +1871,13 @@ class EqWindow(Adw.ApplicationWindow):
         is offered only when a real edit sits at or below the
         current position (the seed at index 0 is a baseline, not a
         step), redo -- when one sits ahead."""
+        h = self._hist
+
         def _step(rng):
-            return any(not self._hist[i].get("sel")
-                       and self._snap_alive(self._hist[i])
+            return any(not h.marks(i).get("sel") and self._snap_alive(i)
                        for i in rng)
-        self.undo_btn.set_sensitive(
-            _step(range(1, self._hidx + 1)))
-        self.redo_btn.set_sensitive(
-            _step(range(self._hidx + 1, len(self._hist))))
+        self.undo_btn.set_sensitive(_step(range(1, h.index + 1)))
+        self.redo_btn.set_sensitive(_step(range(h.index + 1, len(h))))
 
     # ---- band table --------------------------------------------------------
     def _on_preamp(self, spin):
@@ -2391,7 +2529,7 @@ class EqWindow(Adw.ApplicationWindow):
             v = self._auto_preamp_db()
             self.preamp = -v if v else 0.0
         self._load_slot(self.cur_ch)
-        self._on_edit()
+        self._on_edit(("slots", self.cur_ch, "bands"))
 
     def _import_profile(self):
         """Import a .pdeq package (or an older raw-JSON export):
@@ -2596,6 +2734,7 @@ class EqWindow(Adw.ApplicationWindow):
                 return
             self.pref_layers.upsert(dict(cur, name=txt))
             self._sync_taste_card()
+            self._touch_layer(lid)
             self._schedule_save()    # renames join the timeline
         return cb
 
@@ -2617,6 +2756,7 @@ class EqWindow(Adw.ApplicationWindow):
                                        "bands": []})
         self.pref_layers.set_active(lid)
         self._taste_refresh()
+        self._touched.add(("taste",))
         self._schedule_save()        # creating a layer is an edit
 
     def _on_taste_delete(self, lay):
@@ -2637,6 +2777,7 @@ class EqWindow(Adw.ApplicationWindow):
                 return
             self.pref_layers.delete(lay["id"])
             self._taste_refresh()
+            self._touched.add(("taste",))
             self._schedule_save()    # Ctrl+Z resurrects the layer
         dlg.connect("response", on_resp)
         dlg.present(self)
@@ -2648,11 +2789,22 @@ class EqWindow(Adw.ApplicationWindow):
         act = self.pref_layers.active()
         if act is None:
             return
+        if not final:                # a drag: heard, not yet stored
+            self._audition_edit(extra=[dict(b) for b in bands])
+            return
         self.pref_layers.upsert(dict(act, bands=bands))
+        self._touch_layer(act["id"])
         self._apply_now()
         self._schedule_save()        # one global-history entry per
-        if final:                    # settled gesture
-            self._update_headroom()
+        self._update_headroom()      # settled gesture
+
+    def _touch_layer(self, lid):
+        """Name one taste layer as edited for the next history push."""
+        for i, l in enumerate(self.pref_layers.layers):
+            if l["id"] == lid:
+                self._touched.add(("taste", "layers", i))
+                return
+        self._touched.add(("taste",))
 
 class EqApplication(Adw.Application):
     def __init__(self):
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""The editor's undo/redo timeline, stored as patches.
+
+The window used to keep one full serialized snapshot per step -- every
+slot of every channel plus every taste layer -- and deduplicated a push
+by comparing the whole new snapshot against the whole current one. On
+an 8-channel profile with a few layers that is the entire editor state
+copied and compared per settled edit, a hundred times over.
+
+Here a step is a PATCH: the leaves that changed, addressed by path
+(("preamp",), ("slots", "FL", "bands", 3, "gain"), ("taste", "layers",
+1, "bands")), each with its old value for the way back. push() diffs
+a whole new state against the current one -- equal subtrees are
+skipped without copying, an unchanged step yields an empty patch and
+is dropped. An edit that knows what it touched does better:
+push_patch() takes the new values at those paths only and diffs each
+against the cursor's value there, so building, dedup and storage all
+cost the edited subtrees, not the state. Either way the NEW state is
+stored by structural sharing: only the containers along a changed
+path are copied, everything else is the previous state's objects. Undo and redo apply one patch from the
+cursor, O(changed); random access replays forward from the nearest
+keyframe (a full state every KEYFRAME_EVERY entries) or walks from
+the cursor, whichever is shorter. When the cap trims the oldest entry,
+its successor is promoted to a keyframe so the timeline stays
+self-contained.
+
+States are plain JSON-like trees (dicts, lists, scalars) and are
+READ-ONLY once pushed: they share structure with their neighbours.
+Per-entry marks (sel, born, pid -- whatever the caller wants to walk
+the timeline by) live beside the patches, never inside the state, so
+they take no part in dedup. No GTK; the window owns what a state means.
+"""
+
+HISTORY_CAP = 100          # entries kept; the oldest fall off
+KEYFRAME_EVERY = 16        # a full state every N entries
+
+_GONE = object()           # patch value: the key does not exist
+
+
+def diff(old, new, path=()):
+    """[(path, old_value, new_value)] turning `old` into `new`. Dicts
+    recurse per key (a missing key is _GONE), equal-length lists per
+    index; anything else that differs is replaced whole."""
+    if old is new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        out = []
+        for k, v in new.items():
+            o = old.get(k, _GONE)
+            if o is _GONE:
+                out.append((path + (k,), _GONE, v))
+            else:
+                out.extend(diff(o, v, path + (k,)))
+        for k, o in old.items():
+            if k not in new:
+                out.append((path + (k,), o, _GONE))
+        return out
+    if isinstance(old, list) and isinstance(new, list) \
+            and len(old) == len(new):
+        out = []
+        for i, (o, v) in enumerate(zip(old, new)):
+            out.extend(diff(o, v, path + (i,)))
+        return out
+    if type(old) is type(new) and old == new:
+        return []
+    return [(path, old, new)]
+
+
+def _get(node, path):
+    """The value at `path`, or _GONE when the path does not exist."""
+    for k in path:
+        try:
+            node = node[k]
+        except (KeyError, IndexError, TypeError):
+            return _GONE
+    return node
+
+
+def _put(node, path, value):
+    """Copy-on-write: a new tree with `value` at `path`, sharing every
+    subtree off the path with `node`."""
+    if not path:
+        return value
+    k, rest = path[0], path[1:]
+    cp = dict(node) if isinstance(node, dict) else list(node)
+    if rest:
+        cp[k] = _put(node[k], rest, value)
+    elif value is _GONE:
+        del cp[k]
+    else:
+        cp[k] = value
+    return cp
+
+
+def apply(state, patch, forward=True):
+    """The state `patch` leads to (or, forward=False, comes from)."""
+    for path, old, new in (patch if forward else reversed(patch)):
+        state = _put(state, path, new if forward else old)
+    return state
+
+
+class History:
+    """A linear undo timeline with a cursor. push() records a state
+    and push_patch() the changed paths of one (either drops the redo
+    branch), move(i) returns the state at entry i and puts the cursor
+    there, marks(i) the entry's marks.
+
+    Entries are {"patch": [...] | None, "key": state | None,
+    "marks": {...}}; the first entry, and one in every KEYFRAME_EVERY
+    after it, carries its full state in "key" -- so state(i) replays at
+    most keyframe_every patches, however long the session ran."""
+
+    def __init__(self, cap=HISTORY_CAP, keyframe_every=KEYFRAME_EVERY):
+        self.cap = max(2, int(cap))
+        self.keyframe_every = max(1, int(keyframe_every))
+        self._entries = []
+        self.index = -1
+        self._cur = None           # the state at the cursor
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    @property
+    def current(self):
+        return self._cur
+
+    def seed(self, state, **marks):
+        """Start over with `state` as the only entry."""
+        self._entries = [{"patch": None, "key": state, "marks": marks}]
+        self.index = 0
+        self._cur = state
+
+    def truncate(self):
+        """Drop the redo branch (entries after the cursor)."""
+        del self._entries[self.index + 1:]
+
+    def push(self, state, **marks):
+        """Record `state` after the cursor. Returns False (and records
+        nothing) when it equals the current state; the redo branch is
+        dropped either way."""
+        if not self._entries:
+            self.seed(state, **marks)
+            return True
+        self.truncate()
+        return self._append(diff(self._cur, state), marks)
+
+    def push_patch(self, changes, **marks):
+        """Record an edit from its own account of what it touched:
+        `changes` is [(path, new_value)], each diffed against the
+        cursor state's value at that path only (a missing last key is
+        added; its parent must exist). A path may name a whole subtree -- a slot, a layer --
+        and the stored patch still holds just its changed leaves.
+        Same contract as push(): False when nothing changed, the redo
+        branch dropped either way. Paths must not overlap, and the
+        timeline must have been seeded."""
+        if not self._entries:
+            raise IndexError("push_patch on an empty history")
+        self.truncate()
+        patch = []
+        for path, value in changes:
+            patch.extend(diff(_get(self._cur, tuple(path)), value,
+                              tuple(path)))
+        return self._append(patch, marks)
+
+    def _append(self, patch, marks):
+        if not patch:
+            return False
+        new = apply(self._cur, patch)
+        n = len(self._entries)
+        # Keyed on the distance to the previous keyframe, not on n: once
+        # the cap trims, n sits at `cap` for good and a modulo would
+        # never fire again, leaving state() to replay the whole window.
+        k = n - 1
+        while self._entries[k]["key"] is None:
+            k -= 1
+        self._entries.append({
+            "patch": patch,
+            "key": new if n - k >= self.keyframe_every else None,
+            "marks": marks})
+        self.index = n
+        self._cur = new
+        if len(self._entries) > self.cap:
+            self._trim()
+        return True
+
+    def marks(self, i):
+        return self._entries[i]["marks"]
+
+    def state(self, i):
+        """The state at entry i, without moving the cursor."""
+        if not 0 <= i < len(self._entries):
+            raise IndexError(i)
+        k = i
+        while self._entries[k]["key"] is None:
+            k -= 1
+        if abs(i - self.index) <= i - k:      # walk from the cursor
+            s, j = self._cur, self.index
+        else:                                  # replay from the keyframe
+            s, j = self._entries[k]["key"], k
+        while j < i:
+            j += 1
+            s = apply(s, self._entries[j]["patch"])
+        while j > i:
+            s = apply(s, self._entries[j]["patch"], forward=False)
+            j -= 1
+        return s
+
+    def move(self, i):
+        """Put the cursor on entry i and return its state."""
+        self._cur = self.state(i)
+        self.index = i
+        return self._cur
+
+    def _trim(self):
+        nxt = self._entries[1]
+        if nxt["key"] is None:
+            nxt["key"] = self.state(1)
+        nxt["patch"] = None
+        del self._entries[0]
+        self.index -= 1
@@ -9,8 +9,10 @@ once and recalled per output:
                    channel calibration files, and the compensation domain
                    (RAW / HEQ / IDF / HPN, which shapes the fit target).
   MeasureMemory    per-sink recall -- the last mic profile used for a sink
-                   and the last auto-level volume that measured it well,
-                   so re-measuring the same output needs no re-setup.
+                   and, per mic, the last auto-level volume that measured
+                   it well, the adaptive sweep plan and, per rig, the
+                   learned volume->peak law auto-level starts from, so
+                   re-measuring the same output needs no re-setup.
 
 Both save atomically (tmp + os.replace) and tolerate a missing or
 corrupt file by starting empty, mirroring profiles.py. Filesystem + JSON
@@ -196,10 +198,30 @@ class MeasureMemory:
         v = vols.get(source) if isinstance(vols, dict) else None
         return float(v) if isinstance(v, (int, float)) else None
 
-    def remember(self, sink, mic_profile=None, source=None, volume=None):
+    def sweep_for(self, sink, source):
+        """The cached adaptive sweep plan (SweepPlan.as_dict()) for this
+        sink+source pair, or None. Keyed like the volume: the SNR a plan
+        was derived from belongs to the pair at its level."""
+        plans = self.for_sink(sink).get("sweeps")
+        p = plans.get(source) if isinstance(plans, dict) else None
+        return dict(p) if isinstance(p, dict) else None
+
+    def law_for(self, sink, source, rig=None):
+        """The learned volume->peak law (measure_session.fit_volume_law)
+        for this sink, source and rig, or None. The rig is part of the
+        key because the same mic in another coupler reads another gain
+        at the same volume; an unnamed rig keys as ''."""
+        laws = self.for_sink(sink).get("laws")
+        per = laws.get(source) if isinstance(laws, dict) else None
+        law = per.get(rig or "") if isinstance(per, dict) else None
+        return dict(law) if isinstance(law, dict) else None
+
+    def remember(self, sink, mic_profile=None, source=None, volume=None,
+                 sweep=None, law=None, rig=None):
         """Update a sink's recall; only the provided fields change. The
-        mic profile is per-sink (which mic to preselect); the volume is
-        stored under sink+source (needs source to key it)."""
+        mic profile is per-sink (which mic to preselect); the volume and
+        the sweep plan are stored under sink+source, the law under
+        sink+source+rig (need source to key them)."""
         if not sink:
             return
         e = dict(self.for_sink(sink))
@@ -209,16 +231,33 @@ class MeasureMemory:
             vols = dict(e.get("volumes") or {})
             vols[source] = round(float(volume), 4)
             e["volumes"] = vols
+        if sweep is not None and source:
+            plans = dict(e.get("sweeps") or {})
+            plans[source] = dict(sweep)
+            e["sweeps"] = plans
+        if law is not None and source:
+            laws = dict(e.get("laws") or {})
+            per = dict(laws.get(source) or {})
+            per[rig or ""] = dict(law)
+            laws[source] = per
+            e["laws"] = laws
         self.state[sink] = e
         _atomic_write(MEASURE_STATE_FILE, self.state)
 
     def forget_volume(self, sink, source):
         """Drop the remembered volume for a sink+source pair (the wizard's
-        re-level: the next sweep finds the level afresh)."""
+        re-level: the next sweep finds the level afresh). The sweep plan
+        goes with it: it was derived at that level. The volume law stays
+        -- it is a shape, not a level, and re-leveling verifies it on
+        the first probe anyway."""
         e = self.for_sink(sink)
-        vols = e.get("volumes")
-        if isinstance(vols, dict) and source in vols:
-            del vols[source]
+        changed = False
+        for key in ("volumes", "sweeps"):
+            d = e.get(key)
+            if isinstance(d, dict) and source in d:
+                del d[source]
+                changed = True
+        if changed:
             self.state[sink] = e
             _atomic_write(MEASURE_STATE_FILE, self.state)
 
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""Several measurement rigs on one machine, at once. No GTK, no prompts.
+
+A lab with three couplers on three sinks and three mics should not run
+three measure_run.py invocations back to back: a take is mostly waiting
+(capture lead, the sweep itself, the decay tail), and the waits of
+independent rigs overlap perfectly. RigScheduler runs one
+MeasureSession per rig on its own thread and lets them sweep
+concurrently.
+
+What is shared and what is not:
+
+- Shared, serialized: the per-device-eq metadata object (each rig's
+  profile bypass reads, clears and restores its own sink's key in the
+  ONE object the WirePlumber hook watches) and the foreign-stream mute
+  writes. Both go through measure_session.SHARED_LOCK, held for the
+  milliseconds one write takes, never across a sweep -- so rig B's
+  bypass can land while rig A's sweep plays, but two read-modify-write
+  cycles never interleave.
+- Per rig, never shared: the session itself -- its takes, levels and
+  auto-level controller --, its cal, its save directory (one
+  subdirectory per rig name) and its results, one result_ch<N>.json per
+  channel in the rig's own out_dir. The sweep and capture streams carry
+  the rig name (SessionConfig.stream_tag), so each rig's path
+  verification checks its own streams and not a neighbour's.
+
+Preconditions run in the constructor, like MeasureSession's: every rig
+must resolve and pass its checks before ANY rig plays a sound, and two
+rigs may not share a sink or a mic (a mic hearing two sweeps measures
+neither). A rig that fails mid-run is reported with its error; the
+others carry on. The report states throughput as takes per hour -- the
+number a lab plans its day with -- both overall and per rig, next to
+the serial time the same work would have taken one rig at a time.
+"""
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from .measure_session import (MeasureCancelled, MeasureError, MeasureSession,
+                              RefusalError)
+
+
+@dataclass
+class RigPlan:
+    """One rig's work order: a SessionConfig plus how many accepted
+    takes to collect on which channels. level_stuck is a caller
+    decision in the single-rig API; an unattended rig either keeps the
+    capture (accept_stuck) or fails with the reason."""
+    name: str
+    cfg: object                    # measure_session.SessionConfig
+    channels: tuple = (0,)
+    takes: int = 1
+    out_dir: str = None            # result_ch<N>.json land here
+    accept_stuck: bool = False
+
+
+def rig_slug(name):
+    """The file-system and stream-tag form of a rig name: the save
+    subdirectory, the out_dir a driver builds and the stream suffix
+    all use it, so "rig 1" and "rig/1" never land anywhere odd."""
+    return re.sub(r"[^\w.+-]+", "_", name).strip("_")
+
+
+def _per_hour(n, seconds):
+    return round(n * 3600.0 / seconds, 1) if seconds > 0 else None
+
+
+class RigScheduler:
+    """Concurrent MeasureSessions, one per RigPlan. Construct (refuses
+    before any sound), then run() -- blocking, returns the report;
+    cancel() from another thread aborts every rig's sweep in flight.
+    `sessions` and `results` ({rig: {channel: result dict}}) stay
+    readable after the run for callers building canvases."""
+
+    def __init__(self, plans):
+        plans = list(plans)
+        if not plans:
+            raise RefusalError("no rigs to measure")
+        seen = {"name": set(), "sink": set(), "source": set()}
+        for p in plans:
+            if p.takes < 1:
+                raise RefusalError("rig %r: takes must be >= 1" % p.name)
+            if not p.channels:
+                raise RefusalError("rig %r: no channels to measure"
+                                   % p.name)
+            for key, val in (("name", rig_slug(p.name or "")),
+                             ("sink", p.cfg.sink),
+                             ("source", p.cfg.source)):
+                if not val:
+                    raise RefusalError("rig %r: empty %s" % (p.name, key))
+                if val in seen[key]:
+                    raise RefusalError(
+                        "two rigs share the %s %r; every rig needs its "
+                        "own sink, mic and name" % (key, val))
+                seen[key].add(val)
+        self.plans = []
+        self.sessions = {}
+        for p in plans:
+            tag = rig_slug(p.name)
+            cfg = replace(
+                p.cfg, stream_tag=p.cfg.stream_tag or tag,
+                rig=p.cfg.rig or p.name,
+                save_dir=(os.path.join(p.cfg.save_dir, tag)
+                          if p.cfg.save_dir else None))
+            self.plans.append(replace(p, cfg=cfg))
+            self.sessions[p.name] = MeasureSession(cfg)
+        # the sessions resolved independently; ids must not collide
+        # either (two names for one node)
+        for key in ("sink", "source"):
+            ids = [getattr(s, key)["id"] for s in self.sessions.values()]
+            if len(set(ids)) != len(ids):
+                raise RefusalError("two rigs resolved to the same %s node"
+                                   % key)
+        self.results = {}
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Abort every rig: the sweeps in flight raise MeasureCancelled
+        (reported as that rig's error), nothing further is started."""
+        self._cancel.set()
+        for s in self.sessions.values():
+            s.cancel()
+
+    def run(self, on_outcome=None):
+        """Measure all rigs concurrently and return the report.
+        on_outcome(rig_name, channel, TakeOutcome) is called from the
+        rig's worker thread after every sweep, probes included.
+
+        A KeyboardInterrupt while waiting cancels every rig and waits
+        for the workers -- their context exits put back each sink's
+        profile bypass, foreign mutes and listening volume -- before
+        it propagates. The workers are not daemons either: even a
+        second Ctrl-C cannot let the interpreter kill one mid-restore."""
+        reports = {p.name: None for p in self.plans}
+        t0 = time.monotonic()
+        threads, done = [], []
+        for p in self.plans:
+            ev = threading.Event()
+            th = threading.Thread(
+                target=self._rig_worker, name="rig-%s" % p.name,
+                args=(p, t0, reports, on_outcome, ev))
+            th.start()
+            threads.append(th)
+            done.append(ev)
+        # wait on the workers' own events, not Thread.join: a join cut
+        # short by ^C can mark a live thread stopped (bpo-45274), and
+        # the second join would then return mid-restore
+        try:
+            for ev in done:
+                ev.wait()
+        except KeyboardInterrupt:
+            self.cancel()
+            for ev in done:
+                ev.wait()
+            raise
+        finally:
+            for th in threads:
+                th.join()
+        wall = time.monotonic() - t0
+        rigs = [reports[p.name] for p in self.plans]
+        takes = sum(r["takes"] for r in rigs)
+        serial = sum(r["elapsed_s"] for r in rigs)
+        return {"rigs": rigs,
+                "takes": takes,
+                "probes": sum(r["probes"] for r in rigs),
+                "failed": [r["rig"] for r in rigs if r["error"]],
+                "elapsed_s": round(wall, 2),
+                "serial_s": round(serial, 2),
+                "takes_per_hour": _per_hour(takes, wall)}
+
+    def _rig_worker(self, plan, t0, reports, on_outcome, done):
+        ses = self.sessions[plan.name]
+        rep = {"rig": plan.name, "sink": plan.cfg.sink,
+               "source": plan.cfg.source, "takes": 0, "probes": 0,
+               "results": {}, "error": None,
+               "started_s": round(time.monotonic() - t0, 3),
+               "outdir": None, "eq_restored": None}
+        results = self.results.setdefault(plan.name, {})
+        try:
+            with ses:
+                rep["outdir"] = ses.outdir
+                for ch in plan.channels:
+                    got = 0
+                    while got < ses.planned_takes(plan.takes):
+                        if self._cancel.is_set():
+                            raise MeasureCancelled()
+                        out = ses.take(ch)
+                        if on_outcome is not None:
+                            on_outcome(plan.name, ch, out)
+                        if out.kind == "level_probe":
+                            rep["probes"] += 1
+                            continue
+                        if out.kind == "level_stuck":
+                            if not plan.accept_stuck:
+                                raise MeasureError(
+                                    "aborted: %s" % (out.level or {}).get(
+                                        "why", "leveling gave up"))
+                            ses.accept_level()
+                        got += 1
+                        rep["takes"] += 1
+                for ch in plan.channels:
+                    path = None
+                    if plan.out_dir:
+                        os.makedirs(plan.out_dir, exist_ok=True)
+                        path = os.path.join(plan.out_dir,
+                                            "result_ch%d.json" % ch)
+                    results[ch] = ses.finalize(ch, path)
+                    rep["results"][ch] = path
+        except MeasureCancelled:
+            rep["error"] = "cancelled"
+        except (MeasureError, RefusalError) as e:
+            rep["error"] = str(e)
+        except Exception as e:        # one rig's bug must not hide the rest
+            rep["error"] = "%s: %s" % (type(e).__name__, e)
+        finally:
+            if ses.eq_state is not None:
+                rep["eq_restored"] = ses.eq_state.get("restored")
+            now = time.monotonic() - t0
+            rep["finished_s"] = round(now, 3)
+            rep["elapsed_s"] = round(now - rep["started_s"], 3)
+            rep["takes_per_hour"] = _per_hour(rep["takes"],
+                                              rep["elapsed_s"])
+            reports[plan.name] = rep
+            done.set()
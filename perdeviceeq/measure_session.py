@@ -96,11 +96,53 @@ Method notes (worth not re-deriving):
   and a peak above HOT_DBFS is only a low-headroom advisory. The
   authoritative numbers are still computed by the core from the aligned
   impulse.
-- Raw takes (float32 wav, all captured channels) plus the sweep wav, its
-  sidecar and the analytic inverse (REW cross-check) are saved under
-  tests/fixtures-local/<device>_<stamp>/ -- .gitignore'd, real captures
-  never enter git.
+- Adaptive sweep (cfg.adaptive_sweep): the level SNR of the first
+  settled capture picks the sweep length and the averaged take count
+  that reach the protocol's quality (TRUSTED_TAKES clean DEFAULT_N
+  takes) in the least sweep time -- see plan_sweep. The plan rides in
+  `levels.sweep_plan` with its expected time-to-trusted-band; callers
+  cache it per sink+mic in MeasureMemory and pass it back as
+  cfg.sweep_plan, which skips the probe while the room still matches.
+  The take count is the caller's loop: planned_takes(requested) is
+  what to collect so the plan's repeats -- and its time -- hold.
+- Fast level probes (cfg.fast_probe, on by default): auto-level steps
+  play a PROBE_N-sample log chirp instead of the measurement sweep -- the
+  same -6 dBFS sine sweep, so the same crest factor and the same signal
+  RMS, and its peak and pre-roll SNR stand in for the sweep's; a step
+  costs about a second of sound instead of a sweep's length. The chirp
+  dwells less in every band than the sweep, so a sharp resonance rings
+  up less in it: the level the probes call right is always confirmed by
+  the first real sweep played there, in the same take() call. Its
+  peak error calibrates every later probe of the session
+  (`levels.auto_level.probe_error_db`), and a sweep that misses the
+  window goes back into the search as an ordinary level probe.
+- Learned volume law (cfg.volume_law): auto-level's probes are also a
+  free measurement of the sink's volume->peak law, fitted as a line in
+  dB (fit_volume_law) and exposed as `volume_law` once leveled. Callers
+  cache it per sink, mic and rig in MeasureMemory and pass it back: the
+  first probe then goes straight to the predicted level and usually IS
+  the level. The law is a guess about a rig that may have moved, never a
+  shortcut past the checks -- a first probe outside the window corrects
+  the law's offset once and, if that misses too, the bracketing search
+  takes over exactly as without a law.
+- Several rigs at once (measure_rigs): sessions are independent except
+  for the graph state they share -- the per-device-eq metadata object and
+  the foreign-stream mute writes -- which go through SHARED_LOCK; with
+  SessionConfig.stream_tag the sweep and capture streams carry the rig's
+  name so path verification never mistakes a neighbour's stream for ours.
+- The sweep wav, its sidecar and the analytic inverse (REW cross-check)
+  are saved under tests/fixtures-local/<device>_<stamp>/ -- .gitignore'd,
+  real captures never enter git. Next to them every sweep's untouched
+  capture (before any repair, all captured channels) lands ONCE,
+  straight from the capture buffer, in the session's take archive
+  (take_archive.TakeArchive: takes.pdea plus its index), labelled with
+  the take it became; raw_capture_dump adds the auto-level probe
+  captures. The archive is the only raw store -- TakeRecord.wav_path is
+  the take's archive ref -- and re-analysis tools memory-map one capture
+  at a time from it. cfg.take_wavs also exports each accepted take,
+  post-repair, as take%02d.wav for tools that want files.
 """
+import functools
 import json
 import math
 import os
@@ -116,14 +158,20 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 import numpy as np
-from scipy.stats import chi2
 
 from . import measure_core as mc
+from . import runs
 from .pipewire import sink_channels
+from .take_archive import ARCHIVE_NAME, TakeArchive
 
 METADATA_NAME = "per-device-eq"          # same object the app + WP hook use
 PLAY_NODE = "pde-measure-sweep"
 CAPTURE_NODE = "pde-measure-capture"
+# One lock per process over the graph state several concurrent
+# sessions share (measure_rigs runs one per rig): the per-device-eq
+# metadata object and foreign-stream mute writes. Held for the few
+# milliseconds a read-clear or a restore takes, never across a sweep.
+SHARED_LOCK = threading.RLock()
 SINK_API_PREFIXES = ("alsa", "bluez")    # "real device" whitelist
 AUTO_MAX_ADJUST = 8                      # ramp-up + a few bisection steps
 AUTO_START_VOLUME = 0.15                 # cubic; "start quiet"
@@ -137,6 +185,11 @@ AUTO_PEAK_CEIL = HOT_DBFS - 1.0          # aim strictly below the hot flag
 AUTO_SNR_MARGIN_DB = 1.0                 # aim past clean, not onto its edge
 AUTO_TRUST_FLOOR_PK = -20.0              # trust the room's floor read only
 #                                          on a probe at least this hot
+AUTO_LAW_SLOPE = 3.0                     # prior dB of peak per dB of volume:
+#                                          the software cube law
+AUTO_LAW_SLOPES = (0.5, 6.0)             # a fitted slope outside = nonsense
+AUTO_LAW_MIN_PK = -60.0                  # probes quieter than this don't fit
+AUTO_LAW_AIM = AUTO_PEAK_CEIL - 1.5      # a predicted start lands here
 BT_WARM_S = 2.0                          # silence played to a bluez sink
 #                                          after a volume change: absolute
 #                                          volume applies asynchronously
@@ -156,6 +209,18 @@ VERIFY_AFTER_S = 0.4                     # pw-play start -> pw-dump link check
 VERIFY_TIMEOUT_S = 3.0
 CAPTURE_LEAD_S = 0.5                     # record head start (extra pre-roll)
 EXTRA_TAIL_S = 1.0                       # decay + link latency margin
+PROBE_N = 1 << 14                        # auto-level probe chirp: 0.34 s
+PROBE_PRE_S = 0.5                        # its pre-roll: the floor read
+PROBE_POST_S = 0.2
+SWEEP_MIN_N = 1 << 16                    # 1.4 s @ 48 kHz: the bottom octave
+                                         # still gets ~140 ms of dwell
+SWEEP_MAX_N = 1 << 20                    # 21.8 s; longer is a coffee break
+SWEEP_MAX_REPEATS = 8                    # averaged takes a plan may ask for
+SWEEP_OVERHEAD_S = 0.6                   # per sweep beyond the wav: spawn,
+                                         # path checks, analysis
+TRUSTED_TAKES = 3                        # clean takes before a band is trusted
+SWEEP_REPLAN_DB = 3.0                    # a cached plan is re-derived when
+                                         # the room moved this far
 
 
 class MeasureError(RuntimeError):
@@ -381,24 +446,26 @@ class ProfileBypass:
                       "restored": None}
 
     def __enter__(self):
-        prof = metadata_get(self.key)
-        src = "metadata" if prof is not None else None
-        if prof is None:
-            prof = wpstate_get(self.key)
-            src = "wpstate" if prof is not None else None
-        self.state["profile"] = prof
-        self.state["profile_source"] = src
-        if prof is not None:
-            if not metadata_clear(self.key):
-                raise MeasureError("failed to clear %r from the %s metadata"
-                                   % (self.key, METADATA_NAME))
-            self.state["bypass"] = True
+        with SHARED_LOCK:
+            prof = metadata_get(self.key)
+            src = "metadata" if prof is not None else None
+            if prof is None:
+                prof = wpstate_get(self.key)
+                src = "wpstate" if prof is not None else None
+            self.state["profile"] = prof
+            self.state["profile_source"] = src
+            if prof is not None:
+                if not metadata_clear(self.key):
+                    raise MeasureError("failed to clear %r from the %s "
+                                       "metadata" % (self.key, METADATA_NAME))
+                self.state["bypass"] = True
         return self.state
 
     def __exit__(self, *exc):
         if self.state["profile"] is None:
             return False
-        ok = metadata_set(self.key, self.state["profile"])
+        with SHARED_LOCK:
+            ok = metadata_set(self.key, self.state["profile"])
         self.state["restored"] = bool(ok)
         if not ok:
             print("CRITICAL: failed to restore the EQ profile; put it back "
@@ -417,8 +484,9 @@ class MuteOthers:
 
     @staticmethod
     def _set_mute(node_id, mute):
-        r = _run(["pw-cli", "set-param", str(node_id), "Props",
-                  "{ mute = %s }" % ("true" if mute else "false")])
+        with SHARED_LOCK:
+            r = _run(["pw-cli", "set-param", str(node_id), "Props",
+                      "{ mute = %s }" % ("true" if mute else "false")])
         return r.returncode == 0
 
     def __enter__(self):
@@ -524,6 +592,45 @@ def _clamp_vol(v):
     return max(0.02, min(1.0, v))
 
 
+def fit_volume_law(points, prior=None):
+    """Fit peak_dBFS = offset_db + slope * 20log10(v) to unclipped
+    (cubic volume, peak) probes -- a straight line in dB holds for the
+    software cube law and, piecewise, for a BT sink's absolute-volume
+    steps. Two distinct volumes fit both terms (the slope clamped to
+    AUTO_LAW_SLOPES); one fits the offset under the prior's slope (or
+    AUTO_LAW_SLOPE). Probes quieter than AUTO_LAW_MIN_PK or non-finite
+    are left out. Returns the law as a JSON-ready dict, or None without
+    a usable probe."""
+    pts = [(20.0 * math.log10(v), float(pk)) for v, pk in points
+           if v > 0 and math.isfinite(pk) and pk >= AUTO_LAW_MIN_PK]
+    if not pts:
+        return None
+    slope = float((prior or {}).get("slope") or AUTO_LAW_SLOPE)
+    xs = np.array([x for x, _ in pts])
+    ys = np.array([y for _, y in pts])
+    if float(np.ptp(xs)) > 0.5:              # half a dB apart at least
+        xm = float(np.mean(xs))
+        slope = float(np.sum((xs - xm) * (ys - np.mean(ys)))
+                      / np.sum((xs - xm) ** 2))
+        slope = min(max(slope, AUTO_LAW_SLOPES[0]), AUTO_LAW_SLOPES[1])
+    offset = float(np.mean(ys - slope * xs))
+    return {"offset_db": round(offset, 2), "slope": round(slope, 3),
+            "points": len(pts)}
+
+
+def law_volume(law, peak_dbfs):
+    """The cubic volume `law` (fit_volume_law's dict) predicts for a
+    capture peak of `peak_dbfs`, clamped like every auto-level step;
+    None for a missing or malformed law."""
+    try:
+        offset, slope = float(law["offset_db"]), float(law["slope"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (math.isfinite(offset) and math.isfinite(slope)) or slope <= 0:
+        return None
+    return _clamp_vol(10.0 ** ((peak_dbfs - offset) / slope / 20.0))
+
+
 class AutoLevel:
     """Drive the sink volume until the capture is both hot enough
     (peak in AUTO_PEAK_FLOOR..AUTO_PEAK_CEIL) and CLEAN enough (SNR at
@@ -539,12 +646,24 @@ class AutoLevel:
     stays put, so one hot-enough probe predicts the best SNR the rig
     can reach below the safe ceiling (snr_ceiling) -- when that is
     under SNR_WARN_DB, no volume produces a clean take and the caller
-    should refuse honestly instead of hunting."""
+    should refuse honestly instead of hunting.
 
-    def __init__(self):
+    With a learned `law` (fit_volume_law) the caller starts at the
+    law's prediction instead of the quiet ramp; when that first probe
+    misses, next_volume spends ONE step on the law with its offset
+    re-anchored to the probe (the slope of a device rarely changes, its
+    gain -- a moved mic, a different coupler seat -- does), then the
+    bracketing above carries on. A clipped probe has no peak to anchor
+    to and goes straight to the back-off."""
+
+    def __init__(self, law=None):
         self.lo = None            # (v, peak): highest too-quiet probe
         self.hi = None            # (v, peak): lowest too-loud / clipped
         self.ceil = AUTO_EXPLORE_CEIL   # soft: lifts if stuck too quiet
+        self.law = law
+        self.points = []          # (v, peak) of every unclipped probe
+        self._guided = law is not None  # one law-corrected step left
+        self._clipped = False
 
     @staticmethod
     def verdict(peak, snr, clipped=False):
@@ -573,6 +692,9 @@ class AutoLevel:
         return snr + (AUTO_PEAK_CEIL - peak)
 
     def observe(self, v, peak, snr, clipped):
+        self._clipped = bool(clipped)
+        if not clipped:
+            self.points.append((v, peak))
         verdict = self.verdict(peak, snr, clipped)
         if verdict == "loud":
             p = 0.0 if clipped else peak
@@ -585,6 +707,11 @@ class AutoLevel:
                 self.ceil = 1.0           # -> the device needs more
 
     def next_volume(self, v, peak):
+        if self._guided:
+            self._guided = False
+            nv = self._law_step(v, peak)
+            if nv is not None:
+                return nv
         if self.lo and self.hi:                  # bracketed: bisect
             nv = math.sqrt(self.lo[0] * self.hi[0])
         elif self.hi:                            # too loud, no floor yet
@@ -593,6 +720,23 @@ class AutoLevel:
             nv = min(v * AUTO_RAMP, self.ceil)
         return _clamp_vol(nv)
 
+    def _law_step(self, v, peak):
+        """The law re-anchored on the probe at v: its slope, an offset
+        that puts `peak` at `v`. None when the probe cannot anchor it
+        (clipped, non-finite) or the prediction falls outside what the
+        probes already bracket."""
+        if self._clipped or not math.isfinite(peak) or v <= 0:
+            return None
+        slope = float(self.law.get("slope") or AUTO_LAW_SLOPE)
+        anchored = {"slope": slope,
+                    "offset_db": peak - slope * 20.0 * math.log10(v)}
+        nv = law_volume(anchored, AUTO_LAW_AIM)
+        if nv is None or abs(nv - v) < 1e-3:
+            return None
+        if (self.hi and nv >= self.hi[0]) or (self.lo and nv <= self.lo[0]):
+            return None
+        return min(nv, max(self.ceil, v))
+
 
 def peak_dbfs(x):
     if not len(x):
@@ -621,7 +765,7 @@ class CaptureStream:
     pw-record write the wav: no header-finalization worries on kill, and
     the stop condition is an exact frame count, not a timer."""
 
-    def __init__(self, target, channels, rate):
+    def __init__(self, target, channels, rate, node_name=CAPTURE_NODE):
         self.channels = channels
         self.rate = rate
         self.target = int(target)
@@ -636,7 +780,7 @@ class CaptureStream:
                "-P", "{ node.name = %s, node.target = %d, "
                      "node.dont-reconnect = true, application.name = "
                      "\"per-device-eq measure\" }"
-                     % (CAPTURE_NODE, self.target),
+                     % (node_name, self.target),
                "--format", "f32", "--rate", str(int(rate)),
                "--channels", str(int(channels)), "-"]
         self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
@@ -682,11 +826,19 @@ class CaptureStream:
                 self.proc.kill()
         self._thread.join(timeout=3)
 
-    def data(self):
-        buf = b"".join(self._chunks)
+    def frames(self):
+        """The capture as a read-only (frames x channels) float32 view
+        of ONE join of the received chunks, trimmed to whole frames --
+        the bytes pw-record sent, uncopied (what the archive stores)."""
+        with self._lock:
+            buf = b"".join(self._chunks)
+            self._chunks = [buf]            # joined once, reused after
         n = len(buf) // (4 * self.channels) * self.channels
-        return np.frombuffer(buf[:n * 4], dtype="<f4") \
-            .reshape(-1, self.channels).astype(np.float64)
+        return np.frombuffer(buf, dtype="<f4", count=n) \
+            .reshape(-1, self.channels)
+
+    def data(self):
+        return self.frames().astype(np.float64)
 
 
 # --- playback + path verification --------------------------------------------
@@ -697,10 +849,12 @@ def _play_error(play):
                            (play.stderr.read() or "").strip()))
 
 
-def verify_path(sink, play):
+def verify_path(sink, play, node_name=PLAY_NODE):
     """The sweep stream must exist and link into the target node and
     NOTHING else. Returns the path_clean dict; raises on a dirty path
-    (and on pw-play dying before the stream ever links)."""
+    (and on pw-play dying before the stream ever links). `node_name`
+    is the stream's own name -- tagged per rig when several sessions
+    sweep at once, so each one checks its own stream."""
     deadline = time.monotonic() + VERIFY_TIMEOUT_S
     stream, targets = None, set()
     while time.monotonic() < deadline:
@@ -708,7 +862,7 @@ def verify_path(sink, play):
             raise _play_error(play)
         dump = pw_dump()
         for o in _nodes(dump):
-            if _props(o).get("node.name") == PLAY_NODE:
+            if _props(o).get("node.name") == node_name:
                 stream = o
         if stream is not None:
             targets = {b for a, b in _links(dump) if a == stream["id"]}
@@ -731,7 +885,7 @@ def verify_path(sink, play):
     stream_volume = vol if vol is not None else cv[0]
     info = {"verified": not unknown and sink["id"] in targets,
             "target": node_ident(sink),
-            "playback_stream": {"id": stream["id"], "name": PLAY_NODE,
+            "playback_stream": {"id": stream["id"], "name": node_name,
                                 "volume": stream_volume},
             "unknown_nodes": unknown}
     if unknown:
@@ -745,7 +899,7 @@ def verify_path(sink, play):
     return info
 
 
-def verify_capture(source, cap):
+def verify_capture(source, cap, node_name=CAPTURE_NODE):
     """The capture stream must link FROM the requested source and no
     other. Raises if it is linked to a different source -- a wrong
     default source hijacks the stream and silently records the wrong mic
@@ -758,7 +912,7 @@ def verify_capture(source, cap):
                                % cap.proc.returncode)
         dump = pw_dump()
         for o in _nodes(dump):
-            if _props(o).get("node.name") == CAPTURE_NODE:
+            if _props(o).get("node.name") == node_name:
                 node = o
         if node is not None:
             sources = {a for a, b in _links(dump) if b == node["id"]}
@@ -787,23 +941,32 @@ def verify_capture(source, cap):
 
 
 def run_take(sink, source, wav_path, wav_duration_s, channels, rate,
-             verify, raw_dump_path=None, cancel=None, channel_map=None):
+             verify, archive=None, cancel=None, channel_map=None,
+             stream_tag=None, signal=None, kind="capture"):
     """One sweep: start capture, play the wav, collect exactly enough
     frames. Returns (frames x channels array, path_clean or None). With
-    raw_dump_path, the untouched capture is written there first,
-    for glitch diagnostics."""
-    cap = CaptureStream(source["id"], channels, rate)
+    an `archive` (TakeArchive) the untouched capture is appended to it
+    first, straight from the capture buffer, as a `kind` entry with the
+    played `signal` reference -- glitch evidence and re-analysis input
+    in one write. `stream_tag` suffixes both stream names
+    (pde-measure-sweep.<tag>) so concurrent rigs never verify each
+    other's streams."""
+    play_node, cap_node = PLAY_NODE, CAPTURE_NODE
+    if stream_tag:
+        play_node = "%s.%s" % (PLAY_NODE, stream_tag)
+        cap_node = "%s.%s" % (CAPTURE_NODE, stream_tag)
+    cap = CaptureStream(source["id"], channels, rate, node_name=cap_node)
     play = None
     path_info = None
     try:
         time.sleep(CAPTURE_LEAD_S)
         if verify:
-            cap_info = verify_capture(source, cap)
+            cap_info = verify_capture(source, cap, node_name=cap_node)
         play_cmd = ["pw-play", "--volume", "1.0",
                     "-P", "{ node.name = %s, node.target = %d, "
                           "node.dont-reconnect = true, application.name = "
                           "\"per-device-eq measure\" }"
-                          % (PLAY_NODE, sink["id"])]
+                          % (play_node, sink["id"])]
         if channel_map:
             play_cmd += ["--channel-map", channel_map]
         play_cmd.append(wav_path)
@@ -812,7 +975,7 @@ def run_take(sink, source, wav_path, wav_duration_s, channels, rate,
             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
         if verify:
             time.sleep(VERIFY_AFTER_S)
-            path_info = verify_path(sink, play)
+            path_info = verify_path(sink, play, node_name=play_node)
             path_info["capture"] = cap_info
         deadline = time.monotonic() + wav_duration_s + 30
         while True:
@@ -832,10 +995,10 @@ def run_take(sink, source, wav_path, wav_duration_s, channels, rate,
         if play is not None and play.poll() is None:
             play.kill()
         cap.stop()
-    if raw_dump_path is not None:
-        import soundfile as sf
-        sf.write(raw_dump_path, cap.data(), rate, subtype="FLOAT")
-    return cap.data(), path_info
+    raw = cap.frames()
+    if archive is not None:
+        archive.append(raw, rate, signal=signal, kind=kind)
+    return raw.astype(np.float64), path_info
 
 
 # --- sweep files ---------------------------------------------------------
@@ -851,10 +1014,27 @@ def write_sweep_files(outdir, sweep, pre_s, post_s):
              mc.inverse_sweep(sweep).astype("float32"), sweep.fs,
              subtype="FLOAT")
     with open(wav + ".json", "w") as f:
-        json.dump({"n_samples": sweep.n_samples, "fs": sweep.fs,
-                   "f_start": sweep.f_start, "f_end": sweep.f_end,
-                   "level_dbfs": sweep.level_dbfs, "pre_silence_s": pre_s,
-                   "post_silence_s": post_s}, f, indent=1)
+        json.dump(signal_ref(sweep, pre_s, post_s), f, indent=1)
+    return wav
+
+
+def signal_ref(sweep, pre_s, post_s):
+    """A played sweep's parameters -- the sweep.wav sidecar, and the
+    reference a take archive entry regenerates its signal from."""
+    return {"n_samples": sweep.n_samples, "fs": sweep.fs,
+            "f_start": sweep.f_start, "f_end": sweep.f_end,
+            "level_dbfs": sweep.level_dbfs, "pre_silence_s": pre_s,
+            "post_silence_s": post_s}
+
+
+def write_probe_file(outdir, probe, pre_s, post_s):
+    """The auto-level probe wav: the short chirp between its silences."""
+    import soundfile as sf
+    wav = os.path.join(outdir, "probe.wav")
+    sf.write(wav, np.concatenate([np.zeros(int(pre_s * probe.fs)),
+                                  probe.signal,
+                                  np.zeros(int(post_s * probe.fs))])
+             .astype("float32"), probe.fs, subtype="FLOAT")
     return wav
 
 
@@ -895,8 +1075,14 @@ class SessionConfig:
     save_dir: str = None    # None -> throwaway tempdir, wiped on exit
     mute_others: bool = False
     auto_level: bool = False
-    raw_capture_dump: bool = False
+    raw_capture_dump: bool = False  # archive the level probes' captures too
+    take_wavs: bool = False         # also export take%02d.wav (post-repair)
     start_volume: float = None      # applied on enter when not auto_level
+    stream_tag: str = None          # per-rig stream name suffix (measure_rigs)
+    adaptive_sweep: bool = False    # pick the sweep length from the floor
+    sweep_plan: dict = None         # cached SweepPlan.as_dict() to start from
+    volume_law: dict = None         # cached fit_volume_law() for auto-level
+    fast_probe: bool = True         # level on the short chirp, not sweeps
 
 
 @dataclass
@@ -911,7 +1097,8 @@ class TakeRecord:
     peak_dbfs: float
     clipped: int              # full-scale sample count (0 = clean)
     repaired: int             # interpolated non-finite samples
-    wav_path: str
+    wav_path: str             # the raw capture: archive ref (path#entry),
+                              # or take%02d.wav without an archive
     chan_vol: object = None   # sink channelVolumes entry (linear) for
                               # the played channel at sweep time
     soft_vol: object = None   # softVolumes ditto -- the gain PipeWire
@@ -929,9 +1116,123 @@ def spread_trust_bound(spread, n_takes):
     trust is earned by accumulating agreeing takes -- x2.42 at two,
     x1.61 at three, approaching 1 -- or restored by deleting the
     outlier, never by dilution."""
-    df = n_takes - 1
-    k = math.sqrt(df / chi2.ppf(1.0 - TRUST_CONFIDENCE, df))
-    return np.asarray(spread, float) * k
+    return np.asarray(spread, float) * _trust_multiplier(n_takes - 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _trust_multiplier(df):
+    """sqrt(df / chi2_a(df)), once per df. scipy.stats is half a
+    second of import, so it loads here, on the first bound, not with
+    the module."""
+    from scipy.stats import chi2
+    return math.sqrt(df / chi2.ppf(1.0 - TRUST_CONFIDENCE, df))
+
+
+def _gain_db(g):
+    """20*log10 of a recorded software gain, or None where
+    gain_comp_factors would call it unusable."""
+    try:
+        g = float(g)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(g) or g <= 0.0:
+        return None
+    return 20.0 * math.log10(g)
+
+
+class SpreadSums:
+    """Running per-frequency sums over one channel's takes, so the
+    take-to-take spread -- and every leave-one-out spread -- is O(freqs)
+    instead of a rebuild over the take stack.
+
+    The spread average_and_spread reports is the ddof=1 std of the
+    gain-COMPENSATED curves, and compensation is a common shift plus a
+    per-take constant (-20 log10 g): the std is that of x - 20 log10 g,
+    whichever take is the quietest. Two sets of sums are kept,
+    deviations from the first curve seen (no cancellation between
+    large dB levels): over x - 20 log10 g for the takes whose gain is
+    usable, and over raw x for all of them -- a single unusable gain
+    turns compensation off for the whole set, and leaving exactly
+    that take out turns it back on."""
+
+    def __init__(self):
+        self._ent = {}              # key -> (x, gain dB or None)
+        self._reset()
+
+    def _reset(self):
+        self._ref = None
+        self._raw = None            # [sum d, sum d^2], every take
+        self._norm = None           # the same, usable gains, shifted
+        self._bad = 0               # takes with an unusable gain
+
+    def __len__(self):
+        return len(self._ent)
+
+    def __contains__(self, key):
+        return key in self._ent
+
+    def add(self, key, mag_db, gain):
+        x = np.asarray(mag_db, float)
+        gd = _gain_db(gain)
+        if self._ref is None:
+            self._ref = x.copy()
+            z = np.zeros_like(x)
+            self._raw, self._norm = [z, z.copy()], [z.copy(), z.copy()]
+        self._ent[key] = (x, gd)
+        self._move(x, gd, 1.0)
+
+    def remove(self, key):
+        x, gd = self._ent.pop(key)
+        if not self._ent:           # empty: drop any rounding drift
+            self._reset()
+            return
+        self._move(x, gd, -1.0)
+
+    def _move(self, x, gd, sign):
+        d = x - self._ref
+        self._raw[0] += sign * d
+        self._raw[1] += sign * d * d
+        if gd is None:
+            self._bad += int(sign)
+        else:
+            d = d - gd
+            self._norm[0] += sign * d
+            self._norm[1] += sign * d * d
+
+    def sync(self, items):
+        """Bring the sums in line with `items`, (key, mag_db, gain)
+        in any order: keys gone are removed, new ones added, and a
+        take whose curve object or usable gain changed is re-entered
+        -- O(takes) comparisons plus O(freqs) per actual change."""
+        live = set()
+        for key, mag, gain in items:
+            live.add(key)
+            cur = self._ent.get(key)
+            if cur is not None and cur[0] is np.asarray(mag, float) \
+                    and cur[1] == _gain_db(gain):
+                continue
+            if cur is not None:
+                self.remove(key)
+            self.add(key, mag, gain)
+        for key in [k for k in self._ent if k not in live]:
+            self.remove(key)
+
+    def spread(self, exclude=None):
+        """ddof=1 std across the takes, `exclude` (a key) left out;
+        None below two takes."""
+        out = self._ent.get(exclude)
+        n = len(self._ent) - (out is not None)
+        if n < 2:
+            return None
+        bad = self._bad - (out is not None and out[1] is None)
+        s1, s2 = self._norm if bad == 0 else self._raw
+        if out is not None and (bad != 0 or out[1] is not None):
+            d = out[0] - self._ref
+            if bad == 0:
+                d = d - out[1]
+            s1, s2 = s1 - d, s2 - d * d
+        var = (s2 - s1 * s1 / n) / (n - 1)
+        return np.sqrt(np.maximum(var, 0.0))
 
 
 def trusted_band_hz(freqs, ok, min_run_oct=1.0 / 6.0):
@@ -942,37 +1243,98 @@ def trusted_band_hz(freqs, ok, min_run_oct=1.0 / 6.0):
     qualifying run degenerates to floor >= ceiling, which reads as
     'no trusted band'. The pure half of trusted_ceiling_hz /
     trusted_floor_hz, shared with the profile-side trust report."""
-    f = np.asarray(freqs, float)
-    ok = np.asarray(ok, bool)
-    min_ratio = 2.0 ** min_run_oct
-    n = len(f)
-    ceiling = float(f[0])
-    i = n - 1
-    while i >= 0:
-        if not ok[i]:
-            i -= 1
-            continue
-        j = i
-        while j >= 0 and ok[j]:
-            j -= 1
-        if j < 0 or f[i] / f[j + 1] >= min_ratio:
-            ceiling = float(f[i])
-            break
-        i = j
-    floor = float(f[-1])
-    i = 0
-    while i < n:
-        if not ok[i]:
-            i += 1
-            continue
-        j = i
-        while j < n and ok[j]:
-            j += 1
-        if j >= n or f[j - 1] / f[i] >= min_ratio:
-            floor = float(f[i])
-            break
-        i = j
-    return floor, ceiling
+    return runs.band_edges(freqs, ok, 2.0 ** min_run_oct)
+
+
+def take_seconds(samples, fs, pre_s, post_s):
+    """Wall time one sweep costs: the wav, the capture lead and tail
+    and the fixed per-sweep overhead."""
+    return (pre_s + samples / float(fs) + post_s + CAPTURE_LEAD_S
+            + EXTRA_TAIL_S + SWEEP_OVERHEAD_S)
+
+
+@dataclass
+class SweepPlan:
+    """An adaptive sweep choice: `samples` per sweep and `repeats`
+    averaged takes, derived from the level SNR the room allowed.
+    predicted_db is the plan's effective SNR referenced to one
+    DEFAULT_N take; time_to_trusted_s the expected sweep time until
+    the channel has its trusted band, default_s the same for the
+    fixed DEFAULT_N sweep (the saving is the difference)."""
+    samples: int
+    repeats: int
+    snr_db: float
+    target_db: float
+    predicted_db: float
+    take_s: float
+    time_to_trusted_s: float
+    default_s: float
+    reaches: bool = True
+
+    def as_dict(self):
+        return {k: (round(v, 2) if isinstance(v, float) else v)
+                for k, v in self.__dict__.items()}
+
+    @classmethod
+    def from_dict(cls, d):
+        """A cached plan, or None when it is unusable."""
+        try:
+            plan = cls(**{k: d[k] for k in cls.__dataclass_fields__})
+        except (KeyError, TypeError):
+            return None
+        if not SWEEP_MIN_N <= int(plan.samples) <= SWEEP_MAX_N:
+            return None
+        return plan
+
+
+def plan_sweep(snr_db, fs=mc.DEFAULT_FS, pre_s=1.0, post_s=0.5,
+               target_db=None, min_takes=TRUSTED_TAKES):
+    """The sweep length and averaged-take count that reach the target
+    SNR in the least total sweep time.
+
+    The level SNR estimate_snr reads (in-sweep RMS over the pre-roll
+    floor) does not depend on the sweep length; what the deconvolution
+    delivers does: every doubling of the sweep gathers twice the energy
+    per frequency against the same floor, +3 dB, and every doubling of
+    the averaged takes buys the same +3 dB on the noise-driven ripple.
+    The reference is today's protocol -- `min_takes` takes of DEFAULT_N
+    samples each at least target_db clean -- so a plan is never worse
+    than the fixed sweep in a room where that sweep was good: a quiet
+    room gets shorter sweeps, a noisy one longer sweeps and, past
+    SWEEP_MAX_N, more takes. Sweep lengths are powers of two in
+    SWEEP_MIN_N..SWEEP_MAX_N. When nothing reaches the target the
+    strongest plan is returned with reaches=False."""
+    target = (mc.SNR_WARN_DB + AUTO_SNR_MARGIN_DB
+              if target_db is None else float(target_db))
+
+    def pred(n, r):
+        return (snr_db + 10.0 * math.log10(n / float(mc.DEFAULT_N))
+                + 10.0 * math.log10(r / float(min_takes)))
+
+    def cost(n):
+        need = target - pred(n, min_takes)
+        r = max(min_takes,
+                int(math.ceil(min_takes * 10.0 ** (need / 10.0) - 1e-9)))
+        return r, r * take_seconds(n, fs, pre_s, post_s)
+
+    default_s = cost(mc.DEFAULT_N)[1]
+    best = None
+    n = SWEEP_MIN_N
+    while n <= SWEEP_MAX_N:
+        r, t = cost(n)
+        if r <= SWEEP_MAX_REPEATS and (best is None or t < best[2]):
+            best = (n, r, t)
+        n *= 2
+    reaches = best is not None
+    if not reaches:
+        n, r = SWEEP_MAX_N, SWEEP_MAX_REPEATS
+        best = (n, r, r * take_seconds(n, fs, pre_s, post_s))
+    n, r, t = best
+    return SweepPlan(samples=n, repeats=r, snr_db=float(snr_db),
+                     target_db=target, predicted_db=pred(n, r),
+                     take_s=take_seconds(n, fs, pre_s, post_s),
+                     time_to_trusted_s=t, default_s=default_s,
+                     reaches=reaches)
 
 
 TAKE_CLEAN = "clean"        # counts toward a channel's three good takes
@@ -1071,10 +1433,34 @@ class MeasureSession:
         if resolve:
             self._resolve(pw_dump())
 
-        self.sweep = mc.generate_sweep(cfg.samples, cfg.fs, cfg.f_start,
+        # adaptive sweep: a cached plan sets the length up front and is
+        # checked against the first settled capture; without one the
+        # configured length probes the room and the plan follows
+        self.sweep_plan = None
+        self._plan_pending = bool(cfg.adaptive_sweep)
+        samples = cfg.samples
+        if cfg.adaptive_sweep and cfg.sweep_plan:
+            self.sweep_plan = SweepPlan.from_dict(cfg.sweep_plan)
+            if self.sweep_plan is not None:
+                samples = int(self.sweep_plan.samples)
+        self.sweep = mc.generate_sweep(samples, cfg.fs, cfg.f_start,
                                        cfg.f_end)
         self.wav_duration = (cfg.pre_silence + self.sweep.duration_s
                              + cfg.post_silence)
+        # the auto-level probe chirp (fast_probe): written on __enter__
+        # next to the sweep, calibrated against it by the first sweep
+        # played at a level the probes chose
+        self.probe = (mc.generate_sweep(PROBE_N, cfg.fs, cfg.f_start,
+                                        cfg.f_end)
+                      if cfg.fast_probe else None)
+        self.probe_duration = (PROBE_PRE_S + self.probe.duration_s
+                               + PROBE_POST_S if self.probe else None)
+        self.probe_wav = None
+        self.archive = None                 # TakeArchive, opened on __enter__
+        self._capture_ix = None             # archive entry of the last sweep
+        self._probe_on = bool(cfg.fast_probe)
+        self._probe_check = None            # (v, predicted peak) to verify
+        self._probe_offset = 0.0            # sweep peak - probe peak, dB
         self.freqs = mc.log_grid()          # process_takes' exact grid
         slug = re.sub(r"[^\w.+-]+", "_",
                       cfg.device or self.sink_ident["name"]
@@ -1097,7 +1483,10 @@ class MeasureSession:
         self._cancel = threading.Event()    # set by cancel() to abort a sweep
         self._v_cur = self.volume_start
         self._leveled = not cfg.auto_level
-        self._auto_ctl = AutoLevel()
+        # the learned law: cfg's cached one until this session's probes
+        # refit it (set when auto-level locks)
+        self.volume_law = cfg.volume_law
+        self._auto_ctl = AutoLevel(law=cfg.volume_law)
         # where the current sweep level came from: "remembered" (a
         # stored per-source level), "pending" (auto-level will find it
         # on the next sweep), "auto" (auto-level locked it), "manual"
@@ -1107,9 +1496,12 @@ class MeasureSession:
                              else "remembered")
         self._auto_state = {"enabled": bool(cfg.auto_level),
                             "adjustments": 0, "initial": None,
-                            "final": None, "in_window": None}
+                            "final": None, "in_window": None,
+                            "predicted": False, "probes": 0,
+                            "probe_error_db": None}
         self._take_seq = 0                  # take%02d numbers, never reused
         self._takes = {}                    # channel -> [(record, samples)]
+        self._sums = {}                     # channel -> SpreadSums
         self._pending = None                # capture awaiting accept_level
 
     def _resolve(self, dump):
@@ -1172,13 +1564,15 @@ class MeasureSession:
         self.wav = write_sweep_files(self.outdir, self.sweep,
                                      self.cfg.pre_silence,
                                      self.cfg.post_silence)
+        if self.probe is not None:
+            self.probe_wav = write_probe_file(self.outdir, self.probe,
+                                              PROBE_PRE_S, PROBE_POST_S)
+        self.archive = TakeArchive(os.path.join(self.outdir, ARCHIVE_NAME))
         with ExitStack() as stack:
             if self.cfg.auto_level:
-                v = min(self.volume_start
-                        if self.volume_start is not None else 1.0,
-                        AUTO_START_VOLUME)
-                self._auto_state["initial"] = round(v, 4)
-                self._v_cur = v
+                self._v_cur = self._auto_start(
+                    self.volume_start if self.volume_start is not None
+                    else 1.0)
             elif self.cfg.start_volume is not None:
                 self._v_cur = self.cfg.start_volume
             self._stack = stack.pop_all()
@@ -1193,8 +1587,21 @@ class MeasureSession:
             shutil.rmtree(self.outdir, ignore_errors=True)
             self.outdir = None
             self.wav = None       # take() after exit fails loudly again
+            self.probe_wav = None
+            self.archive = None
         return ret
 
+    def planned_takes(self, requested=TRUSTED_TAKES):
+        """Accepted takes to collect on a channel: `requested`, raised
+        to the adaptive plan's repeat count once there is a plan. The
+        plan's length alone does not reach its SNR -- a noisy room's
+        plan counts on averaging more takes, and its time-to-trusted
+        band assumes them. Re-read it after every outcome: the plan
+        can appear (or change) with the first settled capture."""
+        if self.sweep_plan is None:
+            return requested
+        return max(requested, int(self.sweep_plan.repeats))
+
     # -- one physical sweep --------------------------------------------------
 
     def cancel(self):
@@ -1334,36 +1741,15 @@ class MeasureSession:
                                          dump)
         self._pending = None                # a new sweep supersedes it
         self._cancel.clear()                # fresh; cancel() sets it to abort
-        raw_path = (os.path.join(self.outdir,
-                                 "raw%02d.wav" % (self._take_seq + 1))
-                    if cfg.raw_capture_dump else None)
-        cmap = self._channel_map(channel)   # route the sweep to THIS speaker
-        self._mute_foreign(True)            # silence others for THIS sweep
-        try:
-            eq = ProfileBypass(self.sink_ident["name"])
-            self.eq_state = eq.__enter__()  # bypass the device EQ for it
-            try:
-                changed = self._set_meas_volume(True)  # meas. level
-                if changed and (self.sink_ident.get("device_api")
-                                or "").startswith("bluez"):
-                    self._warm_sink()
-                try:
-                    data, info = run_take(self.sink, self.source, self.wav,
-                                          self.wav_duration, cfg.channels,
-                                          self.sweep.fs,
-                                          verify=self.path_clean is None,
-                                          raw_dump_path=raw_path,
-                                          cancel=self._cancel,
-                                          channel_map=cmap)
-                    gains = self._applied_gains(channel)
-                finally:
-                    self._set_meas_volume(False)  # restore listening volume
-            finally:
-                eq.__exit__(None, None, None)   # restore the EQ right after
-        finally:
-            self._mute_foreign(False)       # unmute right after the sweep
-        if info is not None:
-            self.path_clean = info
+        if (not self._leveled and self._probe_on
+                and self.probe_wav is not None
+                and self._probe_check is None):
+            probe = self._probe_level(channel, a)
+            if probe is not None:
+                return probe                # else: the sweep, right here
+        data, gains = self._play(self.wav, self.wav_duration, channel,
+                                 signal_ref(self.sweep, cfg.pre_silence,
+                                            cfg.post_silence))
 
         notes = []
         # diagnostic: scan ALL channels, not just the one we analyze,
@@ -1405,6 +1791,13 @@ class MeasureSession:
 
         if not self._leveled:
             auto = self._auto_state
+            check, self._probe_check = self._probe_check, None
+            if check is not None and check[0] == self._v_cur:
+                # the sweep at the probes' level: their prediction's
+                # error calibrates every later probe of the session
+                err = pk - check[1]
+                auto["probe_error_db"] = round(err, 2)
+                self._probe_offset += err
             snr_q, noise_q = self._quick_snr(chan)
             self._auto_ctl.observe(self._v_cur, pk, snr_q, bool(clipped))
             v_new = self._auto_ctl.next_volume(self._v_cur, pk)
@@ -1418,6 +1811,11 @@ class MeasureSession:
             if ok:
                 self._leveled, auto["in_window"] = True, True
                 self.level_source = "auto"
+                law = fit_volume_law(self._auto_ctl.points,
+                                     prior=self._auto_ctl.law)
+                if law is not None:
+                    self.volume_law = law
+                auto["law"] = self.volume_law
             elif hopeless or auto["adjustments"] >= AUTO_MAX_ADJUST \
                     or stuck:
                 auto["in_window"] = False
@@ -1452,12 +1850,153 @@ class MeasureSession:
                 level = {"peak_dbfs": pk, "snr_db": snr_q,
                          "volume_from": self._v_cur,
                          "volume_to": v_new, "step": auto["adjustments"],
-                         "max_steps": AUTO_MAX_ADJUST}
+                         "max_steps": AUTO_MAX_ADJUST, "probe": "sweep"}
                 self._v_cur = v_new             # next sweep sets the sink
                 return TakeOutcome("level_probe", level=level, notes=notes)
+        if self._plan_pending:
+            probe = self._replan(chan, pk, notes)
+            if probe is not None:
+                return probe
         return self._accept(channel, data, chan, pk, clipped, bad, notes,
                             gains, capture=a)
 
+    def _play(self, wav, duration, channel, signal, kind="capture"):
+        """Play `wav` on the channel's speaker with the whole take
+        choreography -- foreign streams muted, the profile bypassed,
+        the measurement level set (a BT sink warmed after a change) --
+        each restored right after. Returns (frames x channels, applied
+        gains); the first sound also verifies the path. The capture is
+        archived as a `kind` entry of the played `signal` (probes only
+        with raw_capture_dump); _capture_ix points at it."""
+        cfg = self.cfg
+        archive = (self.archive if kind != "probe" or cfg.raw_capture_dump
+                   else None)
+        self._capture_ix = None
+        cmap = self._channel_map(channel)   # route the sweep to THIS speaker
+        self._mute_foreign(True)            # silence others for THIS sweep
+        try:
+            eq = ProfileBypass(self.sink_ident["name"])
+            self.eq_state = eq.__enter__()  # bypass the device EQ for it
+            try:
+                changed = self._set_meas_volume(True)  # meas. level
+                if changed and (self.sink_ident.get("device_api")
+                                or "").startswith("bluez"):
+                    self._warm_sink()
+                try:
+                    data, info = run_take(self.sink, self.source, wav,
+                                          duration, cfg.channels,
+                                          self.sweep.fs,
+                                          verify=self.path_clean is None,
+                                          archive=archive,
+                                          cancel=self._cancel,
+                                          channel_map=cmap,
+                                          stream_tag=cfg.stream_tag,
+                                          signal=signal, kind=kind)
+                    gains = self._applied_gains(channel)
+                finally:
+                    self._set_meas_volume(False)  # restore listening volume
+            finally:
+                eq.__exit__(None, None, None)   # restore the EQ right after
+        finally:
+            self._mute_foreign(False)       # unmute right after the sweep
+        if info is not None:
+            self.path_clean = info
+        if archive is not None:
+            self._capture_ix = len(archive) - 1
+        return data, gains
+
+    def _probe_level(self, channel, a):
+        """One auto-level step on the probe chirp instead of the sweep.
+        Its peak plus the calibration offset (0 dB until a sweep has
+        checked it: chirp and sweep share level and crest factor)
+        stands in for the sweep's peak, its pre-roll floor read for the
+        SNR. A volume move returns the level_probe outcome (level
+        "probe": "chirp"). A level the probes call right -- or one they
+        cannot judge: a non-finite flood, a search that would give up
+        -- returns None, and take() plays the real sweep at once; that
+        sweep verifies the prediction or states the verdict itself."""
+        auto = self._auto_state
+        data, _ = self._play(self.probe_wav, self.probe_duration, channel,
+                             signal_ref(self.probe, PROBE_PRE_S,
+                                        PROBE_POST_S), kind="probe")
+        auto["probes"] += 1
+        chan = data[:, a]
+        bad = int(np.count_nonzero(~np.isfinite(chan)))
+        if bad:
+            if bad > max(1, int(REPAIR_MAX_MS / 1000.0 * self.sweep.fs)) \
+                    or bad >= len(chan):
+                self._probe_on = False      # leave judging to the sweeps
+                return None
+            chan = repair_nonfinite(chan)   # an xrun, as in a take
+        pk = peak_dbfs(chan) + self._probe_offset
+        clipped = bool(np.count_nonzero(np.abs(chan) >= FULLSCALE))
+        snr, _ = self._quick_snr(chan, self.probe)
+        ctl = self._auto_ctl
+        if not clipped and ctl.verdict(pk, snr) == "ok":
+            self._probe_check = (self._v_cur, pk)
+            return None
+        ctl.observe(self._v_cur, pk, snr, clipped)
+        v_new = ctl.next_volume(self._v_cur, pk)
+        ceiling = None if clipped else AutoLevel.snr_ceiling(pk, snr)
+        if (abs(v_new - self._v_cur) < 1e-3
+                or (ceiling is not None and ceiling < mc.SNR_WARN_DB)
+                or auto["adjustments"] >= AUTO_MAX_ADJUST):
+            self._probe_on = False          # giving up is a sweep's call
+            return None
+        auto["adjustments"] += 1
+        level = {"peak_dbfs": pk, "snr_db": snr,
+                 "volume_from": self._v_cur, "volume_to": v_new,
+                 "step": auto["adjustments"],
+                 "max_steps": AUTO_MAX_ADJUST, "probe": "chirp"}
+        self._v_cur = v_new
+        return TakeOutcome("level_probe", level=level)
+
+    def _replan(self, chan, pk, notes):
+        """Adaptive sweep, on the first capture at a settled level:
+        keep a cached plan the room still matches, else derive the
+        plan from this capture's SNR. A length change turns the
+        capture into a probe (kind level_probe, level["sweep_plan"]),
+        since every raw take of a session must share one sweep --
+        finalize deconvolves them all with it. After the first raw
+        take the length is frozen; the plan is still reported."""
+        self._plan_pending = False
+        snr, _ = self._quick_snr(chan)
+        if snr is None:
+            return None                     # no onset: keep what we have
+        cached = self.sweep_plan
+        if cached is not None \
+                and abs(snr - cached.snr_db) <= SWEEP_REPLAN_DB:
+            return None
+        cfg = self.cfg
+        plan = plan_sweep(snr, self.sweep.fs, cfg.pre_silence,
+                          cfg.post_silence)
+        self.sweep_plan = plan
+        frozen = any(samples is not None
+                     for entries in self._takes.values()
+                     for _, samples in entries)
+        if plan.samples == self.sweep.n_samples or frozen:
+            return None
+        self._set_sweep(plan.samples)
+        return TakeOutcome(
+            "level_probe", notes=notes,
+            level={"peak_dbfs": pk, "snr_db": snr,
+                   "volume_from": self._v_cur, "volume_to": self._v_cur,
+                   "step": self._auto_state["adjustments"],
+                   "max_steps": AUTO_MAX_ADJUST,
+                   "sweep_plan": plan.as_dict()})
+
+    def _set_sweep(self, samples):
+        """Swap the session's sweep (and its wav) for one of `samples`."""
+        cfg = self.cfg
+        self.sweep = mc.generate_sweep(samples, cfg.fs, cfg.f_start,
+                                       cfg.f_end)
+        self.wav_duration = (cfg.pre_silence + self.sweep.duration_s
+                             + cfg.post_silence)
+        if self.outdir and self.wav is not None:
+            self.wav = write_sweep_files(self.outdir, self.sweep,
+                                         cfg.pre_silence,
+                                         cfg.post_silence)
+
     def accept_level(self):
         """Keep the pending level_stuck capture as a take at the current
         level -- the caller's 'continue anyway' decision."""
@@ -1479,16 +2018,30 @@ class MeasureSession:
         re-level. Only valid inside the session (after __enter__)."""
         self._leveled = False
         self._pending = None
-        self._auto_ctl = AutoLevel()
+        self._auto_ctl = AutoLevel(law=self.volume_law)
         self._auto_state = {"enabled": True, "adjustments": 0,
                             "initial": None, "final": None,
-                            "in_window": None}
-        v = min(self._v_cur if self._v_cur is not None else 1.0,
-                AUTO_START_VOLUME)
-        self._auto_state["initial"] = round(v, 4)
-        self._v_cur = v
+                            "in_window": None, "predicted": False,
+                            "probes": 0, "probe_error_db": None}
+        self._probe_on = self.probe is not None
+        self._probe_check = None
+        self._v_cur = self._auto_start(
+            self._v_cur if self._v_cur is not None else 1.0)
         self.level_source = "pending"
 
+    def _auto_start(self, v_now):
+        """The first auto-level probe's volume: the learned law's
+        prediction when there is one (below the explore ceiling, like
+        any probe), else the quiet start. Recorded in the auto state."""
+        v = min(v_now, AUTO_START_VOLUME)
+        pv = law_volume(self._auto_ctl.law, AUTO_LAW_AIM) \
+            if self._auto_ctl.law else None
+        if pv is not None:
+            v = min(pv, AUTO_EXPLORE_CEIL)
+        self._auto_state["initial"] = round(v, 4)
+        self._auto_state["predicted"] = pv is not None
+        return v
+
     def _accept(self, channel, data, chan, pk, clipped, repaired, notes,
                 gains=(None, None), capture=None):
         snr, _ = self._quick_snr(chan)
@@ -1496,8 +2049,16 @@ class MeasureSession:
             notes.append("WARNING: low SNR (%.1f dB): raise the level or "
                          "kill the noise source" % snr)
         self._take_seq += 1
-        path = save_take_wav(self.outdir, self._take_seq, data,
-                             self.sweep.fs)
+        path = None
+        if self.archive is not None and self._capture_ix is not None:
+            self.archive.label(self._capture_ix, kind="take",
+                               take=self._take_seq, channel=channel,
+                               column=capture, repaired=int(repaired))
+            path = self.archive.ref(self._capture_ix)
+        if path is None or self.cfg.take_wavs:
+            wav = save_take_wav(self.outdir, self._take_seq, data,
+                                self.sweep.fs)
+            path = path or wav
         t = mc.analyze_take(chan, self.sweep, self.freqs)
         rec = TakeRecord(self._take_seq, channel, self.freqs, t.mag_db,
                          t.delay_ms, t.snr_db, pk, clipped, repaired, path,
@@ -1509,21 +2070,22 @@ class MeasureSession:
         return TakeOutcome("take", take=rec,
                            spread_db=self.spread_db(channel), notes=notes)
 
-    def _quick_snr(self, chan):
+    def _quick_snr(self, chan, sweep=None):
         """Fast per-take (snr, noise_dbfs) so a noisy room is caught
         before the next reseat and the auto-level can target SNR.
         Onset = first sustained crossing of 10x the pre-roll RMS;
         threshold and wording match the core. (None, None) when no
-        onset is found."""
-        fs = self.sweep.fs
+        onset is found. `sweep` is the signal played (the session's
+        sweep unless a probe)."""
+        sweep = sweep or self.sweep
+        fs = sweep.fs
         head = chan[:int(0.4 * fs)]
         noise = math.sqrt(float(np.mean(head ** 2))) if len(head) else 0.0
         thr = max(10.0 * noise, 1e-6)
         over = np.flatnonzero(np.abs(chan) > thr)
         if not len(over):
             return None, None
-        snr, _, noise_db = mc.estimate_snr(chan, int(over[0]),
-                                           self.sweep)
+        snr, _, noise_db = mc.estimate_snr(chan, int(over[0]), sweep)
         return snr, noise_db
 
     # -- the accumulated fan --------------------------------------------------
@@ -1583,8 +2145,30 @@ class MeasureSession:
     def spread_db(self, channel, exclude_id=None):
         """Per-frequency std (ddof=1) across the channel's accepted
         takes, level moves compensated; None until there are two. The
-        live fan's width."""
-        return self.average_and_spread(channel, exclude_id)[1]
+        live fan's width. O(freqs), from the channel's running sums,
+        with or without a take left out."""
+        return self._channel_sums(channel).spread(exclude_id)
+
+    def _channel_sums(self, channel):
+        """The channel's SpreadSums, synced to its take list: an
+        accept, discard or recorded-gain edit since the last look
+        costs O(freqs) once, everything else a scalar check."""
+        sums = self._sums.setdefault(channel, SpreadSums())
+        sums.sync((rec.id, rec.mag_db, rec.soft_vol)
+                  for rec, _ in self._takes.get(channel, []))
+        return sums
+
+    def _bounds(self, exclude=None):
+        """{channel: confidence-bounded spread} over the channels
+        with two takes or more, `exclude` (a take id) left out."""
+        out = {}
+        for c in self._takes:
+            sums = self._channel_sums(c)
+            n = len(sums) - (exclude in sums)
+            if n < 2:
+                continue
+            out[c] = spread_trust_bound(sums.spread(exclude), n)
+        return out
 
     def _trust_mask(self, thresh, exclude=None):
         """(freqs, ok) under the confidence bound, or None without
@@ -1596,21 +2180,12 @@ class MeasureSession:
         x2.42 at two, x1.61 at three, approaching 1 -- or restored by
         deleting the outlier, never by dilution. Shared by the
         ceiling (the auto EQ handle) and the spread driver."""
-        combined = None
-        for c, entries in self._takes.items():
-            if exclude is not None:
-                entries = [e for e in entries if e[0].id != exclude]
-            if len(entries) < 2:
-                continue
-            sp = self.spread_db(c, exclude_id=exclude)
-            if sp is None:
-                continue
-            sp = spread_trust_bound(sp, len(entries))
-            combined = (sp if combined is None
-                        else np.maximum(combined, sp))
-        if combined is None:
+        bounds = self._bounds(exclude)
+        if not bounds:
             return None
-        return np.asarray(self.freqs, float), combined <= thresh
+        return (np.asarray(self.freqs, float),
+                np.max(np.vstack(list(bounds.values())), axis=0)
+                <= thresh)
 
     def trusted_ceiling_hz(self, thresh=SPREAD_MAX_DB):
         """Highest frequency the take-to-take statistics still trust:
@@ -1704,19 +2279,32 @@ class MeasureSession:
         (DRIVER_MIN_OCT): when the scatter is spread evenly over the
         takes, deleting any one of them fixes nothing and nothing is
         flagged -- a highlight that cannot deliver on its promise
-        would be a lie."""
-        base = self._trusted_octaves(thresh)
-        if base is None:
+        would be a lie. Every leave-one-out spread comes from the
+        channel's running sums, so a sweep costs O(takes x freqs),
+        not a rebuild of every channel per take."""
+        bounds = self._bounds()
+        if not bounds:
             return None
+        f = np.asarray(self.freqs, float)
+        step = math.log2(f[-1] / f[0]) / max(1, len(f) - 1)
+        base = float((np.max(np.vstack(list(bounds.values())), axis=0)
+                      <= thresh).sum()) * step
         best = None
         for c, entries in self._takes.items():
             if len(entries) < 3:
                 continue
+            # the other channels' bound does not move: one max, then
+            # O(freqs) per left-out take from the running sums
+            rest = [b for k, b in bounds.items() if k != c]
+            others = (np.max(np.vstack(rest), axis=0) if rest
+                      else None)
+            sums = self._channel_sums(c)
             for rec, _ in entries:
-                oc = self._trusted_octaves(thresh, exclude=rec.id)
-                if oc is None:
-                    continue
-                gain = oc - base
+                sp = spread_trust_bound(sums.spread(rec.id),
+                                        len(entries) - 1)
+                if others is not None:
+                    sp = np.maximum(sp, others)
+                gain = float((sp <= thresh).sum()) * step - base
                 if gain < DRIVER_MIN_OCT:
                     continue
                 if best is None or gain > best[1]:
@@ -1724,8 +2312,8 @@ class MeasureSession:
         return best
 
     def discard(self, channel, take_id):
-        """Drop a bad take from the accumulation. The wav stays on disk
-        as evidence; ids and file numbers are never reused."""
+        """Drop a bad take from the accumulation. Its capture stays in
+        the archive as evidence; ids and file numbers are never reused."""
         entries = self._takes.get(channel, [])
         for i, (rec, _) in enumerate(entries):
             if rec.id == take_id:
@@ -1814,6 +2402,8 @@ class MeasureSession:
             "gain_comp_db": comp_db,
             "auto_level": auto,
         }
+        if self.sweep_plan is not None:
+            levels["sweep_plan"] = self.sweep_plan.as_dict()
         result = mc.process_takes(
             recordings, self.sweep,
             cal=(cal if cal is not None else self.cfg.cal),
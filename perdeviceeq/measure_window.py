@@ -1985,6 +1985,8 @@ class MeasureWindow(Adw.Window):
                 except Exception as e:
                     self._error("Could not delete the stored take: "
                                 "%s" % e)
+                else:
+                    self._live_trust(self.edit_pid)
             self._refresh_all()
         return cb
 
@@ -2054,7 +2056,9 @@ class MeasureWindow(Adw.Window):
                 sink=self.sink_node, source=mic,
                 channels=self.mic_ch, auto_level=use_auto,
                 mute_others=True, device=self.sink_desc,
-                start_volume=(None if use_auto else remembered))
+                start_volume=(None if use_auto else remembered),
+                volume_law=(self.memory.law_for(self.sink_node, mic)
+                            if use_auto else None))
             self._relevel_pending = False
             try:
                 # an absent home births the session unresolved:
@@ -2188,7 +2192,9 @@ class MeasureWindow(Adw.Window):
         v = getattr(self.session, "_v_cur", self.session.volume_start)
         src = self._source_name()
         if v is not None and src:
-            self.memory.remember(self.sink_node, source=src, volume=v)
+            self.memory.remember(self.sink_node, source=src, volume=v,
+                                 law=getattr(self.session, "volume_law",
+                                             None))
         self._refresh_all()
         return False
 
@@ -2242,6 +2248,16 @@ class MeasureWindow(Adw.Window):
             self._canvas_ids[(ch, rec.id)] = ids["take"]
         except Exception as e:
             self._error("Could not store the take: %s" % e)
+            return
+        self._live_trust(pid)
+
+    def _live_trust(self, pid):
+        """The editor's trust plaque follows the sitting take by take
+        when it shows the profile being measured (its TrustState pays
+        only for the take that moved; the overlay catches up when the
+        window closes)."""
+        if self.parent.current_pid == pid:
+            self.parent._live_take()
 
     def _adopt_canvas(self):
         """Seed the fresh session with the profile's stored takes so
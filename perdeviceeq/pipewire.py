@@ -9,9 +9,9 @@ applies it to the live node and re-applies on every reconnect. Reading state
 pw-metadata. No GTK here; only stdlib + the PipeWire CLI tools.
 """
 
-import json, re, shutil, subprocess, threading
+import atexit, collections, json, re, shutil, subprocess, threading, time
 
-from .config import METADATA_NAME
+from .config import BATCH_KEY, BATCH_PROTOCOL, METADATA_NAME
 
 
 def _run(cmd, timeout=2.0):
@@ -215,6 +215,287 @@ def metadata_clear(node_name):
     r = _run(["pw-metadata", "-n", METADATA_NAME, "-d", "0", node_name])
     return r.returncode == 0
 
+
+# One argv string may not exceed MAX_ARG_STRLEN (128 KiB on Linux): a
+# batch is cut into writes below this, each a complete JSON object.
+BATCH_MAX_BYTES = 96 * 1024
+
+
+def batch_supported():
+    """Whether the LOADED hook reads the batch key (hook_protocol()
+    at or past BATCH_PROTOCOL). One pw-metadata read; asked per batch,
+    never cached, so a hook reinstalled mid-session is honoured."""
+    found, ver = hook_protocol()
+    try:
+        return found and ver is not None and \
+            float(ver) >= float(BATCH_PROTOCOL)
+    except ValueError:
+        return False
+
+
+def metadata_batch(changes):
+    """Write many devices' graphs ({node_name: graph, or None to clear})
+    with one pw-metadata child per BATCH_MAX_BYTES of JSON instead of
+    one per device: the hook applies every entry and mirrors it to the
+    device's own key. Returns None -- nothing written -- when the loaded
+    hook predates the batch key (the caller writes key by key), else
+    whether every write landed."""
+    if not batch_supported():
+        return None
+    chunks, cur, size = [], {}, 2
+    for node, graph in changes.items():
+        g = graph or ""
+        n = len(json.dumps(node)) + len(json.dumps(g)) + 2
+        if cur and size + n > BATCH_MAX_BYTES:
+            chunks.append(cur)
+            cur, size = {}, 2
+        cur[node] = g
+        size += n
+    if cur:
+        chunks.append(cur)
+    ok = True
+    for c in chunks:
+        r = _run(["pw-metadata", "-n", METADATA_NAME, "0", BATCH_KEY,
+                  json.dumps(c, ensure_ascii=False)])
+        ok = ok and r.returncode == 0 and "Found" in (r.stdout + r.stderr)
+    return ok
+
+
+class MetadataWriter:
+    """The one writer of the per-device-eq metadata: a long-lived worker
+    thread behind a coalescing queue.
+
+    Every debounced edit used to fire its own thread and pw-metadata
+    child, so a drag or an --apply over dozens of devices was spawn
+    bound, and two threads racing for one key could land the OLDER
+    graph last. Here set()/clear() only enqueue and return: the queue
+    keeps one pending write per node (a newer graph replaces the
+    queued one -- the hook would overwrite it anyway) and the single
+    worker delivers in the order the latest writes were made, so the
+    value that sticks is always the last one asked for.
+
+    pw-metadata has no session mode and the metadata cannot be held
+    open from here, so a lone write -- a GUI edit -- is still one
+    child. With a batch_fn (the process-wide writer passes
+    metadata_batch) the worker drains the whole queue per delivery and
+    hands two or more writes to it, so an --apply over N devices is one
+    protocol read plus one write whatever N; against a hook without the
+    batch key it falls back to one child per write, bounded only by
+    the coalescing.
+
+    stats() reports writes asked for, delivered, coalesced away and
+    failed, and the enqueue-to-delivered latency (ms) of the last
+    LATENCY_WINDOW deliveries; results[node] is the last delivery's
+    outcome. flush() waits for the queue to drain; close() drains and
+    stops the worker (the process-wide writer does it at exit)."""
+
+    LATENCY_WINDOW = 256
+
+    def __init__(self, set_fn=None, clear_fn=None, batch_fn=None):
+        self._set = set_fn or metadata_set
+        self._clear = clear_fn or metadata_clear
+        self._batch = batch_fn
+        self._cv = threading.Condition()
+        self._pending = collections.OrderedDict()   # node -> (graph, t0)
+        self._busy = False
+        self._closed = False
+        self._thread = None
+        self._lat = collections.deque(maxlen=self.LATENCY_WINDOW)
+        self._n = {"writes": 0, "delivered": 0, "coalesced": 0,
+                   "failed": 0}
+        self.results = {}
+
+    def set(self, node, graph):
+        self._put(node, graph)
+
+    def clear(self, node):
+        self._put(node, None)
+
+    def set_many(self, changes):
+        """Queue {node: graph, or None to clear} in one go, so the
+        worker sees all of it at once (one batch, not a first write
+        racing ahead of the rest)."""
+        self._put_all(changes.items())
+
+    def _put(self, node, graph):
+        self._put_all([(node, graph)])
+
+    def _put_all(self, items):
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("metadata writer is closed")
+            now = time.monotonic()
+            for node, graph in items:
+                self._n["writes"] += 1
+                if node in self._pending:
+                    self._n["coalesced"] += 1
+                    del self._pending[node]     # re-queued behind the others
+                self._pending[node] = (graph, now)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="pde-metadata", daemon=True)
+                self._thread.start()
+            self._cv.notify_all()
+
+    def _worker(self):
+        while True:
+            with self._cv:
+                while not self._pending and not self._closed:
+                    self._cv.wait()
+                if not self._pending:
+                    return                  # closed and drained
+                if self._batch is not None:
+                    todo = list(self._pending.items())
+                    self._pending.clear()
+                else:
+                    todo = [self._pending.popitem(last=False)]
+                self._busy = True
+            oks = self._deliver(todo)
+            with self._cv:
+                self._busy = False
+                now = time.monotonic()
+                for (node, (_graph, t0)), ok in zip(todo, oks):
+                    self.results[node] = bool(ok)
+                    self._n["delivered" if ok else "failed"] += 1
+                    self._lat.append(1000.0 * (now - t0))
+                self._cv.notify_all()
+
+    def _deliver(self, todo):
+        """One ok per (node, (graph, t0)) of `todo`: one batch write
+        when there are several and the hook takes it, else key by key
+        in queue order."""
+        if len(todo) > 1:
+            try:
+                ok = self._batch({n: g for n, (g, _t0) in todo})
+            except Exception:
+                ok = False
+            if ok is not None:
+                return [ok] * len(todo)
+        oks = []
+        for node, (graph, _t0) in todo:
+            try:
+                oks.append(self._clear(node) if graph is None
+                           else self._set(node, graph))
+            except Exception:           # a writer must outlive a bad call
+                oks.append(False)
+        return oks
+
+    def flush(self, timeout=None):
+        """Block until every queued write is delivered; False on timeout."""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cv:
+            while self._pending or self._busy:
+                left = None if end is None else end - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._cv.wait(left)
+        return True
+
+    def close(self, timeout=None):
+        """Deliver what is queued, then stop the worker."""
+        ok = self.flush(timeout)
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+        return ok
+
+    def stats(self):
+        with self._cv:
+            out = dict(self._n, pending=len(self._pending))
+            lat = sorted(self._lat)
+        if lat:
+            out["latency_ms"] = {
+                "last": round(self._lat[-1], 2),
+                "mean": round(sum(lat) / len(lat), 2),
+                "p50": round(lat[len(lat) // 2], 2),
+                "p95": round(lat[min(len(lat) - 1,
+                                     int(0.95 * len(lat)))], 2),
+                "max": round(lat[-1], 2)}
+        else:
+            out["latency_ms"] = None
+        return out
+
+
+_WRITER = None
+_WRITER_LOCK = threading.Lock()
+
+
+def metadata_writer():
+    """The process-wide MetadataWriter (created on first use; drained
+    for up to two seconds at interpreter exit, so a last edit made just
+    before quitting still lands)."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = MetadataWriter(batch_fn=metadata_batch)
+            atexit.register(_WRITER.close, 2.0)
+        return _WRITER
+
+AUDITION_HZ = 25                     # live drag preview rate bound
+
+
+class Audition:
+    """The live preview of a drag: what the user hears WHILE a band
+    handle moves, before the edit settles into a save.
+
+    The settled path (debounced save -> profile store -> graph ->
+    metadata) is right for an edit and wrong for a gesture: 200 ms
+    behind the hand and a disk write per pause. offer() takes a
+    graph BUILDER, not a graph -- a pointer fires far faster than a
+    graph is worth building -- and publishes at most `hz` times a
+    second through the MetadataWriter: the first offer of a burst
+    goes out at once (a drag answers immediately), later ones only
+    replace the stashed builder, and tick() -- the caller's timer,
+    polled at the same rate -- publishes the stash once the interval
+    has passed, so the position the hand stopped at is the one heard.
+    Nothing here saves, pushes history or refreshes a canvas; the
+    release commits through the settled path once. cancel() drops a
+    stash the commit supersedes.
+
+    A builder returning None means "nothing to hear" (bypass, an
+    empty chain) and publishes a key removal, like the settled
+    path."""
+
+    def __init__(self, writer=None, hz=AUDITION_HZ, clock=time.monotonic):
+        self._writer = writer
+        self.interval = 1.0 / hz
+        self._clock = clock
+        self._last = None
+        self._stash = None           # (node, builder)
+        self.offered = 0
+        self.published = 0
+
+    def offer(self, node, build):
+        """Stash the latest preview; publish now when the rate allows.
+        Returns True while a preview is still waiting for tick()."""
+        self.offered += 1
+        self._stash = (node, build)
+        return self.tick()
+
+    def tick(self):
+        """Publish the stash if the interval has passed. Returns True
+        while one is still waiting (keep the timer), False when idle."""
+        if self._stash is None:
+            return False
+        now = self._clock()
+        if self._last is not None and now - self._last < self.interval:
+            return True
+        node, build = self._stash
+        self._stash = None
+        self._last = now
+        graph = build()
+        w = self._writer or metadata_writer()
+        if graph is None:
+            w.clear(node)
+        else:
+            w.set(node, graph)
+        self.published += 1
+        return False
+
+    def cancel(self):
+        """Drop a waiting preview (the settled commit supersedes it)."""
+        self._stash = None
+
 _POS_FALLBACK = ["FL", "FR", "FC", "LFE", "RL", "RR", "SL", "SR"]
 
 def _node_channels(name, dump=None):
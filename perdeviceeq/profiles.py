@@ -12,12 +12,18 @@ log grid). A profile without `measurement` is an import or a hand-made
 one. The blocks' shape is owned by their producers; the store only
 guarantees a save/load round-trip never strips them.
 
+Beside the bindings the store keeps a compiled graph cache (GraphCache):
+per bound node, the graph string it should play and what it was built
+from. Every save and every binding refreshes the affected nodes, so
+--apply streams strings instead of parsing profiles.
+
 No GTK. Filesystem + JSON only.
 """
 
 import hashlib
 import os, sys, json, uuid
 
+from . import __version__
 from .config import (SYS_PROFILE_DIRS, USER_PROFILES_DIR, BINDINGS_FILE,
                      CONFIG_DIR, CLEAN_ID, SCHEMA_VERSION, V3_BLOCKS)
 from .eq import profile_graph, profile_has_content
@@ -54,6 +60,15 @@ def playback_sha256(p):
     return hashlib.sha256(blob.encode("utf-8")).hexdigest()
 
 
+def source_sha256(p):
+    """sha256 over the playback body as it SOUNDS -- the preamp
+    included, unlike playback_sha256: the graph cache's staleness
+    key. A canvas-only save leaves it alone."""
+    body = {k: p.get(k) for k in PLAYBACK_KEYS}
+    blob = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
 def editor_body(body, stored):
     """The editor rebuilds only the PLAYBACK body (it edits sound,
     not history). This reattaches the stored profile's v3 blocks so
@@ -87,6 +102,142 @@ def editor_body(body, stored):
     return out
 
 
+GRAPH_CACHE_NAME = "graph-cache.json"   # beside bindings.json
+GRAPH_CACHE_SCHEMA = 1
+# The graph strings are only as current as the code that compiled them:
+# the header carries the package version and a cache written by any
+# other build is a whole miss, so an upgrade that changes profile_graph
+# (or the filter-chain format) cannot keep streaming old strings.
+GRAPH_CACHE_BUILD = __version__
+
+
+def graph_cache_path():
+    """The cache lives beside the bindings it compiles (wherever
+    those are pointed)."""
+    return os.path.join(os.path.dirname(BINDINGS_FILE), GRAPH_CACHE_NAME)
+
+
+def load_bindings():
+    """node.name -> profile id off bindings.json ({} when absent or
+    unreadable)."""
+    try:
+        with open(BINDINGS_FILE, encoding="utf-8") as f:
+            b = json.load(f)
+        return {k: v for k, v in b.items()} if isinstance(b, dict) else {}
+    except Exception:
+        return {}
+
+
+def _taste_key(layer):
+    """(id, sha256 of its bands) of the active taste layer, or
+    (None, None) with taste off."""
+    if not layer:
+        return None, None
+    blob = json.dumps(layer.get("bands") or [], sort_keys=True,
+                      separators=(",", ":"))
+    return (layer.get("id"),
+            hashlib.sha256(blob.encode("utf-8")).hexdigest())
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class GraphCache:
+    """Compiled graphs per node: {"graph", "profile_id",
+    "profile_sha", "path", "stamp", "taste_id", "taste_sha"}.
+
+    The graph is what --apply plays -- the bound profile, exactly
+    graph_for_node(), with a taste layer composed over it only when the
+    caller passes one (--apply --with-taste) -- or None when that is
+    flat. The store compiles taste-free entries. lookup() is the constant-
+    time read: the binding and the taste layer must match and the
+    profile file must carry the stat stamp it was compiled from (and
+    no user file may have appeared to override a system one).
+    Anything else is a miss, and refresh() settles it by sha: a file
+    that was rewritten with the same playback body (a canvas-only
+    save, a touched file) is restamped, only a changed sound is
+    rebuilt. One JSON file, atomic rewrites, written only when an
+    entry changed; a file written by another build (GRAPH_CACHE_BUILD)
+    loads empty."""
+
+    def __init__(self, path=None):
+        self.path = path or graph_cache_path()
+        self.dirty = False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        nodes = data.get("nodes") if isinstance(data, dict) else None
+        self.nodes = (nodes if isinstance(nodes, dict)
+                      and data.get("schema") == GRAPH_CACHE_SCHEMA
+                      and data.get("build") == GRAPH_CACHE_BUILD
+                      else {})
+
+    def lookup(self, node, pid, taste=None):
+        """The entry for `node` bound to `pid` under `taste` (the
+        active layer dict or None), or None when it must be
+        refreshed."""
+        e = self.nodes.get(node)
+        if not isinstance(e, dict) or e.get("profile_id") != pid:
+            return None
+        if [e.get("taste_id"), e.get("taste_sha")] != list(
+                _taste_key(taste)):
+            return None
+        own = os.path.join(USER_PROFILES_DIR, "%s.json" % pid)
+        if e.get("path") != own and os.path.exists(own):
+            return None
+        if e.get("stamp") is None or _stamp(e.get("path")) != e["stamp"]:
+            return None
+        return e
+
+    def refresh(self, node, prof, taste=None):
+        """Bring `node`'s entry in line with `prof` (a loaded store
+        record) under `taste`; returns it."""
+        tid, tsha = _taste_key(taste)
+        sha = source_sha256(prof)
+        old = self.nodes.get(node) or {}
+        if (old.get("profile_id") == prof["id"]
+                and old.get("profile_sha") == sha
+                and old.get("taste_id") == tid
+                and old.get("taste_sha") == tsha):
+            graph = old.get("graph")
+        else:
+            extra = list((taste or {}).get("bands") or [])
+            silent = (not profile_has_content(prof)
+                      and not any(b.get("enabled", True) for b in extra))
+            graph = None if silent else profile_graph(prof, extra=extra)
+        e = {"graph": graph, "profile_id": prof["id"],
+             "profile_sha": sha, "path": prof.get("path"),
+             "stamp": _stamp(prof.get("path")),
+             "taste_id": tid, "taste_sha": tsha}
+        if old != e:
+            self.nodes[node] = e
+            self.dirty = True
+        return e
+
+    def drop(self, node):
+        if self.nodes.pop(node, None) is not None:
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"schema": GRAPH_CACHE_SCHEMA,
+                       "build": GRAPH_CACHE_BUILD, "nodes": self.nodes},
+                      f, indent=1, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
 class ProfileStore:
     """Loads profiles from system (read-only) + user dirs and the bindings map.
     A built-in Clean profile is always present. 'No binding == Clean'."""
@@ -182,6 +333,7 @@ class ProfileStore:
         os.replace(tmp, path)
         rec = dict(body); rec["builtin"] = False; rec["path"] = path
         self.profiles[pid] = rec
+        self._recompile([n for n, i in self.bindings.items() if i == pid])
         return pid
 
     def delete_user(self, pid):
@@ -194,19 +346,16 @@ class ProfileStore:
             pass
         self.profiles.pop(pid, None)
         # any bindings pointing here fall back to Clean (drop the entry)
-        for node in [n for n, i in self.bindings.items() if i == pid]:
+        nodes = [n for n, i in self.bindings.items() if i == pid]
+        for node in nodes:
             self.bindings.pop(node, None)
         self.save_bindings()
+        self._recompile(nodes)
         return True
 
     # ---- bindings ----
     def _load_bindings(self):
-        try:
-            with open(BINDINGS_FILE, encoding="utf-8") as f:
-                b = json.load(f)
-            return {k: v for k, v in b.items()} if isinstance(b, dict) else {}
-        except Exception:
-            return {}
+        return load_bindings()
 
     def save_bindings(self):
         os.makedirs(CONFIG_DIR, exist_ok=True)
@@ -226,6 +375,24 @@ class ProfileStore:
         else:
             self.bindings[node] = pid
         self.save_bindings()
+        self._recompile([node])
+
+    def _recompile(self, nodes):
+        """Refresh the graph cache for `nodes` after a save, a delete
+        or a binding: bound nodes get their compiled (taste-free)
+        graph, unbound ones leave the cache."""
+        if not nodes:
+            return
+        cache = GraphCache()
+        for node in nodes:
+            pid = self.bindings.get(node)
+            p = (self.profiles.get(pid)
+                 if pid and pid != CLEAN_ID else None)
+            if p is None:
+                cache.drop(node)
+            else:
+                cache.refresh(node, p)
+        cache.save()
 
     def graph_for_node(self, node):
         pid = self.bindings.get(node)
@@ -18,6 +18,7 @@ away unless the caller says so explicitly (the GUI turns that into a
 confirmation dialog).
 """
 import math
+import threading
 from datetime import datetime, timezone
 
 import numpy as np
@@ -33,6 +34,35 @@ class RefitError(RuntimeError):
     """The canvas cannot support the requested re-fit."""
 
 
+# Cal curves interpolated onto a canvas grid. Keyed by the points
+# themselves, not just the sha: a hand-built canvas may reuse a sha
+# for other points, and the key costs one small array either way.
+CAL_GRID_MAX = 64           # (cal, grid) curves kept
+_CAL_GRID = {}
+_CAL_LOCK = threading.Lock()
+
+
+def _cal_on_grid(entry, freqs, gkey):
+    """The library entry's cal interpolated onto `freqs` (log-f,
+    edge values held -- apply_mic_cal's rule), or None for a take
+    without a usable cal. Read-only: shared between calls."""
+    pts = np.asarray((entry or {}).get("points") or [], float)
+    if not pts.size:
+        return None
+    key = (pts.tobytes(), gkey)
+    with _CAL_LOCK:
+        got = _CAL_GRID.get(key)
+    if got is not None:
+        return got
+    got = np.interp(np.log(freqs), np.log(pts[:, 0]), pts[:, 1])
+    got.setflags(write=False)
+    with _CAL_LOCK:
+        if len(_CAL_GRID) >= CAL_GRID_MAX:
+            _CAL_GRID.pop(next(iter(_CAL_GRID)))
+        _CAL_GRID[key] = got
+    return got
+
+
 def _utc_now():
     return datetime.now(timezone.utc).isoformat(timespec="seconds")
 
@@ -48,11 +78,20 @@ def channel_results(measurement, take_ids=None, smoothing=6):
     from measurement.cal_library (schema v4: the statistics must
     judge calibrated curves -- uncalibrated ones from different mics
     differ by the mics' own responses, not by the seating), then
-    power-averaged and box-smoothed on the stored grid. The result
-    dicts carry data.freq_hz / mag_db_* / spread_db, the per-take
-    drives under `levels` and the takes' cal shas as `cal_shas`, so
-    fit_peq's balance trims keep their validity gate: channels
-    measured on distinct couplers still refuse to cross-balance.
+    power-averaged and smoothed on the stored grid (`smoothing`: any
+    measure_core.smoothing_spec setting -- 1/N octave, or the
+    psychoacoustic / ERB windows -- every channel in one product with
+    the cached operator). The result dicts carry data.freq_hz /
+    mag_db_* / spread_db, the per-take drives under `levels` and the
+    takes' cal shas as `cal_shas`, so fit_peq's balance trims keep
+    their validity gate: channels measured on distinct couplers still
+    refuse to cross-balance.
+
+    One pass over a (takes x freqs) stack: each distinct cal is
+    interpolated once per grid (and cached) and applied in a
+    single broadcast, and the channel means and spreads are segment
+    reductions -- a canvas of hundreds of takes reconstructs in
+    milliseconds.
 
     take_ids, when given, restricts the fit to those takes (unknown
     ids are an error); default is every take on the canvas."""
@@ -73,66 +112,102 @@ def channel_results(measurement, take_ids=None, smoothing=6):
     if not sel:
         raise RefitError("the canvas has no takes to fit")
 
-    lib = measurement.get("cal_library") or {}
-    by_ch = {}
+    try:
+        s_type, s_frac = mc.smoothing_spec(smoothing)
+    except ValueError as e:
+        raise RefitError(str(e))
     for t in sel:
-        by_ch.setdefault(t.get("channel"), []).append(t)
+        if len(t.get("mag_db_uncal") or []) != len(freqs):
+            raise RefitError("take %s of %s is not on the profile grid"
+                             % (t.get("id"), t.get("channel")))
+    # one (takes x freqs) stack, ordered channel by channel (first
+    # appearance, takes in canvas order within): every statistic
+    # below is a per-segment reduction over it
+    keys, rows = [], {}
+    for i, t in enumerate(sel):
+        k = t.get("channel")
+        if k not in rows:
+            keys.append(k)
+            rows[k] = []
+        rows[k].append(i)
+    order = [i for k in keys for i in rows[k]]
+    takes = [sel[i] for i in order]
+    counts = np.array([len(rows[k]) for k in keys])
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    mags = np.array([t["mag_db_uncal"] for t in takes], float)
 
-    results = {}
-    for key, takes in by_ch.items():
-        for t in takes:
-            if len(t.get("mag_db_uncal") or []) != len(freqs):
-                raise RefitError("take %s of %s is not on the "
-                                 "profile grid" % (t.get("id"), key))
-        mags = np.array([t["mag_db_uncal"] for t in takes], float)
+    comp = np.zeros(len(takes))
+    comp_db = {}
+    for k, a, n in zip(keys, starts, counts):
         factors = gain_comp_factors([t.get("soft_vol")
-                                     for t in takes])
-        comp_db = None
+                                     for t in takes[a:a + n]])
+        comp_db[k] = None
         if factors is not None:
-            comp_db = [round(20.0 * math.log10(k), 3)
-                       for k in factors]
-            mags = mags + np.array(
-                [20.0 * math.log10(k) for k in factors])[:, None]
-        uncal = 10.0 * np.log10(np.mean(10.0 ** (mags / 10.0),
-                                        axis=0))
-        # per-take cal BEFORE the statistics: the spread judges
-        # the seating only when every curve is on its own
-        # acoustic reference
-        for i, t in enumerate(takes):
-            pts = np.asarray(((lib.get(t.get("cal_sha")) or {})
-                              .get("points") or []), float)
-            if pts.size:
-                mags[i] = mc.apply_mic_cal(freqs, mags[i],
-                                           pts[:, 0], pts[:, 1])
-        avg = 10.0 * np.log10(np.mean(10.0 ** (mags / 10.0), axis=0))
-        spread = (mags.std(axis=0, ddof=1) if len(takes) > 1
-                  else None)
-        smoothed = mc.smooth_fractional_octave(avg, ppo, smoothing)
-        results[key] = {
+            db = [20.0 * math.log10(f) for f in factors]
+            comp[a:a + n] = db
+            comp_db[k] = [round(v, 3) for v in db]
+    mags += comp[:, None]
+
+    # per-take cal BEFORE the statistics: the spread judges the
+    # seating only when every curve is on its own acoustic
+    # reference. Each distinct cal is put on the grid once (and
+    # cached) and the stack corrected in one broadcast.
+    lib = measurement.get("cal_library") or {}
+    gkey = (float(freqs[0]), float(freqs[-1]), len(freqs))
+    shas = [t.get("cal_sha") for t in takes]
+    uniq = list(dict.fromkeys(shas))
+    curves = [_cal_on_grid(lib.get(sh), freqs, gkey) for sh in uniq]
+    table = np.vstack([np.zeros(len(freqs)) if c is None else c
+                       for c in curves])
+    where = {sh: j for j, sh in enumerate(uniq)}
+    idx = [where[sh] for sh in shas]
+    cal = mags - table[idx]
+
+    def seg_mean(x):
+        return np.add.reduceat(x, starts, axis=0) / counts[:, None]
+
+    # power once for the stack; the cal moves it by a per-cal factor
+    power = np.exp(mags * (math.log(10.0) / 10.0))
+    uncal = 10.0 * np.log10(seg_mean(power))
+    power *= np.exp(table * (-math.log(10.0) / 10.0))[idx]
+    avg = 10.0 * np.log10(seg_mean(power))
+    dev = cal - np.repeat(seg_mean(cal), counts, axis=0)
+    var = np.add.reduceat(dev * dev, starts, axis=0) \
+        / np.maximum(counts - 1, 1)[:, None]
+    spread = np.sqrt(var)
+
+    results = {}
+    for j, (k, a, n) in enumerate(zip(keys, starts, counts)):
+        ch = takes[a:a + n]
+        results[k] = {
             "grid": dict(grid),
-            "smoothing": {"type": "fractional-octave",
-                          "fraction": smoothing, "domain": "power"},
-            "cal_shas": [t.get("cal_sha") for t in takes],
-            "takes": {"count": len(takes),
-                      "snr_db": [t.get("snr_db") for t in takes],
-                      "delay_ms": [t.get("delay_ms")
-                                   for t in takes]},
+            "smoothing": {"type": s_type, "fraction": s_frac,
+                          "domain": "power"},
+            "cal_shas": shas[a:a + n],
+            "takes": {"count": int(n),
+                      "snr_db": [t.get("snr_db") for t in ch],
+                      "delay_ms": [t.get("delay_ms") for t in ch]},
             "levels": {
-                "take_soft_volumes": [t.get("soft_vol")
-                                      for t in takes],
+                "take_soft_volumes": [t.get("soft_vol") for t in ch],
                 "take_channel_volumes": [t.get("chan_vol")
-                                         for t in takes],
-                "gain_comp_db": comp_db},
-            "data": {"freq_hz": freqs, "mag_db_raw": avg,
-                     "mag_db_smoothed": smoothed,
-                     "mag_db_uncal": uncal, "spread_db": spread},
+                                         for t in ch],
+                "gain_comp_db": comp_db[k]},
+            "data": {"freq_hz": freqs, "mag_db_raw": avg[j],
+                     "mag_db_smoothed": None,
+                     "mag_db_uncal": uncal[j],
+                     "spread_db": spread[j] if n > 1 else None},
         }
+    smoothed = mc.smooth_curves(
+        [r["data"]["mag_db_raw"] for r in results.values()], freqs,
+        smoothing)
+    for r, sm in zip(results.values(), smoothed):
+        r["data"]["mag_db_smoothed"] = sm
     return results, [t.get("id") for t in sel]
 
 
 def refit_profile(prof, bands=None, f_lo=None, f_hi=None,
                   max_boost=None, smoothing=None, take_ids=None,
-                  allow_edited=False, progress=None):
+                  allow_edited=False, progress=None, warm=True):
     """Re-derive the playback body from the profile's own canvas.
 
     Fit parameters default to the stored fit.params (falling back to
@@ -145,6 +220,13 @@ def refit_profile(prof, bands=None, f_lo=None, f_hi=None,
     Safe/Session), and a new `fit` block with a fresh timestamp, the
     take ids actually consumed and a recomputed inputs_sha256.
 
+    With `warm` (the default) a re-fit under the SAME parameters of
+    a fit nobody edited seeds each channel from the bands it
+    replaces (warm_seeds): one take added moves the desired by tenths
+    of a dB, and the optimizer nudges the old bands instead of
+    rebuilding them -- falling back to the full greedy fit whenever
+    the nudged bands miss the old fit's own quality bar.
+
     Raises RefitError when the profile has no canvas, when the fit is
     marked hand-edited and allow_edited is False, or when the takes
     cannot be combined (unknown ids, off-grid data, a mono fit
@@ -174,13 +256,14 @@ def refit_profile(prof, bands=None, f_lo=None, f_hi=None,
     if params["mono"] and len(results) != 1:
         raise RefitError("a mono fit needs exactly one channel; the "
                          "canvas has %d" % len(results))
+    seeds = warm_seeds(prof, params) if warm else None
     fitted = fit_peq.fit_profiles(results, name=prof.get("name"),
                                   bands=params["bands"],
                                   f_lo=params["f_lo"],
                                   f_hi=params["f_hi"],
                                   max_boost=params["max_boost"],
                                   mono=params["mono"],
-                                  progress=progress)
+                                  progress=progress, seeds=seeds)
     out = dict(prof)
     for k in ("apply_all", "ch_keys", "all", "channels"):
         out[k] = fitted[k]
@@ -215,6 +298,51 @@ def refit_profile(prof, bands=None, f_lo=None, f_hi=None,
     return out
 
 
+def warm_seeds(prof, params):
+    """fit_profiles' `seeds` for re-fitting `prof` under `params`:
+    {key: (current bands, tol)}, or None when the current bands are
+    no fit of these parameters -- no fit block, a hand-edited one,
+    or any parameter changed (a new budget or band is a new
+    question, not an increment). tol is the current bands' residual
+    against the desired of the takes they were fit to, so the warm
+    result is held to the old fit's own quality; when those takes
+    are gone the seeds carry no tol (the greedy target alone)."""
+    fit = prof.get("fit") or {}
+    old = fit.get("params") or {}
+    if fit.get("edited") or not fit.get("takes"):
+        return None
+    if any(old.get(k) != v for k, v in params.items() if k != "mono") \
+            or bool(old.get("mono", False)) != params["mono"]:
+        return None
+    if params["mono"]:
+        cur = {"all": (prof.get("all") or {}).get("bands") or []}
+    else:
+        cur = {k: ((prof.get("channels") or {}).get(k) or {})
+               .get("bands") or [] for k in prof.get("ch_keys") or []}
+    cur = {k: b for k, b in cur.items() if b}
+    if not cur:
+        return None
+    try:
+        was, _used = channel_results(prof["measurement"],
+                                     take_ids=fit["takes"],
+                                     smoothing=params["smoothing"])
+    except RefitError:
+        was = {}
+    if params["mono"] and len(was) == 1:
+        was = {"all": next(iter(was.values()))}
+    seeds = {}
+    for key, bands in cur.items():
+        tol = None
+        if key in was:
+            freq, mag = fit_peq._curve(was[key])
+            fg, desired, _m = fit_peq.desired_curve(
+                freq, mag, params["f_lo"], params["f_hi"])
+            tol = fit_peq.seed_residual(bands, fg, desired,
+                                        params["max_boost"])
+        seeds[key] = (bands, tol)
+    return seeds
+
+
 def fit_is_stale(prof):
     """True when the stored fit's fingerprint no longer matches the
     canvas it claims to come from (takes removed or reweighed, cal
@@ -0,0 +1,102 @@
+"""Run-length helpers over boolean masks (pure NumPy).
+
+Every "trusted band" in the package is a statement about runs: the
+live session and the trust report scan each edge inward to the first
+run long enough to count, the frame bridge erodes its trust mask by
+the smoothing half-widths and keeps the longest run. Those scans were
+Python loops over the grid, paid after every take and for every
+bridge pair; on a fine grid (192 points per octave is ~1900 points)
+they were the slowest thing left in the refresh. Here each of them
+is a handful of whole-array operations:
+
+  run_bounds    starts and inclusive ends of the True runs, off one
+                np.diff of the zero-padded mask
+  erode         False spread w points each way (w may vary per
+                point), as a windowed count of False off one
+                cumulative sum (no float kernel)
+  longest_runs  the first longest run of every row of a 2-D mask in
+                one pass -- the bridge matrix bands all its pairs at
+                once; longest_run is the 1-D form
+  band_edges    the trusted-band edge scan of trusted_band_hz: the
+                first and last runs spanning a minimum log-frequency
+                ratio (or touching the far edge of the grid)
+
+The semantics are the loops' to the index -- ties go to the first
+run, a run reaching the far edge of the grid qualifies however short
+-- and tests/test_runs.py holds them against the loops on random
+masks.
+"""
+
+import numpy as np
+
+
+def run_bounds(mask):
+    """(starts, ends) index arrays of the True runs of a 1-D mask,
+    ends inclusive; both empty when there is none."""
+    m = np.asarray(mask, bool)
+    d = np.diff(np.concatenate(([0], m.view(np.int8), [0])))
+    return np.flatnonzero(d == 1), np.flatnonzero(d == -1) - 1
+
+
+def erode(mask, w):
+    """False spreads `w` points each way along the last axis: a point
+    stays True only if its whole [i - w, i + w] window (clipped to
+    the grid) is True. `w` is a count, or an array of per-point
+    counts broadcast against the mask (a variable-width smoothing
+    window reaches further at some frequencies than at others)."""
+    m = np.asarray(mask, bool)
+    w = np.broadcast_to(np.maximum(np.asarray(w, dtype=int), 0), m.shape)
+    if not w.any():
+        return m.copy()
+    n = m.shape[-1]
+    bad = np.cumsum(~m, axis=-1)
+    bad = np.concatenate((np.zeros(m.shape[:-1] + (1,), bad.dtype),
+                          bad), axis=-1)
+    i = np.arange(n)
+    hi = np.minimum(i + w + 1, n)
+    lo = np.maximum(i - w, 0)
+    return (np.take_along_axis(bad, hi, -1)
+            - np.take_along_axis(bad, lo, -1)) == 0
+
+
+def longest_runs(mask):
+    """(start, end) arrays, one entry per row of a 2-D mask: its
+    first longest True run, end inclusive; -1 for a row with none."""
+    m = np.asarray(mask, bool)
+    rows = m.shape[0]
+    pad = np.zeros((rows, 1), np.int8)
+    d = np.diff(np.concatenate((pad, m.view(np.int8), pad), axis=1),
+                axis=1)
+    r, s = np.nonzero(d == 1)
+    _r, e = np.nonzero(d == -1)          # same row-major order
+    start = np.full(rows, -1)
+    end = np.full(rows, -1)
+    if len(r):
+        order = np.lexsort((s, s - e, r))   # row, longest, first
+        head = order[np.r_[True, r[order][1:] != r[order][:-1]]]
+        start[r[head]] = s[head]
+        end[r[head]] = e[head] - 1
+    return start, end
+
+
+def longest_run(mask):
+    """(start, end) of the first longest True run of a 1-D mask, end
+    inclusive, or None."""
+    s, e = longest_runs(np.asarray(mask, bool)[None, :])
+    return (int(s[0]), int(e[0])) if s[0] >= 0 else None
+
+
+def band_edges(freqs, mask, min_ratio):
+    """(floor, ceiling) over an ascending grid: the floor is the
+    start of the first run spanning `min_ratio` in frequency (or
+    reaching the top of the grid), the ceiling the end of the last
+    run spanning it (or reaching the bottom). No qualifying run gives
+    floor = freqs[-1], ceiling = freqs[0], i.e. floor >= ceiling."""
+    f = np.asarray(freqs, float)
+    s, e = run_bounds(mask)
+    wide = f[e] / f[s] >= min_ratio
+    lo = np.flatnonzero(wide | (e == len(f) - 1))
+    hi = np.flatnonzero(wide | (s == 0))
+    floor = float(f[s[lo[0]]]) if len(lo) else float(f[-1])
+    ceiling = float(f[e[hi[-1]]]) if len(hi) else float(f[0])
+    return floor, ceiling
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""A measurement session's raw captures, in one append-only container.
+
+Every sweep a session plays is captured as raw interleaved float32 from
+pw-record's stdout. The archive keeps those bytes exactly as they
+arrived -- untouched, all captured channels, BEFORE any non-finite
+repair -- written once, straight from the capture buffer (no float64
+round trip, no wav encoding), so the evidence of a glitch and the input
+of a re-analysis are the same bytes.
+
+Layout, next to the session's sweep.wav (and, like it, with a JSON
+sidecar):
+
+  takes.pdea       the captures back to back, little-endian float32,
+                   interleaved frames; never rewritten, only appended
+  takes.pdea.json  the index: per capture its byte offset, frames,
+                   channels, rate, the played signal's parameters (the
+                   sweep reference a re-analysis regenerates it from),
+                   its kind ("capture" until the session keeps it as a
+                   "take", "probe" for an auto-level chirp) and, for a
+                   take, its take id, profile channel and analyzed
+                   capture column
+
+Readers memory-map one capture at a time (frames(i) is a read-only
+view), so recompensate.py, capture_glitch_probe.py or any re-analysis
+touches only the captures it asks for, however long the session was.
+The archive is a session's only raw store: a take points at its entry
+by ref(i) ("<path>#<i>", resolved by open_ref), and per-take wav files
+are an opt-in export (SessionConfig.take_wavs).
+No GTK, numpy only; the index is JSON so a truncated or foreign file is
+an ArchiveError, never a crash.
+"""
+import json
+import os
+
+import numpy as np
+
+ARCHIVE_NAME = "takes.pdea"
+INDEX_SUFFIX = ".json"
+FORMAT = "pde-take-archive"
+VERSION = 1
+DTYPE = "<f4"
+_ITEM = np.dtype(DTYPE).itemsize
+
+
+class ArchiveError(RuntimeError):
+    """Missing, truncated or foreign take archive."""
+
+
+def archive_path(path):
+    """The container path for a session dir or the container itself."""
+    return (os.path.join(path, ARCHIVE_NAME) if os.path.isdir(path)
+            else path)
+
+
+class TakeArchive:
+    """One session's capture container. TakeArchive(path) opens for
+    appending (creating it on the first append); TakeArchive.open(path)
+    opens an existing one -- path may be the session directory."""
+
+    def __init__(self, path):
+        self.path = archive_path(path)
+        self.entries = []
+        if os.path.exists(self.path + INDEX_SUFFIX):
+            self._load()
+
+    @classmethod
+    def open(cls, path):
+        arc = cls(path)
+        if not os.path.exists(arc.path + INDEX_SUFFIX):
+            raise ArchiveError("no take archive at %s" % arc.path)
+        return arc
+
+    def _load(self):
+        try:
+            with open(self.path + INDEX_SUFFIX, encoding="utf-8") as f:
+                idx = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ArchiveError("unreadable archive index %s: %s"
+                               % (self.path + INDEX_SUFFIX, e))
+        if not isinstance(idx, dict) or idx.get("format") != FORMAT:
+            raise ArchiveError("%s is not a take archive" % self.path)
+        if idx.get("version", 0) > VERSION:
+            raise ArchiveError("take archive version %s is newer than "
+                               "this reader (%d)"
+                               % (idx.get("version"), VERSION))
+        self.entries = list(idx.get("entries") or [])
+
+    def _save_index(self):
+        tmp = self.path + INDEX_SUFFIX + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": FORMAT, "version": VERSION,
+                       "dtype": DTYPE, "entries": self.entries}, f,
+                      indent=1)
+        os.replace(tmp, self.path + INDEX_SUFFIX)
+
+    # -- writing -------------------------------------------------------------
+
+    def append(self, frames, rate, signal=None, kind="capture", **meta):
+        """Append one capture -- a C-contiguous (frames x channels)
+        float32 array, typically CaptureStream.frames()' view of the
+        capture buffer, written without a copy -- and return its entry
+        index. `signal` is the played signal's reference (n_samples,
+        fs, f_start, f_end, pre_silence_s, post_silence_s)."""
+        frames = np.asarray(frames)
+        if frames.ndim != 2 or frames.dtype != np.dtype(DTYPE):
+            raise ValueError("append wants a 2-D %s array, got %s %s"
+                             % (DTYPE, frames.ndim, frames.dtype))
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)),
+                    exist_ok=True)
+        with open(self.path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            np.ascontiguousarray(frames).tofile(f)
+        entry = {"index": len(self.entries), "offset": int(offset),
+                 "frames": int(frames.shape[0]),
+                 "channels": int(frames.shape[1]), "rate": int(rate),
+                 "signal": dict(signal) if signal else None,
+                 "kind": kind}
+        entry.update(meta)
+        self.entries.append(entry)
+        self._save_index()
+        return entry["index"]
+
+    def ref(self, index):
+        """A string naming entry `index` of this archive: what a take
+        record stores instead of a wav path."""
+        return "%s#%d" % (self.path, index)
+
+    def label(self, index, **fields):
+        """Update an entry's metadata (a capture becoming a take)."""
+        self.entries[index].update(fields)
+        self._save_index()
+
+    # -- reading ---------------------------------------------------------------
+
+    def entry(self, index):
+        try:
+            return self.entries[index]
+        except (IndexError, TypeError):
+            raise ArchiveError("no capture %r in %s" % (index, self.path))
+
+    def find(self, kind=None, **fields):
+        """Entries of `kind` (any when None) matching every field."""
+        return [e for e in self.entries
+                if (kind is None or e.get("kind") == kind)
+                and all(e.get(k) == v for k, v in fields.items())]
+
+    def frames(self, index):
+        """Capture `index` as a read-only (frames x channels) float32
+        memory map -- nothing else of the archive is read."""
+        e = self.entry(index)
+        need = e["offset"] + e["frames"] * e["channels"] * _ITEM
+        try:
+            size = os.path.getsize(self.path)
+        except OSError as err:
+            raise ArchiveError("take archive data missing: %s" % err)
+        if size < need:
+            raise ArchiveError("take archive %s is truncated at capture %d"
+                               % (self.path, index))
+        if e["frames"] == 0:
+            return np.zeros((0, e["channels"]), dtype=DTYPE)
+        return np.memmap(self.path, dtype=DTYPE, mode="r",
+                         offset=e["offset"],
+                         shape=(e["frames"], e["channels"]))
+
+    def column(self, index, channel):
+        """One captured column as float64, the analysis precision."""
+        x = self.frames(index)
+        if not 0 <= channel < x.shape[1]:
+            raise ArchiveError("capture %d has no column %d (%d captured)"
+                               % (index, channel, x.shape[1]))
+        return np.asarray(x[:, channel], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def open_ref(ref):
+    """(TakeArchive, entry index) for a TakeArchive.ref() string."""
+    path, _, ix = str(ref).rpartition("#")
+    if not path or not ix.isdigit():
+        raise ArchiveError("not a take archive entry: %r" % (ref,))
+    arc = TakeArchive.open(path)
+    arc.entry(int(ix))
+    return arc, int(ix)
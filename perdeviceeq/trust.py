@@ -124,77 +124,152 @@ def _fit_cover(band, fitp):
             + (1.0 - FIT_COVER_MIN_FACTOR) * frac), frac
 
 
-def assess(prof, now=None, thresh=ms.SPREAD_MAX_DB):
-    """Trust report for a v3 profile, or None when it has no canvas.
+def _error_report(thresh, reason):
+    return {"score": 0, "band": None, "spread_max_db": thresh,
+            "reasons": [reason], "channels": {}, "newest_utc": None}
 
-    Returns {"score", "band", "spread_max_db", "reasons",
-    "newest_utc", "channels"}; channels maps a key to its own
-    {"score", "band", "coverage", "n_takes", "n_clean", "n_flagged",
-    "n_clipped", "spread_median_db", "snr_min_db", "age_days",
-    "reasons"}. `band` is None when the statistics cannot certify
-    one (fewer than two takes, or the spread bound never holds a
-    1/6-octave run inside the coverage). A canvas that cannot even
-    be reconstructed (off-grid takes, mixed cals) scores 0 with the
-    reconstruction error as the reason. `now` is injectable for
-    tests; the spread gate defaults to the session's SPREAD_MAX_DB."""
-    m = prof.get("measurement")
-    if not isinstance(m, dict) or not m:
-        return None
-    now = now or datetime.now(timezone.utc)
-    takes = m.get("takes") or []
-    if not takes:
-        return {"score": 0, "band": None, "spread_max_db": thresh,
-                "reasons": ["the canvas has no takes"],
-                "channels": {}, "newest_utc": None}
-    try:
-        results, _ = refit.channel_results(m)
-    except refit.RefitError as e:
-        return {"score": 0, "band": None, "spread_max_db": thresh,
-                "reasons": [str(e)], "channels": {},
-                "newest_utc": None}
-
-    sessions = m.get("sessions") or {}
-    fitp = (prof.get("fit") or {}).get("params") or {}
-    channels, order = {}, []
-    combined, freqs = None, None
-    newest_all = None
-    for key, r in results.items():
-        d = r["data"]
-        freqs = np.asarray(d["freq_hz"], float)
-        ch_takes = [t for t in takes if t.get("channel") == key]
+
+class TrustState:
+    """The trust report, maintained take by take.
+
+    assess() below used to rebuild everything from the canvas on every
+    view refresh; this holds the pieces instead and updates them as
+    takes are committed or removed, so the plaque can follow a live
+    measurement. Per channel a SpreadSums over the calibrated,
+    gain-compensated curves (the curves channel_results' spread is
+    taken over -- each take's own cal subtracted once, on add) keeps
+    the spread at O(freqs) per take; the bound, the trusted band, the
+    grade counts and the scalar vitals are recomputed only for the
+    channel that moved, on the next read. add()/remove() are the
+    incremental interface, sync() diffs a whole canvas against what
+    was fed (a take id names one immutable capture: only its cal sha
+    and recorded gain are ever edited in place, and either re-enters
+    it), and assess() composes the report -- the same dict the
+    module-level assess() returns -- from cached parts."""
+
+    def __init__(self, grid=None, thresh=ms.SPREAD_MAX_DB):
+        self.thresh = thresh
+        self._grid = dict(grid or {})
+        g = self._grid
+        self.freqs = mc.log_grid(float(g.get("f_lo", mc.GRID_F_LO)),
+                                 float(g.get("f_hi", mc.GRID_F_HI)),
+                                 int(g.get("ppo", mc.GRID_PPO)))
+        self._gkey = (float(self.freqs[0]), float(self.freqs[-1]),
+                      len(self.freqs))
+        self._lib = {}
+        self._sessions = {}
+        self._takes = {}        # id -> (take, signature), canvas order
+        self._bad = {}          # id -> reconstruction error
+        self._ch = {}           # key -> {"ids": [...], "sums", "part"}
+        self._combined = None   # (bound, band) across channels, cached
+
+    @staticmethod
+    def _sig(t):
+        return (t.get("channel"), t.get("cal_sha"), t.get("soft_vol"),
+                len(t.get("mag_db_uncal") or []))
+
+    def _dirty(self, key=None):
+        if key is not None and key in self._ch:
+            self._ch[key]["part"] = None
+        self._combined = None
+
+    def add(self, take, cal_library=None, sessions=None):
+        """Feed one committed canvas take (re-entering it when its id
+        is already held). `cal_library` / `sessions` are the canvas's
+        own, merged in when given."""
+        if cal_library:
+            self._lib.update(cal_library)
+        if sessions:
+            self._sessions.update(sessions)
+            for key in self._ch:
+                self._dirty(key)
+        tid = take.get("id")
+        if tid in self._takes:
+            self.remove(tid)
+        key = take.get("channel")
+        self._takes[tid] = (take, self._sig(take))
+        mag = take.get("mag_db_uncal") or []
+        if len(mag) != len(self.freqs):
+            self._bad[tid] = ("take %s of %s is not on the profile "
+                              "grid" % (tid, key))
+            return
+        y = np.asarray(mag, float)
+        cal = refit._cal_on_grid(self._lib.get(take.get("cal_sha")),
+                                 self.freqs, self._gkey)
+        if cal is not None:
+            y = y - cal
+        ch = self._ch.setdefault(key, {"ids": [],
+                                       "sums": ms.SpreadSums(),
+                                       "part": None})
+        ch["ids"].append(tid)
+        ch["sums"].add(tid, y, take.get("soft_vol"))
+        self._dirty(key)
+
+    def remove(self, take_id):
+        """Forget a take (a discard, or the first half of a re-entry)."""
+        take, _sig = self._takes.pop(take_id)
+        if self._bad.pop(take_id, None) is not None:
+            return
+        key = take.get("channel")
+        ch = self._ch[key]
+        ch["ids"].remove(take_id)
+        ch["sums"].remove(take_id)
+        if not ch["ids"]:
+            del self._ch[key]
+        self._dirty(key)
+
+    def sync(self, measurement):
+        """Bring the state in line with a canvas: O(takes) signature
+        checks, O(freqs) per take actually added, removed or
+        re-entered. A changed grid starts over."""
+        m = measurement or {}
+        if dict(m.get("grid") or {}) != self._grid:
+            self.__init__(m.get("grid"), self.thresh)
+        self._lib.update(m.get("cal_library") or {})
+        sessions = m.get("sessions") or {}
+        if sessions != self._sessions:
+            self._sessions = dict(sessions)
+            for key in self._ch:
+                self._dirty(key)
+        takes = m.get("takes") or []
+        live = {t.get("id") for t in takes}
+        for tid in [i for i in self._takes if i not in live]:
+            self.remove(tid)
+        for t in takes:
+            held = self._takes.get(t.get("id"))
+            if held is None or held[1] != self._sig(t):
+                self.add(t)
+            else:
+                self._takes[t.get("id")] = (t, held[1])
+        # canvas order: channels by first appearance, takes within
+        order = {t.get("id"): i for i, t in enumerate(takes)}
+        self._takes = dict(sorted(self._takes.items(),
+                                  key=lambda kv: order[kv[0]]))
+        self._bad = dict(sorted(self._bad.items(),
+                                key=lambda kv: order[kv[0]]))
+        self._ch = dict(sorted(self._ch.items(),
+                               key=lambda kv: order[kv[1]["ids"][0]]))
+        for ch in self._ch.values():
+            ch["ids"].sort(key=order.__getitem__)
+
+    def _part(self, key):
+        """The channel's cached report parts, rebuilt if it moved:
+        everything assess() needs except what depends on `now` or
+        the fit."""
+        ch = self._ch[key]
+        if ch["part"] is not None:
+            return ch["part"]
+        freqs, thresh = self.freqs, self.thresh
+        ch_takes = [self._takes[i][0] for i in ch["ids"]]
         n = len(ch_takes)
         grades = [_grade(t) for t in ch_takes]
-        n_clean = sum(g == ms.TAKE_CLEAN for g in grades)
-        n_flag = sum(g == ms.TAKE_FLAGGED for g in grades)
-        n_clip = sum(g == ms.TAKE_CLIPPED for g in grades)
-        cov_lo, cov_hi = _coverage(ch_takes, sessions)
-        sp = d.get("spread_db")
-        band = None
-        if sp is not None and n >= 2:
+        cov_lo, cov_hi = _coverage(ch_takes, self._sessions)
+        sp = ch["sums"].spread()
+        bound = band = None
+        if sp is not None:
             bound = ms.spread_trust_bound(sp, n)
-            combined = (bound if combined is None
-                        else np.maximum(combined, bound))
-            floor, ceiling = ms.trusted_band_hz(freqs,
-                                                bound <= thresh)
+            floor, ceiling = ms.trusted_band_hz(freqs, bound <= thresh)
             band = _clip_band(floor, ceiling, cov_lo, cov_hi)
-
-        reasons = []
-        base = 100 if n_clean >= 3 else BASE_BY_CLEAN[n_clean]
-        if n_clean < 3:
-            extra = ""
-            if n_flag or n_clip:
-                extra = (" (%d flagged, %d clipped)"
-                         % (n_flag, n_clip))
-            reasons.append("%d clean take(s)%s; three make the "
-                           "statistics" % (n_clean, extra))
-        if n < 2:
-            reasons.append("fewer than two takes: no repeatability, "
-                           "no controlled band")
-        elif band is None:
-            reasons.append("the spread bound never holds %.1f dB "
-                           "over a 1/6-octave run inside the "
-                           "coverage" % thresh)
-
         med = None
         if sp is not None:
             sel = np.ones(len(freqs), bool)
@@ -204,67 +279,153 @@ def assess(prof, now=None, thresh=ms.SPREAD_MAX_DB):
             if hi is not None:
                 sel &= freqs <= hi
             if sel.any():
-                med = float(np.median(np.asarray(sp)[sel]))
-        f_spread = _linear_factor(med, SPREAD_GOOD_DB,
-                                  SPREAD_BAD_DB, SPREAD_MIN_FACTOR)
-        if f_spread < 1.0:
-            reasons.append("median in-band spread %.2f dB" % med)
-
+                med = float(np.median(sp[sel]))
         known = [t.get("snr_db") for t in ch_takes
                  if t.get("snr_db") is not None]
-        snr_min = min(known) if known else None
-        f_snr = _linear_factor(snr_min, mc.SNR_WARN_DB,
-                               mc.SNR_WARN_DB - SNR_SPAN_DB,
-                               SNR_MIN_FACTOR)
-        if f_snr < 1.0:
-            reasons.append("worst take SNR %.1f dB (warn at %g)"
-                           % (snr_min, mc.SNR_WARN_DB))
-
-        age, newest = _newest(ch_takes, now)
-        if newest is not None and (newest_all is None
-                                   or newest > newest_all):
-            newest_all = newest
-        f_age = _linear_factor(age, AGE_FRESH_DAYS, AGE_STALE_DAYS,
-                               AGE_MIN_FACTOR)
-        if f_age < 1.0:
-            reasons.append("newest take is %d days old" % age)
-
-        f_fit, frac = _fit_cover(band, fitp)
-        if frac is not None:
-            reasons.append("the fit range %g-%g Hz reaches past the "
-                           "controlled band"
-                           % (fitp.get("f_lo"), fitp.get("f_hi")))
-
-        score = int(round(base * f_spread * f_snr * f_age * f_fit))
-        channels[key] = {
-            "score": max(0, min(100, score)), "band": band,
-            "coverage": ((cov_lo, cov_hi)
-                         if cov_lo is not None and cov_hi is not None
-                         else None),
-            "n_takes": n, "n_clean": n_clean, "n_flagged": n_flag,
-            "n_clipped": n_clip,
-            "spread_median_db": (round(med, 2)
-                                 if med is not None else None),
-            "snr_min_db": (round(snr_min, 1)
-                           if snr_min is not None else None),
-            "age_days": round(age, 1) if age is not None else None,
-            "reasons": reasons,
-        }
-        order.append(key)
-
-    band = None
-    if combined is not None:
-        floor, ceiling = ms.trusted_band_hz(freqs, combined <= thresh)
-        cov_lo, cov_hi = _coverage(takes, sessions)
-        band = _clip_band(floor, ceiling, cov_lo, cov_hi)
-    score = min(c["score"] for c in channels.values())
-    order.sort(key=lambda k: channels[k]["score"])
-    reasons = []
-    for key in order:
-        for r in channels[key]["reasons"]:
-            line = "%s: %s" % (key, r)
-            if line not in reasons:
-                reasons.append(line)
-    return {"score": score, "band": band, "spread_max_db": thresh,
-            "reasons": reasons, "newest_utc": newest_all,
-            "channels": channels}
+        ch["part"] = {
+            "n": n, "bound": bound, "band": band, "med": med,
+            "cov": (cov_lo, cov_hi),
+            "n_clean": sum(g == ms.TAKE_CLEAN for g in grades),
+            "n_flag": sum(g == ms.TAKE_FLAGGED for g in grades),
+            "n_clip": sum(g == ms.TAKE_CLIPPED for g in grades),
+            "snr_min": min(known) if known else None,
+            "takes": ch_takes}
+        return ch["part"]
+
+    def assess(self, now=None, fit_params=None):
+        """The trust report (see the module-level assess) from the
+        cached parts: the channels that moved since the last read
+        pay O(freqs), the rest is bookkeeping."""
+        thresh = self.thresh
+        if not self._takes:
+            return _error_report(thresh, "the canvas has no takes")
+        if self._bad:
+            return _error_report(thresh, next(iter(self._bad.values())))
+        now = now or datetime.now(timezone.utc)
+        fitp = fit_params or {}
+        channels, order = {}, []
+        newest_all = None
+        for key in self._ch:
+            pt = self._part(key)
+            n, band, med = pt["n"], pt["band"], pt["med"]
+            n_clean, n_flag, n_clip = (pt["n_clean"], pt["n_flag"],
+                                       pt["n_clip"])
+            cov_lo, cov_hi = pt["cov"]
+            reasons = []
+            base = 100 if n_clean >= 3 else BASE_BY_CLEAN[n_clean]
+            if n_clean < 3:
+                extra = ""
+                if n_flag or n_clip:
+                    extra = (" (%d flagged, %d clipped)"
+                             % (n_flag, n_clip))
+                reasons.append("%d clean take(s)%s; three make the "
+                               "statistics" % (n_clean, extra))
+            if n < 2:
+                reasons.append("fewer than two takes: no "
+                               "repeatability, no controlled band")
+            elif band is None:
+                reasons.append("the spread bound never holds %.1f dB "
+                               "over a 1/6-octave run inside the "
+                               "coverage" % thresh)
+
+            f_spread = _linear_factor(med, SPREAD_GOOD_DB,
+                                      SPREAD_BAD_DB, SPREAD_MIN_FACTOR)
+            if f_spread < 1.0:
+                reasons.append("median in-band spread %.2f dB" % med)
+
+            snr_min = pt["snr_min"]
+            f_snr = _linear_factor(snr_min, mc.SNR_WARN_DB,
+                                   mc.SNR_WARN_DB - SNR_SPAN_DB,
+                                   SNR_MIN_FACTOR)
+            if f_snr < 1.0:
+                reasons.append("worst take SNR %.1f dB (warn at %g)"
+                               % (snr_min, mc.SNR_WARN_DB))
+
+            age, newest = _newest(pt["takes"], now)
+            if newest is not None and (newest_all is None
+                                       or newest > newest_all):
+                newest_all = newest
+            f_age = _linear_factor(age, AGE_FRESH_DAYS,
+                                   AGE_STALE_DAYS, AGE_MIN_FACTOR)
+            if f_age < 1.0:
+                reasons.append("newest take is %d days old" % age)
+
+            f_fit, frac = _fit_cover(band, fitp)
+            if frac is not None:
+                reasons.append("the fit range %g-%g Hz reaches past "
+                               "the controlled band"
+                               % (fitp.get("f_lo"), fitp.get("f_hi")))
+
+            score = int(round(base * f_spread * f_snr * f_age
+                              * f_fit))
+            channels[key] = {
+                "score": max(0, min(100, score)), "band": band,
+                "coverage": ((cov_lo, cov_hi)
+                             if cov_lo is not None
+                             and cov_hi is not None else None),
+                "n_takes": n, "n_clean": n_clean,
+                "n_flagged": n_flag, "n_clipped": n_clip,
+                "spread_median_db": (round(med, 2)
+                                     if med is not None else None),
+                "snr_min_db": (round(snr_min, 1)
+                               if snr_min is not None else None),
+                "age_days": (round(age, 1)
+                             if age is not None else None),
+                "reasons": reasons,
+            }
+            order.append(key)
+
+        score = min(c["score"] for c in channels.values())
+        order.sort(key=lambda k: channels[k]["score"])
+        reasons = []
+        for key in order:
+            for r in channels[key]["reasons"]:
+                line = "%s: %s" % (key, r)
+                if line not in reasons:
+                    reasons.append(line)
+        return {"score": score, "band": self._band(),
+                "spread_max_db": thresh, "reasons": reasons,
+                "newest_utc": newest_all, "channels": channels}
+
+    def _band(self):
+        """The profile's controlled band: channels combined by max
+        bound (exactly like the live session), cached until a take
+        moves."""
+        if self._combined is None:
+            bounds = [self._part(k)["bound"] for k in self._ch]
+            bounds = [b for b in bounds if b is not None]
+            band = None
+            if bounds:
+                comb = np.max(np.vstack(bounds), axis=0)
+                floor, ceiling = ms.trusted_band_hz(
+                    self.freqs, comb <= self.thresh)
+                cov_lo, cov_hi = _coverage(
+                    [t for t, _s in self._takes.values()],
+                    self._sessions)
+                band = _clip_band(floor, ceiling, cov_lo, cov_hi)
+            self._combined = (band,)
+        return self._combined[0]
+
+
+def assess(prof, now=None, thresh=ms.SPREAD_MAX_DB):
+    """Trust report for a v3 profile, or None when it has no canvas.
+
+    Returns {"score", "band", "spread_max_db", "reasons",
+    "newest_utc", "channels"}; channels maps a key to its own
+    {"score", "band", "coverage", "n_takes", "n_clean", "n_flagged",
+    "n_clipped", "spread_median_db", "snr_min_db", "age_days",
+    "reasons"}. `band` is None when the statistics cannot certify
+    one (fewer than two takes, or the spread bound never holds a
+    1/6-octave run inside the coverage). A canvas that cannot even
+    be reconstructed (off-grid takes) scores 0 with the
+    reconstruction error as the reason. `now` is injectable for
+    tests; the spread gate defaults to the session's SPREAD_MAX_DB.
+    A one-shot TrustState: a view refreshing the same profile keeps
+    its own and sync()s it instead."""
+    m = prof.get("measurement")
+    if not isinstance(m, dict) or not m:
+        return None
+    st = TrustState(m.get("grid"), thresh)
+    st.sync(m)
+    return st.assess(now=now,
+                     fit_params=(prof.get("fit") or {}).get("params"))
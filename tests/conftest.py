@@ -23,3 +23,12 @@ def fixtures_dir(tmp_path_factory):
         capture_output=True,
     )
     return out
+
+
+@pytest.fixture(autouse=True)
+def _private_refit_cache(tmp_path, monkeypatch):
+    """The export re-fit cache lives under the user's config dir;
+    every test gets its own, empty one."""
+    from perdeviceeq import export_peq
+    monkeypatch.setattr(export_peq, "REFIT_CACHE_DIR",
+                        str(tmp_path / "refit-cache"))
@@ -16,18 +16,67 @@ coordinate:
   muted_log.json       every pw-cli mute write, in order
   volume_log.json      every wpctl set-volume, in order
 
+Multi-rig: PDE_SHIM_RIGS=N (default 1) adds N-1 more sink/mic pairs,
+test_sink_rig<k> / test_source_rig<k>, each acoustically coupled only to
+its own partner (rig k's mic hears rig k's sink). Rig 0 is the legacy
+pair and keeps the plain file names above; rig k's per-rig state files
+carry a _rig<k> suffix (played_rig1.json, volume_rig1.json, ...). The
+shared files -- metadata.json, muted.json, the counters and logs -- stay
+single, like the PipeWire objects they fake: metadata.json and
+muted.json are read-modify-written WITHOUT a lock, as a racing client
+would against a naive store, so concurrent rigs lose writes unless the
+caller serializes them (measure_session's SHARED_LOCK does).
+
 Env knobs: PDE_SHIM_FOREIGN=1 adds a foreign stream on the sink,
 PDE_SHIM_PLAY_FAIL=1 makes pw-play exit 1 (mid-measure failure),
 PDE_SHIM_PLAY_SECONDS holds the fake stream alive for path verification,
 PDE_SHIM_NOISE / PDE_SHIM_DELAY_MS shape the fake capture, PDE_SHIM_REPO
 points at the checkout so pw-record imports perdeviceeq.pde_audit.
 """
+import fcntl
 import json
 import os
+from contextlib import contextmanager
 
 SINK_ID, SOURCE_ID, PLAY_ID, FOREIGN_ID = 50, 40, 60, 70
 CAPTURE_ID, WRONG_SOURCE_ID, OTHER_SINK_ID = 80, 41, 90
 SINK_NAME, SOURCE_NAME = "test_sink", "test_source"
+RIG_ID_BASE, RIG_ID_STEP = 100, 10     # rig k >= 1: ids base + step*k + i
+
+
+def rigs():
+    """[{"k", "sink_id", "sink_name", "source_id", "source_name",
+    "play_id", "capture_id", "foreign_id", "suffix"}] for every fake
+    rig, rig 0 first with the legacy ids and names."""
+    n = max(1, int(os.environ.get("PDE_SHIM_RIGS", "1")))
+    out = [{"k": 0, "sink_id": SINK_ID, "sink_name": SINK_NAME,
+            "source_id": SOURCE_ID, "source_name": SOURCE_NAME,
+            "play_id": PLAY_ID, "capture_id": CAPTURE_ID,
+            "foreign_id": FOREIGN_ID, "suffix": ""}]
+    for k in range(1, n):
+        b = RIG_ID_BASE + RIG_ID_STEP * k
+        out.append({"k": k, "sink_id": b, "sink_name": "%s_rig%d"
+                    % (SINK_NAME, k), "source_id": b + 1,
+                    "source_name": "%s_rig%d" % (SOURCE_NAME, k),
+                    "play_id": b + 2, "capture_id": b + 4,
+                    "foreign_id": b + 6, "suffix": "_rig%d" % k})
+    return out
+
+
+def rig_by(key, value, default=0):
+    """The rig whose `key` (sink_id, source_id, ...) equals value;
+    rig `default` when none does (legacy single-rig behaviour)."""
+    rs = rigs()
+    for r in rs:
+        if value is not None and r[key] == value:
+            return r
+    return rs[default]
+
+
+def rig_file(name, rig):
+    """Per-rig state file name: played.json -> played_rig1.json."""
+    base, ext = os.path.splitext(name)
+    return base + rig["suffix"] + ext
 
 
 def state_dir():
@@ -49,19 +98,33 @@ def read_json(name, default=None):
 
 
 def write_json(name, obj):
-    tmp = path(name) + ".tmp"
+    tmp = "%s.%d.tmp" % (path(name), os.getpid())   # racing writers
     with open(tmp, "w") as f:
         json.dump(obj, f)
     os.replace(tmp, path(name))
 
 
+@contextmanager
+def locked(name):
+    """Exclusive lock for a shim-internal read-modify-write (counters,
+    logs): concurrent rigs run many shims at once."""
+    with open(path(name) + ".lock", "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
 def append_json(name, entry):
-    log = read_json(name, [])
-    log.append(entry)
-    write_json(name, log)
+    with locked(name):
+        log = read_json(name, [])
+        log.append(entry)
+        write_json(name, log)
 
 
 def bump(name):
-    n = int(read_json(name, 0)) + 1
-    write_json(name, n)
+    with locked(name):
+        n = int(read_json(name, 0)) + 1
+        write_json(name, n)
     return n
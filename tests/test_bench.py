@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Tests for tools/bench.py: the cases build and run, the baseline
+round-trips, and the comparison flags exactly what crossed the
+threshold. Timings themselves are never asserted -- a shared CI box
+is no stopwatch."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "tools"))
+import bench                                        # noqa: E402
+
+
+def test_compare_flags_time_and_memory_past_the_threshold():
+    base = bench.snapshot({
+        "a": {"best_s": 1.0, "median_s": 1.0, "peak_mib": 10.0},
+        "b": {"best_s": 1.0, "median_s": 1.0, "peak_mib": 10.0}})
+    now = {"a": {"best_s": 1.2, "median_s": 9.0, "peak_mib": 10.0},
+           "b": {"best_s": 1.3, "median_s": 1.0, "peak_mib": 13.0},
+           "new": {"best_s": 5.0, "median_s": 5.0, "peak_mib": 1.0}}
+    bad = bench.compare(now, base, threshold=0.25)
+    assert len(bad) == 2                  # a is inside, new is unjudged
+    assert all(line.startswith("b: ") for line in bad)
+    assert bench.compare(now, base, threshold=0.5) == []
+
+
+def test_cases_run_and_the_baseline_gates(tmp_path):
+    res = bench.run_cases(["response_db", "channel_results"], repeat=1)
+    for r in res.values():
+        assert r["best_s"] > 0.0 and r["peak_mib"] > 0.0
+    base = tmp_path / "base.json"
+    run = [sys.executable, str(ROOT / "tools" / "bench.py"),
+           "--cases", "response_db", "--repeat", "1"]
+    p = subprocess.run(run + ["--save", str(base)],
+                       capture_output=True, text=True, timeout=300)
+    assert p.returncode == 0, p.stderr
+    snap = json.loads(base.read_text())
+    assert snap["schema"] == bench.SCHEMA
+    # a baseline ten times faster than reality is a regression
+    snap["cases"]["response_db"]["best_s"] /= 10.0
+    base.write_text(json.dumps(snap))
+    p = subprocess.run(run + ["--baseline", str(base)],
+                       capture_output=True, text=True, timeout=300)
+    assert p.returncode == 1 and "REGRESSION response_db" in p.stdout
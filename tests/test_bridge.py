@@ -5,6 +5,8 @@ import pytest
 
 from perdeviceeq import bridge
 from perdeviceeq import measure_core as mc
+from perdeviceeq import refit
+from perdeviceeq import runs
 
 GRID = {"f_lo": 20.0, "f_hi": 20000.0, "ppo": 96}
 FREQS = mc.log_grid(GRID["f_lo"], GRID["f_hi"], GRID["ppo"])
@@ -95,6 +97,31 @@ def test_bridge_recovers_the_injected_delta():
         assert lo < 100.0
 
 
+def test_bridge_smooths_as_each_profile_was_fitted():
+    """A profile fitted with 'erb' is bridged on its erb curves, and the
+    trust mask erodes by the wider of the two operators' reach."""
+    pa, pb, _ = _make_pair()
+    plain = bridge.compute_bridge(pa, pb)
+    pb["fit"] = {"params": {"smoothing": "erb"}}
+    res = bridge.compute_bridge(pa, pb)
+    assert res["b"]["smoothing"] == "erb" and res["a"]["smoothing"] == 6
+    want, _ = refit.channel_results(pb["measurement"], smoothing="erb")
+    ma = bridge._mean_curves(pa)["FL"][1]
+    mb = np.asarray(want["FL"]["data"]["mag_db_smoothed"])
+    e = res["channels"]["FL"]
+    assert np.allclose(e["delta_db"], _aligned(FREQS, ma - mb))
+    # erb is far wider than 1/6 octave in the bass: the guard follows
+    h = np.maximum(mc.smoothing_half_widths(FREQS, 6),
+                   mc.smoothing_half_widths(FREQS, "erb"))
+    assert h[0] > mc.smoothing_half_widths(FREQS, 6)[0]
+    band = np.zeros(N, bool)
+    run = runs.longest_run(runs.erode(e["trust_mask"], h))
+    band[run[0]:run[1] + 1] = True
+    assert np.array_equal(e["band_mask"], band)
+    assert e["trusted_band_hz"][1] <= \
+        plain["channels"]["FL"]["trusted_band_hz"][1]
+
+
 def test_channel_skew_warns():
     pa, pb, _ = _make_pair(extra_left_b=1.5, wild_top=False)
     res = bridge.compute_bridge(pa, pb)
@@ -137,3 +164,55 @@ def test_no_shared_channels_is_an_error():
         t["channel"] = "C"
     with pytest.raises(bridge.BridgeError):
         bridge.compute_bridge(pa, pb)
+
+
+def test_matrix_agrees_with_pairs_and_splits_the_rigs(tmp_path):
+    rng = np.random.default_rng(11)
+    base, lf = _base(), np.log10(FREQS)
+    truth = [np.zeros(N), _delta(), -0.8 * _delta(),
+             1.5 * np.exp(-((lf - math.log10(1000.0)) / 0.2) ** 2)]
+    profs = []
+    for k, g in enumerate(truth):
+        takes = [_take("r%d_%d%s" % (k, i, ch), ch,
+                       base + g + _noise(rng, 0.15))
+                 for i in range(3) for ch in ("FL", "FR")]
+        profs.append(_profile("p%d" % k, "R%d" % k, takes))
+    res = bridge.compute_matrix(profs)
+    pair = bridge.compute_bridge(profs[1], profs[2])
+    freqs = res["freq_hz"]
+    assert np.allclose(freqs, pair["freq_hz"])
+    for c, ch in enumerate(res["channels"]):
+        assert np.allclose(res["delta_db"][1, 2, c],
+                           pair["channels"][ch]["delta_db"])
+        assert np.allclose(res["delta_db"][2, 1, c],
+                           -pair["channels"][ch]["delta_db"])
+    # the pair band is judged on the worse channel: inside both
+    lo, hi = res["pair_band_hz"][1][2]
+    for ch in ("FL", "FR"):
+        clo, chi = pair["channels"][ch]["trusted_band_hz"]
+        assert lo >= clo and hi <= chi
+    # every rig trusted against every other: the offsets are each
+    # rig's aligned shape minus the mean of all of them
+    mean = np.mean([_aligned(freqs, g) for g in truth], axis=0)
+    off = ~np.eye(len(truth), dtype=bool)
+    t = res["pair_band_mask"][off].all(axis=0)
+    assert t.sum() > N // 2
+    for k, g in enumerate(truth):
+        want = _aligned(freqs, g) - mean
+        got = res["rig_offset_db"][k, 0]
+        assert np.max(np.abs(got[t] - want[t])) < 0.35
+    # a rig that never repeats has no trusted partner: NaN, and the
+    # others still split cleanly among themselves
+    wild = [_take("w%d%s" % (i, ch), ch, base + _noise(rng, 0.15)
+                  + _noise(rng, 40.0)) for i in range(3)
+            for ch in ("FL", "FR")]
+    res = bridge.compute_matrix(profs + [_profile("pw", "W", wild)])
+    assert np.isnan(res["rig_offset_db"][4]).all()
+    assert np.isnan(res["pair_max_abs_delta_db"][0, 4])
+    rp = bridge.write_matrix_outputs(res, str(tmp_path))
+    assert "5 rigs" in open(rp).read()
+    assert (tmp_path / "matrix.json").exists()
+    rows = (tmp_path / "offsets.txt").read_text().splitlines()
+    assert len(rows) == 2 + len(freqs)
+    with pytest.raises(bridge.BridgeError):
+        bridge.compute_matrix(profs[:1])
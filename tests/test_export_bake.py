@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""The windowless export bake (export_bake): Baker, the batch and its
+manifest."""
+
+import hashlib
+import json
+
+import pytest
+
+from perdeviceeq import export_bake as xb
+from perdeviceeq import export_peq as ex
+from perdeviceeq.config import SCHEMA_VERSION
+
+
+def _profile(pid="u1", name="Desk speakers", fl_gain=2.0):
+    return {"id": pid, "name": name, "version": SCHEMA_VERSION,
+            "apply_all": False, "preamp": -1.0,
+            "ch_keys": ["FL", "FR"],
+            "all": {"bands": []},
+            "channels": {
+                "FL": {"bands": [
+                    {"type": "LSC", "freq": 120.0, "gain": -1.5,
+                     "q": 0.7, "enabled": True},
+                    {"type": "PK", "freq": 2000.0, "gain": fl_gain,
+                     "q": 1.0, "enabled": True}]},
+                "FR": {"bands": [
+                    {"type": "PK", "freq": 2000.0, "gain": 4.0,
+                     "q": 1.0, "enabled": True}]}}}
+
+
+_TASTE = ("Warm", [{"type": "PK", "freq": 3000.0, "gain": -2.0,
+                    "q": 1.0, "enabled": True}])
+
+
+def test_baker_verifies_every_writer():
+    bk = xb.Baker(_profile(), _TASTE[1], _TASTE[0])
+    for t in ex.BUILTIN_TARGETS:
+        for pol in xb.target_policies(t, bk.chains):
+            res = bk.bake(t, pol)
+            assert res["text"], (t["id"], pol)
+            if t["writer"] == "fixed":
+                assert res["ok"] is None
+                assert res["resid_rms"] == res["sol"]["resid_rms"]
+            else:
+                assert res["ok"] is True, (t["id"], pol, res["line"])
+                assert res["null_db"] <= ex.NULL_PASS_DB
+    # taste names the source; without it the header says so too
+    t = ex.BUILTIN_TARGETS[1]
+    assert "taste layer" in bk.bake(t)["text"]
+    assert "taste layer" not in bk.bake(t, taste=False)["text"]
+
+
+def test_a_refit_is_run_or_handed_back():
+    bk = xb.Baker(_profile())
+    t = dict(ex.BUILTIN_TARGETS[1], max_bands=1)
+    due = bk.bake(t, "FL", refit=False)
+    assert due["text"] == "" and "1" in due["refit"]
+    res = bk.bake(t, "FL")
+    assert res["refit"] == due["refit"]
+    assert res["ok"] is True and res["resid_rms"] is not None
+    assert "Re-fit to 1 bands" in res["text"]
+
+
+def test_batch_writes_every_artifact_and_the_manifest(tmp_path):
+    profs = [_profile(), _profile("u2", "Desk speakers", fl_gain=3.0)]
+    targets = ex.BUILTIN_TARGETS
+    seen = []
+    man = xb.bake_batch(profs, targets, str(tmp_path / "a"),
+                        taste=_TASTE, jobs=1, on_entry=seen.append)
+    npre = len(ex.BUILTIN_TARGETS[3]["presets"])
+    assert man["count"] == 2 * (len(targets) - 1 + npre) == len(seen)
+    assert man["failed"] == 0
+    disk = json.loads((tmp_path / "a" / xb.MANIFEST_NAME).read_text())
+    assert disk == man
+    files = [e["file"] for e in man["files"]]
+    assert len(set(files)) == len(files)         # name clash numbered
+    for e in man["files"]:
+        data = (tmp_path / "a" / e["file"]).read_bytes()
+        assert hashlib.sha256(data).hexdigest() == e["sha256"]
+        if e["writer"] == "fixed":
+            assert e["preset"] and e["resid_max"] is not None
+            assert ("Device preset: %s." % e["preset"]) \
+                in data.decode("utf-8")
+        else:
+            assert e["ok"] is True and e["null_db"] is not None
+        assert e["taste"] == "Warm"
+
+    # the process pool bakes the same bytes
+    par = xb.bake_batch(profs, targets, str(tmp_path / "b"),
+                        taste=_TASTE, jobs=2)
+    assert [(e["file"], e["sha256"]) for e in par["files"]] == \
+        [(e["file"], e["sha256"]) for e in man["files"]]
+
+
+def test_batch_refusals(tmp_path):
+    with pytest.raises(xb.ExportError):
+        xb.bake_batch([], ex.BUILTIN_TARGETS, str(tmp_path))
+    with pytest.raises(xb.ExportError):
+        xb.bake_batch([_profile()], [], str(tmp_path))
+    # one bad bake is recorded, the rest still land
+    bad = dict(_profile("u3", "Old"), version=3)
+    man = xb.bake_batch([bad], [ex.BUILTIN_TARGETS[0],
+                                ex.BUILTIN_TARGETS[1]],
+                        str(tmp_path / "c"), jobs=1)
+    assert [e["ok"] for e in man["files"]] == [False, True]
+    assert man["files"][0]["file"] is None and man["failed"] == 1
+
+
+def test_a_failed_null_names_where_the_error_lives(monkeypatch):
+    real = ex.parametric_text
+
+    def lying(preamp, bands, header=()):
+        bands = [dict(b) for b in bands]
+        bands[-1]["gain"] += 0.5
+        return real(preamp, bands, header=header)
+    monkeypatch.setattr(ex, "parametric_text", lying)
+    res = xb.Baker(_profile()).bake(ex.BUILTIN_TARGETS[1], "FL")
+    assert res["ok"] is False
+    assert res["bands"][0][0] == "PK 2000 Hz"
+    assert "largest contribution: PK 2000 Hz" in res["line"]
+    assert "at least" in res["line"]
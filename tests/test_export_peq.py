@@ -3,6 +3,7 @@
 writers and their null tests (ROADMAP sprint item 1)."""
 
 import json
+import os
 
 import pytest
 
@@ -323,6 +324,60 @@ def test_null_test_catches_a_lie():
     assert ex.null_test_parametric(text, freqs, ref) > ex.NULL_PASS_DB
 
 
+def test_null_engine_matches_the_scalar_reading():
+    chains = ex.composed_chains(_profile_all(), _TASTE)
+    _k, g0, b0 = chains[0]
+    g, b, _ = ex.fold_flat(g0, b0)
+    text = ex.parametric_text(g, b)
+    freqs = ex.log_grid(20.0, 12000.0, 480)
+    ref = ex.chain_response(g0, b0, freqs)
+    pre, bands = eq.parse_autoeq(text)
+    scalar = max(abs(a - r) for a, r in
+                 zip(eq.response_db(pre, bands, freqs), ref))
+    assert ex.null_test_parametric(text, freqs, ref) == \
+        pytest.approx(scalar, abs=1e-9)
+    # the reference is memoized, read-only, and the scalar curve
+    r1 = ex.reference_response(g0, b0, freqs)
+    assert ex.reference_response(g0, b0, freqs) is r1
+    assert not r1.flags.writeable
+    assert list(r1) == pytest.approx(ref, abs=1e-9)
+
+    gf = ex.graphic_grid()
+    resp, _n = ex.collapse(chains, "all", gf)
+    gtext, shift = ex.graphiceq_text(gf, resp)
+    fs, gs = ex.parse_graphiceq(gtext)
+    scalar = max(abs(ex._interp_logf(fs, gs, f) - (r + shift))
+                 for f, r in zip(freqs, ref))
+    assert ex.null_test_graphic(gtext, freqs, ref, shift) == \
+        pytest.approx(scalar, abs=1e-9)
+
+
+def test_null_check_stops_on_a_certain_fail_and_names_the_band():
+    chains = ex.composed_chains(_profile_all(), None)
+    _k, g0, b0 = chains[0]
+    g, b, _ = ex.fold_flat(g0, b0)
+    lie = [dict(x) for x in b]
+    lie[0]["gain"] += 0.6                      # the 1 kHz peak
+    text = ex.parametric_text(g, lie)
+    freqs = ex.log_grid(20.0, 12000.0, 480)
+    ref = ex.reference_response(g0, b0, freqs)
+    fast = ex.null_check_parametric(text, freqs, ref)
+    full = ex.null_check_parametric(text, freqs, ref, exhaustive=True)
+    assert fast["max"] > ex.NULL_PASS_DB
+    assert not fast["exact"] and fast["points"] < len(freqs)
+    assert full["exact"] and full["points"] == len(freqs)
+    assert fast["max"] <= full["max"]
+    assert full["freq"] == pytest.approx(1000.0, rel=0.05)
+    pre, bands = eq.parse_autoeq(text)
+    errs = ex.band_errors(pre, bands, g, b, freqs)
+    assert errs[0][0] == "PK 1000 Hz"
+    assert errs[0][1] == pytest.approx(0.6, abs=0.01)
+    assert dict(errs)["preamp"] == 0.0
+    # a passing artifact is verified on every point
+    ok = ex.null_check_parametric(ex.parametric_text(g, b), freqs, ref)
+    assert ok["exact"] and ok["max"] <= ex.NULL_PASS_DB
+
+
 # ---- the fixed-band fit (writer class b) --------------------------------
 
 _T8 = {"id": "t8", "name": "T8", "writer": "fixed",
@@ -390,6 +445,58 @@ def test_load_basis_roundtrip_and_mismatch(tmp_path, capsys):
     assert "does not match" in capsys.readouterr().err
 
 
+def test_fixed_basis_is_cached_and_the_solve_matches_the_full_one(
+        tmp_path):
+    import numpy as np
+    from scipy.optimize import lsq_linear
+    freqs = ex.log_grid(50.0, 16000.0, 240)
+    t = dict(_T8, gain_range=[-6.0, 6.0])
+    fb = ex.fixed_basis(t, freqs)
+    assert ex.fixed_basis(dict(t), list(freqs)) is fb      # same key
+    assert ex.fixed_basis(dict(t, basis_q=2.0), freqs) is not fb
+    assert ex.fixed_basis(t, freqs[:-1]) is not fb
+    rng = np.random.default_rng(3)
+    for scale in (1.0, 12.0):               # inside, then past the bounds
+        d = scale * (fb["basis"] @ rng.normal(0, 1, 8)) + 0.7
+        a = np.hstack([fb["basis"], np.ones((len(freqs), 1))])
+        ref = lsq_linear(a, d, bounds=([-6.0] * 8 + [-np.inf],
+                                       [6.0] * 8 + [np.inf])).x
+        sol = ex.solve_fixed(dict(t, gain_step=0.0), freqs, list(d))
+        assert sol["gains"] == pytest.approx(list(ref[:8]), abs=1e-4)
+
+    # a measured basis is keyed on the file's CONTENT
+    unit = fb["basis"]
+    bp = tmp_path / "t8.basis.json"
+    for g in (6.0, 3.0):
+        bp.write_text(json.dumps(
+            {"freq": freqs, "curve_gain_db": g,
+             "curves": [[g * unit[i][j] for i in range(len(freqs))]
+                        for j in range(8)]}), encoding="utf-8")
+        mb = ex.fixed_basis(dict(t, basis_file=str(bp)), freqs)
+        assert mb is ex.fixed_basis(dict(t, basis_file=str(bp)), freqs)
+        assert "measured" in mb["note"]
+    bp.write_text(json.dumps({"freq": [1, 2]}), encoding="utf-8")
+    assert "assumed" in ex.fixed_basis(dict(t, basis_file=str(bp)),
+                                       freqs)["note"]
+
+
+def test_solve_presets_ranks_by_fidelity():
+    t = next(x for x in ex.BUILTIN_TARGETS if x["id"] == "vendor-graphic")
+    freqs = ex.log_grid(20.0, 12000.0, 240)
+    # a curve drawn with the Denon layout: its own preset fits best
+    den = t["presets"][1]
+    b = ex.peaking_basis(den["centers"], 1.414, freqs)
+    d = [float(v) for v in 3.0 * b[:, 1] - 2.0 * b[:, 3]]
+    ranked = ex.solve_presets(t, freqs, d)
+    assert len(ranked) == len(t["presets"])
+    assert ranked[0][0]["name"] == den["name"]
+    rms = [s["resid_rms"] for _p, s in ranked]
+    assert rms == sorted(rms)
+    assert ranked[0][1] == ex.solve_fixed(
+        dict(t, centers=den["centers"], gain_range=den["gain_range"],
+             gain_step=den["gain_step"]), freqs, d)
+
+
 # ---- Poweramp Equalizer ------------------------------------------------
 
 
@@ -593,6 +700,42 @@ def test_refit_bands_budget_and_residual():
     assert len(one) <= 1 and rmax1 > rmax
 
 
+def test_refit_cache_answers_a_repeat_question(monkeypatch):
+    from perdeviceeq import fit_peq
+    fg = ex.log_grid(20.0, 12000.0, 120)
+    shape = [{"type": "PK", "freq": 500.0, "gain": 3.0, "q": 1.0,
+              "enabled": True}]
+    desired = ex.chain_response(0.0, shape, fg)
+    lim = {"gain": [-6.0, 6.0]}
+    first = ex.refit_bands(fg, desired, 20.0, 12000.0, 2, 6.0,
+                           limits=lim, cache=True)
+    assert len(os.listdir(ex.REFIT_CACHE_DIR)) == 1
+
+    def boom(*_a, **_k):
+        raise AssertionError("the optimizer ran on a cached question")
+    monkeypatch.setattr(fit_peq, "fit_to_desired", boom)
+    assert ex.refit_bands(fg, list(desired), 20.0, 12000.0, 2, 6.0,
+                          limits=dict(lim), cache=True) == first
+    with pytest.raises(AssertionError):        # another limit box
+        ex.refit_bands(fg, desired, 20.0, 12000.0, 2, 6.0,
+                       limits={"gain": [-3.0, 3.0]}, cache=True)
+    with pytest.raises(AssertionError):        # uncached by request
+        ex.refit_bands(fg, desired, 20.0, 12000.0, 2, 6.0,
+                       limits=lim)
+
+    # a torn file is a miss, and the directory stays bounded
+    key = ex.refit_key(fg, desired, 20.0, 12000.0, 2, 6.0, lim)
+    with open(os.path.join(ex.REFIT_CACHE_DIR, key + ".json"),
+              "w") as f:
+        f.write("{")
+    assert ex._refit_cached(key) is None
+    monkeypatch.setattr(ex, "REFIT_CACHE_MAX", 3)
+    for n in range(5):
+        ex._refit_store("k%d" % n, [], 0.0, 0.0)
+    assert sorted(os.listdir(ex.REFIT_CACHE_DIR)) == \
+        ["k2.json", "k3.json", "k4.json"]
+
+
 def test_sample_curve_edge_hold_and_mean():
     fg = [100.0, 1000.0, 10000.0]
     c = [1.0, 3.0, 5.0]
@@ -793,6 +936,59 @@ def test_audit_target_scores_and_reasons():
     assert r == ["no per-channel EQ", "band budget 1"]
 
 
+def test_chain_responses_match_the_scalar_engine():
+    freqs = ex.log_grid(20.0, 20000.0, 97)
+    chains = [("FL", -2.0, [{"type": "PK", "freq": 1000.0, "gain": 5.0,
+                             "q": 2.0, "enabled": True},
+                            {"type": "LSC", "freq": 90.0, "gain": -3.0,
+                             "q": 0.7, "enabled": True},
+                            {"type": "HSC", "freq": 8000.0, "gain": 9.0,
+                             "q": 0.7, "enabled": False}]),
+              ("FR", 1.5, [])]
+    got = ex.chain_responses(chains, freqs)
+    assert got.shape == (2, 97)
+    for row, (_k, g, b) in zip(got, chains):
+        assert list(row) == pytest.approx(ex.chain_response(g, b, freqs),
+                                          abs=1e-9)
+
+
+def test_audit_targets_streams_and_caches(monkeypatch):
+    freqs = ex.log_grid(20.0, 12000.0, 240)
+    chains = [("FL", -3.0, [{"type": "PK", "freq": 2000.0, "gain": -4.0,
+                             "q": 1.6, "enabled": True}]),
+              ("FR", -3.0, [{"type": "PK", "freq": 2100.0, "gain": -5.0,
+                             "q": 1.6, "enabled": True}])]
+    targets = ex.load_targets()
+    ids = [t["id"] for t in targets]
+    assert ex.cached_audits(targets, chains, freqs) == {}
+    seen = []
+    got = ex.audit_targets(targets, chains, freqs,
+                           on_result=lambda tid, a: seen.append(tid))
+    assert seen == ids
+    assert got == {t["id"]: ex.audit_target(t, chains, freqs)
+                   for t in targets}
+
+    # a second pass is pure cache: audit_target never runs
+    calls = []
+    real = ex.audit_target
+    monkeypatch.setattr(ex, "audit_target",
+                        lambda *a: calls.append(a) or real(*a))
+    assert ex.cached_audits(targets, chains, freqs) == got
+    assert ex.audit_targets(targets, chains, freqs) == got
+    assert calls == []
+    # ... keyed on the chains, the grid and the target's content
+    moved = [(k, g + 1.0, b) for k, g, b in chains]
+    ex.audit_targets(targets[:1], moved, freqs)
+    ex.audit_targets(targets[:1], chains, freqs[:-1])
+    edited = dict(targets[1], max_bands=1)
+    ex.audit_targets([edited], chains, freqs)
+    assert len(calls) == 3
+    # a closed picker stops the walk between targets
+    fresh = [(k, g - 7.0, b) for k, g, b in chains]
+    assert ex.audit_targets(targets, fresh, freqs,
+                            cancelled=lambda: True) == {}
+
+
 def test_refit_progress_is_alive_and_bounded():
     fg = ex.log_grid(20.0, 12000.0, 240)
     shape = [{"type": "PK", "freq": 150.0, "gain": 4.0, "q": 1.2,
@@ -305,3 +305,79 @@ def test_fit_profiles_progress_is_the_perband_heartbeat():
         assert ev == sorted(ev) and ev   # the counter climbs
     mid = [s for s in seen if s[1] == "FL"]
     assert all(v[0] <= 0.5 for v in mid)  # FL lives in its half
+
+
+def _room(ripple=0.0):
+    """A six-feature desired on the fit grid, plus `ripple` dB of slow
+    log-frequency wobble: the curve an added take nudges."""
+    fg = np.logspace(np.log10(20), np.log10(12000), fit_peq.GRID)
+    d = np.zeros_like(fg)
+    for f0, g, w in [(60, 5, .5), (250, -4, .3), (1200, 3, .2),
+                     (3000, -6, .15), (7000, 4, .3), (150, -2, .4)]:
+        d += g * np.exp(-0.5 * (np.log2(fg / f0) / w) ** 2)
+    return fg, d + ripple * np.sin(np.log2(fg) * 1.3)
+
+
+def test_warm_start_nudges_the_bands_it_is_given():
+    fg, d0 = _room()
+    cold_st = {}
+    b0, _r = fit_peq.fit_to_desired(fg, d0, 20, 12000, 10, 6.0,
+                                    stats=cold_st)
+    assert cold_st["warm"] is False
+    tol = fit_peq.seed_residual(b0, fg, d0, 6.0)
+
+    fg, d1 = _room(0.3)
+    st = {}
+    b1, _r = fit_peq.fit_to_desired(fg, d1, 20, 12000, 10, 6.0,
+                                    seed=b0, seed_tol=tol, stats=st)
+    assert st["warm"] is True
+    assert st["evals"] < cold_st["evals"] / 3
+    assert len(b1) <= 10
+    assert fit_peq.seed_residual(b1, fg, d1, 6.0) <= max(
+        tol, fit_peq.RESID_TARGET_DB) + fit_peq.PRUNE_EPS_DB
+    # seeds may be band dicts, as profiles store them
+    dicts = [{"type": t, "freq": f, "gain": g, "q": q}
+             for t, f, g, q in b0]
+    st2 = {}
+    fit_peq.fit_to_desired(fg, d1, 20, 12000, 10, 6.0, seed=dicts,
+                           seed_tol=tol, stats=st2)
+    assert st2["warm"] is True
+
+
+def test_warm_start_falls_back_when_the_curve_moved_too_far():
+    fg, d0 = _room()
+    b0, _r = fit_peq.fit_to_desired(fg, d0, 20, 12000, 10, 6.0)
+    fg, d1 = _room(3.0)
+    st = {}
+    b1, _r = fit_peq.fit_to_desired(fg, d1, 20, 12000, 10, 6.0,
+                                    seed=b0, stats=st)
+    cold, _r = fit_peq.fit_to_desired(fg, d1, 20, 12000, 10, 6.0)
+    # the warm answer missed its bar: the greedy fit ran and won
+    assert st["warm"] is False
+    assert b1 == cold
+
+
+def test_search_beats_the_greedy_inside_the_same_box():
+    fg, d = _room(0.3)
+    st = {}
+    bands, resid = fit_peq.search_to_desired(fg, d, 20, 12000, 5, 6.0,
+                                             starts=4, jobs=1, stats=st)
+    assert st["starts"] == 4 and st["jobs"] == 1
+    assert st["cpu_seconds"] > 0 and st["evals"] > 0
+    # the greedy commits to a cancelling topology at this budget; a
+    # peaking-only candidate does not
+    assert st["best"][0] < st["greedy"][0] - 1.0
+    assert st["won"] != 0
+    assert len(bands) <= 5
+    for t, f, g, q in bands:
+        assert 20 <= f <= 12000 and -24.0 <= g <= 6.0 + 1e-9
+        assert 0.3 <= q <= (8.0 if t == "PK" else fit_peq.SHELF_Q_MAX)
+    assert np.allclose(resid, d - fit_peq._response(bands, fg))
+    # a pool answers exactly what one process does
+    par, _r = fit_peq.search_to_desired(fg, d, 20, 12000, 5, 6.0,
+                                        starts=4, jobs=2)
+    assert par == bands
+    # one start is the greedy itself
+    one, _r = fit_peq.search_to_desired(fg, d, 20, 12000, 5, 6.0,
+                                        starts=1)
+    assert one == fit_peq.fit_to_desired(fg, d, 20, 12000, 5, 6.0)[0]
@@ -0,0 +1,187 @@
+"""The patch-based undo timeline (history.History)."""
+import copy
+import json
+
+import pytest
+
+from perdeviceeq import history as hs
+
+
+def editor_state(nch=8, nbands=10, layers=3):
+    """An editor snapshot of the window's shape: an 8-channel profile
+    with a few taste layers."""
+    def bands(off):
+        return [{"type": "PK", "freq": 100.0 * (i + 1) + off,
+                 "gain": 0.0, "q": 1.0, "enabled": True}
+                for i in range(nbands)]
+    keys = ["C%d" % c for c in range(nch)]
+    return {"pid": "u1", "apply_all": False, "preamp": -3.0,
+            "preamp_auto": True, "ch_keys": keys,
+            "slots": dict({k: {"bands": bands(c)}
+                           for c, k in enumerate(keys)},
+                          all={"bands": []}),
+            "taste": {"active": "t0",
+                      "layers": [{"id": "t%d" % k, "name": "L%d" % k,
+                                  "bands": bands(k)}
+                                 for k in range(layers)]}}
+
+
+def test_steps_are_patches_and_replay_both_ways():
+    h = hs.History(keyframe_every=4)
+    s = editor_state()
+    h.seed(s, pid="u1")
+    states = [copy.deepcopy(s)]
+    for k in range(11):
+        s = copy.deepcopy(s)
+        s["slots"]["C%d" % (k % 8)]["bands"][k % 10]["gain"] = k + 0.5
+        if k % 3 == 0:
+            s["preamp"] = -3.0 - k
+        if k == 5:
+            s["taste"]["layers"][1]["bands"].pop()    # a layer edit
+        if k == 7:
+            s["slots"]["C2"]["new"] = True            # a key appears
+        assert h.push(s, pid="u1", step=k)
+        states.append(copy.deepcopy(s))
+    assert not h.push(copy.deepcopy(s), sel=True)     # equal: dropped
+    assert len(h) == 12 and h.index == 11
+
+    # a band drag is ONE leaf; the preamp rides along as another
+    e = h._entries[4]
+    assert [p for p, _, _ in e["patch"]] == [
+        ("preamp",), ("slots", "C3", "bands", 3, "gain")]
+    # unchanged subtrees are shared, not copied
+    assert h.state(3)["slots"]["C7"] is h.state(4)["slots"]["C7"]
+
+    for i in reversed(range(12)):                     # undo all the way
+        assert h.move(i) == states[i]
+    for i in range(12):                               # and redo
+        assert h.move(i) == states[i]
+    h.move(2)
+    for i in (11, 0, 9, 5, 6):                        # random access
+        assert h.state(i) == states[i]
+    assert h.marks(8) == {"pid": "u1", "step": 7}
+
+
+def test_push_mid_history_drops_the_redo_branch():
+    h = hs.History()
+    h.seed({"a": 1})
+    for v in (2, 3, 4):
+        h.push({"a": v})
+    assert h.move(1) == {"a": 2}
+    assert h.push({"a": 9, "b": [1]})
+    assert len(h) == 3 and h.current == {"a": 9, "b": [1]}
+    assert h.move(1) == {"a": 2}
+    assert not h.push({"a": 2})                       # dedup at the cursor
+    assert len(h) == 2
+
+
+def test_the_cap_promotes_a_keyframe():
+    h = hs.History(cap=5, keyframe_every=3)
+    h.seed({"n": 0, "x": [0, 0]})
+    for n in range(1, 13):
+        h.push({"n": n, "x": [n, 0]})
+    assert len(h) == 5 and h.index == 4
+    assert h._entries[0]["key"] is not None
+    assert h._entries[0]["patch"] is None
+    assert [h.state(i)["n"] for i in range(5)] == [8, 9, 10, 11, 12]
+    assert h.move(0) == {"n": 8, "x": [8, 0]}
+    with pytest.raises(IndexError):
+        h.state(5)
+
+
+def test_keyframes_keep_coming_past_the_cap():
+    """A session far longer than the cap: the trimmed window keeps a
+    keyframe at most keyframe_every entries apart, so a replay never
+    walks the whole window."""
+    h = hs.History(cap=100, keyframe_every=16)
+    h.seed({"n": 0, "x": [0, 0]})
+    for n in range(1, 400):
+        h.push({"n": n, "x": [n, n % 7]})
+    assert len(h) == 100
+    keys = [i for i, e in enumerate(h._entries) if e["key"] is not None]
+    assert keys[0] == 0
+    assert max(b - a for a, b in zip(keys, keys[1:] + [len(h)])) <= 16
+    for i in (0, 17, 50, 99):
+        assert h.state(i) == {"n": 300 + i, "x": [300 + i, (300 + i) % 7]}
+    h.move(20)
+    h.push({"n": -1, "x": [0, 0]})            # past the cap after a truncate
+    keys = [i for i, e in enumerate(h._entries) if e["key"] is not None]
+    assert max(b - a for a, b in zip(keys, keys[1:] + [len(h)])) <= 16
+    assert h.state(21) == {"n": -1, "x": [0, 0]}
+
+
+def test_a_step_costs_what_changed():
+    """Constant-cost edits on a big state: the stored patch of a
+    one-band edit does not grow with channels or layers."""
+    sizes = []
+    for nch in (2, 8, 32):
+        h = hs.History()
+        s = editor_state(nch=nch, layers=nch)
+        h.seed(s)
+        s = copy.deepcopy(s)
+        s["slots"]["C1"]["bands"][2]["gain"] = 4.0
+        h.push(s)
+        sizes.append(len(json.dumps([(list(p), o, n) for p, o, n
+                                     in h._entries[1]["patch"]])))
+    assert sizes[0] == sizes[1] == sizes[2]
+
+
+class _Untouchable:
+    """A leaf that fails any comparison: a push that visits it fails."""
+
+    def __eq__(self, other):
+        raise AssertionError("an untouched subtree was compared")
+
+    __hash__ = object.__hash__
+
+
+def test_push_patch_reads_only_the_touched_paths():
+    """An edit site names what it changed: the slot, the layer, the
+    preamp. Building, dedup and storage never look at the rest, and
+    the step replays like a full-state push."""
+    h = hs.History()
+    s = editor_state()
+    s["slots"]["C5"]["bands"][0]["gain"] = _Untouchable()
+    h.seed(s, pid="u1")
+    ref = hs.History()
+    ref.seed(s, pid="u1")
+
+    slot = copy.deepcopy(s["slots"]["C1"]["bands"][:4])
+    slot[2]["gain"] = 4.0
+    layer = {"id": "t1", "name": "Bright", "bands": []}
+    edit = [(("slots", "C1", "bands"),
+             slot + s["slots"]["C1"]["bands"][4:]),
+            (("taste", "layers", 1), layer),
+            (("preamp",), -5.0), (("pid",), "u1")]
+    assert h.push_patch(edit, pid="u1")
+    assert [p for p, _, _ in h._entries[1]["patch"]] == [
+        ("slots", "C1", "bands", 2, "gain"),
+        ("taste", "layers", 1, "name"), ("taste", "layers", 1, "bands"),
+        ("preamp",)]
+
+    full = dict(s, preamp=-5.0,
+                slots=dict(s["slots"], C1={"bands": edit[0][1]}),
+                taste=dict(s["taste"], layers=[
+                    s["taste"]["layers"][0], layer,
+                    s["taste"]["layers"][2]]))
+    ref.push(full, pid="u1")
+    assert sorted(h._entries[1]["patch"], key=lambda c: str(c[0])) \
+        == sorted(ref._entries[1]["patch"], key=lambda c: str(c[0]))
+    assert h.current["slots"]["C5"] is s["slots"]["C5"]    # shared
+
+    # the same values again, or only scalars that did not move: no step
+    assert not h.push_patch(edit)
+    assert not h.push_patch([(("preamp",), -5.0), (("apply_all",), False)])
+    assert len(h) == 2
+
+    assert h.push_patch([(("slots", "all", "bands"), [{"type": "LS"}])])
+    assert h.move(1)["slots"]["all"]["bands"] == []
+    assert h.move(0)["preamp"] == -3.0
+    assert h.move(2)["slots"]["all"]["bands"] == [{"type": "LS"}]
+    assert h.current["taste"]["layers"][1] == layer
+    h.move(1)
+    assert h.push_patch([(("preamp",), 0.0)])            # drops the redo
+    assert len(h) == 3 and h.current["slots"]["all"]["bands"] == []
+
+    with pytest.raises(IndexError):
+        hs.History().push_patch([(("preamp",), 0.0)])
@@ -123,6 +123,25 @@ def test_stable_delays_do_not_warn(sweep):
     assert mc.BT_JITTER_WARNING not in result["warnings"]
 
 
+def test_magnitude_is_the_exact_dtft_on_the_grid():
+    # a notch-rich segment of awkward (non-block-multiple) length:
+    # the evaluator must hit the brute-force DTFT at every grid
+    # point, and a stack of takes must answer row for row
+    rng = np.random.default_rng(7)
+    n = 1237
+    segs = rng.standard_normal((3, n)) * np.exp(-np.arange(n) / 200.0)
+    freqs = mc.log_grid(ppo=24)
+    got = mc.ir_to_magnitude(segs, FS, freqs)
+    w = 2 * np.pi * freqs / FS
+    ref = 20 * np.log10(np.abs(
+        np.exp(-1j * np.outer(w, np.arange(n))) @ segs.T)).T
+    assert got.shape == (3, len(freqs))
+    assert np.abs(got - ref).max() < 1e-9
+    one = mc.ir_to_magnitude(segs[1], FS, freqs)
+    assert one.shape == freqs.shape
+    assert np.abs(one - got[1]).max() < 1e-9
+
+
 # --- SNR ----------------------------------------------------------------
 
 def test_low_snr_warns(sweep):
@@ -141,6 +160,34 @@ def test_clean_loop_snr_is_sane(sweep):
     assert result["takes"]["snr_min_db"] > mc.SNR_WARN_DB
 
 
+def test_smoothing_engine_modes_and_stacks():
+    freqs = mc.log_grid()
+    rng = np.random.default_rng(3)
+    curves = 3 * rng.standard_normal((4, len(freqs)))
+    # the constant box is the old edge-padded convolution, exactly
+    half = int(round(mc.GRID_PPO / (2 * 6)))
+    pad = np.pad(10 ** (curves[0] / 10), half, mode="edge")
+    box = 10 * np.log10(np.convolve(
+        pad, np.full(2 * half + 1, 1.0 / (2 * half + 1)), mode="valid"))
+    assert np.abs(mc.smooth_fractional_octave(curves[0], mc.GRID_PPO, 6)
+                  - box).max() < 1e-9
+    assert np.array_equal(mc.smooth_curves(curves[0], freqs, 0), curves[0])
+    for mode in ("psychoacoustic", "erb"):
+        op = mc.smoothing_operator(freqs, mode)
+        assert op is mc.smoothing_operator(freqs, mode)      # cached
+        assert np.allclose(np.asarray(op.sum(axis=1)).ravel(), 1.0)
+        # one product over the stack answers row for row
+        stack = mc.smooth_curves(curves, freqs, mode)
+        assert stack.shape == curves.shape
+        assert np.abs(stack[2] - mc.smooth_curves(curves[2], freqs, mode)
+                      ).max() < 1e-12
+        # variable resolution: broad in the bass, narrow up top
+        width = np.diff(op.indptr)
+        assert width[0] > width[-1]
+    with pytest.raises(ValueError):
+        mc.smoothing_spec("cubic")
+
+
 # --- mic calibration ------------------------------------------------------
 
 def test_mic_cal_parse_and_apply(sweep, tmp_path):
@@ -94,6 +94,37 @@ def test_measure_memory_per_sink_and_source(paths):
     assert mp.MeasureMemory().mic_for("sink_a") is None
 
 
+def test_measure_memory_sweep_plan_per_pair(paths):
+    m = mp.MeasureMemory()
+    assert m.sweep_for("sink_a", "srcA") is None
+    plan = {"samples": 65536, "repeats": 3, "snr_db": 55.0}
+    m.remember("sink_a", source="srcA", volume=0.5, sweep=plan)
+    m.remember("sink_a", sweep={"samples": 1})       # no source: ignored
+    m2 = mp.MeasureMemory()
+    assert m2.sweep_for("sink_a", "srcA") == plan
+    assert m2.sweep_for("sink_a", "srcB") is None
+    # re-level forgets the plan with the volume it was derived at
+    m2.forget_volume("sink_a", "srcA")
+    assert mp.MeasureMemory().sweep_for("sink_a", "srcA") is None
+
+
+def test_measure_memory_volume_law_per_rig(paths):
+    m = mp.MeasureMemory()
+    assert m.law_for("sink_a", "srcA") is None
+    law = {"offset_db": -20.0, "slope": 3.0, "points": 2}
+    m.remember("sink_a", source="srcA", law=law)
+    m.remember("sink_a", source="srcA", law=dict(law, offset_db=-8.0),
+               rig="coupler 2")
+    m2 = mp.MeasureMemory()
+    assert m2.law_for("sink_a", "srcA") == law
+    assert m2.law_for("sink_a", "srcA", "coupler 2")["offset_db"] == -8.0
+    assert m2.law_for("sink_a", "srcB") is None
+    # re-level keeps the law: the first probe verifies it anyway
+    m2.remember("sink_a", source="srcA", volume=0.4)
+    m2.forget_volume("sink_a", "srcA")
+    assert mp.MeasureMemory().law_for("sink_a", "srcA") == law
+
+
 def test_measure_memory_ignores_junk(paths):
     _, memf = paths
     memf.write_text("not json")
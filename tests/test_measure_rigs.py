@@ -0,0 +1,200 @@
+"""Concurrent multi-rig measurement (measure_rigs.RigScheduler).
+
+The shims fake several independent rigs with PDE_SHIM_RIGS=N: rig k's
+mic hears only rig k's sink, while the per-device-eq metadata object and
+the foreign-stream mute state stay ONE shared store, read-modify-written
+without a lock -- exactly the resources the scheduler must serialize.
+"""
+import json
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from perdeviceeq import measure_rigs as mr
+from perdeviceeq import measure_session as ms
+from perdeviceeq.take_archive import TakeArchive
+
+ROOT = Path(__file__).resolve().parent.parent
+SHIMS = ROOT / "tests" / "shims"
+
+GRAPH_A = ("{ nodes = [ { type = builtin name = eq label = param_eq "
+           "config = { filters = [ { type = bq_peaking, freq = 200, "
+           "gain = 9.6, q = 2.25 } ] } } ] }")
+GRAPH_B = GRAPH_A.replace("freq = 200", "freq = 3150")
+SINKS = ("test_sink", "test_sink_rig1", "test_sink_rig2")
+SOURCES = ("test_source", "test_source_rig1", "test_source_rig2")
+
+
+@pytest.fixture
+def rig_state(tmp_path, monkeypatch):
+    state = tmp_path / "state"
+    state.mkdir()
+    (state / "metadata.json").write_text(json.dumps(
+        {SINKS[0]: GRAPH_A, SINKS[1]: GRAPH_B, SINKS[2]: GRAPH_A}))
+    monkeypatch.setenv("PDE_SHIM_DIR", str(state))
+    monkeypatch.setenv("PDE_SHIM_REPO", str(ROOT))
+    monkeypatch.setenv("PDE_SHIM_PLAY_SECONDS", "0.9")
+    monkeypatch.setenv("PDE_SHIM_RIGS", "3")
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "xdg-state"))
+    monkeypatch.setenv("PATH", "%s%s%s"
+                       % (SHIMS, os.pathsep, os.environ["PATH"]))
+    return state
+
+
+def plan(tmp_path, k, **kw):
+    cfg = ms.SessionConfig(sink=SINKS[k], source=SOURCES[k],
+                           samples=131072, mute_others=True,
+                           save_dir=str(tmp_path / "takes"))
+    return mr.RigPlan("rig %d" % k, cfg,
+                      out_dir=str(tmp_path / "out" / str(k)), **kw)
+
+
+def test_rigs_sweep_concurrently_and_stay_separate(rig_state, tmp_path,
+                                                   monkeypatch):
+    monkeypatch.setenv("PDE_SHIM_FOREIGN", "1")
+    seen = []
+    sched = mr.RigScheduler([plan(tmp_path, k) for k in range(3)])
+    rep = sched.run(on_outcome=lambda r, ch, out: seen.append((r, out.kind)))
+
+    assert rep["failed"] == [], [r["error"] for r in rep["rigs"]]
+    assert rep["takes"] == 3
+    assert sorted(seen) == [("rig 0", "take"), ("rig 1", "take"),
+                            ("rig 2", "take")]
+    # the rigs overlapped in time: every one started before any finished
+    rigs = rep["rigs"]
+    assert max(r["started_s"] for r in rigs) \
+        < min(r["finished_s"] for r in rigs)
+    assert rep["elapsed_s"] < rep["serial_s"]
+    assert rep["takes_per_hour"] == pytest.approx(
+        3 * 3600.0 / rep["elapsed_s"], rel=0.02)
+    assert all(r["takes_per_hour"] > 0 for r in rigs)
+
+    # every bypass restored ITS key: the shared store lost no write
+    assert json.loads((rig_state / "metadata.json").read_text()) == \
+        {SINKS[0]: GRAPH_A, SINKS[1]: GRAPH_B, SINKS[2]: GRAPH_A}
+    assert all(r["eq_restored"] is True for r in rigs)
+    # ... and each sink sounded with its own key cleared
+    snaps = [json.loads((rig_state / ("meta_at_play_%d.json" % n))
+                        .read_text()) for n in (1, 2, 3)]
+    for k in range(3):
+        assert any(SINKS[k] not in s for s in snaps)
+    # each rig's foreign stream was muted for its sweep and restored
+    muted = json.loads((rig_state / "muted.json").read_text())
+    assert muted == {"70": False, "116": False, "126": False}
+    log = json.loads((rig_state / "muted_log.json").read_text())
+    assert len(log) == 6
+
+    # takes, outdirs and results never mix
+    outdirs = {r["outdir"] for r in rigs}
+    assert len(outdirs) == 3
+    for k, r in enumerate(rigs):
+        assert os.path.basename(os.path.dirname(r["outdir"])) \
+            == "rig_%d" % k
+        assert not [n for n in os.listdir(r["outdir"])
+                    if n.endswith(".wav") and n.startswith("take")]
+        assert len(TakeArchive.open(r["outdir"]).find("take")) == 1
+        res = json.loads(Path(r["results"][0]).read_text())
+        assert res["takes"]["count"] == 1
+        assert res["rig"] == "rig %d" % k
+        assert res["path_clean"]["target"]["name"] == SINKS[k]
+        assert res["path_clean"]["capture"]["source"]["name"] \
+            == SOURCES[k]
+        assert res["path_clean"]["playback_stream"]["name"] \
+            == "pde-measure-sweep.rig_%d" % k
+        assert sched.results["rig %d" % k][0]["takes"]["count"] == 1
+
+
+def test_ctrl_c_waits_for_every_rig_to_restore(rig_state, tmp_path,
+                                               monkeypatch):
+    """A Ctrl-C mid-sweep cancels the rigs and returns only once each
+    one's bypass, mute and volume are back -- nothing is left for the
+    interpreter to kill half-restored on its way out."""
+    monkeypatch.setenv("PDE_SHIM_FOREIGN", "1")
+    monkeypatch.setenv("PDE_SHIM_PLAY_SECONDS", "3")
+    for k in range(2):
+        suffix = "_rig%d" % k if k else ""
+        (rig_state / ("volume%s.json" % suffix)).write_text(
+            json.dumps({"cubic": 0.30}))
+    plans = [plan(tmp_path, k) for k in range(2)]
+    for p in plans:
+        p.cfg.start_volume = 0.6
+    sched = mr.RigScheduler(plans)
+    main = threading.main_thread().ident
+
+    def interrupt():                         # once both sinks sound
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline and not all(
+                (rig_state / ("meta_at_play_%d.json" % n)).exists()
+                for n in (1, 2)):
+            time.sleep(0.02)
+        time.sleep(0.3)
+        signal.pthread_kill(main, signal.SIGINT)
+
+    threading.Thread(target=interrupt, daemon=True).start()
+    with pytest.raises(KeyboardInterrupt):
+        sched.run()
+
+    assert not [t for t in threading.enumerate()
+                if t.name.startswith("rig-") and t.is_alive()]
+    assert json.loads((rig_state / "metadata.json").read_text()) == \
+        {SINKS[0]: GRAPH_A, SINKS[1]: GRAPH_B, SINKS[2]: GRAPH_A}
+    for k in range(2):
+        suffix = "_rig%d" % k if k else ""
+        vol = json.loads((rig_state / ("volume%s.json" % suffix))
+                         .read_text())["cubic"]
+        assert vol == pytest.approx(0.30, abs=1e-3)
+    assert 0.6 in [round(e["cubic"], 2) for e in json.loads(
+        (rig_state / "volume_log.json").read_text())]
+    muted = json.loads((rig_state / "muted.json").read_text())
+    assert muted == {"70": False, "116": False}
+    assert all(s.eq_state["restored"] is True
+               for s in sched.sessions.values())
+
+
+def test_shared_sink_or_mic_refuses_before_any_sound(rig_state, tmp_path):
+    a, b = plan(tmp_path, 0), plan(tmp_path, 1)
+    b.cfg.source = SOURCES[0]
+    with pytest.raises(ms.RefusalError, match="share the source"):
+        mr.RigScheduler([a, b])
+    b = plan(tmp_path, 1)
+    b.cfg.sink = str(50)                   # the id of rig 0's sink
+    with pytest.raises(ms.RefusalError, match="same sink node"):
+        mr.RigScheduler([a, b])
+    assert not (rig_state / "play-counter").exists()
+
+
+def test_a_failing_rig_does_not_stop_the_others(rig_state, tmp_path,
+                                                monkeypatch):
+    sched = mr.RigScheduler([plan(tmp_path, 0), plan(tmp_path, 1)])
+    monkeypatch.setenv("PDE_SHIM_RIGS", "1")  # rig 1 left after arming
+    rep = sched.run()
+    assert rep["failed"] == ["rig 1"]
+    assert "failed to open" in rep["rigs"][1]["error"]
+    assert rep["rigs"][0]["takes"] == 1
+    assert rep["takes"] == 1
+
+
+def test_shared_writes_wait_for_the_lock(rig_state):
+    """The bypass and the mute writes queue behind SHARED_LOCK, so a
+    neighbour rig's read-modify-write can never interleave with them."""
+    done = []
+
+    def bypass():
+        with ms.ProfileBypass(SINKS[1]):
+            done.append("bypass")
+        ms.MuteOthers._set_mute(70, True)
+        done.append("mute")
+
+    with ms.SHARED_LOCK:
+        th = threading.Thread(target=bypass)
+        th.start()
+        th.join(0.5)
+        assert done == []                   # parked behind the holder
+    th.join(10)
+    assert done == ["bypass", "mute"]
+    assert json.loads((rig_state / "metadata.json").read_text())[SINKS[1]] \
+        == GRAPH_B
@@ -49,6 +49,7 @@ def run_measure(tmp_path, extra=(), env_extra=None, input_text="",
     env["PDE_SHIM_REPO"] = str(ROOT)
     env["PDE_SHIM_PLAY_SECONDS"] = "0.9"
     env["XDG_STATE_HOME"] = str(tmp_path / "xdg-state")   # isolate WpState
+    env["HOME"] = str(tmp_path / "home")           # ... and MeasureMemory
     env["PATH"] = "%s%s%s" % (SHIMS, os.pathsep, env["PATH"])
     env.update(env_extra or {})
     out = tmp_path / "result.json"
@@ -112,7 +113,8 @@ def test_end_to_end_two_takes(tmp_path):
     outdir = next((tmp_path / "takes").iterdir())
     names = {p.name for p in outdir.iterdir()}
     assert {"sweep.wav", "sweep.wav.json", "sweep-inverse.wav",
-            "take01.wav", "take02.wav"} <= names
+            "takes.pdea", "takes.pdea.json"} <= names
+    assert not [n for n in names if n.startswith("take0")]  # archive only
 
     # the measured curve is the chain, up to a constant gain
     freqs = np.asarray(r["data"]["freq_hz"])
@@ -182,6 +184,7 @@ def test_auto_level_starts_quiet_and_lands_in_window(tmp_path):
     vol = json.loads((state / "volume.json").read_text())["cubic"]
     assert vol == pytest.approx(0.30, abs=1e-3)   # restored to listening level
     assert auto["final"] > 0.30                   # the sweep itself ran hotter
+    assert "chirp probe), retrying the take" in proc.stdout
     log = json.loads((state / "volume_log.json").read_text())
     assert log[0]["cubic"] == pytest.approx(ms.AUTO_START_VOLUME, abs=1e-3)
     assert log[-1]["cubic"] == pytest.approx(0.30, abs=1e-3)   # last = restore
@@ -201,10 +204,41 @@ def test_auto_level_converges_on_a_nonlinear_gain(tmp_path):
     # the ceiling lifted past its start (the device needed more than 80%)
     assert r["levels"]["auto_level"]["final"] > ms.AUTO_EXPLORE_CEIL
     # the accepted level must not be a clipped one
-    outdir = next((tmp_path / "takes").iterdir())
-    import soundfile as sf
-    x, _ = sf.read(str(outdir / "take01.wav"), always_2d=True)
-    assert float(np.max(np.abs(x[:, 0]))) < ms.FULLSCALE
+    from perdeviceeq.take_archive import TakeArchive
+    arc = TakeArchive.open(str(next((tmp_path / "takes").iterdir())))
+    [kept] = arc.find("take", take=1)
+    assert float(np.max(np.abs(arc.column(kept["index"], 0)))) \
+        < ms.FULLSCALE
+
+
+def test_auto_level_learns_the_volume_law(tmp_path):
+    proc, _, _ = run_measure(tmp_path, ["--auto-level", "--rig", "bench"])
+    assert proc.returncode == 0, proc.stderr
+    state = json.loads((tmp_path / "home" / ".config" / "per-device-eq"
+                        / "measure-state.json").read_text())
+    law = state["test_sink"]["laws"]["test_source"]["bench"]
+    assert law["slope"] == pytest.approx(3.0, abs=0.3)
+
+    proc, out, _ = run_measure(tmp_path, ["--auto-level", "--rig", "bench"])
+    assert proc.returncode == 0, proc.stderr
+    assert "start at the learned level" in proc.stdout
+    assert "auto-level: sink volume" not in proc.stdout     # no probe
+    auto = json.loads(out.read_text())["levels"]["auto_level"]
+    assert auto["predicted"] is True and auto["adjustments"] == 0
+    # another rig has not learned anything yet: the quiet start
+    proc, out, _ = run_measure(tmp_path, ["--auto-level", "--rig", "other"])
+    assert proc.returncode == 0, proc.stderr
+    assert json.loads(out.read_text())["levels"]["auto_level"]["initial"] \
+        == pytest.approx(ms.AUTO_START_VOLUME, abs=1e-3)
+
+
+def test_sweep_probes_level_on_the_measurement_sweep(tmp_path):
+    proc, out, _ = run_measure(tmp_path, ["--auto-level", "--sweep-probes"])
+    assert proc.returncode == 0, proc.stderr
+    assert "sweep probe), retrying the take" in proc.stdout
+    assert "chirp probe" not in proc.stdout
+    auto = json.loads(out.read_text())["levels"]["auto_level"]
+    assert auto["probes"] == 0 and auto["in_window"] is True
 
 
 def test_without_auto_level_volume_is_never_written(tmp_path):
@@ -217,18 +251,26 @@ def test_without_auto_level_volume_is_never_written(tmp_path):
 # --- capture sanity: a dropout is repaired, a fault aborts -----------------
 
 def test_raw_capture_dump_keeps_the_pre_repair_capture(tmp_path):
-    # --raw-capture-dump keeps the untouched capture (glitch evidence)
-    # while the saved take is post-repair and clean
+    # the take archive keeps the untouched capture (glitch evidence)
+    # while the saved take is post-repair and clean; --raw-capture-dump
+    # adds the auto-level probes' captures
     proc, out, state = run_measure(
-        tmp_path, ["--takes", "1", "--raw-capture-dump"],
+        tmp_path, ["--takes", "1", "--raw-capture-dump", "--auto-level",
+                   "--take-wavs"],
         env_extra={"PDE_SHIM_NAN_CH": "0", "PDE_SHIM_NAN_AT_START": "1"})
     assert proc.returncode == 0, proc.stderr
     import soundfile as sf
+    from perdeviceeq.take_archive import TakeArchive
     outdir = next((tmp_path / "takes").iterdir())
     take, _ = sf.read(str(outdir / "take01.wav"), always_2d=True)
-    raw, _ = sf.read(str(outdir / "raw01.wav"), always_2d=True)
+    arc = TakeArchive.open(str(outdir))
+    [kept] = arc.find("take", take=1)
+    raw = arc.frames(kept["index"])
     assert np.isfinite(take[:, 0]).all()          # analyzed take is clean
     assert not np.isfinite(raw[:, 0]).all()        # raw keeps the glitch
+    assert kept["repaired"] == 1
+    assert arc.find("probe")                       # the chirps, too
+    assert not list(outdir.glob("raw*.wav"))       # no second copy
 
 
 def test_capture_uses_raw_flag(tmp_path):
@@ -252,7 +294,8 @@ def test_glitch_on_unanalyzed_channel_is_reported(tmp_path):
 def test_isolated_dropout_is_repaired(tmp_path):
     # one NaN sample (a capture xrun) must be interpolated, not fatal,
     # and the saved take must come out finite
-    proc, out, state = run_measure(tmp_path, ["--takes", "1"],
+    proc, out, state = run_measure(tmp_path, ["--takes", "1",
+                                              "--take-wavs"],
                                    env_extra={"PDE_SHIM_NAN_CH": "0"})
     assert proc.returncode == 0, proc.stderr
     assert "interpolated" in proc.stderr
@@ -445,3 +488,42 @@ def test_capture_glitch_probe_runs_against_shims(tmp_path):
     assert r.returncode == 0, r.stderr
     assert "1/1 runs had non-finite samples" in r.stdout
     assert "dropout" in r.stdout
+
+
+def test_adaptive_sweep_plans_then_reuses_the_cache(tmp_path):
+    env = {"HOME": str(tmp_path / "home")}       # MeasureMemory lives here
+    proc, out, _ = run_measure(tmp_path, ["--adaptive-sweep",
+                                          "--samples", "131072"],
+                               env_extra=env)
+    assert proc.returncode == 0, proc.stderr
+    assert "adaptive sweep: SNR" in proc.stdout        # probed once
+    assert "Sweep plan  :" in proc.stdout
+    plan = json.loads(out.read_text())["levels"]["sweep_plan"]
+    state = json.loads((tmp_path / "home" / ".config" / "per-device-eq"
+                        / "measure-state.json").read_text())
+    assert state["test_sink"]["sweeps"]["test_source"] == plan
+
+    proc, out, _ = run_measure(tmp_path, ["--adaptive-sweep"],
+                               env_extra=env)
+    assert proc.returncode == 0, proc.stderr
+    assert "adaptive sweep: SNR" not in proc.stdout    # the cache held
+    r = json.loads(out.read_text())
+    assert r["takes"]["count"] == plan["repeats"] == ms.TRUSTED_TAKES
+    assert r["levels"]["sweep_plan"]["samples"] == plan["samples"]
+
+
+def test_adaptive_sweep_takes_the_plans_repeats(tmp_path):
+    """A noisy room's plan counts on averaging: past the longest sweep
+    it asks for more than TRUSTED_TAKES takes, and the runner records
+    that many -- not --takes -- so the announced time holds."""
+    proc, out, _ = run_measure(
+        tmp_path, ["--adaptive-sweep", "--samples", "131072"],
+        env_extra={"HOME": str(tmp_path / "home"),
+                   "PDE_SHIM_NOISE": "2.5e-4"}, input_text="\n" * 8)
+    assert proc.returncode == 0, proc.stderr
+    r = json.loads(out.read_text())
+    plan = r["levels"]["sweep_plan"]
+    assert plan["samples"] == ms.SWEEP_MAX_N
+    assert plan["repeats"] > ms.TRUSTED_TAKES
+    assert r["takes"]["count"] == plan["repeats"]
+    assert "take %d/%d" % (plan["repeats"], plan["repeats"]) in proc.stdout
@@ -9,6 +9,7 @@ contract itself is pinned by test_measure_run.py; this file pins the
 API shapes and the accumulation semantics.
 """
 import json
+import math
 import os
 import threading
 from pathlib import Path
@@ -18,6 +19,7 @@ import pytest
 
 from perdeviceeq.pde_audit import DEMO_PROFILE, chain_curve
 from perdeviceeq import measure_session as ms
+from perdeviceeq.take_archive import TakeArchive, open_ref
 
 ROOT = Path(__file__).resolve().parent.parent
 SHIMS = ROOT / "tests" / "shims"
@@ -76,8 +78,9 @@ def test_take_spread_discard_finalize(shim_state, tmp_path):
         assert out1.take.repaired == 0
         # shim delay (~800 ms) + the wav's own 1.0 s pre-silence
         assert 1700.0 < out1.take.delay_ms < 1900.0
-        assert os.path.basename(out1.take.wav_path) == "take01.wav"
-        assert os.path.exists(out1.take.wav_path)
+        arc, ix = open_ref(out1.take.wav_path)     # the archive entry
+        assert arc.entry(ix)["take"] == 1
+        assert not list(Path(ses.outdir).glob("take*.wav"))  # no 2nd copy
         assert_matches_chain(out1.take.freq_hz, out1.take.mag_db)
         assert ses.path_clean["verified"] is True
         assert ses.path_clean["capture"]["verified"] is True
@@ -98,11 +101,12 @@ def test_take_spread_discard_finalize(shim_state, tmp_path):
         assert dropped.id == 1
         assert [r.id for r in ses.takes_of(0)] == [2]
         assert ses.spread_db(0) is None               # fan collapsed
-        assert os.path.exists(dropped.wav_path)       # evidence stays
+        assert open_ref(dropped.wav_path)[0].find("take", take=1)  # kept
 
         out3 = ses.take(0)
         assert out3.take.id == 3                      # ids never reused
-        assert os.path.basename(out3.take.wav_path) == "take03.wav"
+        arc, ix = open_ref(out3.take.wav_path)
+        assert arc.entry(ix)["take"] == 3
         assert out3.spread_db is not None
 
     # bypass restored verbatim on exit
@@ -598,6 +602,44 @@ def test_driver_judges_bandwidth_not_the_ceiling(shim_state, tmp_path):
         assert drv[1] > 4.0          # ~5 octaves of bass won back
 
 
+def test_spread_sums_match_the_stack_leave_one_out():
+    """The running sums answer what the take stack does -- every
+    leave-one-out spread, including leaving out the one take whose
+    unknown gain had switched compensation off -- and keep doing so
+    through discards and re-adds."""
+    rng = np.random.default_rng(11)
+    freqs = ms.mc.log_grid()
+    recs = [ms.TakeRecord(k, 0, freqs,
+                          70.0 + rng.standard_normal(len(freqs)),
+                          5.0, 50.0, -6.0, 0, 0, None,
+                          soft_vol=(None if k == 3
+                                    else float(rng.uniform(0.1, 1.0))))
+            for k in range(8)]
+
+    def stack(ids):
+        mags = [r.mag_db for r in recs if r.id in ids]
+        f = ms.gain_comp_factors([r.soft_vol for r in recs
+                                  if r.id in ids])
+        if f is not None:
+            mags = [m + 20.0 * math.log10(k) for m, k in zip(mags, f)]
+        return np.vstack(mags).std(axis=0, ddof=1)
+
+    sums = ms.SpreadSums()
+    for r in recs:
+        sums.add(r.id, r.mag_db, r.soft_vol)
+    ids = {r.id for r in recs}
+    assert np.abs(sums.spread() - stack(ids)).max() < 1e-9
+    for r in recs:
+        assert np.abs(sums.spread(r.id)
+                      - stack(ids - {r.id})).max() < 1e-9
+    sums.remove(3)                   # compensation comes back on
+    sums.remove(5)
+    assert np.abs(sums.spread() - stack(ids - {3, 5})).max() < 1e-9
+    sums.sync((r.id, r.mag_db, r.soft_vol) for r in recs[:2])
+    assert len(sums) == 2 and sums.spread(0) is None
+    assert np.abs(sums.spread() - stack({0, 1})).max() < 1e-9
+
+
 def test_trusted_floor_follows_the_statistics(shim_state, tmp_path):
     """Mirror of the ceiling: a bass cliff (leaky seal every other
     take) lifts the floor to its edge; a mid-band island does not."""
@@ -719,7 +761,7 @@ def test_ephemeral_outdir_wiped_and_takes_stamped(shim_state, tmp_path):
         assert out and os.path.isdir(out)
         ses.take(0)
         ses.take(1, analyze=0)           # right cup on the left mic
-        assert (Path(out) / "take01.wav").exists()
+        assert TakeArchive.open(out).find("take", take=1)
         r0 = ses.takes_of(0)[0]
         r1 = ses.takes_of(1)[0]
         assert r0.capture_channel == 0
@@ -826,3 +868,194 @@ def test_take_fails_honestly_when_an_end_left(shim_state, tmp_path,
         with pytest.raises(ms.MeasureError,
                            match="failed to open"):
             ses.take(0)
+
+
+# --- adaptive sweep length ------------------------------------------------
+
+def test_plan_sweep_trades_length_for_noise():
+    fixed = ms.take_seconds(ms.mc.DEFAULT_N, 48000, 1.0, 0.5)
+    # the protocol room: exactly the target at the default sweep
+    p = ms.plan_sweep(41.0)
+    assert (p.samples, p.repeats) == (ms.mc.DEFAULT_N, ms.TRUSTED_TAKES)
+    assert p.time_to_trusted_s == pytest.approx(3 * fixed)
+    assert p.default_s == pytest.approx(p.time_to_trusted_s)
+    # a quiet room: shorter sweeps, same quality bar, less time
+    q = ms.plan_sweep(60.0)
+    assert q.samples == ms.SWEEP_MIN_N
+    assert q.predicted_db >= q.target_db
+    assert q.time_to_trusted_s < q.default_s
+    # a noisy room: longer sweeps first (cheaper than more takes)
+    n = ms.plan_sweep(36.0)
+    assert n.samples > ms.mc.DEFAULT_N
+    assert n.predicted_db >= n.target_db
+    assert n.time_to_trusted_s < n.default_s
+    # past the longest sweep, takes are added; hopeless is said so
+    m = ms.plan_sweep(33.0)
+    assert m.samples == ms.SWEEP_MAX_N and m.repeats > ms.TRUSTED_TAKES
+    assert m.reaches
+    h = ms.plan_sweep(10.0)
+    assert not h.reaches and h.repeats == ms.SWEEP_MAX_REPEATS
+    # never slower than the fixed sweep wherever the target is reachable
+    for snr in range(34, 80, 3):
+        p = ms.plan_sweep(float(snr))
+        assert p.time_to_trusted_s <= p.default_s + 1e-9
+    assert ms.SweepPlan.from_dict(q.as_dict()).samples == q.samples
+    assert ms.SweepPlan.from_dict({"samples": 7}) is None
+
+
+def test_adaptive_sweep_probes_once_then_measures(shim_state, tmp_path):
+    ses = ms.MeasureSession(make_cfg(tmp_path, adaptive_sweep=True))
+    assert ses.planned_takes(1) == 1          # no plan yet
+    with ses:
+        probe = ses.take(0)
+        assert probe.kind == "level_probe"
+        plan = probe.level["sweep_plan"]
+        assert ses.planned_takes(1) == plan["repeats"] == ms.TRUSTED_TAKES
+        assert ses.planned_takes(5) == 5
+        # the shim room is quiet (SNR ~50 dB): the shortest sweep does
+        assert plan["samples"] == ms.SWEEP_MIN_N
+        assert plan["time_to_trusted_s"] < plan["default_s"]
+        assert probe.level["volume_to"] == probe.level["volume_from"]
+        out = ses.take(0)
+        assert out.kind == "take"
+        assert ses.sweep.n_samples == ms.SWEEP_MIN_N
+        assert ses.take(0).kind == "take"     # planned once, not per take
+        res = ses.finalize(0)
+    assert res["takes"]["count"] == 2
+    assert res["levels"]["sweep_plan"]["samples"] == ms.SWEEP_MIN_N
+    assert_matches_chain(res["data"]["freq_hz"], res["data"]["mag_db_raw"])
+
+
+def test_cached_sweep_plan_skips_the_probe(shim_state, tmp_path):
+    cached = ms.plan_sweep(51.0).as_dict()
+    ses = ms.MeasureSession(make_cfg(tmp_path, adaptive_sweep=True,
+                                     sweep_plan=cached))
+    assert ses.sweep.n_samples == cached["samples"]
+    with ses:
+        assert ses.take(0).kind == "take"
+    # a cache from a much quieter room is re-derived on the first sweep
+    stale = dict(cached, snr_db=80.0, samples=ms.SWEEP_MAX_N // 2)
+    ses = ms.MeasureSession(make_cfg(tmp_path, adaptive_sweep=True,
+                                     sweep_plan=stale))
+    with ses:
+        out = ses.take(0)
+        assert out.kind == "level_probe"
+        assert out.level["sweep_plan"]["samples"] == ms.SWEEP_MIN_N
+
+
+def test_fit_volume_law_and_its_inverse():
+    cube = [(v, -10.0 + 60.0 * np.log10(v)) for v in (0.2, 0.4, 0.8)]
+    law = ms.fit_volume_law(cube)
+    assert law["slope"] == pytest.approx(3.0, abs=1e-3)
+    assert law["offset_db"] == pytest.approx(-10.0, abs=0.01)
+    assert law["points"] == 3
+    assert ms.law_volume(law, -10.0 + 60.0 * np.log10(0.5)) \
+        == pytest.approx(0.5, abs=1e-3)
+    # one probe: the offset under the prior's slope; junk is left out
+    one = ms.fit_volume_law([(0.5, -12.0), (0.9, float("nan")),
+                             (0.02, -90.0)], prior={"slope": 2.0})
+    assert one["slope"] == 2.0 and one["points"] == 1
+    assert ms.law_volume(one, -12.0) == pytest.approx(0.5, abs=1e-3)
+    assert ms.fit_volume_law([]) is None
+    assert ms.law_volume({"slope": "x"}, -10.0) is None
+
+
+def test_learned_law_levels_on_the_first_probe(shim_state, tmp_path):
+    first = ms.MeasureSession(make_cfg(tmp_path, samples=65536,
+                                       auto_level=True))
+    with first:
+        while first.take(0).kind != "take":
+            pass
+    law = first.volume_law
+    assert law["slope"] == pytest.approx(3.0, abs=0.3)   # the shim's cube
+
+    ses = ms.MeasureSession(make_cfg(tmp_path, samples=65536,
+                                     auto_level=True, volume_law=law))
+    with ses:
+        out = ses.take(0)
+    assert out.kind == "take"                  # no bracketing at all
+    auto = ses.finalize(0)["levels"]["auto_level"]
+    assert auto["predicted"] is True
+    assert auto["adjustments"] == 0
+    assert auto["initial"] == pytest.approx(
+        ms.law_volume(law, ms.AUTO_LAW_AIM), abs=1e-3)
+    assert auto["law"]["points"] == 1
+
+
+def test_stale_law_corrects_once_then_brackets(shim_state, tmp_path):
+    # the mic moved: the cached law reads 20 dB hot, so its start is far
+    # too quiet -- one re-anchored step, not the slow ramp, finds it
+    law = {"offset_db": 20.0, "slope": 3.0, "points": 3}
+    ses = ms.MeasureSession(make_cfg(tmp_path, samples=65536,
+                                     auto_level=True, volume_law=law))
+    kinds = []
+    with ses:
+        while len(kinds) < ms.AUTO_MAX_ADJUST + 2:
+            kinds.append(ses.take(0).kind)
+            if kinds[-1] == "take":
+                break
+    assert kinds == ["level_probe", "take"]
+    assert ses.volume_law["offset_db"] < law["offset_db"] - 10.0
+
+    # a clipping start has no peak to anchor: plain back-off
+    ctl = ms.AutoLevel(law=law)
+    ctl.observe(0.5, 0.0, None, True)
+    assert ctl.next_volume(0.5, 0.0) == pytest.approx(
+        0.5 * ms.AUTO_CLIP_BACKOFF)
+
+
+def test_level_probes_are_short_chirps_verified_by_the_sweep(shim_state,
+                                                             tmp_path):
+    ses = ms.MeasureSession(make_cfg(tmp_path, auto_level=True))
+    assert ses.probe_duration < ses.wav_duration / 2
+    probes = []
+    with ses:
+        while True:
+            out = ses.take(0)
+            if out.kind != "level_probe":
+                break
+            probes.append(out.level["probe"])
+    assert out.kind == "take"
+    assert probes and set(probes) == {"chirp"}
+    assert ms.AUTO_PEAK_FLOOR <= out.take.peak_dbfs <= ms.AUTO_PEAK_CEIL
+    auto = ses.finalize(0)["levels"]["auto_level"]
+    assert auto["probes"] == len(probes) + 1        # + the one that locked
+    assert abs(auto["probe_error_db"]) < 3.0        # the chirp predicts
+
+
+def test_a_miscalibrated_probe_is_caught_by_the_sweep(shim_state, tmp_path):
+    ses = ms.MeasureSession(make_cfg(tmp_path, auto_level=True))
+    kinds = []
+    with ses:
+        ses._probe_offset = 9.0             # probes read 9 dB too hot
+        for _ in range(2 * ms.AUTO_MAX_ADJUST):
+            out = ses.take(0)
+            kinds.append((out.level or {}).get("probe", out.kind))
+            if out.kind == "take":
+                break
+    assert kinds[-1] == "take"
+    assert "sweep" in kinds                 # the sweep refused the level
+    assert ms.AUTO_PEAK_FLOOR <= out.take.peak_dbfs <= ms.AUTO_PEAK_CEIL
+    # the offset was corrected by the miss, then verified small
+    assert abs(ses._probe_offset) < 3.0
+    assert abs(ses.finalize(0)["levels"]["auto_level"]["probe_error_db"]) \
+        < 3.0
+
+
+def test_every_sweep_lands_once_in_the_take_archive(shim_state, tmp_path):
+    ses = ms.MeasureSession(make_cfg(tmp_path, take_wavs=True))
+    with ses:
+        t1 = ses.take(0).take
+        t2 = ses.take(0, analyze=0).take
+        outdir = ses.outdir
+    arc = TakeArchive.open(outdir)
+    assert [e["take"] for e in arc.find("take")] == [t1.id, t2.id]
+    e = arc.find("take", take=t2.id)[0]
+    assert e["signal"]["n_samples"] == ses.sweep.n_samples
+    assert e["channels"] == 1 and e["rate"] == ses.sweep.fs
+    assert t2.wav_path == arc.ref(e["index"])
+    # take_wavs: the opt-in export holds the same (here unrepaired) data
+    import soundfile as sf
+    wav, _ = sf.read(os.path.join(outdir, "take%02d.wav" % t2.id),
+                     always_2d=True)
+    assert np.array_equal(arc.frames(e["index"]), wav.astype("<f4"))
@@ -91,3 +91,175 @@ def test_hook_protocol_states(monkeypatch):
 
     monkeypatch.setattr(pipewire, "_run", fake(""))
     assert pipewire.hook_protocol() == (False, None)
+
+
+def test_metadata_writer_coalesces_and_keeps_order():
+    import threading
+    import pytest
+    busy, gate = threading.Event(), threading.Event()
+    seen = []
+
+    def slow_set(node, graph):
+        busy.set()
+        gate.wait(5)                    # hold the first delivery in flight
+        seen.append((node, graph))
+        return node != "bad"
+
+    w = pipewire.MetadataWriter(set_fn=slow_set,
+                                clear_fn=lambda n: seen.append((n, None))
+                                or True)
+    w.set("a", "g0")
+    assert busy.wait(5)
+    for k in range(1, 30):              # a drag: 29 graphs for one sink
+        w.set("a", "g%d" % k)
+    w.set("b", "x")
+    w.clear("c")
+    w.set("bad", "y")
+    w.set("b", "x2")                    # b's latest write is now last
+    gate.set()
+    assert w.flush(5)
+    # every node once with its latest value, in the order of those
+    # latest writes -- the last value asked for is the one that sticks
+    assert seen == [("a", "g0"), ("a", "g29"), ("c", None), ("bad", "y"),
+                    ("b", "x2")]
+    st = w.stats()
+    assert st["writes"] == 34 and st["pending"] == 0
+    assert st["coalesced"] == 29 and st["failed"] == 1
+    assert st["delivered"] == 4 and w.results["bad"] is False
+    assert st["latency_ms"]["max"] >= st["latency_ms"]["p50"] > 0
+    w.close()
+    with pytest.raises(RuntimeError):
+        w.set("a", "late")
+
+
+def test_audition_bounds_the_rate_and_keeps_the_last_position():
+    t = [0.0]
+    sent, built = [], []
+
+    class W:
+        def set(self, node, graph):
+            sent.append((node, graph))
+
+        def clear(self, node):
+            sent.append((node, None))
+
+    def builder(k):
+        return lambda: built.append(k) or ("g%d" % k if k != 99 else None)
+
+    # binary-exact steps: 32 Hz, motion every 1/128 s
+    au = pipewire.Audition(writer=W(), hz=32, clock=lambda: t[0])
+    assert au.offer("a", builder(0)) is False     # first one goes at once
+    for k in range(1, 40):                        # 40 motion events
+        t[0] += 1 / 128
+        au.offer("a", builder(k))
+    # one publish per interval, only the builders that got sent ran
+    assert sent == [("a", "g0"), ("a", "g4"), ("a", "g8"), ("a", "g12"),
+                    ("a", "g16"), ("a", "g20"), ("a", "g24"), ("a", "g28"),
+                    ("a", "g32"), ("a", "g36")]
+    assert built == [0, 4, 8, 12, 16, 20, 24, 28, 32, 36]
+    assert au.tick() is True                      # g39 waits for its slot
+    t[0] += 4 / 128
+    assert au.tick() is False and sent[-1] == ("a", "g39")
+    assert au.offered == 40 and au.published == 11
+    t[0] += 1 / 128
+    au.offer("a", builder(99))                    # bypassed mid-drag
+    au.cancel()                                   # ... and the commit won
+    t[0] += 1.0
+    assert au.tick() is False and sent[-1] == ("a", "g39")
+    au.offer("a", builder(99))
+    assert sent[-1] == ("a", None)
+
+
+def test_metadata_writer_against_the_shim(tmp_path, monkeypatch):
+    import json
+    import os
+    from pathlib import Path
+    shims = Path(__file__).resolve().parent / "shims"
+    state = tmp_path / "state"
+    state.mkdir()
+    (state / "metadata.json").write_text(json.dumps({"gone": "old"}))
+    monkeypatch.setenv("PDE_SHIM_DIR", str(state))
+    monkeypatch.setenv("PATH", "%s%s%s" % (shims, os.pathsep,
+                                           os.environ["PATH"]))
+    w = pipewire.MetadataWriter()
+    for k in range(12):
+        w.set("sink_a", "{ graph %d }" % k)
+    w.set("sink_b", "{ b }")
+    w.clear("gone")
+    assert w.close(60)
+    assert json.loads((state / "metadata.json").read_text()) == \
+        {"sink_a": "{ graph 11 }", "sink_b": "{ b }"}
+    st = w.stats()
+    assert st["failed"] == 0 and st["delivered"] < 14   # spawns coalesced
+    assert w.results == {"sink_a": True, "sink_b": True, "gone": True}
+
+
+def _shim_env(tmp_path, monkeypatch, meta):
+    import json
+    import os
+    from pathlib import Path
+    shims = Path(__file__).resolve().parent / "shims"
+    state = tmp_path / "state"
+    state.mkdir()
+    (state / "metadata.json").write_text(json.dumps(meta))
+    monkeypatch.setenv("PDE_SHIM_DIR", str(state))
+    monkeypatch.setenv("PATH", "%s%s%s" % (shims, os.pathsep,
+                                           os.environ["PATH"]))
+    return state
+
+
+def test_metadata_writer_batches_many_devices(tmp_path, monkeypatch):
+    """An --apply over many devices: a protocol-2 hook takes them in one
+    pw-metadata write (plus the protocol read); an older hook is fed
+    key by key, and a batch too big for one argv is cut."""
+    import json
+    state = _shim_env(tmp_path, monkeypatch,
+                      {"protocol": "2", "gone": "old"})
+    changes = {"sink_%02d" % i: "{ graph %d }" % i for i in range(20)}
+    changes["gone"] = None
+    w = pipewire.MetadataWriter(batch_fn=pipewire.metadata_batch)
+    w.set_many(changes)
+    assert w.close(60)
+    meta = json.loads((state / "metadata.json").read_text())
+    assert meta == dict({k: v for k, v in changes.items() if v},
+                        protocol="2")
+    calls = json.loads((state / "metadata_calls.json").read_text())
+    assert len(calls) == 2                      # protocol read + one batch
+    assert w.results == {k: True for k in changes}
+    assert w.stats()["delivered"] == 21
+
+    # too big for one argv string: several writes, every key lands
+    monkeypatch.setattr(pipewire, "BATCH_MAX_BYTES", 120)
+    w = pipewire.MetadataWriter(batch_fn=pipewire.metadata_batch)
+    w.set_many({k: "{ again }" for k in changes})
+    assert w.close(60)
+    meta = json.loads((state / "metadata.json").read_text())
+    assert meta == dict({k: "{ again }" for k in changes}, protocol="2")
+    calls = json.loads((state / "metadata_calls.json").read_text())
+    assert 4 < len(calls) - 2 < 21
+
+    # a pre-batch hook (no stamp): one write per device, as before
+    (state / "metadata.json").write_text(json.dumps({"gone": "old"}))
+    (state / "metadata_calls.json").unlink()
+    w = pipewire.MetadataWriter(batch_fn=pipewire.metadata_batch)
+    w.set_many(changes)
+    assert w.close(60)
+    meta = json.loads((state / "metadata.json").read_text())
+    assert meta == {k: v for k, v in changes.items() if v}
+    calls = json.loads((state / "metadata_calls.json").read_text())
+    assert len(calls) == 1 + 21
+    assert w.results == {k: True for k in changes}
+
+
+def test_the_hook_speaks_our_protocol():
+    """The shipped hook and config agree on the protocol stamp and the
+    batch key (they are bumped together by hand)."""
+    import re
+    from pathlib import Path
+    from perdeviceeq import config
+    lua = (Path(__file__).resolve().parent.parent / "wireplumber"
+           / config.WP_SCRIPT_NAME).read_text()
+    assert re.search(r'local PROTOCOL = "([^"]+)"', lua).group(1) \
+        == config.PROTOCOL
+    assert re.search(r'local BATCH = "([^"]+)"', lua).group(1) \
+        == config.BATCH_KEY
@@ -154,3 +154,102 @@ def test_edited_mark_is_derived_from_the_fit_output():
     # and riding the preamp on a fitted profile stays clean
     quiet = profiles.editor_body(dict(body, preamp=-6.2), cold)
     assert quiet["fit"]["edited"] is False
+
+
+def test_graph_cache_follows_saves_and_feeds_apply(tmp_path, monkeypatch):
+    from perdeviceeq import cli, eq, preferences
+    monkeypatch.setattr(preferences, "PREF_LAYERS_FILE",
+                        str(tmp_path / "layers.json"))
+    st = _store(tmp_path, monkeypatch)
+    body = dict(mig.migrate_body(_v2()), version=profiles.SCHEMA_VERSION)
+    pid = st.save_user(body)
+    st.set_binding("sink.a", pid)
+    cache = profiles.GraphCache()
+    assert cache.path == str(tmp_path / profiles.GRAPH_CACHE_NAME)
+    want = eq.profile_graph(st.get(pid))
+    assert cache.lookup("sink.a", pid)["graph"] == want
+
+    pushed = {}
+
+    class Writer:
+        results = {}
+
+        def set(self, node, graph):
+            pushed[node] = graph
+            self.results[node] = True
+
+        def clear(self, node):
+            pushed[node] = None
+
+        def set_many(self, changes):
+            for node, graph in changes.items():
+                if graph is None:
+                    self.clear(node)
+                else:
+                    self.set(node, graph)
+
+        def flush(self):
+            pass
+
+    loads = []
+
+    class Store(profiles.ProfileStore):
+        def __init__(self):
+            loads.append(1)
+            super().__init__()
+
+    monkeypatch.setattr(cli, "metadata_writer", Writer)
+    monkeypatch.setattr(cli, "ProfileStore", Store)
+    assert cli.cmd_apply() == 0
+    assert pushed == {"sink.a": want} and not loads   # all hits
+
+    # rewritten behind the store with the same sound: settled by sha,
+    # restamped, the graph kept
+    path = tmp_path / ("%s.json" % pid)
+    raw = json.loads(path.read_text())
+    raw["name"] = "renamed"
+    path.write_text(json.dumps(raw))
+    assert profiles.GraphCache().lookup("sink.a", pid) is None
+    assert cli.cmd_apply() == 0 and pushed["sink.a"] == want
+    assert len(loads) == 1
+    assert profiles.GraphCache().lookup("sink.a", pid) is not None
+    # an active taste layer stays out of a plain --apply (the bound
+    # profile as saved, all hits) ...
+    layers = preferences.PreferenceLayers()
+    lid = layers.upsert({"name": "bass", "bands": [
+        {"type": "LSC", "freq": 100, "gain": 4.0, "q": 0.7}]})
+    layers.set_active(lid)
+    assert cli.cmd_apply() == 0 and len(loads) == 1
+    assert pushed["sink.a"] == want
+    # ... and --with-taste is a different sound: rebuilt with it
+    assert cli.cmd_apply(taste=True) == 0 and len(loads) == 2
+    assert pushed["sink.a"] == eq.profile_graph(
+        st.get(pid), extra=layers.active_bands())
+    assert cli.cmd_apply(taste=True) == 0 and len(loads) == 2
+    st.save_user(dict(st.get(pid), preamp=-3.0))     # the store stays
+    assert profiles.GraphCache().lookup("sink.a", pid)["taste_id"] is None
+    # unbinding drops the entry
+    st.set_binding("sink.a", None)
+    assert "sink.a" not in profiles.GraphCache().nodes
+
+
+def test_graph_cache_from_another_build_is_a_miss(tmp_path, monkeypatch):
+    """An upgrade may change what profile_graph emits: entries compiled
+    by another build are never served, whatever their stamps say."""
+    from perdeviceeq import eq
+    st = _store(tmp_path, monkeypatch)
+    body = dict(mig.migrate_body(_v2()), version=profiles.SCHEMA_VERSION)
+    pid = st.save_user(body)
+    st.set_binding("sink.a", pid)
+    path = tmp_path / profiles.GRAPH_CACHE_NAME
+    data = json.loads(path.read_text())
+    assert data["build"] == profiles.GRAPH_CACHE_BUILD
+    data["build"] = "0.0.0"
+    data["nodes"]["sink.a"]["graph"] = "an old format"
+    path.write_text(json.dumps(data))
+    cache = profiles.GraphCache()
+    assert cache.lookup("sink.a", pid) is None
+    e = cache.refresh("sink.a", st.get(pid))
+    assert e["graph"] == eq.profile_graph(st.get(pid))
+    cache.save()
+    assert profiles.GraphCache().lookup("sink.a", pid)["graph"] == e["graph"]
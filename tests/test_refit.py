@@ -137,6 +137,49 @@ def test_mixed_cals_within_channel_calibrate_per_take():
     assert np.allclose(d["spread_db"], 0.0, atol=1e-6)
 
 
+def test_interleaved_canvas_matches_the_per_take_pipeline():
+    """Many takes, channels interleaved, cals shared and missing:
+    the stacked reconstruction answers what the per-take pipeline
+    (gain shift, apply_mic_cal, power mean, ddof=1 spread) would."""
+    rng = np.random.default_rng(5)
+    lib = {c: {"points": [[f, float(rng.normal())]
+                          for f in np.geomspace(15.0, 22000.0, 30)]}
+           for c in ("x", "y")}
+    takes = []
+    for i in range(60):
+        takes.append(_take("t%d" % i, ("FL", "FR", "C")[i % 3],
+                           3.0 * rng.standard_normal(N),
+                           soft=float(rng.uniform(0.2, 1.0)),
+                           cal_sha=("x", "y", None, "gone")[i % 4]))
+    res, used = refit.channel_results(_meas(takes, lib=lib))
+    assert used == [t["id"] for t in takes]
+    assert list(res) == ["FL", "FR", "C"]
+    for key, r in res.items():
+        mine = [t for t in takes if t["channel"] == key]
+        soft = [t["soft_vol"] for t in mine]
+        rows = []
+        for t in mine:
+            m = np.asarray(t["mag_db_uncal"]) \
+                + 20.0 * math.log10(min(soft) / t["soft_vol"])
+            pts = np.asarray((lib.get(t["cal_sha"]) or {})
+                             .get("points") or [], float)
+            if pts.size:
+                m = mc.apply_mic_cal(FREQS, m, pts[:, 0], pts[:, 1])
+            rows.append(m)
+        rows = np.array(rows)
+        want = 10.0 * np.log10(np.mean(10.0 ** (rows / 10.0), axis=0))
+        assert r["cal_shas"] == [t["cal_sha"] for t in mine]
+        assert np.abs(r["data"]["mag_db_raw"] - want).max() < 1e-9
+        assert np.abs(r["data"]["spread_db"]
+                      - rows.std(axis=0, ddof=1)).max() < 1e-9
+    # each cal went onto the grid once, and is shared read-only
+    got = [refit._cal_on_grid(lib[c], FREQS, (20.0, 20000.0, N))
+           for c in ("x", "y")]
+    assert got[0] is refit._cal_on_grid(lib["x"], FREQS,
+                                        (20.0, 20000.0, N))
+    assert not got[1].flags.writeable
+
+
 def test_take_selection_is_validated():
     m = _meas([_take("a", "FL", np.zeros(N))])
     with pytest.raises(refit.RefitError, match="unknown take"):
@@ -271,3 +314,64 @@ def test_reconstruction_matches_live_pipeline(shim_state, store,
         assert np.max(np.abs(got - want)) < 0.05
     for key in ("FL", "FR"):
         assert prof["channels"][key]["bands"]
+
+
+def test_canvas_replays_a_variable_smoothing_mode():
+    m = _prof()["measurement"]
+    box, _ids = refit.channel_results(m)
+    erb, _ids = refit.channel_results(m, smoothing="erb")
+    for key in ("FL", "FR"):
+        r = erb[key]
+        assert r["smoothing"] == {"type": "erb", "fraction": None,
+                                  "domain": "power"}
+        assert np.array_equal(r["data"]["mag_db_raw"],
+                              box[key]["data"]["mag_db_raw"])
+        want = mc.smooth_curves(r["data"]["mag_db_raw"],
+                                r["data"]["freq_hz"], "erb")
+        assert np.abs(r["data"]["mag_db_smoothed"] - want).max() < 1e-12
+        assert not np.allclose(r["data"]["mag_db_smoothed"],
+                               box[key]["data"]["mag_db_smoothed"])
+    with pytest.raises(refit.RefitError):
+        refit.channel_results(m, smoothing="gammatone")
+
+
+def test_an_added_take_refits_warm(monkeypatch):
+    from perdeviceeq import fit_peq
+    first = refit.refit_profile(_prof())
+    prof = json.loads(json.dumps(first))
+    prof["measurement"]["takes"].append(
+        _take("c", "FL", _bumpy(1000.0, 6.4)))
+    seeds = refit.warm_seeds(prof, prof["fit"]["params"])
+    assert set(seeds) == {"FL", "FR"}
+    assert all(tol is not None for _b, tol in seeds.values())
+
+    runs = []
+    real = fit_peq.fit_to_desired
+
+    def spy(*a, **k):
+        st = k["stats"] = {}
+        out = real(*a, **k)
+        runs.append(st)
+        return out
+    monkeypatch.setattr(fit_peq, "fit_to_desired", spy)
+    warm = refit.refit_profile(prof)
+    assert [r["warm"] for r in runs] == [True, True]
+    warm_runs, runs[:] = list(runs), []
+    cold = refit.refit_profile(prof, warm=False)
+    assert [r["warm"] for r in runs] == [False, False]
+    assert sum(r["evals"] for r in warm_runs) \
+        < sum(r["evals"] for r in runs)
+    assert warm["fit"]["takes"] == ["a", "b", "c"]
+    # the warm answer fits the new curve about as well as the cold
+    results, _u = refit.channel_results(prof["measurement"])
+    for key in ("FL", "FR"):
+        fg, d, _m = fit_peq.desired_curve(*fit_peq._curve(results[key]),
+                                          20.0, 12000.0)
+        assert fit_peq.seed_residual(
+            warm["channels"][key]["bands"], fg, d, 6.0) <= max(
+            fit_peq.seed_residual(cold["channels"][key]["bands"],
+                                  fg, d, 6.0),
+            fit_peq.RESID_TARGET_DB) + fit_peq.PRUNE_EPS_DB
+    # a changed budget is a new question: no seeds
+    assert refit.warm_seeds(prof, dict(prof["fit"]["params"],
+                                       bands=4)) is None
@@ -0,0 +1,127 @@
+"""The run-length toolkit (perdeviceeq/runs.py) against the loops it
+replaced.
+
+The reference scans below are the bridge's and the live session's
+former Python loops, verbatim in behaviour: random masks of every
+density (plus the degenerate ones) must give the same indices and
+the same band edges, ties and grid-edge runs included.
+"""
+import numpy as np
+
+from perdeviceeq import runs
+from perdeviceeq import measure_core as mc
+from perdeviceeq import measure_session as ms
+
+
+def _erode_ref(mask, w):
+    if w <= 0:
+        return mask.copy()
+    kern = np.ones(2 * w + 1)
+    return ~(np.convolve((~mask).astype(float), kern, mode="same")
+             > 0.0)
+
+
+def _longest_ref(mask):
+    best = None
+    i, n = 0, len(mask)
+    while i < n:
+        if mask[i]:
+            j = i
+            while j + 1 < n and mask[j + 1]:
+                j += 1
+            if best is None or j - i > best[1] - best[0]:
+                best = (i, j)
+            i = j + 1
+        else:
+            i += 1
+    return best
+
+
+def _edges_ref(f, ok, min_ratio):
+    n = len(f)
+    ceiling = float(f[0])
+    i = n - 1
+    while i >= 0:
+        if not ok[i]:
+            i -= 1
+            continue
+        j = i
+        while j >= 0 and ok[j]:
+            j -= 1
+        if j < 0 or f[i] / f[j + 1] >= min_ratio:
+            ceiling = float(f[i])
+            break
+        i = j
+    floor = float(f[-1])
+    i = 0
+    while i < n:
+        if not ok[i]:
+            i += 1
+            continue
+        j = i
+        while j < n and ok[j]:
+            j += 1
+        if j >= n or f[j - 1] / f[i] >= min_ratio:
+            floor = float(f[i])
+            break
+        i = j
+    return floor, ceiling
+
+
+def _masks(n, rng):
+    yield np.zeros(n, bool)
+    yield np.ones(n, bool)
+    one = np.zeros(n, bool)
+    one[n // 2] = True
+    yield one
+    for p in (0.1, 0.5, 0.9, 0.98):
+        for _ in range(20):
+            yield rng.random(n) < p
+
+
+def test_runs_match_the_loops():
+    rng = np.random.default_rng(3)
+    freqs = mc.log_grid(20.0, 20000.0, 24)
+    n = len(freqs)
+    ratio = 2.0 ** (1.0 / 6.0)
+    batch = []
+    for m in _masks(n, rng):
+        assert runs.longest_run(m) == _longest_ref(m)
+        for w in (0, 1, 4):
+            assert np.array_equal(runs.erode(m, w), _erode_ref(m, w))
+        assert runs.band_edges(freqs, m, ratio) == \
+            _edges_ref(freqs, m, ratio)
+        assert ms.trusted_band_hz(freqs, m) == \
+            _edges_ref(freqs, m, ratio)
+        s, e = runs.run_bounds(m)
+        assert np.array_equal(m, np.isin(
+            np.arange(n), np.concatenate(
+                [np.arange(a, b + 1) for a, b in zip(s, e)] or [[]])))
+        batch.append(m)
+    # the 2-D forms row by row
+    batch = np.array(batch)
+    lo, hi = runs.longest_runs(batch)
+    for m, a, b in zip(batch, lo, hi):
+        ref = _longest_ref(m)
+        assert (a, b) == (ref if ref else (-1, -1))
+    assert np.array_equal(runs.erode(batch, 2),
+                          np.array([_erode_ref(m, 2) for m in batch]))
+
+
+def test_erode_takes_per_point_widths():
+    """A variable-width window: point i keeps its mark only if its own
+    [i - w_i, i + w_i] span is clean; a constant array is the scalar."""
+    rng = np.random.default_rng(5)
+    n = 97
+    for m in _masks(n, rng):
+        w = rng.integers(0, 6, n)
+        ref = np.array([m[max(0, i - w[i]):i + w[i] + 1].all()
+                        for i in range(n)])
+        assert np.array_equal(runs.erode(m, w), ref)
+        assert np.array_equal(runs.erode(m, np.full(n, 3)),
+                              runs.erode(m, 3))
+    two = np.array([rng.random(n) < 0.9 for _ in range(4)])
+    ws = rng.integers(0, 4, (4, n))
+    assert np.array_equal(runs.erode(two, ws),
+                          np.array([runs.erode(r, w)
+                                    for r, w in zip(two, ws)]))
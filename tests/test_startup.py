@@ -0,0 +1,72 @@
+"""Headless startup stays light: the import-time budget of the CLI.
+
+`--apply` runs from login scripts and next to WirePlumber; `--list-*`
+and `--inspect` are what people script against. Each is run here as
+the real launcher under `python -X importtime` (the PipeWire CLIs
+faked by tests/shims/, HOME a temp dir) and must import neither GTK
+nor NumPy/SciPy. That module set is the hard guard: it trips on a
+heavy import slipping back to module level whatever the machine.
+The clock is only a backstop against import-time work (a table
+built, a file parsed at module level): the command is run once to
+warm the bytecode cache, then the measured run must stay within
+IMPORT_BUDGET_S of cumulative import time -- about fifty times what
+it costs warm on a laptop, since a cold cache alone is several times
+the warm figure and a loaded CI container slower again.
+The measurement modules keep SciPy off their own import path too:
+importing the trust report (which pulls the whole canvas pipeline)
+must not load scipy.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+SHIMS = ROOT / "tests" / "shims"
+HEAVY = ("numpy", "scipy", "gi", "soundfile")
+IMPORT_BUDGET_S = 1.0         # warm cache; the module set is the guard
+
+
+def _importtime(args, tmp_path):
+    env = os.environ.copy()
+    env["HOME"] = str(tmp_path)
+    env["PATH"] = str(SHIMS) + os.pathsep + env.get("PATH", "")
+    env["PDE_SHIM_DIR"] = str(tmp_path / "shim")
+    env["PDE_SHIM_REPO"] = str(ROOT)
+    p = subprocess.run(
+        [sys.executable, "-X", "importtime", str(ROOT / "per-device-eq.py")]
+        + args, env=env, capture_output=True, text=True, timeout=60)
+    mods, total_us = [], 0
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cum, name = line[len("import time:"):].split("|")
+        if not cum.strip().isdigit():
+            continue                     # the header row
+        mods.append(name.strip())
+        if not name.startswith("  "):    # top level: cumulative
+            total_us += int(cum)
+    return p, mods, total_us / 1e6
+
+
+@pytest.mark.parametrize("args", [["--list-profiles"], ["--list-sinks"],
+                                  ["--list-sources"], ["--apply"],
+                                  ["--inspect", "test_sink"]])
+def test_headless_commands_stay_light(args, tmp_path):
+    _importtime(args, tmp_path)          # warm-up: bytecode cache
+    p, mods, total = _importtime(args, tmp_path)
+    assert "perdeviceeq" in mods, p.stderr[-2000:]
+    heavy = sorted({m for m in mods if m.split(".")[0] in HEAVY})
+    assert not heavy, "%s imported %s" % (args, heavy)
+    assert total < IMPORT_BUDGET_S, "%s: %.3f s of imports" % (args, total)
+
+
+def test_measurement_modules_leave_scipy_to_first_use():
+    code = ("import sys; import perdeviceeq.trust, perdeviceeq.bridge; "
+            "print(sorted(m for m in sys.modules "
+            "if m.split('.')[0] == 'scipy'))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=str(ROOT),
+                         capture_output=True, text=True, timeout=60)
+    assert out.stdout.strip() == "[]", out.stderr[-2000:]
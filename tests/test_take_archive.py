@@ -0,0 +1,116 @@
+"""The session take archive (take_archive.TakeArchive): raw captures
+written once, read back one memory-mapped capture at a time, and the
+tools that re-read them (recompensate --archive, capture_glitch_probe
+--archive)."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from perdeviceeq import measure_core as mc
+from perdeviceeq import take_archive as ta
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _capture(n, channels=2, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, channels)).astype("<f4")
+
+
+def test_append_label_and_lazy_read(tmp_path):
+    arc = ta.TakeArchive(str(tmp_path))
+    a, b = _capture(1000), _capture(500, seed=1)
+    b[7, 1] = np.nan
+    assert arc.append(a, 48000, signal={"n_samples": 64}) == 0
+    assert arc.append(b, 48000, kind="probe") == 1
+    arc.label(0, kind="take", take=1, channel=0, column=1)
+
+    back = ta.TakeArchive.open(str(tmp_path / ta.ARCHIVE_NAME))
+    assert len(back) == 2
+    assert [e["kind"] for e in back.entries] == ["take", "probe"]
+    assert back.find("take", take=1)[0]["signal"] == {"n_samples": 64}
+    x = back.frames(1)
+    assert isinstance(x, np.memmap)              # mapped, not loaded
+    assert x.shape == (500, 2) and not x.flags.writeable
+    assert np.array_equal(x, b, equal_nan=True)  # the bytes, untouched
+    col = back.column(0, 1)
+    assert col.dtype == np.float64 and np.array_equal(col, a[:, 1])
+    assert back.entries[1]["offset"] == a.nbytes
+    with pytest.raises(ta.ArchiveError):
+        back.column(0, 2)
+    with pytest.raises(ValueError):
+        arc.append(a.astype(np.float64), 48000)   # float32 only, as sent
+
+
+def test_damaged_archives_fail_cleanly(tmp_path):
+    with pytest.raises(ta.ArchiveError):
+        ta.TakeArchive.open(str(tmp_path))
+    arc = ta.TakeArchive(str(tmp_path))
+    arc.append(_capture(100), 48000)
+    with open(arc.path, "r+b") as f:
+        f.truncate(100)
+    with pytest.raises(ta.ArchiveError, match="truncated"):
+        ta.TakeArchive.open(str(tmp_path)).frames(0)
+    (tmp_path / (ta.ARCHIVE_NAME + ".json")).write_text('{"format": "x"}')
+    with pytest.raises(ta.ArchiveError, match="not a take archive"):
+        ta.TakeArchive.open(str(tmp_path))
+
+
+def test_recompensate_rebuilds_uncal_from_the_archive(tmp_path):
+    sw = mc.generate_sweep(1 << 15)
+    fs = sw.fs
+    sig = {"n_samples": sw.n_samples, "fs": fs, "f_start": sw.f_start,
+           "f_end": sw.f_end}
+    arc = ta.TakeArchive(str(tmp_path / "session"))
+    recs = []
+    for k in range(2):
+        rng = np.random.default_rng(k)
+        y = np.concatenate([np.zeros(fs // 2), 0.3 * sw.signal,
+                            np.zeros(fs // 2)])
+        y = y + 1e-5 * rng.standard_normal(len(y))
+        cap = np.stack([y, -y], axis=1).astype("<f4")
+        arc.label(arc.append(cap, fs, signal=sig), kind="take", take=k + 1,
+                  channel=0, column=1)
+        recs.append(cap[:, 1].astype(np.float64))
+    arc.append(_capture(fs), fs, kind="probe")     # ignored: not a take
+    direct = mc.process_takes(recs, sw, smoothing_fraction=0)
+
+    freqs = np.asarray(direct["data"]["freq_hz"])
+    # a result from before the grid block: the default grid is assumed
+    assert direct["grid"]["ppo"] == mc.GRID_PPO
+    r0 = {"cal_file": "OLD.txt", "smoothing": {"fraction": 6},
+          "warnings": [],
+          "data": {"freq_hz": list(freqs),
+                   "mag_db_raw": list(freqs * 0), "mag_db_uncal": None}}
+    res, out = tmp_path / "r.json", tmp_path / "o.json"
+    res.write_text(json.dumps(r0))
+    cal = tmp_path / "FLAT.txt"
+    cal.write_text("20 0\n20000 0\n")
+    r = subprocess.run([sys.executable, str(ROOT / "tools"
+                                            / "recompensate.py"),
+                        "--result", str(res), "--cal", str(cal),
+                        "--archive", str(tmp_path / "session"),
+                        "--out", str(out)],
+                       capture_output=True, text=True, timeout=120)
+    assert r.returncode == 0, r.stderr
+    got = json.loads(out.read_text())["data"]["mag_db_uncal"]
+    assert np.allclose(got, direct["data"]["mag_db_raw"], atol=1e-6)
+
+
+def test_glitch_probe_scans_an_archive(tmp_path):
+    arc = ta.TakeArchive(str(tmp_path))
+    arc.append(_capture(2000), 48000)
+    bad = _capture(2000, seed=3)
+    bad[11, 0] = np.inf
+    arc.label(arc.append(bad, 48000), kind="take", take=1)
+    r = subprocess.run([sys.executable, str(ROOT / "tools"
+                                            / "capture_glitch_probe.py"),
+                        "--archive", str(tmp_path)],
+                       capture_output=True, text=True, timeout=60)
+    assert r.returncode == 0, r.stderr
+    assert "1/2 runs had non-finite samples" in r.stdout
+    assert "(take 1): nonfinite at 11" in r.stdout
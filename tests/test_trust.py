@@ -201,3 +201,53 @@ def test_spread_median_costs_inside_the_band():
     assert ch["spread_median_db"] > trust.SPREAD_GOOD_DB
     assert ch["score"] < 100
     assert any("median in-band spread" in r for r in ch["reasons"])
+
+
+def test_incremental_state_tracks_the_canvas():
+    rng = np.random.default_rng(7)
+
+    def noisy(tid, key):
+        t = _take(tid, key, rng.normal(0.0, 0.6, N) + _hf_break(2.0),
+                  snr=float(rng.uniform(20.0, 50.0)))
+        t["soft_vol"] = float(rng.uniform(0.2, 0.5))
+        return t
+
+    def same(a, b):
+        assert a["score"] == b["score"] and a["reasons"] == b["reasons"]
+        assert a["band"] == b["band"]
+        assert list(a["channels"]) == list(b["channels"])
+        for k, ca in a["channels"].items():
+            cb = b["channels"][k]
+            assert ca["band"] == cb["band"]
+            assert ca["spread_median_db"] == cb["spread_median_db"]
+            assert ca["n_takes"] == cb["n_takes"]
+
+    takes = []
+    st = trust.TrustState(GRID)
+    for i in range(4):
+        for key in ("FL", "FR"):
+            t = noisy("%s%d" % (key, i), key)
+            takes.append(t)
+            st.add(t, sessions=_meas([])["sessions"])
+            same(st.assess(now=NOW),
+                 trust.assess({"measurement": _meas(list(takes))},
+                              now=NOW))
+    st.remove("FL1")
+    takes = [t for t in takes if t["id"] != "FL1"]
+    same(st.assess(now=NOW),
+         trust.assess({"measurement": _meas(list(takes))}, now=NOW))
+    # sync applies only the delta: an edited gain re-enters its take,
+    # a dropped take leaves, an off-grid one scores the canvas 0
+    takes[2] = dict(takes[2], soft_vol=0.45)
+    del takes[0]
+    m = _meas(takes)
+    st.sync(m)
+    same(st.assess(now=NOW), trust.assess({"measurement": m}, now=NOW))
+    m = _meas(takes + [_take("FR9", "FR", np.zeros(N - 1))])
+    st.sync(m)
+    assert st.assess(now=NOW)["score"] == 0
+    assert st.assess(now=NOW) == trust.assess({"measurement": m},
+                                              now=NOW)
+    st.sync(_meas(takes))
+    same(st.assess(now=NOW),
+         trust.assess({"measurement": _meas(takes)}, now=NOW))
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Speed and memory of the DSP and fitting hot paths.
+
+The tests pin what these functions compute; this pins what they cost.
+Every case is built from deterministic synthetic inputs (fixed seeds,
+the same recipes the tests and tools/make_fixtures.py use: Gaussian
+room features on the fit grid, an exponential sweep through a known
+biquad chain plus noise, seating noise on a two-channel canvas), so
+two runs on one machine measure the code, not the data:
+
+  fit10 / fit20      fit_peq.fit_to_desired, 10 and 20 bands
+  response_db        eq.response_db, 20 bands on the 96 ppo grid
+  channel_results    refit.channel_results, 2 channels x 10 takes
+                     with per-take cals
+  deconvolve_long    measure_core.deconvolve of a 2^20-sample sweep
+  meter_8ch          MeterEngine._run over 2 s of 8-channel float32
+                     blocks through 10-band chains
+
+Each case reports the best and median wall time over --repeat runs
+(after one warm-up) and the peak traced allocation of one extra run
+(tracemalloc sees NumPy's buffers). --save writes the results as a
+baseline JSON; --baseline compares against one and exits 1 when a
+case got slower (best time) or hungrier (peak memory) than the
+baseline by more than --threshold. Baselines are per machine: keep
+one next to the checkout you measure, not in the repo.
+
+Usage:
+    bench.py [--cases fit10,meter_8ch] [--repeat 5]
+             [--save base.json | --baseline base.json [--threshold 0.25]]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from perdeviceeq import eq, fit_peq, refit               # noqa: E402
+from perdeviceeq import measure_core as mc               # noqa: E402
+from perdeviceeq.meter import MeterEngine, chain_sos     # noqa: E402
+
+SCHEMA = 1
+SEED = 20260704
+THRESHOLD = 0.25          # default allowed regression, fraction
+
+
+def _room(rng, n_feat):
+    """A desired correction on the fit grid: `n_feat` Gaussian room
+    features (seeded) plus slow ripple -- the test suite's shape,
+    with enough features that a bigger band budget has work to do."""
+    fg = np.logspace(np.log10(20), np.log10(12000), fit_peq.GRID)
+    d = np.zeros_like(fg)
+    for f0 in np.geomspace(50.0, 8000.0, n_feat):
+        g = rng.uniform(-6.0, 5.0)
+        w = rng.uniform(0.15, 0.5)
+        d += g * np.exp(-0.5 * (np.log2(fg / f0) / w) ** 2)
+    return fg, d + 0.3 * np.sin(np.log2(fg) * 1.3)
+
+
+def _bands(rng, n):
+    return [eq.Band("PK", float(f), float(rng.uniform(-8.0, 6.0)),
+                    float(rng.uniform(0.5, 4.0)), True)
+            for f in np.geomspace(40.0, 14000.0, n)]
+
+
+def case_fit(n_bands):
+    def setup():
+        fg, d = _room(np.random.default_rng(SEED), n_bands * 2 // 3)
+        return lambda: fit_peq.fit_to_desired(fg, d, 20, 12000,
+                                              n_bands, 6.0)
+    return setup
+
+
+def case_response_db():
+    bands = _bands(np.random.default_rng(SEED), 20)
+    freqs = list(mc.log_grid())
+    return lambda: eq.response_db(-3.0, bands, freqs)
+
+
+def case_channel_results():
+    rng = np.random.default_rng(SEED)
+    freqs = mc.log_grid()
+    lf = np.log10(freqs)
+    base = -2.0 * (lf - lf[0]) + 4.0 * np.exp(
+        -((lf - np.log10(3000.0)) / 0.15) ** 2)
+    lib, takes = {}, []
+    for ch in ("FL", "FR"):
+        sha = "cal-%s" % ch
+        pts = np.geomspace(20.0, 20000.0, 200)
+        lib[sha] = {"file": sha + ".txt", "points": [
+            [float(f), float(v)] for f, v in
+            zip(pts, rng.normal(0.0, 0.5, len(pts)))]}
+        for i in range(10):
+            noise = np.convolve(rng.normal(0.0, 0.2, len(freqs)),
+                                np.ones(9) / 9.0, mode="same")
+            takes.append({
+                "id": "%s%d" % (ch, i), "session": "s1", "channel": ch,
+                "capture_channel": 0, "cal_sha": sha,
+                "mag_db_uncal": [float(v) for v in base + noise],
+                "snr_db": 45.0, "soft_vol": 0.3, "chan_vol": 0.3})
+    meas = {"grid": {"f_lo": mc.GRID_F_LO, "f_hi": mc.GRID_F_HI,
+                     "ppo": mc.GRID_PPO},
+            "sessions": {"s1": {}}, "cal_library": lib, "takes": takes}
+    return lambda: refit.channel_results(meas)
+
+
+def case_deconvolve_long():
+    rng = np.random.default_rng(SEED)
+    sweep = mc.generate_sweep(n_samples=1 << 20)
+    from scipy import signal as sg
+    room = sg.sosfilt(chain_sos(_bands(rng, 6), sweep.fs),
+                      sweep.signal)
+    pad = np.zeros(sweep.fs // 2)
+    rec = np.concatenate((pad, room, pad, pad))
+    rec = rec + rng.normal(0.0, 1e-3, len(rec))
+    return lambda: mc.deconvolve(rec, sweep)
+
+
+def case_meter_8ch():
+    rng = np.random.default_rng(SEED)
+    n, fs = 8, 48000
+    x = (0.3 * rng.standard_normal((2 * fs, n))).astype(np.float32)
+    raw = x.tobytes()
+    eng = MeterEngine(lambda frame: None, fs=fs)
+    chains = [_bands(rng, 10) for _ in range(n)]
+
+    def run():
+        eng.set_chains(-3.0, chains)
+        eng._run(io.BytesIO(raw))
+    return run
+
+
+CASES = {
+    "fit10": case_fit(10),
+    "fit20": case_fit(20),
+    "response_db": case_response_db,
+    "channel_results": case_channel_results,
+    "deconvolve_long": case_deconvolve_long,
+    "meter_8ch": case_meter_8ch,
+}
+
+
+def measure(fn, repeat):
+    """(best s, median s, peak MiB) of a zero-argument callable."""
+    fn()                                    # warm-up: caches, imports
+    times = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _cur, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), statistics.median(times), peak / 2.0 ** 20
+
+
+def run_cases(names=None, repeat=5, report=None):
+    """{name: {"best_s", "median_s", "peak_mib"}} for the chosen
+    cases (default: all), in CASES order."""
+    out = {}
+    for name in (names or list(CASES)):
+        if name not in CASES:
+            raise SystemExit("unknown case %r (known: %s)"
+                             % (name, ", ".join(CASES)))
+        best, med, peak = measure(CASES[name](), repeat)
+        out[name] = {"best_s": best, "median_s": med, "peak_mib": peak}
+        if report:
+            report(name, out[name])
+    return out
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Regression lines: a case slower (best time) or hungrier (peak
+    memory) than the baseline by more than `threshold`. Cases missing
+    on either side are not judged."""
+    bad = []
+    base = (baseline or {}).get("cases") or {}
+    for name, r in results.items():
+        b = base.get(name)
+        if not b:
+            continue
+        for key, unit in (("best_s", "s"), ("peak_mib", "MiB")):
+            old, new = b.get(key), r.get(key)
+            if old and new is not None and new > old * (1.0 + threshold):
+                bad.append("%s: %s %.4g %s -> %.4g %s (+%.0f%%)"
+                           % (name, key, old, unit, new, unit,
+                              100.0 * (new / old - 1.0)))
+    return bad
+
+
+def snapshot(results):
+    return {"schema": SCHEMA, "python": platform.python_version(),
+            "numpy": np.__version__, "machine": platform.machine(),
+            "cases": results}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--cases", help="comma-separated subset of: "
+                    + ", ".join(CASES))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--save", metavar="JSON",
+                    help="write the results as a baseline")
+    ap.add_argument("--baseline", metavar="JSON",
+                    help="compare against a saved baseline")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD,
+                    help="allowed regression (default %g = +%d%%)"
+                    % (THRESHOLD, 100 * THRESHOLD))
+    args = ap.parse_args()
+    base = None
+    if args.baseline:
+        with open(args.baseline) as fh:
+            base = json.load(fh)
+    old = (base or {}).get("cases") or {}
+
+    def report(name, r):
+        ref = old.get(name, {}).get("best_s")
+        print("%-16s best %9.2f ms  median %9.2f ms  peak %8.2f MiB%s"
+              % (name, 1e3 * r["best_s"], 1e3 * r["median_s"],
+                 r["peak_mib"],
+                 "  (%+.0f%%)" % (100.0 * (r["best_s"] / ref - 1.0))
+                 if ref else ""))
+        sys.stdout.flush()
+
+    names = args.cases.split(",") if args.cases else None
+    res = run_cases(names, args.repeat, report)
+    if args.save:
+        with open(args.save, "w") as fh:
+            json.dump(snapshot(res), fh, indent=1, sort_keys=True)
+            fh.write("\n")
+        print("baseline written: %s" % args.save)
+    if base is not None:
+        bad = compare(res, base, args.threshold)
+        for line in bad:
+            print("REGRESSION " + line)
+        if bad:
+            return 1
+        print("no regression past +%d%%" % round(100 * args.threshold))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
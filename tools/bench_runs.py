@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the run-length toolkit (perdeviceeq/runs.py).
+
+Usage:
+    bench_runs.py [--repeat N]
+
+Times run_bounds, erode, longest_run, band_edges and a 900-row
+longest_runs (a 30-rig bridge matrix) on the 20 Hz-20 kHz grid at
+24..384 points per octave, on a realistic mask: trusted from the
+bottom, a few single-point dropouts, chaos above 10 kHz. The
+ns/point column is the check: flat down the table means the cost is
+O(n) array work, not a per-point Python loop.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from perdeviceeq import runs                          # noqa: E402
+from perdeviceeq import measure_core as mc            # noqa: E402
+
+
+def _mask(freqs, rng):
+    ok = np.ones(len(freqs), bool)
+    ok[rng.choice(len(freqs), 6, replace=False)] = False
+    top = freqs > 10000.0
+    ok[top] = rng.random(int(top.sum())) < 0.5
+    return ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+    rng = np.random.default_rng(0)
+    ratio = 2.0 ** (1.0 / 6.0)
+    print("%5s %6s  %-12s %10s %10s" % ("ppo", "points", "helper",
+                                        "us/call", "ns/point"))
+    for ppo in (24, 48, 96, 192, 384):
+        freqs = mc.log_grid(20.0, 20000.0, ppo)
+        m = _mask(freqs, rng)
+        rows = np.array([_mask(freqs, rng) for _ in range(900)])
+        cases = [
+            ("run_bounds", lambda: runs.run_bounds(m), 1),
+            ("erode", lambda: runs.erode(m, ppo // 12), 1),
+            ("longest_run", lambda: runs.longest_run(m), 1),
+            ("band_edges", lambda: runs.band_edges(freqs, m, ratio), 1),
+            ("longest_runs", lambda: runs.longest_runs(rows), 900),
+        ]
+        for name, fn, nrows in cases:
+            reps = max(1, args.repeat // nrows * 10)
+            t = min(timeit.repeat(fn, number=reps, repeat=3)) / reps
+            print("%5d %6d  %-12s %10.1f %10.2f"
+                  % (ppo, len(freqs), name, t * 1e6,
+                     t * 1e9 / (len(freqs) * nrows)))
+
+
+if __name__ == "__main__":
+    main()
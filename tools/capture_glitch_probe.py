@@ -16,13 +16,21 @@ counts and the first-index histogram localize it.
 
 If NaN shows up here at a real rate on a stable position, that is material
 for a PipeWire bug report (attach: pipewire --version, `pw-cli info 0`, the
-per-run indices, and a raw<NN>.wav). If it never shows here but does inside
-the full measurement, the cause is in the orchestration, not PipeWire.
+per-run indices, and the --save archive). If it never shows here but does
+inside the full measurement, the cause is in the orchestration, not
+PipeWire.
+
+--archive scans captures already on disk instead: a measurement
+session's take archive (every sweep's untouched capture) or one written
+here with --save, one memory-mapped capture at a time, with the same
+report -- so a glitch seen during a real measurement is counted on the
+exact bytes pw-record delivered, without re-running anything.
 
 Example:
   tools/capture_glitch_probe.py --source miniDSP --sink bluez_output.X \
       --sweep tests/fixtures-local/<run>/sweep.wav --runs 50
   tools/capture_glitch_probe.py --source miniDSP --runs 50   # silent, no play
+  tools/capture_glitch_probe.py --archive tests/fixtures-local/<run>/
 """
 import argparse
 import os
@@ -34,6 +42,7 @@ import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from perdeviceeq import measure_session as ms        # noqa: E402
+from perdeviceeq.take_archive import ArchiveError, TakeArchive  # noqa: E402
 
 
 def _play(sink_id, wav):
@@ -44,7 +53,71 @@ def _play(sink_id, wav):
         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
+class Tally:
+    """Per-run non-finite bookkeeping and the final report."""
+
+    def __init__(self, channels):
+        self.runs = 0
+        self.runs_with_nan = 0
+        self.hits = [0] * channels      # non-finite samples per channel
+        self.first_idx = []             # first non-finite index per run
+
+    def add(self, x, label):
+        self.runs += 1
+        run_first = None
+        for c in range(min(len(self.hits), x.shape[1])):
+            idx = np.nonzero(~np.isfinite(x[:, c]))[0]
+            if idx.size:
+                self.hits[c] += int(idx.size)
+                run_first = idx[0] if run_first is None \
+                    else min(run_first, idx[0])
+        if run_first is not None:
+            self.runs_with_nan += 1
+            self.first_idx.append(int(run_first))
+        print("  %s: %s" % (label, "nonfinite at %s" % run_first
+                            if run_first is not None else "clean"))
+
+    def report(self):
+        print("\n%d/%d runs had non-finite samples"
+              % (self.runs_with_nan, self.runs))
+        for c, n in enumerate(self.hits):
+            print("  channel %d: %d non-finite sample(s)" % (c, n))
+        if self.first_idx:
+            vals, cnt = np.unique(np.array(self.first_idx),
+                                  return_counts=True)
+            print("  first-index histogram:",
+                  dict(zip(vals.tolist(), cnt.tolist())))
+        if any(self.hits):
+            print("VERDICT: non-finite samples in the raw capture path -- "
+                  "a real capture dropout, worth a PipeWire report.")
+        else:
+            print("VERDICT: no non-finite samples in %d runs." % self.runs)
+
+
+def scan(a):
+    try:
+        arc = TakeArchive.open(a.archive)
+    except ArchiveError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print("archive: %s (%d capture(s))" % (arc.path, len(arc)))
+    tally = Tally(max([e["channels"] for e in arc.entries] or [1]))
+    for e in arc.entries:
+        what = e["kind"] if e.get("take") is None \
+            else "take %d" % e["take"]
+        tally.add(arc.frames(e["index"]),
+                  "capture %2d (%s)" % (e["index"], what))
+    tally.report()
+    return 0
+
+
 def probe(a):
+    if a.archive:
+        return scan(a)
+    if not a.source:
+        print("--source is required unless scanning an --archive",
+              file=sys.stderr)
+        return 2
     dump = ms.pw_dump()
     src = ms.resolve_node(dump, a.source, "Audio/Source")
     sink = ms.resolve_node(dump, a.sink, "Audio/Sink") if a.sink else None
@@ -54,10 +127,8 @@ def probe(a):
         print("playing %s on %s (id %d) during capture"
               % (a.sweep, sink["info"]["props"].get("node.name"), sink["id"]))
     need = int(a.seconds * a.rate)
-
-    runs_with_nan = 0
-    hits = [0] * a.channels             # non-finite samples per channel
-    first_idx = []                      # first non-finite index seen per run
+    tally = Tally(a.channels)
+    save = TakeArchive(a.save) if a.save else None
 
     for r in range(a.runs):
         cap = ms.CaptureStream(src["id"], a.channels, a.rate)
@@ -71,40 +142,20 @@ def probe(a):
             if play is not None and play.poll() is None:
                 play.kill()
             cap.stop()
-        x = cap.data()
-        run_bad = False
-        run_first = None
-        for c in range(min(a.channels, x.shape[1])):
-            idx = np.nonzero(~np.isfinite(x[:, c]))[0]
-            if idx.size:
-                run_bad = True
-                hits[c] += int(idx.size)
-                run_first = idx[0] if run_first is None \
-                    else min(run_first, idx[0])
-        if run_bad:
-            runs_with_nan += 1
-            first_idx.append(int(run_first))
-        print("  run %2d/%d: %s" % (r + 1, a.runs,
-              "nonfinite at %s" % run_first if run_bad else "clean"))
-
-    print("\n%d/%d runs had non-finite samples" % (runs_with_nan, a.runs))
-    for c in range(a.channels):
-        print("  channel %d: %d non-finite sample(s)" % (c, hits[c]))
-    if first_idx:
-        vals, cnt = np.unique(np.array(first_idx), return_counts=True)
-        print("  first-index histogram:",
-              dict(zip(vals.tolist(), cnt.tolist())))
-    if any(hits):
-        print("VERDICT: non-finite samples in the raw capture path -- a "
-              "real capture dropout, worth a PipeWire report.")
-    else:
-        print("VERDICT: no non-finite samples in %d runs." % a.runs)
+        x = cap.frames()                # the raw f32, uncopied
+        if save is not None:
+            save.append(x, a.rate, kind="glitch-probe", run=r + 1)
+        tally.add(x, "run %2d/%d" % (r + 1, a.runs))
+
+    tally.report()
+    if save is not None:
+        print("captures saved to %s" % save.path)
     return 0
 
 
 def main(argv):
     p = argparse.ArgumentParser(description="capture non-finite glitch probe")
-    p.add_argument("--source", required=True,
+    p.add_argument("--source",
                    help="mic source (id, node.name, or substring)")
     p.add_argument("--sink", help="sink to play the sweep on during capture")
     p.add_argument("--sweep", help="wav to play on --sink (else capture is "
@@ -113,6 +164,10 @@ def main(argv):
     p.add_argument("--channels", type=int, default=2)
     p.add_argument("--rate", type=int, default=48000)
     p.add_argument("--seconds", type=float, default=1.5)
+    p.add_argument("--save", help="append every run's raw capture to this "
+                                  "take archive (takes.pdea)")
+    p.add_argument("--archive", help="scan a take archive (a session dir "
+                                     "or takes.pdea) instead of capturing")
     return probe(p.parse_args(argv))
 
 
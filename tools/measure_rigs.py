@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Concurrent multi-rig measurement runner.
+
+measure_run.py measures one sink/mic pair per invocation, with reseat
+pauses in between; a lab with several couplers wants them all sweeping
+at once, unattended. This is a thin driver over
+measure_rigs.RigScheduler: one --rig NAME SINK SOURCE per rig, the
+same take count on each, results under <out-dir>/<rig>/result_ch<N>.json
+and a throughput line (takes per hour) at the end. No reseat pauses:
+an unattended rig takes its sweeps back to back.
+
+CI without hardware: PDE_SHIM_RIGS=N makes tests/shims fake N rigs
+(test_sink / test_source, test_sink_rig1 / test_source_rig1, ...).
+
+Exit codes: 0 ok, 1 a rig failed, 2 refusal, 3 declined, 130 interrupted.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from perdeviceeq import measure_core as mc
+from perdeviceeq.measure_rigs import RigPlan, RigScheduler, rig_slug
+from perdeviceeq.measure_session import (RefusalError, SessionConfig,
+                                         default_save_base)
+
+
+def confirm(prompt, assume_yes):
+    if assume_yes:
+        print("%s [auto-confirmed: --yes]" % prompt)
+        return True
+    try:
+        ans = input("%s [y/N] " % prompt)
+    except EOFError:
+        return False
+    return ans.strip().lower() in ("y", "yes")
+
+
+def measure(a):
+    if not a.rig:
+        raise RefusalError("no --rig given")
+    out_dir = a.out_dir or os.path.join(a.save_dir or default_save_base(),
+                                        "rigs-out")
+    plans = []
+    for name, sink, source in a.rig:
+        cfg = SessionConfig(sink=sink, source=source, channels=a.channels,
+                            samples=a.samples, fs=a.fs,
+                            smoothing=a.smoothing, device=name,
+                            save_dir=a.save_dir or default_save_base(),
+                            mute_others=a.mute_others,
+                            auto_level=a.auto_level)
+        plans.append(RigPlan(name, cfg, channels=(a.channel,),
+                             takes=a.takes,
+                             out_dir=os.path.join(out_dir, rig_slug(name)),
+                             accept_stuck=a.accept_stuck))
+    sched = RigScheduler(plans)
+    for name, ses in sched.sessions.items():
+        for w in ses.precondition_notes:
+            print("[%s] %s" % (name, w), file=sys.stderr)
+        si, so = ses.sink_ident, ses.source_ident
+        print("rig %-12s sink %s (id %s)  mic %s (id %s)"
+              % (name, si["name"], si["id"], so["name"], so["id"]))
+    if not confirm("Sweeps WILL PLAY on all %d sinks at once. Proceed?"
+                   % len(plans), a.yes):
+        print("declined", file=sys.stderr)
+        return 3
+
+    def progress(rig, ch, out):
+        if out.kind == "take":
+            print("[%s] take %d: peak %.1f dBFS" % (rig, out.take.id,
+                                                    out.take.peak_dbfs))
+        elif out.kind == "level_probe":
+            print("[%s] auto-level: %.0f%% -> %.0f%%"
+                  % (rig, 100 * out.level["volume_from"],
+                     100 * out.level["volume_to"]))
+        for n in out.notes:
+            print("[%s] %s" % (rig, n), file=sys.stderr)
+
+    rep = sched.run(on_outcome=progress)   # Ctrl-C: cancels, joins, raises
+    for r in rep["rigs"]:
+        print("rig %-12s %d take(s), %d probe(s), %.1f s%s"
+              % (r["rig"], r["takes"], r["probes"], r["elapsed_s"],
+                 "  FAILED: %s" % r["error"] if r["error"] else ""))
+    print("%d take(s) in %.1f s (%.1f s one rig at a time): %s takes/hour"
+          % (rep["takes"], rep["elapsed_s"], rep["serial_s"],
+             rep["takes_per_hour"]))
+    if a.report:
+        with open(a.report, "w", encoding="utf-8") as f:
+            json.dump(rep, f, indent=1)
+    return 1 if rep["failed"] else 0
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        epilog="exit codes: 0 ok, 1 a rig failed, 2 refusal, "
+               "3 declined, 130 interrupted")
+    p.add_argument("--rig", nargs=3, action="append",
+                   metavar=("NAME", "SINK", "SOURCE"),
+                   help="one rig: a name, its sink and its mic source "
+                        "(repeat per rig)")
+    p.add_argument("--takes", type=int, default=3,
+                   help="accepted takes per rig")
+    p.add_argument("--channels", type=int, default=1,
+                   help="capture channel count (EARS = 2)")
+    p.add_argument("--channel", type=int, default=0,
+                   help="captured channel to analyze")
+    p.add_argument("--smoothing", type=int, default=6,
+                   help="1/N octave (0 = off)")
+    p.add_argument("--samples", type=int, default=mc.DEFAULT_N)
+    p.add_argument("--fs", type=int, default=mc.DEFAULT_FS)
+    p.add_argument("--mute-others", action="store_true",
+                   help="mute foreign streams on each sink instead of "
+                        "refusing to start")
+    p.add_argument("--auto-level", action="store_true",
+                   help="level every rig on its own (see measure_run)")
+    p.add_argument("--accept-stuck", action="store_true",
+                   help="keep a take when auto-level gives up instead "
+                        "of failing that rig")
+    p.add_argument("--yes", action="store_true",
+                   help="assume yes on the confirmation")
+    p.add_argument("--save-dir", help="base dir for raw takes (one "
+                                      "subdirectory per rig)")
+    p.add_argument("--out-dir", help="results base dir (default: "
+                                     "<save dir>/rigs-out)")
+    p.add_argument("--report", help="write the run report as JSON here")
+    a = p.parse_args(argv)
+
+    try:
+        return measure(a)
+    except RefusalError as e:
+        print("refusing to start: %s" % e, file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print("\ninterrupted (every rig's restore ran in its context "
+              "exit)", file=sys.stderr)
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
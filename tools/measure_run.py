@@ -22,15 +22,17 @@ Exit codes: 0 ok, 1 measurement error, 2 environment/precondition refusal,
 3 declined confirmation, 130 interrupted.
 """
 import argparse
+import dataclasses
 import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from perdeviceeq import measure_core as mc
+from perdeviceeq.measure_prefs import MeasureMemory
 from perdeviceeq.measure_session import (
-    AUTO_MAX_ADJUST, AUTO_PEAK_CEIL, AUTO_START_VOLUME,
-    FaultyCaptureError, MeasureError, MeasureSession, RefusalError,
-    SessionConfig, default_save_base)
+    AUTO_EXPLORE_CEIL, AUTO_LAW_AIM, AUTO_MAX_ADJUST, AUTO_PEAK_CEIL,
+    AUTO_START_VOLUME, FaultyCaptureError, MeasureError, MeasureSession, RefusalError,
+    SessionConfig, default_save_base, law_volume)
 
 
 # --- interaction ---------------------------------------------------------
@@ -54,6 +56,16 @@ def pause_reseat(i, n):
         print("(stdin closed; continuing without the reseat pause)")
 
 
+def plan_text(plan):
+    return ("SNR %.1f dB -> %d-sample sweep (%.1f s a take), %d take(s), "
+            "trusted band in ~%.0f s (fixed sweep ~%.0f s)%s"
+            % (plan["snr_db"], plan["samples"], plan["take_s"],
+               plan["repeats"], plan["time_to_trusted_s"],
+               plan["default_s"],
+               "" if plan["reaches"] else
+               "; the target SNR is out of reach here"))
+
+
 # --- main ----------------------------------------------------------------
 
 def measure(a):
@@ -71,8 +83,28 @@ def measure(a):
                         save_dir=(a.save_dir
                                   or default_save_base()),
                         mute_others=a.mute_others, auto_level=a.auto_level,
-                        raw_capture_dump=a.raw_capture_dump)
+                        raw_capture_dump=a.raw_capture_dump,
+                        take_wavs=a.take_wavs,
+                        adaptive_sweep=a.adaptive_sweep,
+                        fast_probe=not a.sweep_probes)
     ses = MeasureSession(cfg)
+    memory = None
+    if a.adaptive_sweep or a.auto_level:
+        # the plan is cached per resolved sink+mic pair, the volume law
+        # per pair and rig; construction is read-only, so re-birth the
+        # session onto what the cache knows
+        memory = MeasureMemory()
+        sink_name, source_name = (ses.sink_ident["name"],
+                                  ses.source_ident["name"])
+        cached = {}
+        if a.adaptive_sweep:
+            cached["sweep_plan"] = memory.sweep_for(sink_name, source_name)
+        if a.auto_level:
+            cached["volume_law"] = memory.law_for(sink_name, source_name,
+                                                  a.rig)
+        cached = {k: v for k, v in cached.items() if v}
+        if cached:
+            ses = MeasureSession(dataclasses.replace(cfg, **cached))
     for w in ses.precondition_notes:
         print(w, file=sys.stderr)
 
@@ -88,18 +120,25 @@ def measure(a):
              "" if not a.auto_level else "; --auto-level may raise it"))
     print("Sweep       : %.2f s, %g-%g Hz @ %g dBFS digital, stream "
           "volume 1.0, %d take(s)"
-          % (sw.duration_s, sw.f_start, sw.f_end, sw.level_dbfs, a.takes))
+          % (sw.duration_s, sw.f_start, sw.f_end, sw.level_dbfs,
+             ses.planned_takes(a.takes)))
     if not confirm("The sweep WILL PLAY on this device at the volume "
                    "above. Proceed?", a.yes):
         print("declined", file=sys.stderr)
         return 3
     if a.auto_level:
+        law = ses.cfg.volume_law
+        v_law = law_volume(law, AUTO_LAW_AIM) if law else None
+        start = ("start at the learned level %.0f%%"
+                 % (100 * min(v_law, AUTO_EXPLORE_CEIL))
+                 if v_law is not None else
+                 "start quiet at %.0f%%" % (100 * min(v0 or 1.0,
+                                                      AUTO_START_VOLUME)))
         if not confirm("--auto-level will adjust the sink volume "
-                       "(start quiet at %.0f%%, up to %d raises, "
+                       "(%s, up to %d raises, "
                        "target SNR >= %g dB at a peak below %g dBFS). "
                        "Proceed?"
-                       % (100 * min(v0 or 1.0, AUTO_START_VOLUME),
-                          AUTO_MAX_ADJUST, mc.SNR_WARN_DB,
+                       % (start, AUTO_MAX_ADJUST, mc.SNR_WARN_DB,
                           AUTO_PEAK_CEIL), a.yes):
             print("declined", file=sys.stderr)
             return 3
@@ -107,9 +146,11 @@ def measure(a):
     with ses:
         print("Artifacts   : %s" % ses.outdir)
         accepted = 0
-        while accepted < a.takes:
+        # --adaptive-sweep: the plan's repeats raise the count
+        while accepted < ses.planned_takes(a.takes):
+            want = ses.planned_takes(a.takes)
             if accepted:
-                pause_reseat(accepted + 1, a.takes)
+                pause_reseat(accepted + 1, want)
             try:
                 out = ses.take(a.channel)
             except FaultyCaptureError as e:
@@ -122,16 +163,21 @@ def measure(a):
             snr = (out.take.snr_db if out.take
                    else (out.level or {}).get("snr_db"))
             print("take %d/%d: capture peak %.1f dBFS, SNR %s"
-                  % (accepted + 1, a.takes, pk,
+                  % (accepted + 1, want, pk,
                      "%.1f dB" % snr if snr is not None else "n/a"))
             for n in out.notes:
                 print(n, file=sys.stderr)
+            if out.kind == "level_probe" and "sweep_plan" in out.level:
+                print("adaptive sweep: %s, retrying the take"
+                      % plan_text(out.level["sweep_plan"]))
+                continue
             if out.kind == "level_probe":
                 lv = out.level
                 print("auto-level: sink volume %.0f%% -> %.0f%% "
-                      "(step %d/%d), retrying the take"
+                      "(step %d/%d, %s probe), retrying the take"
                       % (100 * lv["volume_from"], 100 * lv["volume_to"],
-                         lv["step"], lv["max_steps"]))
+                         lv["step"], lv["max_steps"],
+                         lv.get("probe", "sweep")))
                 continue
             if out.kind == "level_stuck":
                 if not confirm("Continue at the current level anyway?",
@@ -153,6 +199,16 @@ def measure(a):
              t["snr_min_db"] if t["snr_min_db"] is not None else "n/a"))
     for w in result["warnings"]:
         print("WARNING: %s" % w)
+    if ses.sweep_plan is not None:
+        plan = ses.sweep_plan.as_dict()
+        print("Sweep plan  : %s" % plan_text(plan))
+        if memory is not None:
+            memory.remember(ses.sink_ident["name"],
+                            source=ses.source_ident["name"], sweep=plan)
+    if a.auto_level and ses.volume_law and memory is not None:
+        memory.remember(ses.sink_ident["name"],
+                        source=ses.source_ident["name"],
+                        law=ses.volume_law, rig=a.rig)
     if ses.eq_state["restored"] is False:
         return 1
     return 0
@@ -170,7 +226,8 @@ def main(argv=None):
                    help="measurement mic: node id, node.name or unique "
                         "substring")
     p.add_argument("--takes", type=int, default=1,
-                   help="seatings to average (reseat prompt in between)")
+                   help="seatings to average (reseat prompt in between; "
+                        "--adaptive-sweep may ask for more)")
     p.add_argument("--channels", type=int, default=1,
                    help="capture channel count (EARS = 2)")
     p.add_argument("--channel", type=int, default=0,
@@ -197,6 +254,10 @@ def main(argv=None):
                         "noise floor makes that impossible"
                         % (mc.SNR_WARN_DB, AUTO_PEAK_CEIL,
                            AUTO_MAX_ADJUST))
+    p.add_argument("--sweep-probes", action="store_true",
+                   help="level with full measurement sweeps instead of "
+                        "the short probe chirp (slower; for a device "
+                        "whose chirp and sweep peaks disagree)")
     p.add_argument("--yes", action="store_true",
                    help="assume yes on confirmations (NOT on reseat "
                         "pauses)")
@@ -205,9 +266,19 @@ def main(argv=None):
     p.add_argument("--save-dir",
                    help="base dir for raw takes (default: "
                         "tests/fixtures-local of the checkout, else cwd)")
+    p.add_argument("--adaptive-sweep", action="store_true",
+                   help="choose the sweep length and take count from "
+                        "the measured noise floor (at least --takes); the "
+                        "plan is cached per sink+mic")
     p.add_argument("--raw-capture-dump", action="store_true",
-                   help="also save the untouched capture as raw<NN>.wav "
-                        "for glitch diagnostics")
+                   help="also archive the auto-level probe captures "
+                        "(every sweep's untouched capture is always in "
+                        "the session's takes.pdea) for glitch "
+                        "diagnostics")
+    p.add_argument("--take-wavs", action="store_true",
+                   help="also export every accepted take as "
+                        "take<NN>.wav (post-repair); the raw captures "
+                        "live in takes.pdea either way")
     a = p.parse_args(argv)
 
     try:
@@ -10,12 +10,17 @@ headphones in one reference, does not need a fresh sweep per cal.
 It reads the uncalibrated magnitude the core now stores (data.mag_db_uncal)
 and applies the new cal. For older result.json written before that field
 existed, pass --from-cal with the cal the file was measured through (its
-name is in cal_file) so the old offset can be added back first.
+name is in cal_file) so the old offset can be added back first -- or
+--archive with the session directory (or its takes.pdea): the kept raw
+takes are re-analyzed from the session's take archive, one memory-mapped
+capture at a time, and the uncalibrated curve is rebuilt from them.
 
   recompensate.py --result liberty5_L.json --cal L_RAW_8603052.txt \
       --out liberty5_L_raw.json
   recompensate.py --result old.json --from-cal L_HEQ_8603052.txt \
       --cal L_IDF_8603052.txt --out new.json
+  recompensate.py --result old.json --archive fixtures-local/liberty5_X/ \
+      --channel 0 --cal L_IDF_8603052.txt --out new.json
 """
 import argparse
 import copy
@@ -27,6 +32,48 @@ import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from perdeviceeq import measure_core as mc           # noqa: E402
+from perdeviceeq.take_archive import ArchiveError, TakeArchive  # noqa: E402
+
+
+def uncal_from_archive(path, channel, freqs, r):
+    """The uncalibrated average of the archive's kept takes of profile
+    `channel` (all of them when None and only one channel was kept),
+    re-analyzed exactly like the core: same grid, same sweep, the
+    same repair of isolated non-finite samples."""
+    from perdeviceeq.measure_session import repair_nonfinite
+    arc = TakeArchive.open(path)
+    takes = arc.find("take")
+    if channel is None:
+        chans = sorted({e.get("channel") for e in takes})
+        if len(chans) > 1:
+            raise ArchiveError("the archive holds takes of channels %s; "
+                               "pick one with --channel" % chans)
+    else:
+        takes = [e for e in takes if e.get("channel") == channel]
+    if not takes:
+        raise ArchiveError("no kept takes%s in %s"
+                           % ("" if channel is None
+                              else " of channel %d" % channel, arc.path))
+    refs = {json.dumps(e["signal"], sort_keys=True) for e in takes}
+    if len(refs) != 1 or not takes[0]["signal"]:
+        raise ArchiveError("the kept takes do not share one sweep")
+    sig = takes[0]["signal"]
+    sw = mc.generate_sweep(sig["n_samples"], sig["fs"], sig["f_start"],
+                           sig["f_end"])
+    recs = []
+    for e in takes:                   # one capture mapped at a time
+        x = arc.column(e["index"], e.get("column") or 0)
+        if not np.isfinite(x).all():
+            x = repair_nonfinite(x)
+        recs.append(x)
+    g = r.get("grid") or {}           # older results: the default grid
+    res = mc.process_takes(recs, sw, smoothing_fraction=0,
+                           f_lo=g.get("f_lo", mc.GRID_F_LO),
+                           f_hi=g.get("f_hi", mc.GRID_F_HI),
+                           ppo=g.get("ppo", mc.GRID_PPO))
+    uf = np.asarray(res["data"]["freq_hz"], float)
+    return np.interp(np.log(freqs), np.log(uf),
+                     np.asarray(res["data"]["mag_db_raw"], float))
 
 
 def main(argv):
@@ -36,6 +83,11 @@ def main(argv):
     p.add_argument("--cal", required=True, help="new mic cal file to apply")
     p.add_argument("--from-cal", help="cal the input was measured through "
                                       "(only needed if it lacks mag_db_uncal)")
+    p.add_argument("--archive", help="session dir or takes.pdea to "
+                                     "rebuild the uncalibrated curve from "
+                                     "(when the input lacks mag_db_uncal)")
+    p.add_argument("--channel", type=int,
+                   help="profile channel of the archived takes to use")
     p.add_argument("--out", required=True, help="output result.json")
     a = p.parse_args(argv)
 
@@ -45,6 +97,11 @@ def main(argv):
 
     if "mag_db_uncal" in d and d["mag_db_uncal"] is not None:
         uncal = np.asarray(d["mag_db_uncal"], float)
+    elif a.archive:
+        try:
+            uncal = uncal_from_archive(a.archive, a.channel, freqs, r)
+        except ArchiveError as e:
+            p.error(str(e))
     elif a.from_cal:
         # add the old offset back: stored = uncal - old_cal  ->  uncal =
         # stored + old_cal
@@ -53,14 +110,16 @@ def main(argv):
             + np.interp(np.log(freqs), np.log(of), od)
     else:
         p.error("this result.json has no mag_db_uncal; pass --from-cal with "
-                "the cal it was measured through (%s)"
+                "the cal it was measured through (%s), or --archive with "
+                "its session's take archive"
                 % r.get("cal_file", "unknown"))
 
     nf, nd = mc.load_mic_cal(a.cal)
     avg = mc.apply_mic_cal(freqs, uncal, nf, nd)
-    ppo = r["grid"]["ppo"]
-    frac = r["smoothing"]["fraction"]
-    smoothed = mc.smooth_fractional_octave(avg, ppo, frac)
+    sm = r["smoothing"]
+    smoothed = mc.smooth_curves(
+        avg, freqs, sm["type"] if sm.get("type") in ("psychoacoustic", "erb")
+        else sm["fraction"])
 
     out = copy.deepcopy(r)
     out["cal_file"] = os.path.basename(a.cal)
@@ -21,17 +21,21 @@
 --   * the GUI/CLI push live edits into the "per-device-eq" metadata object; we
 --     subscribe to its "changed" signal, update the table, apply to the live
 --     node, and persist the table back to WpState;
+--   * many devices at once (--apply) arrive as ONE write of the "batch" key, a
+--     JSON object node.name -> graph ("" = Clean): each entry is applied and
+--     mirrored to its own key, the table persisted once, the batch key cleared;
 --   * each sink gets its graph (re)applied when it reaches the "running" state,
 --     which also covers hotplug / Bluetooth reconnect.
 -- No background process of the user's is involved: the EQ lives in WirePlumber.
 
 local log   = Log.open_topic("pde")
 local META  = "per-device-eq"   -- metadata object name (live edits from the app)
-local PROTOCOL = "1"            -- channel protocol; stamped into the metadata on
+local PROTOCOL = "2"            -- channel protocol; stamped into the metadata on
                                 -- activation, compared by the app (bump together
                                 -- with PROTOCOL in perdeviceeq/config.py on any
                                 -- breaking change to the graph string or the
                                 -- metadata contract)
+local BATCH = "batch"           -- key carrying many devices' graphs in one write
 local STATE = "per-device-eq"   -- WpState name -> ~/.local/state/wireplumber/per-device-eq
 
 -- identity / flat graph: a single 0 dB filter. Applied to strip EQ when a device
@@ -87,8 +91,8 @@ md_om:connect("object-added", function(_, m)
     -- stamp the channel protocol; the app compares it at startup
     -- and offers a one-click reinstall on mismatch
     m:set(0, "protocol", "Spa:String:JSON", PROTOCOL)
-    m:connect("changed", function(_, subject, key, typ, value)
-      if key == "protocol" then return end
+    local echo = {}   -- node.name -> value we are mirroring from a batch
+    local function take(key, value)
       if value ~= nil and value ~= "" then
         graphs[key] = value
         local n = nodes[key]; if n then set_graph(n, value) end
@@ -96,6 +100,36 @@ md_om:connect("object-added", function(_, m)
         graphs[key] = nil                  -- key cleared (Clean) -> strip EQ
         local n = nodes[key]; if n then set_graph(n, FLAT) end
       end
+    end
+    m:connect("changed", function(_, subject, key, typ, value)
+      if key == "protocol" then return end
+      if echo[key] ~= nil and echo[key] == (value or "") then
+        echo[key] = nil                    -- our own mirror: applied already
+        return
+      end
+      if key == BATCH then
+        if value == nil or value == "" then return end  -- our own clear
+        local ok, batch = pcall(function() return Json.Raw(value):parse() end)
+        if not ok or type(batch) ~= "table" then
+          log.warning("unreadable batch: " .. tostring(batch)); return
+        end
+        for name, g in pairs(batch) do
+          if type(g) == "string" then take(name, g) end
+        end
+        persist()
+        -- mirror each entry to its own key (readers see what plays, as
+        -- after single writes), then drop the batch itself
+        for name, g in pairs(batch) do
+          if type(g) == "string" then
+            echo[name] = g
+            if g ~= "" then m:set(0, name, "Spa:String:JSON", g)
+            else m:set(0, name, nil, nil) end
+          end
+        end
+        m:set(0, BATCH, nil, nil)
+        return
+      end
+      take(key, value)
       persist()
     end)
   end)